@@ -7,16 +7,16 @@ from jose import jwt, JWTError
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm.exc import StaleDataError
 from core import security
 from core.config import settings
 from core.db import get_db
+from core.last_seen import last_seen_buffer
+from core.principal_cache import principal_cache
 from core.services.accountant_relation_service import EffectiveOwnerActor, resolve_effective_owner_actor
 from core.services.user_account_status_service import is_user_global_web_locked
 from core.request_context import set_request_context
 from models.session import UserSession
 from models.user import User, UserRole
-from core.utils import utc_now_naive
 import logging
 
 logger = logging.getLogger(__name__)
@@ -55,30 +55,30 @@ def _ensure_user_access_allowed(user: User) -> None:
         )
 
 
-async def _touch_last_seen(db: AsyncSession, user: User) -> User:
-    """Update presence without letting an optimistic-lock race fail the request."""
-    user_id = int(user.id)
-    for _attempt in range(3):
-        now = utc_now_naive()
-        if user.last_seen_at and (now - user.last_seen_at).total_seconds() <= 60:
-            return user
+def _session_revoked() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Session has been revoked",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
 
-        user.last_seen_at = now
-        try:
-            await db.commit()
-            return user
-        except StaleDataError:
-            await db.rollback()
-            stmt = (
-                select(User)
-                .where(User.id == user_id)
-                .execution_options(populate_existing=True)
-            )
-            user = (await db.execute(stmt)).scalar_one_or_none()
-            if user is None:
-                raise HTTPException(status_code=404, detail="User not found")
 
-    return user
+async def _reject_blacklisted_session(session_id: str) -> None:
+    from core.services.session_service import is_session_blacklisted
+
+    if await is_session_blacklisted(session_id):
+        raise _session_revoked()
+
+
+async def _require_active_session(db: AsyncSession, session_id: str, user: User) -> None:
+    try:
+        session_uuid = uuid.UUID(session_id)
+    except ValueError:
+        raise _session_revoked()
+
+    active_session = await db.get(UserSession, session_uuid)
+    if not active_session or not active_session.is_active or active_session.user_id != user.id:
+        raise _session_revoked()
 
 
 async def get_current_user(
@@ -106,15 +106,15 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Check if session has been revoked (Redis blacklist)
+    # A recently verified session skips the blacklist and session lookups;
+    # see core/principal_cache.py.
+    cached_principal = None
+    generation = principal_cache.generation
     if session_id:
-        from core.services.session_service import is_session_blacklisted
-        if await is_session_blacklisted(session_id):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Session has been revoked",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+        cached_principal = principal_cache.get(session_id)
+        if cached_principal is None:
+            # Check if session has been revoked (Redis blacklist)
+            await _reject_blacklisted_session(session_id)
         
     # Try to find user by ID (new way) or telegram_id (old way)
     # The payload 'sub' is a string. If it's a digit, it could be either.
@@ -135,28 +135,18 @@ async def get_current_user(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    if session_id:
-        try:
-            session_uuid = uuid.UUID(session_id)
-        except ValueError:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Session has been revoked",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-
-        active_session = await db.get(UserSession, session_uuid)
-        if not active_session or not active_session.is_active or active_session.user_id != user.id:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Session has been revoked",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+    if session_id and not (
+        cached_principal is not None and principal_cache.vouches_for(session_id, cached_principal, user)
+    ):
+        if cached_principal is not None:
+            await _reject_blacklisted_session(session_id)
+        await _require_active_session(db, session_id, user)
+        principal_cache.put(session_id, user, generation=generation)
         
     _ensure_user_access_allowed(user)
 
-    user = await _touch_last_seen(db, user)
-    _ensure_user_access_allowed(user)
+    # Presence is written behind the request; see core/last_seen.py.
+    last_seen_buffer.note(user)
 
     set_request_context(
         actor_id=user.id,
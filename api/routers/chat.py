@@ -802,11 +802,15 @@ async def search_messages(
     q: str,
     chat_id: Optional[int] = None,
     limit: int = 50,
+    before_id: Optional[int] = None,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Search messages.
+
+    Results are newest first and capped at 100 per page; pass the last
+    returned message id as ``before_id`` to fetch the next page.
     """
     allowed_direct_target_ids = await _get_customer_visible_direct_target_ids(db, current_user=current_user)
     if chat_id is not None:
@@ -823,6 +827,7 @@ async def search_messages(
         query_text=q,
         other_user_id=chat_id,
         limit=limit,
+        before_id=before_id,
     )
     result = await db.execute(query)
     messages = result.scalars().all()
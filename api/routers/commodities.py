@@ -10,7 +10,7 @@ import logging
 import re
 
 from core.commodity_defaults import is_locked_imam_commodity_name
-from core.db import get_db
+from core.db import AsyncSessionLocal, get_db
 from core.config import settings
 from core.security import constant_time_secret_equals
 from models.commodity import Commodity, CommodityAlias
@@ -97,36 +97,31 @@ async def ensure_commodity_text_is_available(
     )
 
 @router.get("/", response_model=List[schemas.Commodity])
-async def read_all_commodities(db: AsyncSession = Depends(get_db)):
+async def read_all_commodities():
     """
     دریافت لیست تمام کالاها به همراه نام‌های مستعار آن‌ها.
+
+    بارگذاری با session مستقل انجام می‌شود، چون تازه‌سازی پس‌زمینه کش ممکن است
+    بعد از پایان همین درخواست اجرا شود.
     """
-    # ===== Redis Cache Check =====
-    from core.cache import get_cached_commodities, set_cached_commodities
-    
-    cached = await get_cached_commodities()
-    if cached:
-        return cached
-    # =============================
-    
-    stmt = select(Commodity).options(selectinload(Commodity.aliases)).order_by(Commodity.id)
-    result = await db.execute(stmt)
-    commodities = result.scalars().unique().all()
-    
-    # ===== Cache Result =====
-    # تبدیل به dict برای کش
-    commodities_data = [
-        {
-            "id": c.id,
-            "name": c.name,
-            "aliases": [{"id": a.id, "alias": a.alias, "commodity_id": a.commodity_id} for a in c.aliases]
-        }
-        for c in commodities
-    ]
-    await set_cached_commodities(commodities_data)
-    # ========================
-    
-    return commodities
+    # ===== Redis Cache (single-flight, stale-while-revalidate) =====
+    from core.cache import get_or_load_commodities
+
+    async def load_commodities() -> list[dict]:
+        stmt = select(Commodity).options(selectinload(Commodity.aliases)).order_by(Commodity.id)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(stmt)
+        # تبدیل به dict برای کش
+        return [
+            {
+                "id": c.id,
+                "name": c.name,
+                "aliases": [{"id": a.id, "alias": a.alias, "commodity_id": a.commodity_id} for a in c.aliases]
+            }
+            for c in result.scalars().unique().all()
+        ]
+
+    return await get_or_load_commodities(load_commodities)
 
 @router.get("/{commodity_id}", response_model=schemas.Commodity)
 async def read_commodity(commodity_id: int, db: AsyncSession = Depends(get_db)):
@@ -68,6 +68,7 @@ from core.offer_expiry_contracts import (
 from core.offer_identity import build_offer_public_link, ensure_offer_public_id, is_offer_public_id_shape
 from core.offer_quantity import coalesce_offer_remaining_quantity
 from core.offer_settlement import settlement_type_value
+from core.order_book import order_book
 from core.pack_commodities import (
     is_pack_commodity_name,
     validate_pack_offer_shape,
@@ -1271,6 +1272,38 @@ def _build_active_offer_page_query(
     return query.order_by(Offer.created_at.desc(), Offer.id.desc()).limit(limit + 1)
 
 
+def _active_offer_ids_from_order_book(**filters) -> list[int] | None:
+    """Newest-first active offer ids from the in-process order book; None when it is not ready."""
+    if not order_book.ready:
+        return None
+    return order_book.index.newest_offer_ids(**filters)
+
+
+def _build_active_offer_rows_query(offer_ids: list[int]):
+    # The index only picks the ids; status is rechecked so a just-closed offer never shows.
+    return select(Offer).options(
+        *build_offer_read_options(include_owner_identity=False)
+    ).where(
+        Offer.id.in_(offer_ids),
+        Offer.status == OfferStatus.ACTIVE,
+    ).order_by(Offer.created_at.desc(), Offer.id.desc())
+
+
+async def _load_active_offer_rows_from_index(db: AsyncSession, index_offer_ids: list[int] | None, *, limit: int):
+    """Load the first ``limit`` index ids; None when the index is not ready or is behind the table.
+
+    An id whose offer is no longer ACTIVE (closed before its dirty refresh, or
+    index drift) would leave a short page, so the caller falls back to SQL.
+    """
+    if index_offer_ids is None:
+        return None
+    page_ids = index_offer_ids[:limit]
+    if not page_ids:
+        return []
+    rows = list((await db.execute(_build_active_offer_rows_query(page_ids))).scalars().all())
+    return rows if len(rows) == len(page_ids) else None
+
+
 def _build_market_history_response(
     response: OfferResponse,
     offer: Offer,
@@ -2306,20 +2339,28 @@ async def get_active_offers(
     _ensure_accountant_market_access_allowed(context)
     owner_user = context.owner_user
 
-    query = select(Offer).options(
-        *build_offer_read_options(include_owner_identity=False)
-    ).where(Offer.status == OfferStatus.ACTIVE)
-    
-    if offer_type:
-        query = query.where(Offer.offer_type == (OfferType.BUY if offer_type == "buy" else OfferType.SELL))
-    
-    if commodity_id:
-        query = query.where(Offer.commodity_id == commodity_id)
-    
-    query = query.order_by(Offer.created_at.desc(), Offer.id.desc()).offset(skip).limit(limit)
+    index_offer_ids = _active_offer_ids_from_order_book(
+        offer_type=offer_type,
+        commodity_id=commodity_id,
+        skip=skip,
+        limit=limit,
+    )
+    offers = await _load_active_offer_rows_from_index(db, index_offer_ids, limit=limit)
+    if offers is None:
+        query = select(Offer).options(
+            *build_offer_read_options(include_owner_identity=False)
+        ).where(Offer.status == OfferStatus.ACTIVE)
+
+        if offer_type:
+            query = query.where(Offer.offer_type == (OfferType.BUY if offer_type == "buy" else OfferType.SELL))
+
+        if commodity_id:
+            query = query.where(Offer.commodity_id == commodity_id)
+
+        query = query.order_by(Offer.created_at.desc(), Offer.id.desc()).offset(skip).limit(limit)
     
-    result = await db.execute(query)
-    offers = result.scalars().all()
+        result = await db.execute(query)
+        offers = result.scalars().all()
     if not offers:
         return []
     
@@ -2364,18 +2405,30 @@ async def get_active_offer_page(
             expected_filter_signature=filter_signature,
         )
 
-    query = _build_active_offer_page_query(
-        owner_user_id=owner_user.id,
+    index_offer_ids = _active_offer_ids_from_order_book(
         offer_type=offer_type,
         settlement_type=settlement_type,
         commodity_id=commodity_id,
-        own_only=own_only,
-        cursor_position=cursor_position,
-        limit=limit,
+        user_id=owner_user.id if own_only else None,
+        before=cursor_position,
+        limit=limit + 1,
     )
-    rows = list((await db.execute(query)).scalars().all())
-    has_more = len(rows) > limit
-    page_rows = rows[:limit]
+    page_rows = await _load_active_offer_rows_from_index(db, index_offer_ids, limit=limit)
+    if page_rows is not None:
+        has_more = len(index_offer_ids) > limit
+    else:
+        query = _build_active_offer_page_query(
+            owner_user_id=owner_user.id,
+            offer_type=offer_type,
+            settlement_type=settlement_type,
+            commodity_id=commodity_id,
+            own_only=own_only,
+            cursor_position=cursor_position,
+            limit=limit,
+        )
+        rows = list((await db.execute(query)).scalars().all())
+        has_more = len(rows) > limit
+        page_rows = rows[:limit]
     if not page_rows:
         return ActiveOfferPageResponse(items=[], has_more=False, page_size=0)
 
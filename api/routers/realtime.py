@@ -24,6 +24,8 @@ from core.market_presence import (
     set_market_page_presence,
 )
 from core.metrics import record_websocket_publish_failure, set_active_websocket_connections
+from core.realtime_batching import REALTIME_BATCH_PROTOCOL, RealtimeBatchEncoder, encode_realtime_message
+from core.realtime_fanout import DEFAULT_SUBSCRIBER_QUEUE_SIZE, RealtimeFanoutHub, RealtimeFrame
 from core.services.session_service import is_session_blacklisted
 from core.services.user_account_status_service import is_user_global_web_locked
 from core.production_test_isolation import should_block_webapp_user
@@ -226,6 +228,13 @@ class ConnectionManager:
 
     async def send_event_once(self, websocket: WebSocket, message: dict) -> bool:
         event_id = _normalize_realtime_event_id(message.get("event_id"))
+        return await self._send_once(websocket, event_id, lambda: websocket.send_json(message))
+
+    async def send_text_once(self, websocket: WebSocket, text: str, *, event_id: str | None) -> bool:
+        """Send a frame pre-serialized by the shared fan-out hub, deduplicated like send_event_once."""
+        return await self._send_once(websocket, event_id, lambda: websocket.send_text(text))
+
+    async def _send_once(self, websocket: WebSocket, event_id: str | None, send) -> bool:
         seen = self._seen_event_ids.setdefault(id(websocket), OrderedDict())
         if event_id and event_id in seen:
             return False
@@ -234,7 +243,7 @@ class ConnectionManager:
             while len(seen) > REALTIME_EVENT_DEDUP_CACHE_SIZE:
                 seen.popitem(last=False)
         try:
-            await websocket.send_json(message)
+            await send()
         except Exception:
             if event_id:
                 seen.pop(event_id, None)
@@ -280,6 +289,64 @@ def _project_redis_public_event(event_type: str, payload: dict) -> tuple[dict |
     return project_public_event_payload(event_type, payload), event_id
 
 
+def build_realtime_frame(channel: str, raw_data: str) -> RealtimeFrame | None:
+    """Decode and project one Redis message into its WebSocket and SSE renderings."""
+    try:
+        parsed = json.loads(raw_data)
+    except (TypeError, ValueError, json.JSONDecodeError):
+        return None
+    if not isinstance(parsed, dict):
+        return None
+
+    if channel.startswith("notifications:"):
+        event_type = parsed.get("event", "notification")
+        safe_data = sanitize_payload(parsed.get("data", {}))
+        event_id = None
+        private = True
+    else:
+        event_type = channel.replace("events:", "")
+        safe_data, event_id = _project_redis_public_event(event_type, parsed)
+        private = False
+
+    outgoing = {"type": event_type, "data": safe_data}
+    if event_id:
+        outgoing["event_id"] = event_id
+    event_id_line = f"id: {event_id}\n" if event_id else ""
+    return RealtimeFrame(
+        event_type=event_type,
+        event_id=event_id,
+        # Same encoding as WebSocket.send_json so both paths emit identical frames.
+        websocket_text=json.dumps(outgoing, separators=(",", ":"), ensure_ascii=False),
+        sse_text=f"{event_id_line}event: {event_type}\ndata: {json.dumps(safe_data)}\n\n",
+        private=private,
+        data=safe_data,
+    )
+
+
+realtime_fanout_hub = RealtimeFanoutHub(
+    redis_factory=lambda: redis.Redis(connection_pool=pool),
+    public_event_types=(*WEBSOCKET_PUBLIC_EVENT_TYPES, *SSE_PUBLIC_EVENT_TYPES),
+    frame_builder=build_realtime_frame,
+    queue_size=getattr(settings, "realtime_subscriber_queue_size", DEFAULT_SUBSCRIBER_QUEUE_SIZE),
+    history_size=getattr(settings, "realtime_resume_history_size", 1024),
+)
+
+
+def shared_realtime_subscriber_enabled() -> bool:
+    return bool(getattr(settings, "realtime_shared_subscriber_enabled", False))
+
+
+def negotiate_realtime_protocol(requested: object) -> str | None:
+    """Return the opt-in protocol this connection gets; None keeps v0 frames."""
+    if requested == REALTIME_BATCH_PROTOCOL and shared_realtime_subscriber_enabled():
+        return REALTIME_BATCH_PROTOCOL
+    return None
+
+
+def realtime_batch_interval_seconds() -> float:
+    return max(0.01, float(getattr(settings, "realtime_batch_interval_ms", 250)) / 1000)
+
+
 def realtime_publish_writes_outbound_sync(_source: str = REALTIME_SOURCE_LOCAL) -> bool:
     """Realtime fanout is a local delivery side effect, not a sync producer."""
     return False
@@ -370,11 +437,14 @@ async def _websocket_access_denial(
 @router.websocket("/ws")
 async def websocket_endpoint(
     websocket: WebSocket,
-    token: Optional[str] = Query(default=None)
+    token: Optional[str] = Query(default=None),
+    protocol: Optional[str] = Query(default=None),
+    since: Optional[str] = Query(default=None),
 ):
     """
     WebSocket endpoint برای real-time updates آنی
     Requires JWT token as query parameter: /ws?token=<jwt>
+    Optional ``protocol=batch.v1`` and ``since=<event_id>``: see core.realtime_batching.
     """
     # --- Authentication ---
     if not token:
@@ -399,7 +469,22 @@ async def websocket_endpoint(
     
     try:
         # شروع گوش دادن به Redis Pub/Sub در یک task جداگانه
-        redis_task = asyncio.create_task(listen_redis_events(websocket, user_id, session_id))
+        if negotiate_realtime_protocol(protocol) == REALTIME_BATCH_PROTOCOL:
+            redis_task = asyncio.create_task(
+                listen_batched_realtime_events(
+                    websocket,
+                    user_id,
+                    session_id,
+                    since=_normalize_realtime_event_id(since) if isinstance(since, str) else None,
+                )
+            )
+        else:
+            listener = (
+                listen_shared_realtime_events
+                if shared_realtime_subscriber_enabled()
+                else listen_redis_events
+            )
+            redis_task = asyncio.create_task(listener(websocket, user_id, session_id))
         
         # گوش دادن به پیام‌های کلاینت (برای keep-alive)
         while True:
@@ -510,6 +595,110 @@ async def listen_redis_events(
         logging.error(f"❌ Redis listener critical error: {e}")
 
 
+async def listen_shared_realtime_events(
+    websocket: WebSocket,
+    user_id: int | None = None,
+    session_id: str | None = None,
+):
+    """Forward frames from the process-wide fan-out hub to one WebSocket."""
+    subscription = realtime_fanout_hub.subscribe(
+        user_id=user_id,
+        event_types=WEBSOCKET_PUBLIC_EVENT_TYPES,
+        transport="websocket",
+    )
+    try:
+        while True:
+            frame = await subscription.next_frame()
+            if frame is None:
+                await websocket.close(code=1013, reason="Realtime consumer too slow")
+                break
+            if frame.private:
+                denial = await _websocket_access_denial(int(user_id), session_id)
+                if denial is not None:
+                    await websocket.close(code=denial[0], reason=denial[1])
+                    break
+            try:
+                await manager.send_text_once(websocket, frame.websocket_text, event_id=frame.event_id)
+            except Exception as send_err:
+                logging.error(f"❌ Error sending to WebSocket: {send_err}")
+                break
+    except asyncio.CancelledError:
+        logging.info("🔴 Shared realtime listener cancelled")
+    finally:
+        realtime_fanout_hub.unsubscribe(subscription)
+
+
+async def listen_batched_realtime_events(
+    websocket: WebSocket,
+    user_id: int | None = None,
+    session_id: str | None = None,
+    *,
+    since: str | None = None,
+):
+    """Forward hub frames to one ``batch.v1`` WebSocket, one batch per interval."""
+    subscription = realtime_fanout_hub.subscribe(
+        user_id=user_id,
+        event_types=WEBSOCKET_PUBLIC_EVENT_TYPES,
+        transport="websocket_batch",
+    )
+    encoder = RealtimeBatchEncoder(dedup_size=REALTIME_EVENT_DEDUP_CACHE_SIZE)
+    interval_seconds = realtime_batch_interval_seconds()
+    ack = {
+        "type": "protocol",
+        "protocol": REALTIME_BATCH_PROTOCOL,
+        "interval_ms": round(interval_seconds * 1000),
+    }
+    if since:
+        # Subscribing and reading the history happen without a yield in
+        # between, so no event falls into the gap; False asks for a refetch.
+        replay = realtime_fanout_hub.frames_since(since)
+        ack["resumed"] = replay is not None
+        for frame in replay or ():
+            if frame.event_type in subscription.event_types:
+                encoder.add(frame)
+
+    async def accept(frame: RealtimeFrame | None) -> bool:
+        if frame is None:
+            await websocket.close(code=1013, reason="Realtime consumer too slow")
+            return False
+        if frame.private:
+            denial = await _websocket_access_denial(int(user_id), session_id)
+            if denial is not None:
+                await websocket.close(code=denial[0], reason=denial[1])
+                return False
+        encoder.add(frame)
+        return True
+
+    loop = asyncio.get_running_loop()
+    try:
+        await websocket.send_text(encode_realtime_message(ack))
+        connected = True
+        while connected:
+            if not encoder.pending and not await accept(await subscription.next_frame()):
+                break
+            deadline = loop.time() + interval_seconds
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    frame = await asyncio.wait_for(subscription.next_frame(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                if not await accept(frame):
+                    connected = False
+                    break
+            text = encoder.drain() if connected else None
+            if text is None:
+                continue
+            try:
+                await websocket.send_text(text)
+            except Exception as send_err:
+                logging.error(f"❌ Error sending to WebSocket: {send_err}")
+                break
+    except asyncio.CancelledError:
+        logging.info("🔴 Batched realtime listener cancelled")
+    finally:
+        realtime_fanout_hub.unsubscribe(subscription)
+
+
 # --- SSE Endpoint (Backup) ---
 async def event_generator(user_id: int, session_id: str | None = None):
     """Generator برای SSE events"""
@@ -572,6 +761,36 @@ async def event_generator(user_id: int, session_id: str | None = None):
             await pubsub.unsubscribe()
 
 
+async def shared_event_generator(user_id: int, session_id: str | None = None):
+    """SSE generator fed by the process-wide fan-out hub."""
+    subscription = realtime_fanout_hub.subscribe(
+        user_id=user_id,
+        event_types=SSE_PUBLIC_EVENT_TYPES,
+        transport="sse",
+    )
+    heartbeat_interval = 15
+    loop = asyncio.get_running_loop()
+    last_heartbeat = loop.time()
+    try:
+        while True:
+            timeout = max(0.0, heartbeat_interval - (loop.time() - last_heartbeat))
+            try:
+                frame = await asyncio.wait_for(subscription.next_frame(), timeout=timeout)
+            except asyncio.TimeoutError:
+                yield "event: heartbeat\ndata: {}\n\n"
+                last_heartbeat = loop.time()
+                continue
+            if frame is None:
+                return
+            if frame.private:
+                denial = await _websocket_access_denial(user_id, session_id)
+                if denial is not None:
+                    return
+            yield frame.sse_text
+    finally:
+        realtime_fanout_hub.unsubscribe(subscription)
+
+
 @router.get("/stream")
 async def sse_stream(
     request: Request,
@@ -587,8 +806,9 @@ async def sse_stream(
             headers={"WWW-Authenticate": "Bearer"},
         )
     _token_subject, session_id = auth_result
+    generator = shared_event_generator if shared_realtime_subscriber_enabled() else event_generator
     return StreamingResponse(
-        event_generator(current_user.id, session_id=session_id),
+        generator(current_user.id, session_id=session_id),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
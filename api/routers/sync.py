@@ -7,6 +7,7 @@ from core.audit_logger import audit_log
 from core.metrics import (
     record_offer_publication_health,
     record_overtime_reconciliation_health,
+    record_sync_bulk_apply,
     record_sync_conflict,
     record_sync_health,
     record_sync_parity_summary,
@@ -53,6 +54,12 @@ from core.sync_protocol import (
     validate_sync_protocol_metadata,
 )
 from core.sync_registry import SyncPolicy, get_sync_registry_entry
+from core.sync_reference_cache import (
+    SyncReferenceCache,
+    bind_sync_reference_cache,
+    current_sync_reference_cache,
+    reset_sync_reference_cache,
+)
 from core.sync_transport import assert_runtime_sync_transport_allowed, runtime_sync_tls_verify_setting
 from core.telegram_delivery_runtime_policy import (
     TelegramDeliveryRuntimeMode,
@@ -1721,10 +1728,20 @@ def _nonempty_text(value) -> str | None:
     return text_value or None
 
 
+async def _cached_sync_reference(db: AsyncSession, model, key: str, value) -> int | None:
+    cache = current_sync_reference_cache()
+    if cache is None:
+        return None
+    return await cache.lookup(db, model, key, value)
+
+
 async def _resolve_offer_id_by_public_id(db: AsyncSession, offer_public_id: str | None) -> int | None:
     public_id = _nonempty_text(offer_public_id)
     if not public_id:
         return None
+    cached_id = await _cached_sync_reference(db, Offer, "offer_public_id", public_id)
+    if cached_id is not None:
+        return cached_id
     result = await db.execute(select(Offer.id).where(Offer.offer_public_id == public_id))
     value = _result_scalar_one_or_none(result)
     try:
@@ -1736,6 +1753,9 @@ async def _resolve_offer_id_by_public_id(db: AsyncSession, offer_public_id: str
 async def _resolve_trade_id_by_trade_number(db: AsyncSession, trade_number) -> int | None:
     if trade_number is None or trade_number == "":
         return None
+    cached_id = await _cached_sync_reference(db, Trade, "trade_number", trade_number)
+    if cached_id is not None:
+        return cached_id
     result = await db.execute(select(Trade.id).where(Trade.trade_number == trade_number))
     value = _result_scalar_one_or_none(result)
     try:
@@ -1824,6 +1844,9 @@ async def _resolve_model_id_by_natural_key(db: AsyncSession, model, key: str, va
     column = getattr(model, key, None)
     if column is None:
         return None
+    cached_id = await _cached_sync_reference(db, model, key, value)
+    if cached_id is not None:
+        return cached_id
     result = await db.execute(select(model.id).where(column == value).limit(1))
     resolved = _result_scalar_one_or_none(result)
     try:
@@ -3571,6 +3594,125 @@ async def _apply_item(
     return 'error'
 
 
+# Tables whose upsert has no per-row ordering guard or pre-write lookup, so a
+# run of them can be written by one multi-row INSERT ... ON CONFLICT.
+SYNC_BULK_UPSERT_TABLES = frozenset(
+    {
+        "admin_broadcast_messages",
+        "commodities",
+        "commodity_aliases",
+        "notifications",
+        "telegram_admin_broadcasts",
+    }
+)
+SYNC_BULK_MAX_BIND_PARAMS = 30000
+
+
+def _register_sync_references(cache: SyncReferenceCache, items: list[dict]) -> None:
+    """Queue every natural key a batch will localize so each kind resolves in one query."""
+    for item in items:
+        table = item.get("table")
+        data = item.get("data")
+        if isinstance(data, str):
+            try:
+                data = json.loads(data)
+            except ValueError:
+                continue
+        if not isinstance(data, dict):
+            continue
+        cache.want(Offer, "offer_public_id", _nonempty_text(data.get("offer_public_id")))
+        cache.want(Offer, "offer_public_id", _nonempty_text(data.get("republished_offer_public_id")))
+        cache.want(Trade, "trade_number", data.get("trade_number"))
+        cache.want(Trade, "trade_number", data.get("resulting_trade_number"))
+        cache.want(Commodity, "name", _nonempty_text(data.get("commodity_name")))
+        cache.want(
+            CustomerRelation,
+            "invitation_token",
+            _nonempty_text(data.get("customer_relation_invitation_token")),
+        )
+        natural_key = NATURAL_KEYS.get(table)
+        model = get_model_class(table) if natural_key and table != "users" else None
+        if model is not None:
+            cache.want(model, natural_key, data.get(natural_key))
+
+
+async def _prepare_sync_bulk_upsert_row(
+    db: AsyncSession,
+    table: str,
+    operation: str,
+    record_id,
+    data: dict,
+    model,
+) -> tuple[str, dict] | None:
+    """Return ``(conflict_column, row)`` when the item can join a multi-row upsert.
+
+    Mirrors the INSERT/UPDATE preparation ``_apply_item`` performs for
+    ``SYNC_BULK_UPSERT_TABLES``; anything else goes through ``_apply_item``.
+    """
+    if table not in SYNC_BULK_UPSERT_TABLES or operation not in ("INSERT", "UPDATE"):
+        return None
+    if not await _localize_commodity_reference_by_name(db, table, data):
+        return None
+    row = dict(data)
+    if _sync_table_has_public_identity(table, row):
+        row.pop("id", None)
+    else:
+        row["id"] = record_id
+    row = _filter_model_columns(model, row)
+    natural_key = NATURAL_KEYS.get(table)
+    conflict_column = natural_key if natural_key and row.get(natural_key) else "id"
+    if row.get(conflict_column) in (None, ""):
+        return None
+    return conflict_column, row
+
+
+def _build_sync_bulk_upsert_stmt(model, table: str, conflict_column: str, rows: list[dict]):
+    """Multi-row equivalent of ``_build_upsert_stmt`` for ``SYNC_BULK_UPSERT_TABLES``."""
+    stmt = pg_insert(model).values(rows)
+    if table == "notifications" and conflict_column == "dedupe_key":
+        return stmt.on_conflict_do_update(
+            index_elements=['dedupe_key'],
+            index_where=model.dedupe_key.isnot(None),
+            set_=_notification_upsert_set_dict(model, stmt, rows[0]),
+        )
+    set_dict = {key: stmt.excluded[key] for key in rows[0] if key not in {"id", conflict_column}}
+    if not set_dict:
+        return stmt.on_conflict_do_nothing(index_elements=[conflict_column])
+    return stmt.on_conflict_do_update(index_elements=[conflict_column], set_=set_dict)
+
+
+async def _apply_sync_bulk_upsert(db: AsyncSession, table: str, model, conflict_column: str, rows: list[dict]) -> bool:
+    """Write ``rows`` in one SAVEPOINT; False means the caller must apply them one by one."""
+    try:
+        async with db.begin_nested():
+            await db.execute(
+                _build_sync_bulk_upsert_stmt(model, table, conflict_column, rows),
+                execution_options={"is_sync": True},
+            )
+    except Exception as exc:
+        record_sync_bulk_apply(server_mode=settings.server_mode, table=table, result="fallback", count=len(rows))
+        logger.warning(
+            "Bulk sync upsert failed; applying rows one by one",
+            extra={
+                "event": "sync.bulk_upsert_fallback",
+                "table": table,
+                "row_count": len(rows),
+                **_summarize_exception(exc),
+            },
+        )
+        return False
+    record_sync_bulk_apply(server_mode=settings.server_mode, table=table, result="applied", count=len(rows))
+    logger.info(
+        "Bulk sync upsert applied",
+        extra={
+            "event": "sync.bulk_upsert_applied",
+            "table": table,
+            "row_count": len(rows),
+        },
+    )
+    return True
+
+
 def _notification_user_ids_from_items(items: list[dict]) -> set[int]:
     user_ids: set[int] = set()
     for item in items:
@@ -3916,6 +4058,128 @@ async def receive_sync_data(
     user_changes_applied = False
     market_runtime_state_changed = False
     notification_user_ids = _notification_user_ids_from_items(sorted_items)
+    # Catch-up batches batch-resolve natural keys and write guard-free tables
+    # with multi-row upserts; small live batches keep the per-item path.
+    bulk_apply = bool(getattr(settings, "sync_receive_bulk_apply_enabled", True)) and len(sorted_items) >= max(
+        2, int(getattr(settings, "sync_receive_bulk_min_items", 50) or 50)
+    )
+    bulk_batch_size = max(2, int(getattr(settings, "sync_receive_bulk_batch_size", 500) or 500))
+    bulk_entries: list[tuple[tuple, str, dict]] = []
+    bulk_seen_keys: set[tuple[str, object]] = set()
+    bulk_shape: tuple | None = None
+    reference_cache = SyncReferenceCache() if bulk_apply else None
+    if reference_cache is not None:
+        _register_sync_references(reference_cache, sorted_items)
+    reference_token = bind_sync_reference_cache(reference_cache)
+
+    async def _apply_received_item(entry) -> None:
+        nonlocal processed_count, user_changes_applied, market_runtime_state_changed
+        item, table, operation, model, data, record_id, watermark_context = entry
+        try:
+            deleted_user_telegram_effect = await _synced_deleted_user_telegram_effect(
+                db,
+                table=table,
+                operation=operation,
+                record_id=record_id,
+                data=data,
+            )
+            source_server = _sync_item_source_server(item)
+            apply_args = (
+                {"source_server": source_server}
+                if table in {"offer_requests", "offer_publication_states"}
+                or bool(getattr(settings, "registration_sync_v2_enabled", False))
+                else {}
+            )
+            if reference_cache is not None:
+                reference_cache.begin_write(table)
+            result = await _apply_item(
+                db,
+                table,
+                operation,
+                record_id,
+                data,
+                model,
+                new_offers,
+                terminal_offers,
+                **apply_args,
+            )
+            if result in {'ok', 'ignored'}:
+                await _record_sync_watermark_applied(db, watermark_context)
+                processed_count += 1
+                if table == "users":
+                    user_changes_applied = True
+                if result == 'ok':
+                    if deleted_user_telegram_effect is not None:
+                        synced_deleted_user_telegram_effects.append(deleted_user_telegram_effect)
+                    if table == "market_runtime_state" and operation in {"INSERT", "UPDATE"}:
+                        market_runtime_state_changed = True
+                    completed_trade_offer_id = _completed_trade_offer_id_from_sync(table, data)
+                    if completed_trade_offer_id:
+                        completed_trade_offer_ids.append(completed_trade_offer_id)
+                    logger.info(f"✅ Sync Item Applied: {table}:{record_id} ({operation})")
+                else:
+                    logger.info(
+                        "Sync item ignored by guard",
+                        extra={
+                            "event": "sync.item_ignored",
+                            "table": table,
+                            "record_id": record_id,
+                            "operation": operation,
+                        },
+                    )
+            elif result == 'deferred':
+                deferred_items.append(entry)
+            else:
+                error_detail = _sync_error_detail(item, "apply_failed")
+                errors.append(error_detail)
+                error_details.append(error_detail)
+        except Exception as e:
+            logger.error(
+                "Unexpected sync application error",
+                extra={
+                    "event": "sync.apply_unexpected_error",
+                    "table": table,
+                    "record_id": record_id,
+                    **_summarize_exception(e),
+                },
+            )
+            error_detail = _sync_error_detail(item, "apply_exception")
+            errors.append(error_detail)
+            error_details.append(error_detail)
+
+    async def _flush_bulk_upserts() -> None:
+        nonlocal processed_count
+        if not bulk_entries:
+            return
+        entries = list(bulk_entries)
+        bulk_entries.clear()
+        bulk_seen_keys.clear()
+        (_item, table, _operation, model, *_rest), conflict_column, _row = entries[0]
+        if reference_cache is not None:
+            reference_cache.begin_write(table)
+        rows = [row for _entry, _column, row in entries]
+        if len(rows) < 2 or not await _apply_sync_bulk_upsert(db, table, model, conflict_column, rows):
+            for entry, _column, _row in entries:
+                await _apply_received_item(entry)
+            return
+        for (item, table, _operation, _model, _data, record_id, watermark_context), _column, _row in entries:
+            try:
+                await _record_sync_watermark_applied(db, watermark_context)
+            except Exception as e:
+                logger.error(
+                    "Unexpected sync application error",
+                    extra={
+                        "event": "sync.apply_unexpected_error",
+                        "table": table,
+                        "record_id": record_id,
+                        **_summarize_exception(e),
+                    },
+                )
+                error_detail = _sync_error_detail(item, "apply_exception")
+                errors.append(error_detail)
+                error_details.append(error_detail)
+                continue
+            processed_count += 1
 
     try:
         # --- Pass 1: Process all items ---
@@ -4063,6 +4327,28 @@ async def receive_sync_data(
                     record_id=record_id,
                     data=data,
                 )
+                if bulk_entries and bulk_entries[0][0][1] != table:
+                    await _flush_bulk_upserts()
+                if reference_cache is not None:
+                    reference_cache.begin_write(table)
+                bulk_candidate = (
+                    await _prepare_sync_bulk_upsert_row(db, table, operation, record_id, data, model)
+                    if bulk_apply
+                    else None
+                )
+                # A row or watermark aggregate may appear only once per
+                # multi-row upsert; a repeat flushes so it sees the first write.
+                bulk_keys: set[tuple[str, object]] = set()
+                if bulk_candidate is not None:
+                    bulk_keys.add(("row", repr(bulk_candidate[1].get(bulk_candidate[0]))))
+                    if watermark_context is not None:
+                        bulk_keys.add(("watermark", _sync_watermark_lock_key(watermark_context)))
+                if bulk_entries and (
+                    bulk_candidate is None
+                    or (table, bulk_candidate[0], tuple(bulk_candidate[1])) != bulk_shape
+                    or bulk_keys & bulk_seen_keys
+                ):
+                    await _flush_bulk_upserts()
                 watermark_decision = await _evaluate_sync_watermark(db, watermark_context)
                 if watermark_context is not None and watermark_decision.action == "stale":
                     _log_sync_watermark_decision(watermark_context, watermark_decision)
@@ -4093,60 +4379,15 @@ async def receive_sync_data(
                     error_details.append(error_detail)
                     continue
 
-                deleted_user_telegram_effect = await _synced_deleted_user_telegram_effect(
-                    db,
-                    table=table,
-                    operation=operation,
-                    record_id=record_id,
-                    data=data,
-                )
-                apply_args = (
-                    {"source_server": source_server}
-                    if table in {"offer_requests", "offer_publication_states"}
-                    or bool(getattr(settings, "registration_sync_v2_enabled", False))
-                    else {}
-                )
-                result = await _apply_item(
-                    db,
-                    table,
-                    operation,
-                    record_id,
-                    data,
-                    model,
-                    new_offers,
-                    terminal_offers,
-                    **apply_args,
-                )
-                if result in {'ok', 'ignored'}:
-                    await _record_sync_watermark_applied(db, watermark_context)
-                    processed_count += 1
-                    if table == "users":
-                        user_changes_applied = True
-                    if result == 'ok':
-                        if deleted_user_telegram_effect is not None:
-                            synced_deleted_user_telegram_effects.append(deleted_user_telegram_effect)
-                        if table == "market_runtime_state" and operation in {"INSERT", "UPDATE"}:
-                            market_runtime_state_changed = True
-                        completed_trade_offer_id = _completed_trade_offer_id_from_sync(table, data)
-                        if completed_trade_offer_id:
-                            completed_trade_offer_ids.append(completed_trade_offer_id)
-                        logger.info(f"✅ Sync Item Applied: {table}:{record_id} ({operation})")
-                    else:
-                        logger.info(
-                            "Sync item ignored by guard",
-                            extra={
-                                "event": "sync.item_ignored",
-                                "table": table,
-                                "record_id": record_id,
-                                "operation": operation,
-                            },
-                        )
-                elif result == 'deferred':
-                    deferred_items.append((item, table, operation, model, data, record_id, watermark_context))
-                else:
-                    error_detail = _sync_error_detail(item, "apply_failed")
-                    errors.append(error_detail)
-                    error_details.append(error_detail)
+                entry = (item, table, operation, model, data, record_id, watermark_context)
+                if bulk_candidate is not None:
+                    conflict_column, row = bulk_candidate
+                    bulk_shape = (table, conflict_column, tuple(row))
+                    bulk_entries.append((entry, conflict_column, row))
+                    bulk_seen_keys.update(bulk_keys)
+                    if len(bulk_entries) >= min(bulk_batch_size, SYNC_BULK_MAX_BIND_PARAMS // max(1, len(row))):
+                        await _flush_bulk_upserts()
+                    continue
             except Exception as e:
                 logger.error(
                     "Unexpected sync application error",
@@ -4160,6 +4401,11 @@ async def receive_sync_data(
                 error_detail = _sync_error_detail(item, "apply_exception")
                 errors.append(error_detail)
                 error_details.append(error_detail)
+                continue
+
+            await _apply_received_item(entry)
+
+        await _flush_bulk_upserts()
 
         # --- Pass 2: Retry deferred items (FK violations) ---
         if deferred_items:
@@ -4210,6 +4456,8 @@ async def receive_sync_data(
                         or bool(getattr(settings, "registration_sync_v2_enabled", False))
                         else {}
                     )
+                    if reference_cache is not None:
+                        reference_cache.begin_write(table)
                     result = await _apply_item(
                         db,
                         table,
@@ -4601,6 +4849,8 @@ async def receive_sync_data(
             },
         )
         raise HTTPException(status_code=500, detail="Sync batch processing failed")
+    finally:
+        reset_sync_reference_cache(reference_token)
 
 
 @router.post("/resync")
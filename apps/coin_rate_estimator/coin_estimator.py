@@ -14,7 +14,6 @@ from __future__ import annotations
 import argparse
 import bisect
 from contextlib import ExitStack
-from copy import deepcopy
 import json
 import math
 import os
@@ -45,6 +44,10 @@ from core.market_intelligence.market_regime import (  # noqa: E402
     operational_market_regime,
     stabilize_market_regime,
 )
+from core.market_intelligence.minute_aggregates import (  # noqa: E402
+    minute_aggregate_available,
+    summarize_minute_window,
+)
 from morning_reopen import (  # noqa: E402
     METHOD_NAME as MORNING_REOPEN_METHOD,
     build_morning_reopen_anchor,
@@ -60,6 +63,8 @@ from online_recalibration import (  # noqa: E402
     group_market_evidence_kind,
     prune_prediction_ledger,
 )
+from snapshot_cache import SnapshotCache  # noqa: E402
+from telegram_price_collector.db import PRICE_EVENT_MINUTE_AGGREGATES  # noqa: E402
 
 
 RUNTIME_ROOT = Path(
@@ -115,39 +120,41 @@ PRICE_MULTIPLIER = 1_000  # project convention: 178000 means 178,000,000 toman
 # previously re-queried from SQLite for every challenger.  This cache is keyed
 # by the exact snapshot timestamp, so it cannot carry a value into a later
 # refresh or change the mathematical result of an individual model.
-_EMPIRICAL_RATIO_SNAPSHOT_CACHE: dict[tuple[Any, ...], dict[str, Any]] = {}
-_EMPIRICAL_RATIO_SNAPSHOT_CACHE_MAX = 128
+_EMPIRICAL_RATIO_SNAPSHOT_CACHE = SnapshotCache(
+    "empirical_ratio", max_entries=128, max_bytes=8 * 1024 * 1024
+)
 # The three structural books (main + two non-ML shadows) observe the exact
 # same market/conversation snapshot.  These outputs do not depend on model
 # coefficients, so sharing them is mathematically neutral and removes repeated
 # SQLite connections/scans from every 30-second shadow cycle.  Keys always
-# include the exact timestamp and input gate, and callers receive a deep copy.
-_MODEL_INDEPENDENT_SNAPSHOT_CACHE: dict[tuple[Any, ...], dict[str, Any]] = {}
-_MODEL_INDEPENDENT_SNAPSHOT_CACHE_MAX = 512
+# include the exact timestamp and input gate.  Values are frozen on insert and
+# shared read-only; a caller that edits one works on its own copy.
+_MODEL_INDEPENDENT_SNAPSHOT_CACHE = SnapshotCache(
+    "model_independent", max_entries=512, max_bytes=64 * 1024 * 1024
+)
 
 
 def _empirical_ratio_cache_get(key: tuple[Any, ...]) -> dict[str, Any] | None:
-    value = _EMPIRICAL_RATIO_SNAPSHOT_CACHE.get(key)
-    return deepcopy(value) if value is not None else None
+    return _EMPIRICAL_RATIO_SNAPSHOT_CACHE.get(key)
 
 
 def _empirical_ratio_cache_put(key: tuple[Any, ...], value: dict[str, Any]) -> dict[str, Any]:
-    if len(_EMPIRICAL_RATIO_SNAPSHOT_CACHE) >= _EMPIRICAL_RATIO_SNAPSHOT_CACHE_MAX:
-        _EMPIRICAL_RATIO_SNAPSHOT_CACHE.clear()
-    _EMPIRICAL_RATIO_SNAPSHOT_CACHE[key] = deepcopy(value)
-    return value
+    return _EMPIRICAL_RATIO_SNAPSHOT_CACHE.put(key, value)
 
 
 def _snapshot_cache_get(key: tuple[Any, ...]) -> dict[str, Any] | None:
-    value = _MODEL_INDEPENDENT_SNAPSHOT_CACHE.get(key)
-    return deepcopy(value) if value is not None else None
+    return _MODEL_INDEPENDENT_SNAPSHOT_CACHE.get(key)
 
 
 def _snapshot_cache_put(key: tuple[Any, ...], value: dict[str, Any]) -> dict[str, Any]:
-    if len(_MODEL_INDEPENDENT_SNAPSHOT_CACHE) >= _MODEL_INDEPENDENT_SNAPSHOT_CACHE_MAX:
-        _MODEL_INDEPENDENT_SNAPSHOT_CACHE.clear()
-    _MODEL_INDEPENDENT_SNAPSHOT_CACHE[key] = deepcopy(value)
-    return value
+    return _MODEL_INDEPENDENT_SNAPSHOT_CACHE.put(key, value)
+
+
+def snapshot_cache_stats() -> list[dict[str, Any]]:
+    return [
+        _MODEL_INDEPENDENT_SNAPSHOT_CACHE.stats(),
+        _EMPIRICAL_RATIO_SNAPSHOT_CACHE.stats(),
+    ]
 
 
 def _snapshot_timestamp(value: datetime | None) -> str | None:
@@ -158,6 +165,38 @@ def _snapshot_timestamp(value: datetime | None) -> str | None:
     return value.astimezone(timezone.utc).isoformat()
 
 
+def export_snapshot_caches(end: datetime) -> dict[str, list[tuple[tuple[Any, ...], dict[str, Any]]]]:
+    """Return the cached model-independent inputs of one exact snapshot.
+
+    Challenger books evaluated in a worker process install these first, so
+    they read the same inputs the main book already read, without repeating
+    the SQLite scans and without any chance of observing a newer row.
+    """
+
+    stamp = _snapshot_timestamp(end)
+    return {
+        "model_independent": [
+            (key, value)
+            for key, value in _MODEL_INDEPENDENT_SNAPSHOT_CACHE.items()
+            if stamp in key
+        ],
+        "empirical_ratio": [
+            (key, value)
+            for key, value in _EMPIRICAL_RATIO_SNAPSHOT_CACHE.items()
+            if stamp in key
+        ],
+    }
+
+
+def install_snapshot_caches(
+    entries: dict[str, list[tuple[tuple[Any, ...], dict[str, Any]]]],
+) -> None:
+    for key, value in entries.get("model_independent", ()):
+        _snapshot_cache_put(key, value)
+    for key, value in entries.get("empirical_ratio", ()):
+        _empirical_ratio_cache_put(key, value)
+
+
 def _market_connection_identity(connection: sqlite3.Connection) -> str | None:
     """Return a stable file identity; do not cache in-memory test databases."""
 
@@ -515,6 +554,63 @@ def connect_market_db(path: Path, *, read_only: bool = True) -> sqlite3.Connecti
     return connection
 
 
+def _no_market_value(seconds: int) -> dict[str, Any]:
+    return {
+        "status": "NO_DATA",
+        "llm_value": NO_DATA_TOKEN,
+        "average_price": None,
+        "point_price": None,
+        "latest_price": None,
+        "latest_event_utc": None,
+        "latest_event_type": None,
+        "latest_side": None,
+        "average_window_seconds": seconds,
+        "minimum_price": None,
+        "maximum_price": None,
+        "sample_count": 0,
+        "first_event_utc": None,
+        "last_event_utc": None,
+    }
+
+
+def _aggregated_market_value(
+    connection: sqlite3.Connection,
+    *,
+    start: datetime,
+    end: datetime,
+    seconds: int,
+    filters: dict[str, str | None],
+) -> dict[str, Any]:
+    """Same result as the raw ``price_events`` scan, read from minute buckets."""
+
+    summary = summarize_minute_window(
+        connection,
+        PRICE_EVENT_MINUTE_AGGREGATES,
+        start_utc=iso_utc(start),
+        end_utc=iso_utc(end),
+        filters=filters,
+    )
+    if summary is None:
+        return _no_market_value(seconds)
+    average = summary.average_price
+    return {
+        "status": "OBSERVED",
+        "llm_value": average,
+        "average_price": average,
+        "point_price": summary.latest_price,
+        "latest_price": summary.latest_price,
+        "latest_event_utc": summary.latest_event_utc,
+        "latest_event_type": str(summary.latest_dimensions["event_type"]),
+        "latest_side": str(summary.latest_dimensions["side"]),
+        "average_window_seconds": seconds,
+        "minimum_price": summary.minimum_price,
+        "maximum_price": summary.maximum_price,
+        "sample_count": summary.sample_count,
+        "first_event_utc": summary.first_event_utc,
+        "last_event_utc": summary.latest_event_utc,
+    }
+
+
 def average_market_value(
     connection: sqlite3.Connection,
     *,
@@ -527,15 +623,20 @@ def average_market_value(
     event_type: str | None = None,
 ) -> dict[str, Any]:
     start = end - timedelta(seconds=seconds)
+    filters = {
+        "instrument": instrument,
+        "market_label": market_label,
+        "settlement_term": settlement_term,
+        "trade_form": trade_form,
+        "event_type": event_type,
+    }
+    if minute_aggregate_available(connection, PRICE_EVENT_MINUTE_AGGREGATES):
+        return _aggregated_market_value(
+            connection, start=start, end=end, seconds=seconds, filters=filters
+        )
     clauses = ["event_time_utc > ?", "event_time_utc <= ?"]
     parameters: list[Any] = [iso_utc(start), iso_utc(end)]
-    for column, value in (
-        ("instrument", instrument),
-        ("market_label", market_label),
-        ("settlement_term", settlement_term),
-        ("trade_form", trade_form),
-        ("event_type", event_type),
-    ):
+    for column, value in filters.items():
         if value is not None:
             clauses.append(f"{column} = ?")
             parameters.append(value)
@@ -554,22 +655,7 @@ def average_market_value(
     ).fetchone()
     count = int(row["sample_count"])
     if count == 0:
-        return {
-            "status": "NO_DATA",
-            "llm_value": NO_DATA_TOKEN,
-            "average_price": None,
-            "point_price": None,
-            "latest_price": None,
-            "latest_event_utc": None,
-            "latest_event_type": None,
-            "latest_side": None,
-            "average_window_seconds": seconds,
-            "minimum_price": None,
-            "maximum_price": None,
-            "sample_count": 0,
-            "first_event_utc": None,
-            "last_event_utc": None,
-        }
+        return _no_market_value(seconds)
     latest = connection.execute(
         f"""
         SELECT price_num, event_time_utc, event_type, side
@@ -581,22 +667,7 @@ def average_market_value(
         parameters,
     ).fetchone()
     if latest is None:
-        return {
-            "status": "NO_DATA",
-            "llm_value": NO_DATA_TOKEN,
-            "average_price": None,
-            "point_price": None,
-            "latest_price": None,
-            "latest_event_utc": None,
-            "latest_event_type": None,
-            "latest_side": None,
-            "average_window_seconds": seconds,
-            "minimum_price": None,
-            "maximum_price": None,
-            "sample_count": 0,
-            "first_event_utc": None,
-            "last_event_utc": None,
-        }
+        return _no_market_value(seconds)
     average = float(row["average_price"])
     return {
         "status": "OBSERVED",
@@ -5697,11 +5768,15 @@ def estimate_rates(
             "canonical_store_required": effective_regime_market_db is not None,
         }
         for settlement in SETTLEMENT_CONFIG:
-            inputs = observed_inputs(
-                connection,
-                settlement,
-                end,
-                regime_connection=regime_connection,
+            # Shallow copy: the cached snapshot is shared read-only, and only
+            # the top-level ``market_regime`` entry is replaced below.
+            inputs = dict(
+                observed_inputs(
+                    connection,
+                    settlement,
+                    end,
+                    regime_connection=regime_connection,
+                )
             )
             if effective_regime_market_db is not None and regime_connection is None:
                 inputs["market_regime"] = {
@@ -10,6 +10,7 @@ import hmac
 import html
 import json
 import math
+import multiprocessing
 import os
 import re
 import secrets
@@ -18,13 +19,16 @@ import sqlite3
 import sys
 import threading
 import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from copy import deepcopy
+from functools import partial
 from datetime import datetime, time as dt_time, timedelta, timezone
 from http import HTTPStatus
 from http.cookies import SimpleCookie
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 from urllib.parse import parse_qs, urlencode, urlsplit
 from zoneinfo import ZoneInfo
 import jdatetime
@@ -53,12 +57,15 @@ from coin_estimator import (  # noqa: E402
     GROUP_ANCHOR_WINDOW_SECONDS,
     NO_DATA_TOKEN,
     apply_low_date_family_band_separation,
+    average_market_value,
     enforce_cash_tomorrow_term_structure,
     estimate_rates,
+    export_snapshot_caches,
     iso_utc,
     live_point_value,
     load_model,
     parse_datetime,
+    snapshot_cache_stats,
     write_json_atomic,
 )
 from offer_text_parser import (  # noqa: E402
@@ -122,11 +129,12 @@ from online_recalibration import (  # noqa: E402
     record_predictions,
     summarize_model_outcomes,
 )
-from shadow_parallel import run_shadow_parallel  # noqa: E402
+from shadow_parallel import evaluate_shadow_book, run_shadow_parallel  # noqa: E402
 from estimate_finalization import finalize_deterministic_book  # noqa: E402
 from ml_residual_shadow import (  # noqa: E402
     DEFAULT_ML_ARTIFACT,
     DEFAULT_ML_SHADOW_STATE,
+    evaluate_ml_residual_book,
     run_ml_residual_shadow,
 )
 from shadow_cross_calibration import maybe_run_shadow_cross_calibration  # noqa: E402
@@ -210,6 +218,16 @@ def shadow_light_mode() -> bool:
     return _env_flag("COIN_RATE_ESTIMATOR_SHADOW_LIGHT", "0")
 
 
+def parallel_books_enabled() -> bool:
+    """Evaluate the challenger books in worker processes; output is identical."""
+
+    return _env_flag("COIN_RATE_ESTIMATOR_PARALLEL_BOOKS", "0")
+
+
+def book_pool_workers() -> int:
+    return _env_bounded_int("COIN_RATE_ESTIMATOR_BOOK_WORKERS", 3, minimum=1, maximum=8)
+
+
 def estimate_refresh_seconds() -> int:
     raw = os.environ.get("COIN_RATE_ESTIMATOR_ESTIMATE_REFRESH_SECONDS", "").strip()
     if raw:
@@ -1020,25 +1038,19 @@ def read_melted_minute_averages(
         return empty
     try:
         end = parse_datetime(end_value)
-        start = iso_utc(end - timedelta(seconds=30))
         connection = sqlite3.connect(f"file:{market_db.resolve()}?mode=ro", uri=True)
         connection.row_factory = sqlite3.Row
         result: dict[str, dict[str, Any]] = {}
         for form in ("PAPER", "PHYSICAL"):
-            row = connection.execute(
-                """
-                SELECT AVG(price_num) AS average_price, COUNT(*) AS sample_count,
-                       MAX(event_time_utc) AS last_event_utc
-                FROM price_events
-                WHERE instrument='MELTED_GOLD' AND trade_form=?
-                  AND event_time_utc > ? AND event_time_utc <= ?
-                """,
-                (form, start, iso_utc(end)),
-            ).fetchone()
+            # Shares the estimator's window reader, including its minute
+            # aggregate fast path when the collector maintains one.
+            value = average_market_value(
+                connection, end=end, seconds=30, instrument="MELTED_GOLD", trade_form=form,
+            )
             result[form] = {
-                "average_price": float(row["average_price"]) if row["average_price"] is not None else None,
-                "sample_count": int(row["sample_count"] or 0),
-                "last_event_utc": row["last_event_utc"],
+                "average_price": value["average_price"],
+                "sample_count": int(value["sample_count"]),
+                "last_event_utc": value["last_event_utc"],
             }
         connection.close()
         return result
@@ -7810,6 +7822,123 @@ def persist_message(
     raise RuntimeError("unreachable persistence retry state")
 
 
+# Challenger books only read SQLite and the snapshot handed to them, so they
+# run in spawned workers (never forked: the web server and estimator threads
+# are live).  The pool is created on first use and replaced if a worker dies.
+_BOOK_POOL_LOCK = threading.Lock()
+_BOOK_POOL: ProcessPoolExecutor | None = None
+
+
+def _book_pool() -> ProcessPoolExecutor:
+    global _BOOK_POOL
+    with _BOOK_POOL_LOCK:
+        if _BOOK_POOL is None:
+            _BOOK_POOL = ProcessPoolExecutor(
+                max_workers=book_pool_workers(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _BOOK_POOL
+
+
+def _discard_book_pool(pool: ProcessPoolExecutor) -> None:
+    global _BOOK_POOL
+    with _BOOK_POOL_LOCK:
+        if _BOOK_POOL is pool:
+            _BOOK_POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_book_pool() -> None:
+    global _BOOK_POOL
+    with _BOOK_POOL_LOCK:
+        pool, _BOOK_POOL = _BOOK_POOL, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _pooled_book(
+    pool: ProcessPoolExecutor,
+    future: Future,
+    fallback: Callable[[], dict[str, Any]],
+) -> Callable[[], dict[str, Any]]:
+    def result() -> dict[str, Any]:
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            # Infrastructure failure, not a model failure: evaluate in-process.
+            _discard_book_pool(pool)
+            return fallback()
+
+    return result
+
+
+def schedule_challenger_books(
+    *,
+    market_db: Path,
+    regime_market_db: Path | None,
+    conversation_db: Path,
+    end: datetime,
+    live_group_events_enabled: bool,
+    group_live_events_before: datetime | None,
+    shadow_model_paths: dict[str, Path | None],
+    ml_artifact_path: Path,
+    ml_live_estimate: dict[str, Any],
+) -> dict[str, Callable[[], dict[str, Any]]]:
+    """Submit every configured challenger book to the worker pool.
+
+    Must run after the main book so the model-independent snapshot it read
+    can be shipped to the workers instead of being re-read per book.
+    """
+
+    pool = _book_pool()
+    snapshot_caches = export_snapshot_caches(end)
+    evaluations: dict[str, Callable[[], dict[str, Any]]] = {}
+    try:
+        for name, model_path in shadow_model_paths.items():
+            if model_path is None or not model_path.is_file():
+                continue
+            fallback = partial(
+                evaluate_shadow_book,
+                model_path,
+                market_db=market_db,
+                regime_market_db=regime_market_db,
+                conversation_db=conversation_db,
+                end=end,
+                live_group_events_enabled=live_group_events_enabled,
+                group_live_events_before=group_live_events_before,
+                finalize_book=finalize_deterministic_book,
+            )
+            future = pool.submit(fallback, snapshot_caches=snapshot_caches)
+            evaluations[name] = _pooled_book(pool, future, fallback)
+        if ml_artifact_path.is_file():
+            fallback = partial(
+                evaluate_ml_residual_book,
+                ml_live_estimate,
+                artifact_path=ml_artifact_path,
+                end=end,
+                finalize_book=finalize_deterministic_book,
+            )
+            evaluations["ml"] = _pooled_book(pool, pool.submit(fallback), fallback)
+    except (BrokenProcessPool, RuntimeError):
+        # Books without a future simply run serially in their usual place.
+        _discard_book_pool(pool)
+    return evaluations
+
+
+class EstimationStageTimer:
+    """Accumulate wall-clock seconds per refresh stage into ``sink``."""
+
+    def __init__(self, sink: dict[str, float] | None) -> None:
+        self._sink = sink
+        self._mark = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        if self._sink is not None:
+            self._sink[stage] = round(self._sink.get(stage, 0.0) + now - self._mark, 4)
+        self._mark = now
+
+
 def refresh_estimate(
     model: dict[str, Any],
     market_db: Path,
@@ -7828,7 +7957,17 @@ def refresh_estimate(
     ml_shadow_model_path: Path | None = None,
     ml_shadow_state_path: Path | None = None,
     health_config: InputHealthConfig | None = None,
+    publish: bool = True,
+    stage_seconds: dict[str, float] | None = None,
 ) -> dict[str, Any]:
+    """Build one estimate cycle.
+
+    ``publish=False`` leaves the hand-off to the caller (see
+    :func:`publish_estimate`), which lets the estimation loop compute on a
+    worker thread and swap the state in from the event loop.  When
+    ``stage_seconds`` is given it receives wall-clock seconds per stage.
+    """
+    timer = EstimationStageTimer(stage_seconds)
     effective_end = (end or datetime.now(timezone.utc)).astimezone(timezone.utc).replace(microsecond=0)
     effective_calibration_db = calibration_db or DEFAULT_CALIBRATION_DB
     if effective_calibration_db.resolve() == conversation_db.resolve():
@@ -7887,6 +8026,7 @@ def refresh_estimate(
     finally:
         observation_connection.close()
     calibration_connection.close()
+    timer.lap("reconciliation")
     previous_state = state.get()
     previous_settlements = previous_state.get("settlements")
     previous_settlements = (
@@ -7907,10 +8047,36 @@ def refresh_estimate(
         live_group_events_enabled=enabled,
         group_live_events_before=disabled_since,
     )
+    timer.lap("estimate_rates")
     # ML residual is trained for the structural (pre-online-residual) book.
     # Keep an immutable branch so serving does not mix its baseline with the
     # main model's learned online calibration.
     ml_structural_estimate = deepcopy(estimate)
+    research_model_path = (
+        research_shadow_model_path
+        if research_shadow_model_path is not None
+        else DEFAULT_RESEARCH_SHADOW_MODEL
+    )
+    ml_artifact_path = (
+        ml_shadow_model_path if ml_shadow_model_path is not None else DEFAULT_ML_SHADOW_MODEL
+    )
+    # Challengers do not depend on the main book's online calibration below,
+    # so in parallel mode they are evaluated while it runs.
+    challenger_books = (
+        schedule_challenger_books(
+            market_db=market_db,
+            regime_market_db=regime_market_db,
+            conversation_db=conversation_db,
+            end=effective_end,
+            live_group_events_enabled=enabled,
+            group_live_events_before=disabled_since,
+            shadow_model_paths={"shadow": shadow_model_path, "research": research_model_path},
+            ml_artifact_path=ml_artifact_path,
+            ml_live_estimate=ml_structural_estimate,
+        )
+        if parallel_books_enabled()
+        else {}
+    )
     finalization = {"term_structure_fixes": [], "low_date_rows": 0, "band_widened": 0}
     calibration_connection = open_calibration_connection(effective_calibration_db)
     try:
@@ -7934,6 +8100,7 @@ def refresh_estimate(
     estimate["live_group_input_control"] = control
     estimate["service_status"] = "RUNNING"
     estimate["manual_entry_counts"] = manual_entry_counts(conversation_db)
+    timer.lap("snapshot_calibration")
     light = shadow_light_mode()
     shadow_meta = run_shadow_parallel(
         live_estimate=estimate,
@@ -7946,31 +8113,33 @@ def refresh_estimate(
         live_group_events_enabled=enabled,
         group_live_events_before=disabled_since,
         finalize_book=finalize_deterministic_book,
+        evaluation=challenger_books.get("shadow"),
     )
+    timer.lap("shadow_previous")
     research_meta = run_shadow_parallel(
         live_estimate=estimate,
         market_db=market_db,
         regime_market_db=regime_market_db,
         conversation_db=conversation_db,
         end=effective_end,
-        shadow_model_path=research_shadow_model_path
-        if research_shadow_model_path is not None
-        else DEFAULT_RESEARCH_SHADOW_MODEL,
+        shadow_model_path=research_model_path,
         shadow_state_path=research_shadow_state_path or DEFAULT_RESEARCH_SHADOW_STATE,
         live_group_events_enabled=enabled,
         group_live_events_before=disabled_since,
         finalize_book=finalize_deterministic_book,
+        evaluation=challenger_books.get("research"),
     )
+    timer.lap("shadow_morning_reopen")
     ml_meta = run_ml_residual_shadow(
         live_estimate=ml_structural_estimate,
         end=effective_end,
-        artifact_path=ml_shadow_model_path
-        if ml_shadow_model_path is not None
-        else DEFAULT_ML_SHADOW_MODEL,
+        artifact_path=ml_artifact_path,
         shadow_state_path=ml_shadow_state_path or DEFAULT_ML_SHADOW_STATE_PATH,
         comparison_estimate=estimate,
         finalize_book=finalize_deterministic_book,
+        evaluation=challenger_books.get("ml"),
     )
+    timer.lap("shadow_ml")
     estimate["shadow_parallel"] = {
         "enabled": shadow_meta.get("enabled"),
         "status": shadow_meta.get("status"),
@@ -8030,6 +8199,7 @@ def refresh_estimate(
         )
     if (not light) and estimate["shadow_cross_calibration"].get("applied_count"):
         finalization = finalize_deterministic_book(estimate)
+    timer.lap("cross_calibration")
     # MAIN_ONLINE keeps its 30-second learning cadence.  Accuracy is a separate
     # cohort: the same final main book plus all three challengers are recorded
     # only when all four exist, at one exact timestamp.  This prevents a later
@@ -8136,6 +8306,7 @@ def refresh_estimate(
         calibration_connection.close()
         raise
     calibration_connection.close()
+    timer.lap("prediction_ledger")
     estimate["online_residual_learning"] = {
         "mode": "BOUNDED_ONLINE_RESIDUAL_CALIBRATION",
         "reconciliation": reconciliation,
@@ -8164,9 +8335,35 @@ def refresh_estimate(
             "DEGRADED": "DEGRADED",
             "CRITICAL": "INPUT_CRITICAL",
         }.get(str(health.get("status") or "CRITICAL"), "INPUT_CRITICAL")
+        timer.lap("input_health")
+    if publish:
+        publish_estimate(state, state_path, estimate)
+        timer.lap("publish")
+    return estimate
+
+
+def publish_estimate(state: StateStore, state_path: Path, estimate: dict[str, Any]) -> None:
+    """Hand a finished estimate to the web-facing store and the state file."""
     state.set(estimate)
     write_json_atomic(state_path, estimate, mode=0o644)
-    return estimate
+
+
+def estimation_cycle_report(
+    *,
+    duration_seconds: float,
+    refresh_seconds: int,
+    consecutive_overruns: int,
+    stage_seconds: dict[str, float],
+) -> dict[str, Any]:
+    overrun = duration_seconds > refresh_seconds
+    return {
+        "duration_seconds": round(duration_seconds, 4),
+        "refresh_seconds": refresh_seconds,
+        "overrun": overrun,
+        "overrun_seconds": round(max(0.0, duration_seconds - refresh_seconds), 4),
+        "consecutive_overruns": consecutive_overruns + 1 if overrun else 0,
+        "stage_seconds": dict(stage_seconds),
+    }
 
 
 async def estimation_loop(
@@ -8187,63 +8384,113 @@ async def estimation_loop(
     ml_shadow_model_path: Path | None = None,
     ml_shadow_state_path: Path | None = None,
 ) -> None:
+    # The estimate is CPU and SQLite bound.  Running it on a dedicated thread
+    # keeps the Telegram and external collectors on this loop responsive; one
+    # worker means cycles never overlap.  The finished book is handed to the
+    # StateStore only after its cycle report is attached.
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="coin-estimate")
     last_run: datetime | None = None
     refresh_seconds = estimate_refresh_seconds()
-    while True:
-        now = datetime.now(timezone.utc).replace(microsecond=0)
-        if last_run is None or (now - last_run).total_seconds() >= refresh_seconds:
-            end = now
-            try:
-                estimate = refresh_estimate(
-                    model,
-                    market_db,
-                    conversation_db,
-                    state_path,
-                    state,
-                    calibration_db=calibration_db,
-                    regime_market_db=regime_market_db,
-                    end=end,
-                    group_live_control=group_live_control,
-                    shadow_model_path=shadow_model_path,
-                    shadow_state_path=shadow_state_path,
-                    research_shadow_model_path=research_shadow_model_path,
-                    research_shadow_state_path=research_shadow_state_path,
-                    ml_shadow_model_path=ml_shadow_model_path,
-                    ml_shadow_state_path=ml_shadow_state_path,
-                    health_config=health_config,
-                )
-                print(
-                    json.dumps(
-                        {
-                            "event": "estimate_complete",
-                            "window_end_utc": estimate["window_end_utc"],
-                            "settlements": list(estimate["settlements"]),
-                            "input_health_status": (
-                                estimate.get("input_health") or {}
-                            ).get("status"),
-                            "input_health_reason_codes": (
-                                estimate.get("input_health") or {}
-                            ).get("reason_codes", []),
-                        },
-                        ensure_ascii=False,
-                    ),
-                    flush=True,
-                )
-                last_run = end
-            except Exception as exc:
-                failed = state.get()
-                failed["service_status"] = "ESTIMATION_ERROR"
-                failed["last_error"] = f"{type(exc).__name__}: {exc}"[:500]
-                failed["generated_at_utc"] = iso_utc(datetime.now(timezone.utc))
-                state.set(failed)
-                print(
-                    json.dumps(
-                        {"event": "estimate_failed", "error": failed["last_error"]},
-                        ensure_ascii=False,
-                    ),
-                    flush=True,
-                )
-        await asyncio.sleep(1)
+    consecutive_overruns = 0
+    try:
+        while True:
+            now = datetime.now(timezone.utc).replace(microsecond=0)
+            if last_run is None or (now - last_run).total_seconds() >= refresh_seconds:
+                end = now
+                stage_seconds: dict[str, float] = {}
+                started = time.perf_counter()
+                try:
+                    estimate = await loop.run_in_executor(
+                        executor,
+                        partial(
+                            refresh_estimate,
+                            model,
+                            market_db,
+                            conversation_db,
+                            state_path,
+                            state,
+                            calibration_db=calibration_db,
+                            regime_market_db=regime_market_db,
+                            end=end,
+                            group_live_control=group_live_control,
+                            shadow_model_path=shadow_model_path,
+                            shadow_state_path=shadow_state_path,
+                            research_shadow_model_path=research_shadow_model_path,
+                            research_shadow_state_path=research_shadow_state_path,
+                            ml_shadow_model_path=ml_shadow_model_path,
+                            ml_shadow_state_path=ml_shadow_state_path,
+                            health_config=health_config,
+                            publish=False,
+                            stage_seconds=stage_seconds,
+                        ),
+                    )
+                    cycle = estimation_cycle_report(
+                        duration_seconds=time.perf_counter() - started,
+                        refresh_seconds=refresh_seconds,
+                        consecutive_overruns=consecutive_overruns,
+                        stage_seconds=stage_seconds,
+                    )
+                    consecutive_overruns = cycle["consecutive_overruns"]
+                    estimate["estimation_cycle"] = cycle
+                    publish_started = time.perf_counter()
+                    await loop.run_in_executor(
+                        executor, publish_estimate, state, state_path, estimate
+                    )
+                    stage_seconds["publish"] = round(time.perf_counter() - publish_started, 4)
+                    if cycle["overrun"]:
+                        print(
+                            json.dumps(
+                                {
+                                    "event": "estimate_overrun",
+                                    "window_end_utc": estimate["window_end_utc"],
+                                    "duration_seconds": cycle["duration_seconds"],
+                                    "refresh_seconds": refresh_seconds,
+                                    "consecutive_overruns": consecutive_overruns,
+                                },
+                                ensure_ascii=False,
+                            ),
+                            flush=True,
+                        )
+                    print(
+                        json.dumps(
+                            {
+                                "event": "estimate_complete",
+                                "window_end_utc": estimate["window_end_utc"],
+                                "settlements": list(estimate["settlements"]),
+                                "input_health_status": (
+                                    estimate.get("input_health") or {}
+                                ).get("status"),
+                                "input_health_reason_codes": (
+                                    estimate.get("input_health") or {}
+                                ).get("reason_codes", []),
+                                "duration_seconds": cycle["duration_seconds"],
+                                "overrun": cycle["overrun"],
+                                "stage_seconds": stage_seconds,
+                                "snapshot_caches": snapshot_cache_stats(),
+                            },
+                            ensure_ascii=False,
+                        ),
+                        flush=True,
+                    )
+                    last_run = end
+                except Exception as exc:
+                    failed = state.get()
+                    failed["service_status"] = "ESTIMATION_ERROR"
+                    failed["last_error"] = f"{type(exc).__name__}: {exc}"[:500]
+                    failed["generated_at_utc"] = iso_utc(datetime.now(timezone.utc))
+                    state.set(failed)
+                    print(
+                        json.dumps(
+                            {"event": "estimate_failed", "error": failed["last_error"]},
+                            ensure_ascii=False,
+                        ),
+                        flush=True,
+                    )
+            await asyncio.sleep(1)
+    finally:
+        # A cycle already on the worker finishes on its own; nothing new starts.
+        executor.shutdown(wait=False, cancel_futures=True)
 
 
 async def _public_collector_heartbeat(
@@ -8844,6 +9091,7 @@ def main() -> int:
     finally:
         server.shutdown()
         server.server_close()
+        shutdown_book_pool()
     return 0
 
 
@@ -347,6 +347,25 @@ def apply_ml_residual_to_estimate(
     return shadow
 
 
+def evaluate_ml_residual_book(
+    live_estimate: dict[str, Any],
+    *,
+    artifact_path: Path,
+    end: datetime,
+    finalize_book: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    """Apply the residual artifact; picklable so a worker process can run it."""
+
+    artifact = _load_artifact(artifact_path)
+    shadow_estimate = apply_ml_residual_to_estimate(live_estimate, artifact, end=end)
+    finalization = finalize_book(shadow_estimate) if finalize_book else None
+    return {
+        "shadow_version": artifact.get("shadow_version"),
+        "estimate": shadow_estimate,
+        "finalization": finalization,
+    }
+
+
 def run_ml_residual_shadow(
     *,
     live_estimate: dict[str, Any],
@@ -355,8 +374,13 @@ def run_ml_residual_shadow(
     shadow_state_path: Path | None = None,
     comparison_estimate: dict[str, Any] | None = None,
     finalize_book: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+    evaluation: Callable[[], dict[str, Any]] | None = None,
 ) -> dict[str, Any]:
-    """Fail-closed ML residual shadow on the identical live estimate payload."""
+    """Fail-closed ML residual shadow on the identical live estimate payload.
+
+    ``evaluation`` supplies an already scheduled
+    :func:`evaluate_ml_residual_book` result.
+    """
 
     path = artifact_path or DEFAULT_ML_ARTIFACT
     state_path = shadow_state_path or DEFAULT_ML_SHADOW_STATE
@@ -373,11 +397,18 @@ def run_ml_residual_shadow(
         write_json_atomic(state_path, meta, mode=0o644)
         return meta
     try:
-        artifact = _load_artifact(path)
-        shadow_estimate = apply_ml_residual_to_estimate(
-            live_estimate, artifact, end=end
+        book = (
+            evaluation()
+            if evaluation is not None
+            else evaluate_ml_residual_book(
+                live_estimate,
+                artifact_path=path,
+                end=end,
+                finalize_book=finalize_book,
+            )
         )
-        finalization = finalize_book(shadow_estimate) if finalize_book else None
+        shadow_estimate = book["estimate"]
+        finalization = book["finalization"]
         comparison = compare_centers(comparison_estimate or live_estimate, shadow_estimate)
         payload = {
             "enabled": True,
@@ -385,7 +416,7 @@ def run_ml_residual_shadow(
             "generated_at_utc": iso_utc(datetime.now(timezone.utc)),
             "shadow_model_path": str(path),
             "shadow_model_kind": "ML_RESIDUAL_HGB",
-            "shadow_version": artifact.get("shadow_version"),
+            "shadow_version": book["shadow_version"],
             "authoritative_override": False,
             "comparison_vs_live": {
                 "paired_estimated_count": comparison["paired_estimated_count"],
@@ -404,7 +435,7 @@ def run_ml_residual_shadow(
                 "enabled": True,
                 "status": "OK",
                 "comparison_vs_live": payload["comparison_vs_live"],
-                "shadow_version": artifact.get("shadow_version"),
+                "shadow_version": book["shadow_version"],
                 "estimate": shadow_estimate,
             }
         )
@@ -79,6 +79,15 @@ WORD_QUANTITIES = {
 CASH_MARKERS = ("نقدی", "نفدی", "نغدی", "نقد", "امروز", "حاضر")
 TOMORROW_MARKERS = ("فردا", "فردایی", "شب حساب", "شب ح", "ش ح")
 PAPER_MARKERS = ("کاغذ", "حواله", "غیررسمی", "غیر رسمی")
+# Commodity and low-date markers are checked for every parsed offer, so they
+# are compiled once here instead of going through the ``re`` module cache.
+LOW_DATE_FRACTION_PATTERN = re.compile(r"(?:ربع|رب|بع|ریع|نیم)\s*(?:ت|پ)(?=\s|\d|$)")
+LOW_DATE_FRACTION_SPACED_PATTERN = re.compile(r"(?:ربع|رب|بع|ریع|نیم)\s+ا\s+پ(?:\s|$)")
+LOW_DATE_ABOVE_80_PATTERN = re.compile(r"(?:بالا(?:ی)?\s*80)(?:\s|$)")
+ONE_GRAM_DIGIT_PATTERN = re.compile(r"(?:^|\s)1\s*گرمی")
+ONE_GRAM_WORD_PATTERN = re.compile(r"(?:^|\s)گرمی(?:\s|$)")
+QUARTER_MARKER_PATTERN = re.compile(r"(?:^|\s)(?:ربع|رب|بع|ریع)(?=\s|\d|$)")
+BAHAR_SHORT_MARKER_PATTERN = re.compile(r"(?:^|\s)پ(?:\s|$)")
 
 
 @dataclass(frozen=True)
@@ -202,9 +211,9 @@ def has_low_date_marker(text: str) -> bool:
     if any(marker in text for marker in LOW_DATE_MARKERS):
         return True
     return bool(
-        re.search(r"(?:ربع|رب|بع|ریع|نیم)\s*(?:ت|پ)(?=\s|\d|$)", text)
-        or re.search(r"(?:ربع|رب|بع|ریع|نیم)\s+ا\s+پ(?:\s|$)", text)
-        or re.search(r"(?:بالا(?:ی)?\s*80)(?:\s|$)", text)
+        LOW_DATE_FRACTION_PATTERN.search(text)
+        or LOW_DATE_FRACTION_SPACED_PATTERN.search(text)
+        or LOW_DATE_ABOVE_80_PATTERN.search(text)
     )
 
 
@@ -212,11 +221,11 @@ def explicit_commodity(text: str) -> tuple[str | None, str | None]:
     low_date = has_low_date_marker(text)
     if (
         "یک گرمی" in text
-        or re.search(r"(?:^|\s)1\s*گرمی", text)
-        or re.search(r"(?:^|\s)گرمی(?:\s|$)", text)
+        or ONE_GRAM_DIGIT_PATTERN.search(text)
+        or ONE_GRAM_WORD_PATTERN.search(text)
     ):
         return "یک گرمی", "EXPLICIT_ONE_GRAM"
-    if re.search(r"(?:^|\s)(?:ربع|رب|بع|ریع)(?=\s|\d|$)", text):
+    if QUARTER_MARKER_PATTERN.search(text):
         return (
             ("ربع تاریخ پایین", "EXPLICIT_QUARTER_LOW_DATE")
             if low_date
@@ -232,7 +241,7 @@ def explicit_commodity(text: str) -> tuple[str | None, str | None]:
         return "بهار", "EXPLICIT_BAHAR_OR_LOW_DATE_FULL"
     if "امام" in text or "تمام" in text:
         return "امام", "EXPLICIT_IMAM"
-    if re.search(r"(?:^|\s)پ(?:\s|$)", text):
+    if BAHAR_SHORT_MARKER_PATTERN.search(text):
         return "بهار", "EXPLICIT_BAHAR_SHORT"
     return None, None
 
@@ -7,7 +7,13 @@ import json
 from pathlib import Path
 from typing import Any, Callable
 
-from coin_estimator import estimate_rates, iso_utc, load_model, write_json_atomic
+from coin_estimator import (
+    estimate_rates,
+    install_snapshot_caches,
+    iso_utc,
+    load_model,
+    write_json_atomic,
+)
 
 
 def _centers(estimate: dict[str, Any]) -> dict[str, dict[str, Any]]:
@@ -67,6 +73,40 @@ def compare_centers(live: dict[str, Any], shadow: dict[str, Any]) -> dict[str, A
     }
 
 
+def evaluate_shadow_book(
+    shadow_model_path: Path,
+    *,
+    market_db: Path,
+    regime_market_db: Path | None,
+    conversation_db: Path,
+    end: datetime,
+    live_group_events_enabled: bool,
+    group_live_events_before: datetime | None,
+    finalize_book: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+    snapshot_caches: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Estimate one challenger book; picklable so a worker process can run it."""
+
+    if snapshot_caches:
+        install_snapshot_caches(snapshot_caches)
+    shadow_model = load_model(shadow_model_path)
+    shadow_estimate = estimate_rates(
+        shadow_model,
+        market_db,
+        end,
+        conversation_db,
+        regime_market_db=regime_market_db,
+        live_group_events_enabled=live_group_events_enabled,
+        group_live_events_before=group_live_events_before,
+    )
+    finalization = finalize_book(shadow_estimate) if finalize_book else None
+    return {
+        "model_kind": shadow_model.get("model_kind"),
+        "estimate": shadow_estimate,
+        "finalization": finalization,
+    }
+
+
 def run_shadow_parallel(
     *,
     live_estimate: dict[str, Any],
@@ -79,8 +119,14 @@ def run_shadow_parallel(
     live_group_events_enabled: bool,
     group_live_events_before: datetime | None,
     finalize_book: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+    evaluation: Callable[[], dict[str, Any]] | None = None,
 ) -> dict[str, Any]:
-    """Estimate with an optional shadow model and write an isolated state file."""
+    """Estimate with an optional shadow model and write an isolated state file.
+
+    ``evaluation`` supplies an already scheduled :func:`evaluate_shadow_book`
+    result (for example a process-pool future); its failures fail closed
+    exactly like an in-process evaluation.
+    """
 
     meta: dict[str, Any] = {
         "enabled": False,
@@ -93,24 +139,29 @@ def run_shadow_parallel(
         write_json_atomic(shadow_state_path, meta, mode=0o644)
         return meta
     try:
-        shadow_model = load_model(shadow_model_path)
-        shadow_estimate = estimate_rates(
-            shadow_model,
-            market_db,
-            end,
-            conversation_db,
-            regime_market_db=regime_market_db,
-            live_group_events_enabled=live_group_events_enabled,
-            group_live_events_before=group_live_events_before,
+        book = (
+            evaluation()
+            if evaluation is not None
+            else evaluate_shadow_book(
+                shadow_model_path,
+                market_db=market_db,
+                regime_market_db=regime_market_db,
+                conversation_db=conversation_db,
+                end=end,
+                live_group_events_enabled=live_group_events_enabled,
+                group_live_events_before=group_live_events_before,
+                finalize_book=finalize_book,
+            )
         )
-        finalization = finalize_book(shadow_estimate) if finalize_book else None
+        shadow_estimate = book["estimate"]
+        finalization = book["finalization"]
         comparison = compare_centers(live_estimate, shadow_estimate)
         payload = {
             "enabled": True,
             "status": "OK",
             "generated_at_utc": iso_utc(datetime.now(timezone.utc)),
             "shadow_model_path": str(shadow_model_path),
-            "shadow_model_kind": shadow_model.get("model_kind"),
+            "shadow_model_kind": book["model_kind"],
             "authoritative_override": False,
             "comparison_vs_live": {
                 "paired_estimated_count": comparison["paired_estimated_count"],
@@ -127,7 +178,7 @@ def run_shadow_parallel(
             {
                 "enabled": True,
                 "status": "OK",
-                "shadow_model_kind": shadow_model.get("model_kind"),
+                "shadow_model_kind": book["model_kind"],
                 "comparison_vs_live": payload["comparison_vs_live"],
                 "estimate": shadow_estimate,
             }
@@ -22,6 +22,15 @@ from core.market_intelligence.herat_price_normalization import (
     HERAT_TEMPORAL_RANGE_VERSION,
     normalize_herat_price,
 )
+from core.market_intelligence.minute_aggregates import MinuteAggregateSpec
+
+
+# Trigger-maintained per-minute summaries that let the estimator read market
+# windows without rescanning every raw ``price_events`` row.
+PRICE_EVENT_MINUTE_AGGREGATES = MinuteAggregateSpec(
+    source_table="price_events",
+    aggregate_table="price_event_minute_aggregates",
+)
 
 
 SCHEMA = """
@@ -215,7 +224,7 @@ SELECT
 FROM external_market_observations
 JOIN external_instruments
   ON external_instruments.code = external_market_observations.instrument_code;
-"""
+""" + PRICE_EVENT_MINUTE_AGGREGATES.ddl()
 
 
 def connect(path: Path | str) -> sqlite3.Connection:
@@ -230,8 +239,18 @@ def connect(path: Path | str) -> sqlite3.Connection:
     return connection
 
 
+def _table_exists(connection: sqlite3.Connection, name: str) -> bool:
+    return connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (name,),
+    ).fetchone() is not None
+
+
 def initialize(connection: sqlite3.Connection) -> None:
+    backfill = not _table_exists(connection, PRICE_EVENT_MINUTE_AGGREGATES.aggregate_table)
     connection.executescript(SCHEMA)
+    if backfill:
+        PRICE_EVENT_MINUTE_AGGREGATES.rebuild(connection)
     connection.commit()
 
 
@@ -244,6 +263,7 @@ def reset_database(connection: sqlite3.Connection) -> None:
         DROP TABLE IF EXISTS external_instruments;
         DROP TABLE IF EXISTS external_collection_runs;
         DROP TABLE IF EXISTS minute_prices;
+        DROP TABLE IF EXISTS price_event_minute_aggregates;
         DROP TABLE IF EXISTS price_events;
         DROP TABLE IF EXISTS raw_posts;
         DROP TABLE IF EXISTS collection_runs;
@@ -767,7 +767,9 @@ class EstimatorTests(unittest.TestCase):
                 trade_form="PHYSICAL",
                 end=end,
             )
-            first["sample"].append(2)
+            with self.assertRaises(TypeError):
+                first["sample"].append(2)
+            result["sample"].append(3)
             second = select_empirical_cash_tomorrow_ratio(
                 Path("/tmp/ratio-cache.sqlite3"),
                 commodity="امام",
@@ -775,6 +777,7 @@ class EstimatorTests(unittest.TestCase):
                 end=end,
             )
         self.assertEqual(raw.call_count, 1)
+        self.assertIs(second, first)
         self.assertEqual(second["sample"], [1])
 
     def test_calibration_prefers_recent_bubble_regime(self) -> None:
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import io
+import json
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+import live_server
+from live_server import (
+    GroupLiveInputControl,
+    StateStore,
+    estimation_cycle_report,
+    prepare_calibration_store,
+    refresh_estimate,
+)
+from test_estimator import make_conversation_db, make_market_db, model
+
+
+def _printed_events(buffer: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in buffer.getvalue().splitlines() if line.strip()]
+
+
+class EstimationCycleReportTests(unittest.TestCase):
+    def test_overrun_is_counted_against_the_refresh_interval(self) -> None:
+        first = estimation_cycle_report(
+            duration_seconds=7.5,
+            refresh_seconds=5,
+            consecutive_overruns=0,
+            stage_seconds={"estimate_rates": 6.0},
+        )
+        second = estimation_cycle_report(
+            duration_seconds=6.0,
+            refresh_seconds=5,
+            consecutive_overruns=first["consecutive_overruns"],
+            stage_seconds={},
+        )
+        recovered = estimation_cycle_report(
+            duration_seconds=1.0,
+            refresh_seconds=5,
+            consecutive_overruns=second["consecutive_overruns"],
+            stage_seconds={},
+        )
+
+        self.assertTrue(first["overrun"])
+        self.assertEqual(first["overrun_seconds"], 2.5)
+        self.assertEqual(second["consecutive_overruns"], 2)
+        self.assertFalse(recovered["overrun"])
+        self.assertEqual(recovered["consecutive_overruns"], 0)
+
+
+class RefreshEstimateHandOffTests(unittest.TestCase):
+    def test_unpublished_refresh_leaves_state_untouched_and_reports_stages(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            market_db = root / "market.sqlite3"
+            conversation_db = root / "conversation.sqlite3"
+            calibration_db = root / "online_calibration.sqlite3"
+            make_market_db(market_db)
+            make_conversation_db(conversation_db)
+            prepare_calibration_store(calibration_db, conversation_db)
+            state = StateStore()
+            stage_seconds: dict[str, float] = {}
+
+            result = refresh_estimate(
+                model(),
+                market_db,
+                conversation_db,
+                root / "state.json",
+                state,
+                calibration_db=calibration_db,
+                end=datetime(2026, 7, 20, 10, 2, tzinfo=timezone.utc),
+                shadow_model_path=root / "missing-shadow.json",
+                shadow_state_path=root / "shadow-state.json",
+                research_shadow_model_path=root / "missing-research.json",
+                research_shadow_state_path=root / "research-state.json",
+                ml_shadow_model_path=root / "missing-ml.joblib",
+                ml_shadow_state_path=root / "ml-state.json",
+                publish=False,
+                stage_seconds=stage_seconds,
+            )
+
+            self.assertEqual(result["service_status"], "RUNNING")
+            self.assertFalse((root / "state.json").exists())
+            self.assertEqual(state.get()["service_status"], "STARTING")
+            self.assertEqual(
+                list(stage_seconds),
+                [
+                    "reconciliation",
+                    "estimate_rates",
+                    "snapshot_calibration",
+                    "shadow_previous",
+                    "shadow_morning_reopen",
+                    "shadow_ml",
+                    "cross_calibration",
+                    "prediction_ledger",
+                ],
+            )
+            self.assertTrue(all(value >= 0 for value in stage_seconds.values()))
+
+
+class EstimationLoopTests(unittest.IsolatedAsyncioTestCase):
+    async def _run_one_cycle(self, fake_refresh, *, refresh_seconds: int = 5):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        root = Path(directory.name)
+        state = StateStore()
+        output = io.StringIO()
+        real_sleep = asyncio.sleep
+
+        async def stop_after_first_cycle(_seconds):
+            await real_sleep(0)
+            raise asyncio.CancelledError
+
+        with patch.object(live_server, "refresh_estimate", fake_refresh), patch.object(
+            live_server, "estimate_refresh_seconds", return_value=refresh_seconds
+        ), patch.object(live_server.asyncio, "sleep", stop_after_first_cycle), contextlib.redirect_stdout(output):
+            with self.assertRaises(asyncio.CancelledError):
+                await live_server.estimation_loop(
+                    {},
+                    root / "market.sqlite3",
+                    root / "conversation.sqlite3",
+                    root / "calibration.sqlite3",
+                    root / "state.json",
+                    state,
+                    GroupLiveInputControl(root / "control.json"),
+                )
+        return root, state, _printed_events(output)
+
+    async def test_cycle_runs_off_the_event_loop_and_hands_off_state(self) -> None:
+        calls = []
+        release = threading.Event()
+        loop_ticks = []
+
+        def fake_refresh(*args, publish, stage_seconds, **kwargs):
+            calls.append((threading.current_thread().name, publish))
+            # The event loop must keep running while the estimate is computed.
+            self.assertTrue(release.wait(timeout=5))
+            stage_seconds["estimate_rates"] = 0.25
+            return {"window_end_utc": "2026-07-20T10:02:00Z", "settlements": {"today": {}}}
+
+        async def collector_tick():
+            loop_ticks.append("tick")
+            release.set()
+
+        ticker = asyncio.get_running_loop().call_later(0.01, lambda: asyncio.ensure_future(collector_tick()))
+        self.addCleanup(ticker.cancel)
+
+        root, state, events = await self._run_one_cycle(fake_refresh)
+
+        self.assertEqual(loop_ticks, ["tick"])
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(calls[0][0].startswith("coin-estimate"))
+        self.assertFalse(calls[0][1])
+        published = state.get()
+        self.assertEqual(published["estimation_cycle"]["stage_seconds"], {"estimate_rates": 0.25})
+        self.assertFalse(published["estimation_cycle"]["overrun"])
+        self.assertEqual(json.loads((root / "state.json").read_text(encoding="utf-8")), published)
+        (complete,) = [event for event in events if event["event"] == "estimate_complete"]
+        self.assertEqual(complete["settlements"], ["today"])
+        self.assertIn("publish", complete["stage_seconds"])
+        self.assertFalse(complete["overrun"])
+
+    async def test_slow_cycle_is_reported_as_overrun(self) -> None:
+        def fake_refresh(*args, publish, stage_seconds, **kwargs):
+            return {"window_end_utc": "2026-07-20T10:02:00Z", "settlements": {}}
+
+        _root, state, events = await self._run_one_cycle(fake_refresh, refresh_seconds=-1)
+
+        self.assertTrue(state.get()["estimation_cycle"]["overrun"])
+        self.assertEqual(
+            [event["event"] for event in events],
+            ["estimate_overrun", "estimate_complete"],
+        )
+        self.assertEqual(events[0]["consecutive_overruns"], 1)
+
+    async def test_failed_cycle_marks_estimation_error(self) -> None:
+        def fake_refresh(*args, **kwargs):
+            raise RuntimeError("sqlite locked")
+
+        _root, state, events = await self._run_one_cycle(fake_refresh)
+
+        self.assertEqual(state.get()["service_status"], "ESTIMATION_ERROR")
+        self.assertEqual(events, [{"event": "estimate_failed", "error": "RuntimeError: sqlite locked"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
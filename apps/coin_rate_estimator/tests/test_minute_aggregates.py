@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import random
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+import coin_estimator
+from coin_estimator import average_market_value, iso_utc, select_melted_average
+from live_server import read_melted_minute_averages
+from telegram_price_collector.db import PRICE_EVENT_MINUTE_AGGREGATES, connect, initialize
+
+BASE = datetime(2026, 7, 20, 10, 0, tzinfo=timezone.utc)
+LABELS = (
+    ("آبشده نقدی", "PHYSICAL"),
+    ("آبشده رسمی", "PHYSICAL"),
+    ("آبشده امروزی", "PAPER"),
+    ("آبشده فردایی", "PAPER"),
+)
+
+
+def _insert_event(connection, raw_post_id: int, *, label: str, trade_form: str, event_type: str, price: float, at: datetime) -> None:
+    connection.execute(
+        """
+        INSERT INTO price_events(
+            raw_post_id, event_index, instrument, market_label, settlement_term,
+            trade_form, event_type, side, price_value, price_num, currency,
+            price_unit, movement, event_time_utc, tehran_datetime, tehran_date,
+            tehran_minute, tehran_weekday, tehran_weekday_name, parse_method,
+            parse_confidence, parser_version
+        ) VALUES (?, 0, 'MELTED_GOLD', ?, 'TODAY', ?, ?, 'UNKNOWN', ?, ?, 'IRT',
+                  'TOMAN_PER_MESGHAL_750', 'NONE', ?, '', '', '', 0, '', 'TEST', 1.0, 'test')
+        """,
+        (raw_post_id, label, trade_form, event_type, str(price), price, iso_utc(at)),
+    )
+
+
+class PriceEventMinuteAggregateTests(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.market_db = Path(directory.name) / "market.sqlite3"
+        self.connection = connect(self.market_db)
+        self.addCleanup(self.connection.close)
+        initialize(self.connection)
+        generator = random.Random(3)
+        for index in range(600):
+            self.connection.execute(
+                "INSERT INTO raw_posts(source_code, message_id, published_at_utc, raw_text) VALUES ('TEST', ?, '', '')",
+                (index + 1,),
+            )
+            label, trade_form = generator.choice(LABELS)
+            _insert_event(
+                self.connection,
+                index + 1,
+                label=label,
+                trade_form=trade_form,
+                event_type=generator.choice(("QUOTE", "TRADE")),
+                price=float(generator.randrange(80_000_000, 86_000_000, 10_000)),
+                at=BASE + timedelta(seconds=generator.randrange(0, 20 * 60)),
+            )
+        # Collector re-parses replace a post's events; the triggers must follow.
+        self.connection.execute("DELETE FROM price_events WHERE raw_post_id % 11 = 0")
+        self.connection.execute("UPDATE price_events SET price_num = price_num + 5000 WHERE raw_post_id % 7 = 0")
+        self.connection.commit()
+
+    def _raw(self, function, *args, **kwargs):
+        with patch.object(coin_estimator, "minute_aggregate_available", return_value=False):
+            return function(*args, **kwargs)
+
+    def test_average_market_value_matches_raw_rows(self) -> None:
+        generator = random.Random(5)
+        for _ in range(150):
+            end = BASE + timedelta(seconds=generator.randrange(0, 21 * 60))
+            seconds = generator.choice((30, 60, 90, 15 * 60))
+            label, trade_form = generator.choice(LABELS)
+            for filters in (
+                {"instrument": "MELTED_GOLD", "market_label": label, "trade_form": trade_form},
+                {"instrument": "MELTED_GOLD", "trade_form": trade_form, "event_type": "TRADE"},
+            ):
+                kwargs = {"end": end, "seconds": seconds, **filters}
+                self.assertEqual(
+                    average_market_value(self.connection, **kwargs),
+                    self._raw(average_market_value, self.connection, **kwargs),
+                    kwargs,
+                )
+        summary = coin_estimator.summarize_minute_window(
+            self.connection,
+            PRICE_EVENT_MINUTE_AGGREGATES,
+            start_utc=iso_utc(BASE),
+            end_utc=iso_utc(BASE + timedelta(minutes=15)),
+            filters={"instrument": "MELTED_GOLD"},
+        )
+        self.assertEqual(summary.aggregated_minutes, 14)
+
+    def test_select_melted_average_matches_raw_rows(self) -> None:
+        for settlement in ("CASH", "TOMORROW"):
+            for minute in range(0, 21, 3):
+                end = BASE + timedelta(minutes=minute, seconds=17)
+                self.assertEqual(
+                    select_melted_average(self.connection, settlement, end),
+                    self._raw(select_melted_average, self.connection, settlement, end),
+                )
+
+    def test_dashboard_minute_averages_match_raw_rows(self) -> None:
+        end_value = iso_utc(BASE + timedelta(minutes=9, seconds=40))
+
+        self.assertEqual(
+            read_melted_minute_averages(self.market_db, end_value),
+            self._raw(read_melted_minute_averages, self.market_db, end_value),
+        )
+        self.assertGreater(read_melted_minute_averages(self.market_db, end_value)["PAPER"]["sample_count"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
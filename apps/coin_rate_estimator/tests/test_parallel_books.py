@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import coin_estimator
+import live_server
+from live_server import StateStore, prepare_calibration_store, refresh_estimate
+from test_estimator import make_conversation_db, make_market_db, model
+
+try:
+    import joblib
+    from sklearn.dummy import DummyRegressor
+except ImportError:  # research dependencies are optional
+    joblib = None
+
+VOLATILE_KEYS = frozenset({"generated_at_utc", "last_applied_at_utc", "estimation_cycle"})
+
+
+def _stable(value: Any) -> Any:
+    """Drop wall-clock stamps that legitimately differ between two runs."""
+
+    if isinstance(value, dict):
+        return {key: _stable(item) for key, item in value.items() if key not in VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [_stable(item) for item in value]
+    return value
+
+
+def _clear_snapshot_caches() -> None:
+    coin_estimator._MODEL_INDEPENDENT_SNAPSHOT_CACHE.clear()
+    coin_estimator._EMPIRICAL_RATIO_SNAPSHOT_CACHE.clear()
+
+
+class ParallelBookEvaluationTests(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        self.market_db = self.root / "market.sqlite3"
+        self.conversation_db = self.root / "conversation.sqlite3"
+        make_market_db(self.market_db)
+        make_conversation_db(self.conversation_db)
+        shadow_model = model()
+        shadow_model["model_kind"] = "PREVIOUS_LIVE"
+        (self.root / "shadow.json").write_text(json.dumps(shadow_model), encoding="utf-8")
+        research_model = model()
+        research_model["model_kind"] = "MORNING_REOPEN"
+        (self.root / "research.json").write_text(json.dumps(research_model), encoding="utf-8")
+        self.ml_artifact = self.root / "ml.joblib"
+        if joblib is not None:
+            keys = ["tehran_hour", "tehran_minute_of_day", "is_morning_open"]
+            regressor = DummyRegressor(strategy="constant", constant=0.002)
+            regressor.fit([[9.0, 570.0, 1.0], [10.0, 600.0, 0.0]], [0.002, 0.002])
+            joblib.dump(
+                {"sklearn_model": regressor, "feature_keys": keys, "shadow_version": "TEST_V1"},
+                self.ml_artifact,
+            )
+        self.addCleanup(live_server.shutdown_book_pool)
+        self.addCleanup(_clear_snapshot_caches)
+
+    def _refresh(self, run: str, *, parallel: bool) -> tuple[dict[str, Any], dict[str, Any]]:
+        _clear_snapshot_caches()
+        run_root = self.root / run
+        run_root.mkdir()
+        calibration_db = run_root / "online_calibration.sqlite3"
+        prepare_calibration_store(calibration_db, self.conversation_db)
+        with patch.dict(os.environ, {"COIN_RATE_ESTIMATOR_PARALLEL_BOOKS": "1" if parallel else "0"}):
+            estimate = refresh_estimate(
+                model(),
+                self.market_db,
+                self.conversation_db,
+                run_root / "state.json",
+                StateStore(),
+                calibration_db=calibration_db,
+                end=datetime(2026, 7, 20, 10, 2, tzinfo=timezone.utc),
+                shadow_model_path=self.root / "shadow.json",
+                shadow_state_path=run_root / "shadow-state.json",
+                research_shadow_model_path=self.root / "research.json",
+                research_shadow_state_path=run_root / "research-state.json",
+                ml_shadow_model_path=self.ml_artifact,
+                ml_shadow_state_path=run_root / "ml-state.json",
+            )
+        shadow_states = {
+            name: json.loads((run_root / f"{name}-state.json").read_text(encoding="utf-8"))
+            for name in ("shadow", "research", "ml")
+        }
+        text = json.dumps({"estimate": estimate, "shadows": shadow_states}, ensure_ascii=False)
+        stable = json.loads(text.replace(str(run_root), "RUN_ROOT"))
+        return _stable(stable["estimate"]), _stable(stable["shadows"])
+
+    def test_parallel_books_match_serial_output_exactly(self) -> None:
+        serial_estimate, serial_shadows = self._refresh("serial", parallel=False)
+        parallel_estimate, parallel_shadows = self._refresh("parallel", parallel=True)
+
+        self.assertIsNotNone(live_server._BOOK_POOL)
+        self.assertEqual(serial_shadows["shadow"]["status"], "OK")
+        self.assertEqual(serial_shadows["research"]["status"], "OK")
+        if joblib is not None:
+            self.assertEqual(serial_shadows["ml"]["status"], "OK")
+        self.assertEqual(parallel_shadows, serial_shadows)
+        self.assertEqual(parallel_estimate, serial_estimate)
+
+    def test_broken_pool_falls_back_to_in_process_evaluation(self) -> None:
+        serial_estimate, serial_shadows = self._refresh("serial", parallel=False)
+
+        class BrokenPool:
+            def submit(self, *args, **kwargs):
+                raise live_server.BrokenProcessPool("worker died")
+
+            def shutdown(self, **kwargs):
+                pass
+
+        with patch.object(live_server, "_book_pool", return_value=BrokenPool()):
+            fallback_estimate, fallback_shadows = self._refresh("fallback", parallel=True)
+
+        self.assertEqual(fallback_shadows, serial_shadows)
+        self.assertEqual(fallback_estimate, serial_estimate)
+
+
+class SnapshotCacheExportTests(unittest.TestCase):
+    def tearDown(self) -> None:
+        _clear_snapshot_caches()
+
+    def test_export_selects_only_the_requested_snapshot(self) -> None:
+        end = datetime(2026, 7, 20, 10, 2, tzinfo=timezone.utc)
+        older = datetime(2026, 7, 20, 10, 1, tzinfo=timezone.utc)
+        coin_estimator._snapshot_cache_put(("OBSERVED_INPUTS", "m", None, "CASH", end.isoformat()), {"v": 1})
+        coin_estimator._snapshot_cache_put(("OBSERVED_INPUTS", "m", None, "CASH", older.isoformat()), {"v": 0})
+        coin_estimator._empirical_ratio_cache_put(("c", "امام", "PHYSICAL", end.isoformat(), 1, 2, None), {"r": 1})
+
+        exported = coin_estimator.export_snapshot_caches(end)
+        _clear_snapshot_caches()
+        coin_estimator.install_snapshot_caches(exported)
+
+        self.assertEqual(
+            list(coin_estimator._MODEL_INDEPENDENT_SNAPSHOT_CACHE),
+            [("OBSERVED_INPUTS", "m", None, "CASH", end.isoformat())],
+        )
+        self.assertEqual(len(coin_estimator._EMPIRICAL_RATIO_SNAPSHOT_CACHE), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
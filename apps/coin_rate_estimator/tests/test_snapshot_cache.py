@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import copy
+import json
+import pickle
+import unittest
+
+from snapshot_cache import FrozenDict, FrozenList, SnapshotCache, freeze
+
+
+class FreezeTests(unittest.TestCase):
+    def test_frozen_values_reject_mutation_but_stay_json_compatible(self) -> None:
+        source = {"status": "OBSERVED", "rows": [{"price": 1}], "pair": (1, [2])}
+        frozen = freeze(source)
+        source["rows"].append({"price": 2})
+
+        self.assertIsInstance(frozen, dict)
+        self.assertEqual(frozen, {"status": "OBSERVED", "rows": [{"price": 1}], "pair": (1, [2])})
+        self.assertEqual(json.loads(json.dumps(frozen)), {"status": "OBSERVED", "rows": [{"price": 1}], "pair": [1, [2]]})
+        for mutate in (
+            lambda: frozen.__setitem__("status", "X"),
+            lambda: frozen.update(status="X"),
+            lambda: frozen.pop("status"),
+            lambda: frozen["rows"].append({}),
+            lambda: frozen["rows"][0].__setitem__("price", 2),
+            lambda: frozen["pair"][1].sort(),
+        ):
+            with self.assertRaises(TypeError):
+                mutate()
+
+    def test_deepcopy_thaws_and_pickle_round_trips_frozen(self) -> None:
+        frozen = freeze({"rows": [{"price": 1}]})
+
+        thawed = copy.deepcopy(frozen)
+        thawed["rows"][0]["price"] = 2
+        restored = pickle.loads(pickle.dumps(frozen))
+
+        self.assertIs(type(thawed), dict)
+        self.assertIs(type(thawed["rows"]), list)
+        self.assertEqual(frozen["rows"][0]["price"], 1)
+        self.assertIsInstance(restored, FrozenDict)
+        self.assertIsInstance(restored["rows"], FrozenList)
+        self.assertEqual(restored, frozen)
+        self.assertIs(freeze(frozen), frozen)
+
+
+class SnapshotCacheTests(unittest.TestCase):
+    def test_hit_returns_shared_frozen_value_and_counts(self) -> None:
+        cache = SnapshotCache("test", max_entries=4, max_bytes=1 << 20)
+
+        self.assertIsNone(cache.get("a"))
+        stored = cache.put("a", {"ratio": 1.0})
+
+        self.assertIs(cache.get("a"), stored)
+        self.assertIs(cache.get("a"), stored)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (2, 1, 1))
+        self.assertGreater(stats["bytes"], 0)
+
+    def test_least_recently_used_entry_is_evicted_instead_of_clearing(self) -> None:
+        cache = SnapshotCache("test", max_entries=2, max_bytes=1 << 20)
+        cache.put("a", {"v": 1})
+        cache.put("b", {"v": 2})
+        cache.get("a")
+
+        cache.put("c", {"v": 3})
+
+        self.assertEqual(list(cache), ["a", "c"])
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_byte_ceiling_bounds_memory(self) -> None:
+        cache = SnapshotCache("test", max_entries=100, max_bytes=4096)
+        for index in range(20):
+            cache.put(index, {"rows": list(range(20))})
+
+        stats = cache.stats()
+        self.assertLessEqual(stats["bytes"], 4096)
+        self.assertGreater(stats["evictions"], 0)
+        self.assertIn(19, cache)
+
+    def test_value_larger_than_ceiling_is_served_but_not_cached(self) -> None:
+        cache = SnapshotCache("test", max_entries=100, max_bytes=256)
+        cache.put("small", {"v": 1})
+
+        value = cache.put("huge", {"rows": list(range(1000))})
+
+        self.assertEqual(len(value["rows"]), 1000)
+        self.assertNotIn("huge", cache)
+        self.assertIn("small", cache)
+        self.assertEqual(cache.stats()["oversized"], 1)
+
+    def test_replacing_a_key_keeps_byte_total_consistent(self) -> None:
+        cache = SnapshotCache("test", max_entries=4, max_bytes=1 << 20)
+        cache.put("a", {"rows": list(range(50))})
+        cache.put("a", {"v": 1})
+        cache.clear()
+
+        self.assertEqual(cache.stats()["bytes"], 0)
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+# bot/access_cache.py
+"""Short-lived cache of the bot AuthMiddleware access verdict.
+
+Every Telegram update still loads its ``User`` row, so handlers keep a live
+ORM object.  The registration-activation and bot-access checks are the
+queries this cache skips.  They read the registration intent and relation
+tables, and during market open the same users tap buttons many times a
+second.
+
+An entry is keyed by ``telegram_id`` and is reused only when all of these
+hold:
+
+- it is younger than ``bot_auth_access_cache_ttl_seconds``;
+- the freshly loaded user row still has the same version token (id,
+  ``sync_version``, ``updated_at`` and the fields the checks read), so any
+  committed user update, block or flag change misses;
+- no ``events:bot_access:invalidated`` signal named the user.  The signal is
+  published after commit for relation and registration-intent changes (see
+  ``core.events.setup_bot_access_invalidation_events``).
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+import json
+import logging
+import time
+from typing import Any, Callable, Iterable
+
+import redis.asyncio as redis
+
+from core.config import settings
+from core.metrics import record_bot_auth_access_cache
+
+logger = logging.getLogger(__name__)
+
+BOT_ACCESS_INVALIDATED_CHANNEL = "events:bot_access:invalidated"
+
+
+@dataclass(frozen=True, slots=True)
+class BotAccessCacheEntry:
+    user_id: int
+    token: tuple
+    activation_block: Any
+    access_decision: Any
+    expires_at: float
+
+
+def user_access_token(user: Any) -> tuple:
+    """Fields that, when changed on the user row, must discard a cached verdict."""
+    return tuple(
+        getattr(user, field, None)
+        for field in (
+            "id",
+            "sync_version",
+            "updated_at",
+            "is_deleted",
+            "account_status",
+            "role",
+            "mobile_number",
+            "address",
+        )
+    )
+
+
+class BotAccessCache:
+    """Process-local LRU of access verdicts keyed by ``telegram_id``."""
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float,
+        max_entries: int = 20000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self.max_entries = max(1, int(max_entries))
+        self._clock = clock
+        self._entries: OrderedDict[int, BotAccessCacheEntry] = OrderedDict()
+        # Bumped on every invalidation, so a verdict computed across one is not stored.
+        self.generation = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, telegram_id: int, user: Any) -> BotAccessCacheEntry | None:
+        entry = self._entries.get(int(telegram_id))
+        if entry is None:
+            record_bot_auth_access_cache("miss")
+            return None
+        if entry.expires_at <= self._clock() or entry.token != user_access_token(user):
+            self._entries.pop(int(telegram_id), None)
+            record_bot_auth_access_cache("stale")
+            return None
+        self._entries.move_to_end(int(telegram_id))
+        record_bot_auth_access_cache("hit")
+        return entry
+
+    def put(
+        self,
+        telegram_id: int,
+        user: Any,
+        *,
+        activation_block: Any,
+        access_decision: Any,
+        generation: int | None = None,
+    ) -> None:
+        if not self.enabled or (generation is not None and generation != self.generation):
+            return
+        self._entries[int(telegram_id)] = BotAccessCacheEntry(
+            user_id=int(getattr(user, "id")),
+            token=user_access_token(user),
+            activation_block=activation_block,
+            access_decision=access_decision,
+            expires_at=self._clock() + self.ttl_seconds,
+        )
+        self._entries.move_to_end(int(telegram_id))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, *, user_ids: Iterable[int] = (), telegram_ids: Iterable[int] = ()) -> int:
+        self.generation += 1
+        user_id_set = {int(value) for value in user_ids}
+        doomed = {int(value) for value in telegram_ids if int(value) in self._entries}
+        if user_id_set:
+            doomed.update(key for key, entry in self._entries.items() if entry.user_id in user_id_set)
+        for key in doomed:
+            del self._entries[key]
+        if doomed:
+            record_bot_auth_access_cache("invalidated")
+        return len(doomed)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+
+bot_access_cache = BotAccessCache(
+    ttl_seconds=getattr(settings, "bot_auth_access_cache_ttl_seconds", 10.0),
+    max_entries=getattr(settings, "bot_auth_access_cache_max_entries", 20000),
+)
+
+
+def apply_bot_access_invalidation(cache: BotAccessCache, raw_payload: Any) -> int:
+    data = raw_payload.decode("utf-8") if isinstance(raw_payload, bytes) else str(raw_payload)
+    try:
+        payload = json.loads(data)
+    except (TypeError, ValueError):
+        return 0
+    return cache.invalidate(
+        user_ids=payload.get("user_ids") or (),
+        telegram_ids=payload.get("telegram_ids") or (),
+    )
+
+
+async def listen_bot_access_invalidations(cache: BotAccessCache = bot_access_cache) -> None:
+    """Bot child task: drop cached verdicts named by committed invalidation events."""
+    from core.redis import pool
+
+    redis_client = redis.Redis(connection_pool=pool)
+    pubsub = redis_client.pubsub()
+    await pubsub.subscribe(BOT_ACCESS_INVALIDATED_CHANNEL)
+    logger.info("🔔 Bot access invalidation listener started")
+    try:
+        while True:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            if not message or message.get("type") != "message":
+                await asyncio.sleep(0.1)
+                continue
+            apply_bot_access_invalidation(cache, message.get("data", ""))
+    finally:
+        # Verdicts may have changed while we were not listening.
+        cache.clear()
+        await pubsub.unsubscribe(BOT_ACCESS_INVALIDATED_CHANNEL)
+        await pubsub.close()
+        await redis_client.aclose()
@@ -0,0 +1,244 @@
+# bot/message_delete_scheduler.py
+"""Durable scheduler for delayed bot message deletion.
+
+Pending deletions live in one Redis sorted set.  Each member is
+``"<chat_id>:<message_id>"`` and its score is the due time in epoch seconds.
+They therefore survive bot restarts, and a busy group no longer holds one
+sleeping asyncio task per message.
+
+``schedule`` and ``cancel`` are synchronous so the existing handler call sites
+stay unchanged.  They append to an ordered in-process buffer, and the single
+consumer applies it with one pipeline per cycle.  The consumer sleeps until the
+earliest due score, or until a newly scheduled message is due earlier.  It then
+claims due members in score order, groups them per chat, and removes each group
+with ``deleteMessages`` (up to 100 ids per call).  Every call first takes
+admission from the shared Telegram delivery limiter.  A destination that is
+not admitted yet is pushed back to the limiter's ``not_before`` time.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+import logging
+import time
+from types import SimpleNamespace
+from typing import Any, Callable
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+
+from core.metrics import record_bot_message_deletes, set_bot_message_delete_backlog
+from core.services.telegram_delivery_queue_service import TELEGRAM_PRIMARY_BOT_IDENTITY
+from core.telegram_delivery_queue_limiter import TelegramDeliveryLimiterUnavailableError
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_DELETE_SCHEDULE_KEY = "bot:message_delete:v1"
+MESSAGE_DELETE_BATCH_SIZE = 500
+# Telegram deleteMessages accepts at most 100 ids per call.
+MESSAGE_DELETE_IDS_PER_CALL = 100
+MESSAGE_DELETE_MAX_IDLE_SECONDS = 30.0
+MESSAGE_DELETE_OVERDUE_GRACE_SECONDS = 60.0
+MESSAGE_DELETE_LIMITER_BACKOFF_SECONDS = 30.0
+
+
+def _member(chat_id: int, message_id: int) -> str:
+    return f"{int(chat_id)}:{int(message_id)}"
+
+
+def _parse_member(member: Any) -> tuple[int, int] | None:
+    raw = member.decode("utf-8") if isinstance(member, bytes) else str(member)
+    chat_id, _, message_id = raw.rpartition(":")
+    try:
+        return int(chat_id), int(message_id)
+    except ValueError:
+        return None
+
+
+def message_delete_destination_key(chat_id: int) -> str:
+    return f"private:chat:{chat_id}" if int(chat_id) > 0 else f"chat:{chat_id}"
+
+
+class MessageDeleteScheduler:
+    """Redis sorted-set deletion schedule with a single consumer loop."""
+
+    def __init__(
+        self,
+        bot: Bot,
+        redis_client: Any,
+        *,
+        limiter: Any | None = None,
+        limiter_factory: Callable[[], Any] | None = None,
+        is_anchor: Callable[[int, int], bool] | None = None,
+        key: str = MESSAGE_DELETE_SCHEDULE_KEY,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._bot = bot
+        self._redis = redis_client
+        self._limiter = limiter if limiter is not None else (limiter_factory() if limiter_factory else None)
+        self._limiter_factory = limiter_factory
+        self._is_anchor = is_anchor or (lambda _chat_id, _message_id: False)
+        self._key = key
+        self._clock = clock
+        # Ordered ("add", member, due) / ("remove", member, None) operations not yet in Redis.
+        self._pending_ops: list[tuple[str, str, float | None]] = []
+        self._wake = asyncio.Event()
+        self._next_wake_at: float | None = None
+
+    def schedule(self, chat_id: int, message_id: int, delay_seconds: float) -> None:
+        due = self._clock() + max(0.0, float(delay_seconds))
+        self._pending_ops.append(("add", _member(chat_id, message_id), due))
+        if self._next_wake_at is None or due < self._next_wake_at:
+            self._wake.set()
+
+    def cancel(self, chat_id: int, message_id: int) -> None:
+        self._pending_ops.append(("remove", _member(chat_id, message_id), None))
+        self._wake.set()
+
+    async def flush_pending(self) -> None:
+        if not self._pending_ops:
+            return
+        ops, self._pending_ops = self._pending_ops, []
+        pipe = self._redis.pipeline(transaction=False)
+        for op, member, due in ops:
+            if op == "add":
+                pipe.zadd(self._key, {member: due})
+            else:
+                pipe.zrem(self._key, member)
+        try:
+            await pipe.execute()
+        except Exception:
+            self._pending_ops[:0] = ops
+            raise
+
+    async def _limiter_admission(self, chat_id: int, first_message_id: int):
+        if self._limiter is None:
+            return None
+        job = SimpleNamespace(
+            id=f"message-delete:{_member(chat_id, first_message_id)}",
+            bot_identity=TELEGRAM_PRIMARY_BOT_IDENTITY,
+            destination_key=message_delete_destination_key(chat_id),
+        )
+        return job, await self._limiter.acquire(job, now=datetime.now(timezone.utc))
+
+    async def _defer(self, members: list[str], until: float) -> None:
+        await self._redis.zadd(self._key, {member: until for member in members}, xx=True)
+
+    async def _delete_chat_batch(self, chat_id: int, message_ids: list[int]) -> str:
+        members = [_member(chat_id, message_id) for message_id in message_ids]
+        keep = [message_id for message_id in message_ids if not self._is_anchor(chat_id, message_id)]
+        if not keep:
+            await self._redis.zrem(self._key, *members)
+            record_bot_message_deletes("anchor_skipped", len(members))
+            return "anchor_skipped"
+
+        admission = await self._limiter_admission(chat_id, keep[0])
+        if admission is not None and not admission[1].allowed:
+            retry_after = float(admission[1].retry_after_seconds or 1.0)
+            await self._defer(members, self._clock() + retry_after)
+            record_bot_message_deletes("deferred", len(members))
+            return "deferred"
+
+        try:
+            if len(keep) == 1:
+                await self._bot.delete_message(chat_id, keep[0])
+            else:
+                await self._bot.delete_messages(chat_id, keep)
+            result = "deleted"
+        except TelegramRetryAfter as exc:
+            retry_after = float(exc.retry_after or 1)
+            if admission is not None:
+                await self._limiter.extend_destination_cooldown(
+                    admission[0],
+                    until=datetime.now(timezone.utc) + timedelta(seconds=retry_after),
+                )
+            await self._defer(members, self._clock() + retry_after)
+            record_bot_message_deletes("deferred", len(members))
+            return "deferred"
+        except TelegramBadRequest:
+            # Already deleted, too old, or no rights; nothing left to retry.
+            result = "gone"
+        except Exception as exc:
+            logger.debug(f"Scheduled delete failed for chat {chat_id}: {exc}")
+            result = "failed"
+        await self._redis.zrem(self._key, *members)
+        record_bot_message_deletes(result, len(members))
+        return result
+
+    async def run_once(self) -> float:
+        """Apply buffered schedules, delete every due message and return the next due score."""
+        await self.flush_pending()
+        now = self._clock()
+        due = await self._redis.zrangebyscore(self._key, "-inf", now, start=0, num=MESSAGE_DELETE_BATCH_SIZE)
+        by_chat: dict[int, list[int]] = defaultdict(list)
+        for member in due:
+            parsed = _parse_member(member)
+            if parsed is None:
+                await self._redis.zrem(self._key, member)
+                continue
+            by_chat[parsed[0]].append(parsed[1])
+        for chat_id, message_ids in by_chat.items():
+            for start in range(0, len(message_ids), MESSAGE_DELETE_IDS_PER_CALL):
+                await self._delete_chat_batch(chat_id, message_ids[start : start + MESSAGE_DELETE_IDS_PER_CALL])
+
+        pending = await self._redis.zcard(self._key)
+        overdue = await self._redis.zcount(self._key, "-inf", now - MESSAGE_DELETE_OVERDUE_GRACE_SECONDS)
+        set_bot_message_delete_backlog(pending=int(pending or 0), overdue=int(overdue or 0))
+        if len(due) >= MESSAGE_DELETE_BATCH_SIZE:
+            return now
+        head = await self._redis.zrange(self._key, 0, 0, withscores=True)
+        return float(head[0][1]) if head else now + MESSAGE_DELETE_MAX_IDLE_SECONDS
+
+    async def run(self) -> None:
+        logger.info("🗑️ Message delete scheduler started")
+        while True:
+            try:
+                next_due = await self.run_once()
+            except TelegramDeliveryLimiterUnavailableError as exc:
+                logger.warning(f"Message delete scheduler paused; limiter unavailable: {exc}")
+                if self._limiter_factory is not None:
+                    self._limiter = self._limiter_factory()
+                next_due = self._clock() + MESSAGE_DELETE_LIMITER_BACKOFF_SECONDS
+            except Exception as exc:
+                logger.warning(f"Message delete scheduler cycle failed: {exc}")
+                next_due = self._clock() + 1.0
+
+            now = self._clock()
+            self._next_wake_at = min(next_due, now + MESSAGE_DELETE_MAX_IDLE_SECONDS)
+            self._wake.clear()
+            if self._pending_ops:
+                self._wake.set()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=max(0.0, self._next_wake_at - now))
+            except asyncio.TimeoutError:
+                pass
+
+
+async def run_message_delete_scheduler(bot: Bot, *, settings_obj: Any) -> None:
+    """Bot child task: own the durable delete schedule for this process."""
+    import redis.asyncio as redis
+
+    from bot import message_manager
+    from core.telegram_delivery_queue_limiter import configured_redis_telegram_delivery_limiter
+
+    redis_client = redis.Redis.from_url(
+        str(getattr(settings_obj, "redis_url", "") or ""),
+        decode_responses=True,
+    )
+    scheduler = MessageDeleteScheduler(
+        bot,
+        redis_client,
+        limiter_factory=lambda: configured_redis_telegram_delivery_limiter(redis_client, settings=settings_obj),
+        is_anchor=message_manager.is_anchor,
+    )
+    message_manager.install_delete_scheduler(scheduler)
+    try:
+        await scheduler.run()
+    finally:
+        message_manager.install_delete_scheduler(None)
+        try:
+            await scheduler.flush_pending()
+        except Exception:
+            pass
+        await redis_client.aclose()
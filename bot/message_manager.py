@@ -23,12 +23,24 @@ class DeleteDelay(Enum):
 # نگهداری message_id که کیبورد به آن لنگر زده
 _anchor_messages: dict[int, int] = {}  # chat_id -> message_id
 
+# زمان‌بند پایدار حذف (Redis)؛ تا وقتی نصب نشده از تسک درون‌حافظه‌ای استفاده می‌شود
+_delete_scheduler = None
+
+
+def install_delete_scheduler(scheduler) -> None:
+    """نصب/حذف زمان‌بند پایدار حذف پیام‌ها"""
+    global _delete_scheduler
+    _delete_scheduler = scheduler
+
 
 def set_anchor(chat_id: int, message_id: int):
     """تنظیم پیام لنگر کیبورد"""
     if isinstance(message_id, bool) or not isinstance(message_id, int) or message_id <= 0:
         return
     _anchor_messages[chat_id] = message_id
+    if _delete_scheduler is not None:
+        # The anchor map is process memory; drop the durable delete so a restart cannot remove it.
+        _delete_scheduler.cancel(chat_id, message_id)
 
 
 def get_anchor(chat_id: int) -> Optional[int]:
@@ -98,6 +110,10 @@ def schedule_delete(
         # product rule that the reply keyboard must remain recoverable without
         # requiring /start and avoids an untracked in-memory delete timer.
         return
+
+    if _delete_scheduler is not None:
+        _delete_scheduler.schedule(chat_id, message_id, delay_seconds)
+        return
     
     asyncio.create_task(_delete_message_task(bot, chat_id, message_id, delay_seconds))
 
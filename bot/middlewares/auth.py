@@ -1,5 +1,5 @@
 # bot/middlewares/auth.py (نسخه نهایی و اصلاح شده)
-from typing import Callable, Dict, Any, Awaitable
+from typing import Callable, Dict, Any, Awaitable, Optional
 from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject, Message, CallbackQuery, Update
 from sqlalchemy import select
@@ -25,6 +25,7 @@ from core.services.telegram_username_observation_service import (
     refresh_observed_telegram_username,
 )
 from models.user import User
+from bot.access_cache import BotAccessCache
 from bot.telegram_callback_answer import answer_callback_query_via_runtime
 from bot.telegram_interaction_message import answer_incoming_message_via_runtime
 
@@ -45,8 +46,41 @@ class AuthMiddleware(BaseMiddleware):
     """
     این میدل‌ور، session دیتابیس را به handler ها تزریق کرده و کاربر را احراز هویت می‌کند.
     """
-    def __init__(self, session_pool: async_sessionmaker[AsyncSession]):
+    def __init__(
+        self,
+        session_pool: async_sessionmaker[AsyncSession],
+        access_cache: Optional[BotAccessCache] = None,
+    ):
         self.session_pool = session_pool
+        # Optional per-telegram_id verdict cache; see bot/access_cache.py.
+        self.access_cache = access_cache
+
+    async def _access_checks(self, session: AsyncSession, user: User, telegram_id: int):
+        """Return (activation_block, access_decision); access is None when blocked."""
+        cache = self.access_cache
+        generation = None
+        if cache is not None and cache.enabled:
+            cached = cache.get(telegram_id, user)
+            if cached is not None:
+                return cached.activation_block, cached.access_decision
+            generation = cache.generation
+
+        activation_block = await registration_activation_block_for_user(
+            session,
+            user=user,
+        )
+        access_decision = None
+        if activation_block is None:
+            access_decision = await evaluate_bot_access(session, user)
+        if cache is not None:
+            cache.put(
+                telegram_id,
+                user,
+                activation_block=activation_block,
+                access_decision=access_decision,
+                generation=generation,
+            )
+        return activation_block, access_decision
 
     async def __call__(
         self,
@@ -79,9 +113,10 @@ class AuthMiddleware(BaseMiddleware):
             data["user"] = user
 
             if user and direct_registration_runtime_ready(settings):
-                activation_block = await registration_activation_block_for_user(
+                activation_block, access_decision = await self._access_checks(
                     session,
-                    user=user,
+                    user,
+                    user_telegram_obj.id,
                 )
                 if activation_block is not None:
                     pending_message = (
@@ -101,7 +136,6 @@ class AuthMiddleware(BaseMiddleware):
                             show_alert=True,
                         )
                     return
-                access_decision = await evaluate_bot_access(session, user)
                 if not access_decision.allowed:
                     denial_message = bot_access_denial_message(access_decision.reason)
                     if isinstance(inner_event, Message):
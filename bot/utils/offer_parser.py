@@ -11,6 +11,12 @@ from core.db import AsyncSessionLocal
 from core.services.trade_service import normalize_offer_price_input, validate_price
 from core.trading_settings import get_trading_settings
 from core.pack_commodities import PACK_OFFER_SHAPE_ERROR, PACK_QUANTITY
+from core.commodity_matcher import (
+    UNKNOWN_COMMODITY_NAME,
+    CommodityMatcher,
+    commodity_matcher_for_catalog,
+    normalize_commodity_phrase,
+)
 
 
 @dataclass
@@ -53,8 +59,6 @@ class _PriceToken:
 # جدول تبدیل اعداد فارسی/عربی به انگلیسی
 PERSIAN_DIGITS = '۰۱۲۳۴۵۶۷۸۹'
 ARABIC_DIGITS = '٠١٢٣٤٥٦٧٨٩'
-COMMODITY_BOUNDARY_CHARS = r'\u0600-\u06FF\u200C0-9'
-BAHAR_QUALIFIERS = {"ربع", "نیم"}
 INVALID_OFFER_CONTEXT_MESSAGE = (
     "❌ نوع معامله و تسویه نامعتبر است. از «خ»، «ف»، «خ ف»، «ف ف» "
     "یا معادل کامل آن‌ها به‌صورت یک بلوک استفاده کنید"
@@ -112,48 +116,13 @@ def validate_characters(text: str) -> Tuple[bool, Optional[str]]:
     return True, None
 
 
-def _normalize_commodity_phrase(text: str) -> str:
-    """Normalize commodity text for exact phrase matching."""
-    return ' '.join(text.replace('\u200c', ' ').split())
-
-
-def _commodity_phrase_pattern(name: str) -> re.Pattern:
-    normalized = _normalize_commodity_phrase(name)
-    escaped_parts = [re.escape(part) for part in normalized.split()]
-    phrase = r'\s+'.join(escaped_parts)
-    return re.compile(rf'(?<![{COMMODITY_BOUNDARY_CHARS}]){phrase}(?![{COMMODITY_BOUNDARY_CHARS}])')
-
-
-def _has_bahar_qualifier_conflict(text: str, match: re.Match, candidate_name: str) -> bool:
-    candidate = _normalize_commodity_phrase(candidate_name)
-    if candidate != "بهار":
-        return False
-
-    before = text[:match.start()].strip()
-    if not before:
-        return False
-
-    previous_word = before.split()[-1]
-    return previous_word in BAHAR_QUALIFIERS
+_normalize_commodity_phrase = normalize_commodity_phrase
 
 
 def _match_commodity_name(text: str, name_to_commodity: dict) -> Tuple[Optional[int], str]:
     """Match the longest explicit commodity name/alias as a standalone phrase."""
-    normalized_text = _normalize_commodity_phrase(text)
-    names = sorted(
-        (name for name in name_to_commodity.keys() if _normalize_commodity_phrase(name)),
-        key=lambda item: len(_normalize_commodity_phrase(item)),
-        reverse=True,
-    )
-
-    for name in names:
-        pattern = _commodity_phrase_pattern(name)
-        for match in pattern.finditer(normalized_text):
-            if _has_bahar_qualifier_conflict(normalized_text, match, name):
-                continue
-            return name_to_commodity[name]
-
-    return None, "نامشخص"
+    matched = CommodityMatcher(name_to_commodity).match(text)
+    return matched if matched is not None else (None, UNKNOWN_COMMODITY_NAME)
 
 
 def _extract_residual_commodity_text(text: str) -> str:
@@ -487,23 +456,9 @@ async def find_commodity(
     پیدا کردن کالا از متن
     Returns: (commodity_id, commodity_name)
     """
-    from bot.utils.redis_helpers import get_cached_commodities, set_cached_commodities
-    
-    # تلاش برای خواندن از cache
-    cached = await get_cached_commodities()
-    
-    if cached:
-        # استفاده از cache
-        name_to_commodity = {item["name"]: (item["id"], item["name"]) for item in cached}
-        for item in cached:
-            for alias in item.get("aliases", []):
-                # alias ممکن است string یا dict باشد (بسته به منبع cache)
-                alias_str = alias["alias"] if isinstance(alias, dict) else alias
-                name_to_commodity[alias_str] = (item["id"], item["name"])
-        
-        commodities_list = cached
-    else:
-        # خواندن از دیتابیس و cache کردن
+    from core.cache import get_or_load_commodities
+
+    async def load_commodities() -> list[dict]:
         async with AsyncSessionLocal() as session:
             result = await session.execute(select(Commodity))
             commodities = result.scalars().all()
@@ -511,27 +466,23 @@ async def find_commodity(
             result = await session.execute(select(CommodityAlias))
             aliases = result.scalars().all()
             
-            # ساخت لیست برای cache
-            commodities_list = []
-            for c in commodities:
-                item = {"id": c.id, "name": c.name, "aliases": []}
-                for a in aliases:
-                    if a.commodity_id == c.id:
-                        item["aliases"].append({"id": a.id, "alias": a.alias, "commodity_id": a.commodity_id})
-                commodities_list.append(item)
-            
-            # ذخیره در cache (5 دقیقه)
-            await set_cached_commodities(commodities_list, ttl=300)
-            
-            # ساخت دیکشنری
-            name_to_commodity = {item["name"]: (item["id"], item["name"]) for item in commodities_list}
-            for item in commodities_list:
-                for alias in item.get("aliases", []):
-                    alias_str = alias["alias"] if isinstance(alias, dict) else alias
-                    name_to_commodity[alias_str] = (item["id"], item["name"])
+        # ساخت لیست برای cache
+        commodities_list = []
+        for c in commodities:
+            item = {"id": c.id, "name": c.name, "aliases": []}
+            for a in aliases:
+                if a.commodity_id == c.id:
+                    item["aliases"].append({"id": a.id, "alias": a.alias, "commodity_id": a.commodity_id})
+            commodities_list.append(item)
+        return commodities_list
+
+    # خواندن از cache مشترک با API؛ در نبود آن فقط یک بارگذاری همزمان انجام می‌شود
+    commodities_list = await get_or_load_commodities(load_commodities)
     
     # جستجو در متن (اولویت با نام/نام مستعار بلندتر و فقط به صورت عبارت مستقل)
-    commodity_id, commodity_name = _match_commodity_name(text, name_to_commodity)
+    # The matcher is compiled once per catalog version, not per message.
+    matched = commodity_matcher_for_catalog(commodities_list).match(text)
+    commodity_id, commodity_name = matched if matched is not None else (None, UNKNOWN_COMMODITY_NAME)
     if commodity_id is not None:
         if include_resolution:
             return commodity_id, commodity_name, "EXPLICIT"
@@ -197,6 +197,16 @@ async def check_double_click(user_id: int, offer_id: int, amount: int, timeout:
 # COMMODITY CACHE
 # ============================================
 
+async def _broadcast_commodity_cache_invalidation(key: str) -> None:
+    """اعلام تغییر به کش L1 همه پردازه‌ها (core.cache)"""
+    try:
+        from core.cache import broadcast_cache_invalidation
+
+        await broadcast_cache_invalidation(keys=[key])
+    except Exception as e:
+        logger.debug(f"Failed to broadcast commodity cache invalidation: {e}")
+
+
 async def get_cached_commodities() -> Optional[List[dict]]:
     """
     دریافت لیست کالاها از cache
@@ -244,6 +254,7 @@ async def set_cached_commodities(commodities: List[dict], ttl: int = 300):
         try:
             await redis_client.setex(key, ttl, json.dumps(commodities, ensure_ascii=False))
             await redis_client.aclose()
+            await _broadcast_commodity_cache_invalidation(key)
             return
             
         except Exception as e:
@@ -271,6 +282,12 @@ async def invalidate_commodity_cache():
             logger.debug(f"Failed to invalidate commodity cache: {e}")
 
     _memory_fallback["cache"].pop(key, None)
+    await _broadcast_commodity_cache_invalidation(key)
+    # The in-process offer matcher also rechecks the catalog version, which
+    # covers invalidations made by other processes.
+    from core.commodity_matcher import invalidate_commodity_matcher
+
+    invalidate_commodity_matcher()
 
 
 async def mark_deleted_telegram_user(telegram_id: int):
@@ -4,13 +4,28 @@ Redis Cache Service - لایه کش مرکزی
 
 این ماژول توابع کمکی برای کش کردن داده‌ها در Redis ارائه می‌دهد.
 همه توابع دارای fallback هستند و در صورت خرابی Redis، خطا نمی‌دهند.
+
+برای خانواده‌های کلید پرخواندنی (کالاها، پیام بازار ادمین، میانگین قیمت) یک
+کش L1 درون‌پردازه‌ای جلوی Redis قرار دارد که مقدار decode‌شده را نگه می‌دارد.
+هر نوشتن یا حذف از طریق این ماژول روی کانال ``events:cache:invalidated``
+اعلام می‌شود تا همه workerهای API و پردازه ربات نسخه محلی را دور بریزند.
+L1 فقط وقتی استفاده می‌شود که listener همین کانال وصل باشد.
 """
 
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
 import json
 import logging
-from typing import Any, Optional, TypeVar, Callable
+import time
+import uuid
+from typing import Any, Awaitable, Iterable, Optional, TypeVar, Callable
 from datetime import datetime
 
+from core.config import settings
+from core.metrics import record_cache_refresh, record_cache_request, record_local_cache
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
@@ -40,6 +55,11 @@ class CacheKeys:
     def price_average(commodity_id: int, offer_type: str, quantity_range: str) -> str:
         return f"price_avg:{commodity_id}:{offer_type}:{quantity_range}"
 
+    # Single-flight reload lock: lock:{key}
+    @staticmethod
+    def reload_lock(key: str) -> str:
+        return f"lock:{key}"
+
 
 # ===== TTL Constants (seconds) =====
 class CacheTTL:
@@ -50,6 +70,222 @@ class CacheTTL:
     PRICE_AVG = 60       # 1 minute
     ADMIN_MARKET_CURRENT = 5  # 5 seconds, invalidated/overwritten on writes
 
+    # Stale-while-revalidate windows served after the TTL above (soft expiry)
+    COMMODITIES_STALE = 60
+    PRICE_AVG_STALE = 30
+    RELOAD_LOCK = 5.0     # max seconds one loader holds the Redis reload lock
+
+
+# ===== Process-Local L1 =====
+
+LOCAL_CACHE_INVALIDATED_CHANNEL = "events:cache:invalidated"
+
+# Identifies this process's own broadcasts, which are already applied locally.
+_PROCESS_ORIGIN = uuid.uuid4().hex
+
+
+@dataclass(slots=True)
+class LocalCacheEntry:
+    value: Any
+    size: int
+    expires_at: float
+    redis_deadline: Optional[float]
+
+
+class LocalCache:
+    """
+    LRU درون‌پردازه‌ای مقادیر decode‌شده با بودجه بایت برای هر خانواده کلید
+
+    اندازه هر ورودی طول JSON خوانده‌شده از Redis است. مقدارها بین فراخوان‌ها
+    مشترک‌اند و نباید تغییر داده شوند.
+    """
+
+    def __init__(
+        self,
+        *,
+        budgets: dict[str, int],
+        max_age_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.budgets = {family: max(0, int(budget)) for family, budget in budgets.items()}
+        self.max_age_seconds = max(0.0, float(max_age_seconds))
+        self._clock = clock
+        self._entries: dict[str, OrderedDict[str, LocalCacheEntry]] = {}
+        self._sizes: dict[str, int] = {}
+        # Bumped on every invalidation, so a value read across one is not stored.
+        self.generation = 0
+        # True only while the invalidation listener is subscribed.
+        self.active = False
+
+    def enabled_for(self, family: str) -> bool:
+        return self.active and self.max_age_seconds > 0 and self.budgets.get(family, 0) > 0
+
+    def size_of(self, family: str) -> int:
+        return self._sizes.get(family, 0)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def get(self, key: str, family: str) -> Optional[tuple[Any, Optional[float]]]:
+        """(مقدار، ثانیه‌های باقی‌مانده تا انقضای Redis) یا None"""
+        entries = self._entries.get(family)
+        entry = entries.get(key) if entries else None
+        now = self._clock()
+        if entry is None or entry.expires_at <= now:
+            if entry is not None:
+                self._drop(family, key)
+            record_local_cache(family, "miss")
+            return None
+        entries.move_to_end(key)
+        record_local_cache(family, "hit")
+        remaining = None if entry.redis_deadline is None else entry.redis_deadline - now
+        return entry.value, remaining
+
+    def put(
+        self,
+        key: str,
+        family: str,
+        value: Any,
+        *,
+        size: int,
+        remaining: Optional[float],
+        generation: Optional[int] = None,
+    ) -> None:
+        budget = self.budgets.get(family, 0)
+        if not self.enabled_for(family) or size > budget:
+            return
+        if generation is not None and generation != self.generation:
+            return
+        now = self._clock()
+        max_age = self.max_age_seconds if remaining is None else min(self.max_age_seconds, remaining)
+        if max_age <= 0:
+            return
+        self._drop(family, key)
+        entries = self._entries.setdefault(family, OrderedDict())
+        entries[key] = LocalCacheEntry(
+            value=value,
+            size=size,
+            expires_at=now + max_age,
+            redis_deadline=None if remaining is None else now + remaining,
+        )
+        self._sizes[family] = self._sizes.get(family, 0) + size
+        while self._sizes[family] > budget:
+            evicted_key = next(iter(entries))
+            self._drop(family, evicted_key)
+            record_local_cache(family, "evicted")
+
+    def invalidate(self, *, keys: Iterable[str] = (), patterns: Iterable[str] = ()) -> int:
+        self.generation += 1
+        key_set = set(keys)
+        pattern_list = list(patterns)
+        dropped = 0
+        for family, entries in list(self._entries.items()):
+            doomed = [
+                key
+                for key in entries
+                if key in key_set or any(fnmatchcase(key, pattern) for pattern in pattern_list)
+            ]
+            for key in doomed:
+                self._drop(family, key)
+            if doomed:
+                record_local_cache(family, "invalidated")
+            dropped += len(doomed)
+        return dropped
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+        self._sizes.clear()
+
+    def _drop(self, family: str, key: str) -> None:
+        entries = self._entries.get(family)
+        entry = entries.pop(key, None) if entries else None
+        if entry is not None:
+            self._sizes[family] -= entry.size
+
+
+local_cache = LocalCache(
+    budgets={
+        "commodities": getattr(settings, "cache_local_commodities_max_bytes", 2_097_152),
+        "admin_messages": getattr(settings, "cache_local_admin_messages_max_bytes", 65_536),
+        "price_avg": getattr(settings, "cache_local_price_avg_max_bytes", 262_144),
+    },
+    max_age_seconds=getattr(settings, "cache_local_max_age_seconds", 30.0),
+)
+
+
+def _key_family(key: str) -> str:
+    """خانواده کلید برای L1 و متریک‌ها (مثل commodities یا price_avg)"""
+    parts = key.split(":")
+    if parts[0] == "cache" and len(parts) > 1:
+        return parts[1]
+    return parts[0]
+
+
+def _has_local_budget(keys: Iterable[str] = (), patterns: Iterable[str] = ()) -> bool:
+    return any(local_cache.budgets.get(_key_family(item), 0) > 0 for item in (*keys, *patterns))
+
+
+async def broadcast_cache_invalidation(*, keys: Iterable[str] = (), patterns: Iterable[str] = ()) -> None:
+    """
+    حذف نسخه L1 کلیدها در این پردازه و اعلام آن به بقیه پردازه‌ها
+
+    فقط برای کلیدهایی که خانواده‌شان بودجه L1 دارد پیام منتشر می‌شود.
+    """
+    keys, patterns = list(keys), list(patterns)
+    if not _has_local_budget(keys, patterns):
+        return
+    local_cache.invalidate(keys=keys, patterns=patterns)
+    redis = await _get_redis()
+    if not redis:
+        return
+
+    try:
+        await redis.publish(
+            LOCAL_CACHE_INVALIDATED_CHANNEL,
+            json.dumps({"origin": _PROCESS_ORIGIN, "keys": keys, "patterns": patterns}),
+        )
+    except Exception as e:
+        logger.debug(f"Cache invalidation publish error for {keys or patterns}: {e}")
+
+
+def apply_cache_invalidation(cache: LocalCache, raw_payload: Any) -> int:
+    data = raw_payload.decode("utf-8") if isinstance(raw_payload, bytes) else str(raw_payload)
+    try:
+        payload = json.loads(data)
+    except (TypeError, ValueError):
+        return 0
+    if not isinstance(payload, dict) or payload.get("origin") == _PROCESS_ORIGIN:
+        return 0
+    return cache.invalidate(keys=payload.get("keys") or (), patterns=payload.get("patterns") or ())
+
+
+async def listen_cache_invalidations(cache: LocalCache = local_cache, *, retry_seconds: float = 1.0) -> None:
+    """
+    وظیفه پس‌زمینه هر پردازه: اعمال اعلام‌های حذف L1
+
+    تا وقتی اشتراک برقرار نیست L1 غیرفعال و خالی است، پس اعلامی از دست نمی‌رود.
+    """
+    from core.redis import RedisSubscription, listen_redis_subscription
+
+    def activate() -> None:
+        cache.active = True
+
+    def reset() -> None:
+        cache.active = False
+        cache.clear()
+
+    await listen_redis_subscription(
+        RedisSubscription(
+            name="local_cache",
+            channels=(LOCAL_CACHE_INVALIDATED_CHANNEL,),
+            on_message=lambda data: apply_cache_invalidation(cache, data),
+            on_subscribed=activate,
+            on_reset=reset,
+        ),
+        retry_seconds=retry_seconds,
+    )
+
 
 # ===== Helper Functions =====
 
@@ -70,6 +306,10 @@ async def cache_get(key: str) -> Optional[Any]:
     Returns:
         مقدار کش شده یا None
     """
+    if local_cache.enabled_for(_key_family(key)):
+        found, value, _ = await _cache_get_with_ttl(key)
+        return value if found else None
+
     redis = await _get_redis()
     if not redis:
         return None
@@ -102,6 +342,7 @@ async def cache_set(key: str, value: Any, ttl: int = 60) -> bool:
     
     try:
         await redis.setex(key, ttl, json.dumps(value, ensure_ascii=False, default=str))
+        await broadcast_cache_invalidation(keys=[key])
         return True
     except Exception as e:
         logger.debug(f"Cache set error for {key}: {e}")
@@ -121,6 +362,7 @@ async def cache_delete(key: str) -> bool:
     
     try:
         await redis.delete(key)
+        await broadcast_cache_invalidation(keys=[key])
         return True
     except Exception as e:
         logger.debug(f"Cache delete error for {key}: {e}")
@@ -170,6 +412,37 @@ async def cache_decr(key: str, min_value: int = 0) -> Optional[int]:
         return None
 
 
+async def cache_decr_many(amounts: dict[str, int], min_value: int = 0) -> dict[str, int]:
+    """
+    کاهش چند کلید عدد صحیح در یک رفت‌وبرگشت Redis (حداقل min_value)
+
+    Returns:
+        مقدار جدید هر کلید، یا دیکشنری خالی در صورت خطا
+    """
+    if not amounts:
+        return {}
+    redis = await _get_redis()
+    if not redis:
+        return {}
+
+    try:
+        pipe = redis.pipeline(transaction=False)
+        for key, amount in amounts.items():
+            pipe.decrby(key, int(amount))
+        values = dict(zip(amounts, await pipe.execute()))
+        below_floor = [key for key, value in values.items() if value < min_value]
+        if below_floor:
+            pipe = redis.pipeline(transaction=False)
+            for key in below_floor:
+                pipe.set(key, min_value)
+                values[key] = min_value
+            await pipe.execute()
+        return values
+    except Exception as e:
+        logger.debug(f"Cache decr error for {len(amounts)} keys: {e}")
+        return {}
+
+
 async def cache_delete_pattern(pattern: str) -> int:
     """
     حذف کلیدهای مطابق الگو
@@ -191,13 +464,256 @@ async def cache_delete_pattern(pattern: str) -> int:
         
         if keys:
             await redis.delete(*keys)
-            return len(keys)
-        return 0
+        # Only after Redis no longer holds the old values, so another worker
+        # cannot refill its L1 from them once the broadcast lands.
+        await broadcast_cache_invalidation(patterns=[pattern])
+        return len(keys)
     except Exception as e:
         logger.debug(f"Cache delete pattern error for {pattern}: {e}")
         return 0
 
 
+# ===== Single-Flight Loading =====
+
+# One in-flight load per key in this process; concurrent callers await it.
+_inflight: dict[str, asyncio.Future] = {}
+# Strong references to background stale refreshes.
+_refresh_tasks: set[asyncio.Task] = set()
+
+_RELOAD_LOCK_POLL_SECONDS = 0.05
+_RELEASE_LOCK_SCRIPT = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then "
+    "return redis.call('del', KEYS[1]) end return 0"
+)
+
+
+async def _cache_get_with_ttl(key: str) -> tuple[bool, Any, Optional[float]]:
+    """
+    خواندن مقدار و زمان باقی‌مانده تا انقضای سخت در یک رفت‌وبرگشت
+
+    Returns:
+        (پیدا شد، مقدار، ثانیه‌های باقی‌مانده یا None برای کلید بدون انقضا)
+    """
+    family = _key_family(key)
+    use_local = local_cache.enabled_for(family)
+    if use_local:
+        local_hit = local_cache.get(key, family)
+        if local_hit is not None:
+            return True, *local_hit
+        generation = local_cache.generation
+
+    redis = await _get_redis()
+    if not redis:
+        return False, None, None
+
+    try:
+        pipe = redis.pipeline(transaction=False)
+        pipe.get(key)
+        pipe.pttl(key)
+        data, pttl = await pipe.execute()
+        if data is None:
+            return False, None, None
+        remaining = pttl / 1000 if pttl is not None and pttl >= 0 else None
+        value = json.loads(data)
+        if use_local:
+            local_cache.put(key, family, value, size=len(data), remaining=remaining, generation=generation)
+        return True, value, remaining
+    except Exception as e:
+        logger.debug(f"Cache get error for {key}: {e}")
+        return False, None, None
+
+
+async def _acquire_reload_lock(key: str, timeout: float) -> tuple[bool, Optional[str]]:
+    """
+    گرفتن قفل بارگذاری مشترک بین پردازه‌ها
+
+    بدون Redis قفل «گرفته شده» فرض می‌شود تا بارگذاری متوقف نشود.
+    """
+    redis = await _get_redis()
+    if not redis:
+        return True, None
+
+    token = uuid.uuid4().hex
+    try:
+        acquired = await redis.set(
+            CacheKeys.reload_lock(key), token, nx=True, px=max(1, int(timeout * 1000))
+        )
+    except Exception as e:
+        logger.debug(f"Cache lock error for {key}: {e}")
+        return True, None
+    return (True, token) if acquired else (False, None)
+
+
+async def _release_reload_lock(key: str, token: Optional[str]) -> None:
+    """آزاد کردن قفل فقط اگر هنوز متعلق به همین بارگذار باشد"""
+    if token is None:
+        return
+    redis = await _get_redis()
+    if not redis:
+        return
+
+    try:
+        await redis.eval(_RELEASE_LOCK_SCRIPT, 1, CacheKeys.reload_lock(key), token)
+    except Exception as e:
+        logger.debug(f"Cache unlock error for {key}: {e}")
+
+
+async def _wait_for_peer_load(key: str, timeout: float) -> tuple[bool, Any]:
+    """انتظار برای مقداری که پردازه دارنده قفل می‌نویسد"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        await asyncio.sleep(_RELOAD_LOCK_POLL_SECONDS)
+        found, value, _ = await _cache_get_with_ttl(key)
+        if found:
+            return True, value
+    return False, None
+
+
+async def _load_into_cache(
+    key: str,
+    loader: Callable[[], Awaitable[T]],
+    *,
+    hard_ttl: int,
+    family: str,
+    lock: bool,
+    lock_timeout: float,
+) -> T:
+    """بارگذاری از منبع اصلی در پاسخ به miss و نوشتن در کش"""
+    token = None
+    if lock:
+        acquired, token = await _acquire_reload_lock(key, lock_timeout)
+        if not acquired:
+            found, value = await _wait_for_peer_load(key, lock_timeout)
+            if found:
+                record_cache_refresh(family, "peer")
+                return value
+            # دارنده قفل در زمان مقرر ننوشت؛ خودمان بارگذاری می‌کنیم
+
+    try:
+        try:
+            value = await loader()
+        except Exception:
+            record_cache_refresh(family, "error")
+            raise
+        if value is not None:
+            await cache_set(key, value, hard_ttl)
+        record_cache_refresh(family, "loaded")
+        return value
+    finally:
+        await _release_reload_lock(key, token)
+
+
+async def _refresh_stale(
+    key: str,
+    loader: Callable[[], Awaitable[T]],
+    stale_value: T,
+    *,
+    hard_ttl: int,
+    family: str,
+    lock: bool,
+    lock_timeout: float,
+) -> T:
+    """تازه‌سازی پس‌زمینه مقدار کهنه؛ در صورت خطا مقدار کهنه باقی می‌ماند"""
+    token = None
+    if lock:
+        acquired, token = await _acquire_reload_lock(key, lock_timeout)
+        if not acquired:
+            record_cache_refresh(family, "peer")
+            return stale_value
+
+    try:
+        value = await loader()
+        if value is not None:
+            await cache_set(key, value, hard_ttl)
+        record_cache_refresh(family, "refreshed")
+        return value
+    except Exception as e:
+        logger.warning(f"Cache refresh failed for {key}: {e}")
+        record_cache_refresh(family, "error")
+        return stale_value
+    finally:
+        await _release_reload_lock(key, token)
+
+
+def _begin_flight(key: str) -> asyncio.Future:
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    return future
+
+
+async def _run_flight(key: str, future: asyncio.Future, load: Callable[[], Awaitable[T]]) -> T:
+    try:
+        value = await load()
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as exc:
+        future.set_exception(exc)
+        future.exception()  # the leader re-raises; waiters are optional
+        raise
+    else:
+        future.set_result(value)
+        return value
+    finally:
+        if _inflight.get(key) is future:
+            del _inflight[key]
+
+
+async def cached(
+    key: str,
+    loader: Callable[[], Awaitable[T]],
+    *,
+    ttl: int,
+    stale_ttl: int = 0,
+    family: Optional[str] = None,
+    lock: bool = False,
+    lock_timeout: float = CacheTTL.RELOAD_LOCK,
+) -> T:
+    """
+    خواندن از کش با بارگذاری تک‌پرواز (single-flight)
+
+    - تا ``ttl`` ثانیه مقدار تازه است (انقضای نرم).
+    - تا ``stale_ttl`` ثانیه بعد از آن مقدار کهنه فوراً برگردانده می‌شود و
+      یک تازه‌سازی پس‌زمینه اجرا می‌شود (stale-while-revalidate). کلید با
+      ``ttl + stale_ttl`` در Redis نوشته می‌شود (انقضای سخت)، پس قالب
+      ذخیره‌شده همان JSON خام است و خواننده‌های قدیمی را نمی‌شکند.
+    - در miss فقط یک فراخوانی ``loader`` در هر پردازه اجرا می‌شود و بقیه
+      منتظر همان Future می‌مانند. با ``lock=True`` یک قفل ``SET NX`` در Redis
+      بارگذاری را بین پردازه‌ها (API و ربات) هم تک‌پرواز می‌کند.
+
+    مقدار None کش نمی‌شود. بدون Redis، ``loader`` با همان تک‌پرواز درون‌پردازه‌ای
+    اجرا می‌شود. خطای ``loader`` در miss به همه منتظرها می‌رسد.
+    """
+    family = family or _key_family(key)
+    hard_ttl = int(ttl) + max(0, int(stale_ttl))
+    options = dict(hard_ttl=hard_ttl, family=family, lock=lock, lock_timeout=lock_timeout)
+
+    found, value, remaining = await _cache_get_with_ttl(key)
+    if found:
+        if remaining is None or remaining > stale_ttl:
+            record_cache_request(family, "hit")
+            return value
+        record_cache_request(family, "stale")
+        if key not in _inflight:
+            future = _begin_flight(key)
+            task = asyncio.create_task(
+                _run_flight(key, future, lambda: _refresh_stale(key, loader, value, **options))
+            )
+            _refresh_tasks.add(task)
+            task.add_done_callback(_refresh_tasks.discard)
+        return value
+
+    existing = _inflight.get(key)
+    if existing is not None:
+        record_cache_request(family, "coalesced")
+        return await asyncio.shield(existing)
+
+    record_cache_request(family, "miss")
+    future = _begin_flight(key)
+    return await _run_flight(key, future, lambda: _load_into_cache(key, loader, **options))
+
+
 # ===== High-Level Cache Functions =====
 
 async def get_cached_user_by_telegram_id(telegram_id: int) -> Optional[dict]:
@@ -242,6 +758,16 @@ async def decr_active_offer_count(user_id: int) -> Optional[int]:
     return await cache_decr(key, min_value=0)
 
 
+async def decr_active_offer_counts(expired_by_user: dict[int, int]) -> dict[int, int]:
+    """کاهش تعداد لفظ‌های فعال چند کاربر با یک pipeline"""
+    keys = {CacheKeys.active_offer_count(user_id): user_id for user_id in expired_by_user}
+    values = await cache_decr_many(
+        {key: expired_by_user[user_id] for key, user_id in keys.items()},
+        min_value=0,
+    )
+    return {keys[key]: value for key, value in values.items()}
+
+
 async def get_price_average(commodity_id: int, offer_type: str, quantity_range: str) -> Optional[float]:
     """دریافت میانگین قیمت از کش"""
     key = CacheKeys.price_average(commodity_id, offer_type, quantity_range)
@@ -254,6 +780,23 @@ async def set_price_average(commodity_id: int, offer_type: str, quantity_range:
     return await cache_set(key, avg_price, CacheTTL.PRICE_AVG)
 
 
+async def get_or_load_price_average(
+    commodity_id: int,
+    offer_type: str,
+    quantity_range: str,
+    loader: Callable[[], Awaitable[Optional[float]]],
+) -> Optional[float]:
+    """میانگین قیمت از کش، با بارگذاری تک‌پرواز در صورت نبود"""
+    return await cached(
+        CacheKeys.price_average(commodity_id, offer_type, quantity_range),
+        loader,
+        ttl=CacheTTL.PRICE_AVG,
+        stale_ttl=CacheTTL.PRICE_AVG_STALE,
+        family="price_avg",
+        lock=True,
+    )
+
+
 async def invalidate_price_averages(commodity_id: int = None) -> int:
     """پاک کردن کش میانگین قیمت‌ها"""
     if commodity_id:
@@ -273,6 +816,18 @@ async def set_cached_commodities(commodities: list) -> bool:
     return await cache_set(CacheKeys.COMMODITIES_ALL, commodities, CacheTTL.COMMODITIES)
 
 
+async def get_or_load_commodities(loader: Callable[[], Awaitable[list]]) -> list:
+    """لیست کالاها از کش، با بارگذاری تک‌پرواز بین API و ربات در صورت نبود"""
+    return await cached(
+        CacheKeys.COMMODITIES_ALL,
+        loader,
+        ttl=CacheTTL.COMMODITIES,
+        stale_ttl=CacheTTL.COMMODITIES_STALE,
+        family="commodities",
+        lock=True,
+    )
+
+
 async def invalidate_commodities_cache() -> bool:
     """پاک کردن کش کالاها"""
     return await cache_delete(CacheKeys.COMMODITIES_ALL)
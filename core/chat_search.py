@@ -0,0 +1,56 @@
+"""Normalized chat message search.
+
+Message search matches against ``chat_search_normalize(content)``.  That is an
+IMMUTABLE SQL function created by migration ``1b2c3d4e5f6a``, and a
+``pg_trgm`` GIN index is built on it.  The function folds Arabic letter forms
+to their Persian counterparts and Persian/Arabic-Indic digits to ASCII.  It
+turns ZWNJ into a space, drops tatweel and direction marks, collapses
+whitespace and lower-cases.  ``normalize_chat_search_text`` applies the same
+folding to the user's query, so ``LIKE '%term%'`` on the expression can use
+the trigram index instead of scanning ``messages``.
+"""
+from __future__ import annotations
+
+import re
+
+import sqlalchemy as sa
+
+# Kept character-for-character in sync with the SQL function in the migration.
+# translate() deletes source characters that have no target, so the
+# ``CHAT_SEARCH_DROPPED_CHARS`` must stay at the end of the source string.
+CHAT_SEARCH_FOLDED_CHARS = "يىكۀةأإٱ\u200c۰۱۲۳۴۵۶۷۸۹٠١٢٣٤٥٦٧٨٩"
+CHAT_SEARCH_FOLDED_TARGETS = "ییکههااا 01234567890123456789"
+CHAT_SEARCH_DROPPED_CHARS = "ـ\u200d\u200e\u200f"
+
+CHAT_SEARCH_DEFAULT_LIMIT = 50
+CHAT_SEARCH_MAX_LIMIT = 100
+CHAT_SEARCH_MAX_QUERY_LENGTH = 200
+
+_TRANSLATION = str.maketrans(
+    CHAT_SEARCH_FOLDED_CHARS,
+    CHAT_SEARCH_FOLDED_TARGETS,
+    CHAT_SEARCH_DROPPED_CHARS,
+)
+_WHITESPACE = re.compile(r"\s+")
+_LIKE_SPECIAL = re.compile(r"([\\%_])")
+
+
+def normalize_chat_search_text(value: str | None) -> str:
+    """Fold a query exactly like ``chat_search_normalize`` folds stored content."""
+    folded = str(value or "").translate(_TRANSLATION)
+    return _WHITESPACE.sub(" ", folded).strip().lower()
+
+
+def clamp_chat_search_limit(limit: int | None) -> int:
+    if limit is None:
+        return CHAT_SEARCH_DEFAULT_LIMIT
+    return max(1, min(int(limit), CHAT_SEARCH_MAX_LIMIT))
+
+
+def chat_search_content_expression(content_column):
+    return sa.func.chat_search_normalize(content_column)
+
+
+def chat_search_like_pattern(normalized_query: str) -> str:
+    escaped = _LIKE_SPECIAL.sub(r"\\\1", normalized_query[:CHAT_SEARCH_MAX_QUERY_LENGTH])
+    return f"%{escaped}%"
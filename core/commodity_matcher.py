@@ -0,0 +1,136 @@
+"""Precompiled standalone-phrase matcher for commodity names and aliases.
+
+Offer parsing matches the longest catalog name or alias that appears in the
+text as a standalone phrase.  ``CommodityMatcher`` compiles the whole catalog
+into one alternation regex once.  The regex scans every start position with a
+lookahead and reports the longest phrase found there.  The matcher then keeps
+the candidate with the best rank, using the same order the per-name loop used.
+
+``commodity_matcher_for_catalog`` keeps one matcher for the current catalog
+version and rebuilds it only when the cached catalog changes or
+``invalidate_commodity_matcher`` is called from the commodity change path.
+
+The module depends only on the standard library.
+"""
+from __future__ import annotations
+
+import re
+import threading
+from typing import Any, Generic, Iterable, Mapping, TypeVar
+
+
+COMMODITY_BOUNDARY_CHARS = r'\u0600-\u06FF\u200C0-9'
+BAHAR_QUALIFIERS = {"ربع", "نیم"}
+BAHAR_PHRASE = "بهار"
+UNKNOWN_COMMODITY_NAME = "نامشخص"
+
+T = TypeVar("T")
+
+
+def normalize_commodity_phrase(text: str) -> str:
+    """Normalize commodity text for exact phrase matching."""
+    return ' '.join(text.replace('\u200c', ' ').split())
+
+
+def commodity_phrase_regex(phrase: str) -> str:
+    return r'\s+'.join(re.escape(part) for part in normalize_commodity_phrase(phrase).split())
+
+
+def has_bahar_qualifier_conflict(normalized_text: str, start: int, phrase: str) -> bool:
+    """«ربع بهار»/«نیم بهار» must not resolve to the full «بهار» coin."""
+    if normalize_commodity_phrase(phrase) != BAHAR_PHRASE:
+        return False
+    before = normalized_text[:start].strip()
+    if not before:
+        return False
+    return before.split()[-1] in BAHAR_QUALIFIERS
+
+
+class CommodityMatcher(Generic[T]):
+    """Longest standalone-phrase lookup over a fixed ``name -> value`` mapping."""
+
+    def __init__(self, name_to_value: Mapping[str, T]) -> None:
+        ordered = sorted(
+            (name for name in name_to_value if normalize_commodity_phrase(name)),
+            key=lambda name: len(normalize_commodity_phrase(name)),
+            reverse=True,
+        )
+        # Earlier rank wins; equal normalized phrases keep the first name.
+        self._targets: dict[str, tuple[int, T]] = {}
+        for rank, name in enumerate(ordered):
+            self._targets.setdefault(normalize_commodity_phrase(name), (rank, name_to_value[name]))
+        alternation = "|".join(commodity_phrase_regex(phrase) for phrase in self._targets)
+        self._pattern = (
+            re.compile(
+                rf'(?<![{COMMODITY_BOUNDARY_CHARS}])(?=({alternation})(?![{COMMODITY_BOUNDARY_CHARS}]))'
+            )
+            if alternation
+            else None
+        )
+
+    def __len__(self) -> int:
+        return len(self._targets)
+
+    def match(self, text: str) -> T | None:
+        if self._pattern is None:
+            return None
+        normalized_text = normalize_commodity_phrase(text)
+        best: tuple[int, T] | None = None
+        for match in self._pattern.finditer(normalized_text):
+            rank, value = self._targets[match.group(1)]
+            if best is not None and rank >= best[0]:
+                continue
+            if has_bahar_qualifier_conflict(normalized_text, match.start(), match.group(1)):
+                continue
+            best = (rank, value)
+            if rank == 0:
+                break
+        return None if best is None else best[1]
+
+
+def _alias_text(alias: Any) -> str:
+    # Cached aliases are plain strings or ``{"alias": ...}`` rows depending on the source.
+    return alias["alias"] if isinstance(alias, dict) else alias
+
+
+def catalog_name_map(catalog: Iterable[Mapping[str, Any]]) -> dict[str, tuple[int, str]]:
+    """``name/alias -> (commodity_id, commodity_name)`` for a cached commodity list."""
+    items = list(catalog)
+    name_to_commodity = {item["name"]: (item["id"], item["name"]) for item in items}
+    for item in items:
+        for alias in item.get("aliases", []):
+            name_to_commodity[_alias_text(alias)] = (item["id"], item["name"])
+    return name_to_commodity
+
+
+def catalog_version(catalog: Iterable[Mapping[str, Any]]) -> tuple:
+    return tuple(
+        (item["id"], item["name"], tuple(_alias_text(alias) for alias in item.get("aliases", [])))
+        for item in catalog
+    )
+
+
+_matcher_lock = threading.Lock()
+_matcher: tuple[tuple, CommodityMatcher[tuple[int, str]]] | None = None
+
+
+def commodity_matcher_for_catalog(
+    catalog: Iterable[Mapping[str, Any]],
+) -> CommodityMatcher[tuple[int, str]]:
+    """Return the matcher for ``catalog``, compiling it only when the catalog version changed."""
+    global _matcher
+    items = list(catalog)
+    version = catalog_version(items)
+    current = _matcher
+    if current is not None and current[0] == version:
+        return current[1]
+    matcher = CommodityMatcher(catalog_name_map(items))
+    with _matcher_lock:
+        _matcher = (version, matcher)
+    return matcher
+
+
+def invalidate_commodity_matcher() -> None:
+    global _matcher
+    with _matcher_lock:
+        _matcher = None
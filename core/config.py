@@ -16,6 +16,25 @@ __all__ = ["Settings", "settings"]
 class Settings(BaseSettings):
     bot_token: str | None = None
     bot_username: str | None = None
+    # Pooled Bot API HTTP clients (core.telegram_gateway). Delivery lanes raise
+    # their identity's limit to their slot count plus headroom; http2 needs h2.
+    telegram_http_max_connections: int = 8
+    telegram_http_keepalive_expiry_seconds: float = 60.0
+    telegram_http2_enabled: bool = False
+    # Per-telegram_id access verdict cache in the bot AuthMiddleware; 0 disables it.
+    bot_auth_access_cache_ttl_seconds: float = 10.0
+    bot_auth_access_cache_max_entries: int = 20000
+    # Per-session verified-principal cache in api.deps.get_current_user; 0 disables it.
+    api_principal_cache_ttl_seconds: float = 30.0
+    api_principal_cache_max_entries: int = 50000
+    # Write-behind interval for users.last_seen_at noted by authenticated API requests.
+    last_seen_flush_interval_seconds: float = 5.0
+    # Process-local L1 in front of Redis (core.cache): serialized-byte budget per key family, 0 disables it.
+    cache_local_commodities_max_bytes: int = 2_097_152
+    cache_local_admin_messages_max_bytes: int = 65_536
+    cache_local_price_avg_max_bytes: int = 262_144
+    # Upper bound on L1 entry age, in case an invalidation broadcast is lost.
+    cache_local_max_age_seconds: float = 30.0
     
     # Server Mode (iran vs foreign)
     server_mode: str = "foreign"
@@ -39,6 +58,12 @@ class Settings(BaseSettings):
     public_webapp_url: str | None = None
     sync_api_key: str | None = None
     sync_direct_push_cooldown_seconds: float = 90.0
+    # Direct relay pushes made on the API event loop are micro-batched: the
+    # first queued payload waits at most the window for up to a full batch.
+    sync_direct_push_queue_size: int = 1000
+    sync_direct_push_batch_size: int = 50
+    sync_direct_push_batch_window_ms: float = 20.0
+    sync_direct_push_max_in_flight: int = 8
     # Active offers created on the Iran WebApp must reach the foreign Telegram
     # publisher before their short market lifetime is consumed by unrelated
     # replication work.  This is a committed-outbox acceleration only: the
@@ -49,10 +74,19 @@ class Settings(BaseSettings):
     # is deliberately for just-committed market state, never historical
     # backlog replay after a deploy or outage.
     offer_priority_sync_max_change_age_seconds: float = 45.0
+    # Rows the durable sync worker claims and posts per peer request.  One
+    # keeps the historical row-by-row loop; larger values amortize the peer
+    # round-trip across many aggregates after a burst or an outage.
+    sync_worker_batch_size: int = 1
     sync_verify_tls: bool = True
     sync_ca_bundle: str | None = None
     sync_parity_status_max_age_seconds: int = 900
     sync_watermark_strict_mode: bool = False
+    # Receiver batches of at least this many items batch-resolve natural keys
+    # and write guard-free tables with multi-row upserts.
+    sync_receive_bulk_apply_enabled: bool = True
+    sync_receive_bulk_min_items: int = 50
+    sync_receive_bulk_batch_size: int = 500
     environment: str = "production"
     release_sha: str | None = None
     # Product inference stays opt-in until its local atomic Snapshot publisher
@@ -81,6 +115,7 @@ class Settings(BaseSettings):
     observability_api_key: str | None = None
     trading_bot_service: str = "app"
     trading_bot_metrics_backend: str = "memory"
+    trading_bot_metrics_flush_seconds: float = 1.0
     audit_trail_path: str | None = None
     trusted_proxy_cidrs: str = "127.0.0.1/32,::1/128"
     observability_telegram_user_hash_salt: str | None = None
@@ -115,6 +150,7 @@ class Settings(BaseSettings):
     trade_delivery_worker_recover_limit: int = 100
     offer_publication_worker_interval_seconds: float = 1.0
     offer_publication_worker_batch_limit: int = 25
+    offer_publication_worker_channel_state_plan_limit: int = 2000
     offer_publication_worker_channel_edit_spacing_seconds: float = 0.35
     offer_publication_worker_channel_send_spacing_seconds: float = 0.35
     offer_publication_worker_rate_limit_cooldown_seconds: float = 10.0
@@ -193,6 +229,9 @@ class Settings(BaseSettings):
     telegram_notification_outbox_queue_feeder_interval_seconds: float = 0.2
     telegram_trade_result_queue_feeder_interval_seconds: float = 0.2
     telegram_delivery_queue_worker_batch_limit: int = 25
+    # Jobs (distinct destinations) an execution slot leases per claim round-trip;
+    # the ones still waiting are re-leased before each dispatch.
+    telegram_delivery_queue_worker_claim_batch_size: int = 4
     telegram_delivery_queue_primary_concurrency: int = 4
     telegram_delivery_queue_primary_m0_reserved_concurrency: int = 1
     telegram_delivery_queue_channel_editor_concurrency: int = 1
@@ -243,6 +282,17 @@ class Settings(BaseSettings):
     redis_appendfsync: str = "everysec"
     redis_maxmemory: str = "0"
     redis_maxmemory_policy: str = "noeviction"
+    # Realtime WebSocket/SSE delivery.  When enabled, each API worker keeps a
+    # single Redis subscriber and fans frames out to bounded per-connection
+    # queues; a connection whose queue fills up is closed instead of stalling
+    # the others.  Disabled keeps one pub/sub connection per client.
+    realtime_shared_subscriber_enabled: bool = False
+    realtime_subscriber_queue_size: int = 256
+    # Opt-in ``batch.v1`` WebSocket protocol (needs the shared subscriber):
+    # frames are coalesced per connection every interval, and reconnecting
+    # clients resume from the last public events each worker remembers.
+    realtime_batch_interval_ms: int = 250
+    realtime_resume_history_size: int = 1024
     channel_id: int | None = None  # آیدی کانال برای ارسال پیام
     channel_invite_link: str | None = None  # لینک دعوت کانال
 
@@ -259,6 +309,15 @@ class Settings(BaseSettings):
     web_push_vapid_subject: str | None = None
     web_push_ttl_seconds: int = 3600
     web_push_timeout_seconds: float = 5.0
+    # Market-offer fan-out: concurrent sends over one pooled HTTP session.
+    web_push_fanout_concurrency: int = 16
+
+    # In-process active order book (core.order_book). Opt-in per API worker;
+    # readers fall back to SQL whenever the index is not subscribed and built.
+    order_book_index_enabled: bool = False
+    order_book_refresh_debounce_ms: int = 50
+    order_book_refresh_settle_seconds: float = 1.0
+    order_book_reconcile_interval_seconds: float = 60.0
     sync_signal_redis_timeout_seconds: float = 0.25
 
     # SMS.ir Service
@@ -381,6 +440,7 @@ class Settings(BaseSettings):
             raise ValueError("telegram_delivery_queue_lease_too_short")
         for name in (
             "telegram_delivery_queue_worker_batch_limit",
+            "telegram_delivery_queue_worker_claim_batch_size",
             "telegram_delivery_queue_worker_recover_limit",
             "telegram_delivery_queue_primary_concurrency",
             "telegram_delivery_queue_primary_m0_reserved_concurrency",
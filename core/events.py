@@ -15,7 +15,7 @@ publishing in this module is reserved for local realtime UI events.
 """
 import json
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Iterable
 from datetime import datetime
 from sqlalchemy import event, inspect as sa_inspect
 from sqlalchemy.orm import Session
@@ -241,6 +241,23 @@ def publish_event_sync(event_type: str, data: Dict[str, Any]) -> None:
         logger.error(f"❌ Error publishing event {event_type}: {e}")
 
 
+def publish_events_sync(event_type: str, payloads: Iterable[Dict[str, Any]]) -> None:
+    """Publish several events of one type in a single Redis round trip."""
+    messages = [json.dumps(data) for data in payloads]
+    if not messages:
+        return
+    try:
+        r = _get_sync_redis()
+        channel = f"events:{event_type}"
+        pipe = r.pipeline(transaction=False)
+        for payload in messages:
+            pipe.publish(channel, payload)
+        pipe.execute()
+        logger.info(f"📡 Published {len(messages)} events: {event_type}")
+    except Exception as e:
+        logger.error(f"❌ Error publishing {len(messages)} events {event_type}: {e}")
+
+
 def _isoformat_or_none(value):
     return value.isoformat() if value else None
 
@@ -1522,6 +1539,143 @@ def setup_user_block_events():
     logger.info("✅ UserBlock event listeners registered")
 
 
+BOT_ACCESS_INVALIDATED_EVENT = "bot_access:invalidated"
+_BOT_ACCESS_INVALIDATION_KEY = "bot_access_invalidation"
+
+
+def _bot_access_invalidation_targets(obj) -> tuple[set[int], set[int]]:
+    """Return (user_ids, telegram_ids) whose cached bot access verdict ``obj`` can change."""
+    from models.accountant_relation import AccountantRelation
+    from models.customer_relation import CustomerRelation
+    from models.invitation import Invitation
+    from models.telegram_registration_intent import TelegramRegistrationIntent
+
+    user_ids: set[int] = set()
+    telegram_ids: set[int] = set()
+    if isinstance(obj, CustomerRelation):
+        user_ids.add(getattr(obj, "customer_user_id", None))
+    elif isinstance(obj, AccountantRelation):
+        user_ids.add(getattr(obj, "accountant_user_id", None))
+    elif isinstance(obj, Invitation):
+        user_ids.add(getattr(obj, "registered_user_id", None))
+    elif isinstance(obj, TelegramRegistrationIntent):
+        user_ids.add(getattr(obj, "projected_user_id", None))
+        telegram_ids.add(getattr(obj, "telegram_id", None))
+    return (
+        {int(value) for value in user_ids if value is not None},
+        {int(value) for value in telegram_ids if value is not None},
+    )
+
+
+def collect_bot_access_invalidations(session: Session, flush_context) -> None:
+    """Remember which users' bot access verdicts this transaction may change."""
+    pending = session.info.setdefault(_BOT_ACCESS_INVALIDATION_KEY, (set(), set()))
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        user_ids, telegram_ids = _bot_access_invalidation_targets(obj)
+        pending[0].update(user_ids)
+        pending[1].update(telegram_ids)
+
+
+def publish_bot_access_invalidations_after_commit(session: Session) -> None:
+    # after_commit also fires for RELEASE SAVEPOINT; wait for the root commit.
+    if session.in_nested_transaction():
+        return
+    user_ids, telegram_ids = session.info.pop(_BOT_ACCESS_INVALIDATION_KEY, (set(), set()))
+    if not user_ids and not telegram_ids:
+        return
+    publish_event_sync(
+        BOT_ACCESS_INVALIDATED_EVENT,
+        {"user_ids": sorted(user_ids), "telegram_ids": sorted(telegram_ids)},
+    )
+
+
+def clear_bot_access_invalidations_after_rollback(session: Session) -> None:
+    if session.in_nested_transaction():
+        return
+    session.info.pop(_BOT_ACCESS_INVALIDATION_KEY, None)
+
+
+def setup_bot_access_invalidation_events():
+    """Publish committed relation/registration changes that affect bot access.
+
+    The bot caches its per-user access verdict briefly (see
+    ``bot.access_cache``).  User row changes are caught there by comparing the
+    row version.  This signal covers the relation and registration-intent
+    tables the verdict is also computed from.
+    """
+    event.listen(Session, "after_flush", collect_bot_access_invalidations)
+    event.listen(Session, "after_commit", publish_bot_access_invalidations_after_commit)
+    event.listen(Session, "after_rollback", clear_bot_access_invalidations_after_rollback)
+    logger.info("✅ Bot access invalidation listeners registered")
+
+
+PRINCIPAL_INVALIDATED_EVENT = "principal:invalidated"
+_PRINCIPAL_INVALIDATION_KEY = "principal_invalidation"
+
+
+def _principal_invalidation_targets(obj) -> tuple[set[str], set[int]]:
+    """Return (session_ids, user_ids) whose cached API principal ``obj`` can change."""
+    from sqlalchemy import inspect as sa_inspect
+
+    from core.principal_cache import PRINCIPAL_USER_FIELDS
+    from models.session import UserSession
+    from models.user import User
+
+    if isinstance(obj, UserSession):
+        return ({str(obj.id)} if obj.id is not None else set()), set()
+    if isinstance(obj, User) and obj.id is not None:
+        attrs = sa_inspect(obj).attrs
+        if any(attrs[field].history.has_changes() for field in PRINCIPAL_USER_FIELDS):
+            return set(), {int(obj.id)}
+    return set(), set()
+
+
+def collect_principal_invalidations(session: Session, flush_context) -> None:
+    """Remember which sessions and users' cached API principals this transaction may change."""
+    pending = session.info.setdefault(_PRINCIPAL_INVALIDATION_KEY, (set(), set()))
+    for obj in (*session.dirty, *session.deleted):
+        session_ids, user_ids = _principal_invalidation_targets(obj)
+        pending[0].update(session_ids)
+        pending[1].update(user_ids)
+
+
+def publish_principal_invalidations_after_commit(session: Session) -> None:
+    # after_commit also fires for RELEASE SAVEPOINT; wait for the root commit.
+    if session.in_nested_transaction():
+        return
+    session_ids, user_ids = session.info.pop(_PRINCIPAL_INVALIDATION_KEY, (set(), set()))
+    if not session_ids and not user_ids:
+        return
+    from core.principal_cache import principal_cache
+
+    # Drop this worker's copies now; the broadcast reaches the other workers.
+    principal_cache.invalidate(session_ids=session_ids, user_ids=user_ids)
+    publish_event_sync(
+        PRINCIPAL_INVALIDATED_EVENT,
+        {"session_ids": sorted(session_ids), "user_ids": sorted(user_ids)},
+    )
+
+
+def clear_principal_invalidations_after_rollback(session: Session) -> None:
+    if session.in_nested_transaction():
+        return
+    session.info.pop(_PRINCIPAL_INVALIDATION_KEY, None)
+
+
+def setup_principal_invalidation_events():
+    """Publish committed session and user changes that affect cached API principals.
+
+    ``api.deps.get_current_user`` caches verified sessions briefly (see
+    ``core.principal_cache``).  Any change to a ``UserSession`` row, and a
+    role, status or block change on a ``User`` row, drops the affected
+    entries in every API worker.
+    """
+    event.listen(Session, "after_flush", collect_principal_invalidations)
+    event.listen(Session, "after_commit", publish_principal_invalidations_after_commit)
+    event.listen(Session, "after_rollback", clear_principal_invalidations_after_rollback)
+    logger.info("✅ Principal invalidation listeners registered")
+
+
 def setup_telegram_link_token_events():
     """Setup event listeners for WebApp-issued Telegram account-link tokens."""
     from models.telegram_link_token import TelegramLinkToken
@@ -2037,6 +2191,8 @@ def setup_all_events():
     setup_market_schedule_override_events()
     setup_market_runtime_state_events()
     setup_user_block_events()
+    setup_bot_access_invalidation_events()
+    setup_principal_invalidation_events()
     setup_telegram_link_token_events()
     setup_notification_events()
     setup_user_notification_preference_events()
@@ -0,0 +1,138 @@
+# core/last_seen.py
+"""Write-behind buffer for ``users.last_seen_at``.
+
+``api.deps.get_current_user`` used to commit presence inside the request,
+once a minute per user, and retried on optimistic-lock races.  Requests now
+only note the time here; a per-worker task writes the buffered users every
+``last_seen_flush_interval_seconds`` in one transaction per chunk.
+
+The flush goes through the ORM so user sync events and ``sync_version``
+still behave as they did for the per-request commit.  A value is never moved
+backwards, so several workers flushing the same user is harmless.  Presence
+noted since the last flush is lost if the worker dies; that is at most one
+interval of ``last_seen_at`` for the affected users.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+import logging
+import time
+from typing import Any, Callable
+
+from sqlalchemy import select
+from sqlalchemy.orm.exc import StaleDataError
+
+from core.config import settings
+from core.metrics import record_last_seen_flush
+from core.utils import utc_now_naive
+from models.user import User
+
+logger = logging.getLogger(__name__)
+
+# A user's presence is rewritten at most this often.
+LAST_SEEN_TOUCH_SECONDS = 60
+_FLUSH_CHUNK_SIZE = 500
+_FLUSH_ATTEMPTS = 3
+
+
+class LastSeenBuffer:
+    """Latest unflushed ``last_seen_at`` per user id."""
+
+    def __init__(self, *, touch_seconds: float = LAST_SEEN_TOUCH_SECONDS) -> None:
+        self.touch_seconds = float(touch_seconds)
+        self._pending: dict[int, datetime] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def note(self, user: Any, now: datetime | None = None) -> bool:
+        """Buffer a touch when the user's stored presence is older than ``touch_seconds``."""
+        now = now or utc_now_naive()
+        last_seen_at = getattr(user, "last_seen_at", None)
+        if last_seen_at is not None and (now - last_seen_at).total_seconds() <= self.touch_seconds:
+            return False
+        user_id = int(user.id)
+        pending = self._pending.get(user_id)
+        if pending is None or pending < now:
+            self._pending[user_id] = now
+        return True
+
+    def drain(self) -> dict[int, datetime]:
+        pending, self._pending = self._pending, {}
+        return pending
+
+    def requeue(self, pending: dict[int, datetime]) -> None:
+        for user_id, seen_at in pending.items():
+            current = self._pending.get(user_id)
+            if current is None or current < seen_at:
+                self._pending[user_id] = seen_at
+
+    async def flush(self, session_factory: Callable[[], Any]) -> int:
+        """Write buffered presence; returns the number of users updated."""
+        pending = self.drain()
+        if not pending:
+            return 0
+        started = time.perf_counter()
+        user_ids = sorted(pending)
+        updated = 0
+        for start in range(0, len(user_ids), _FLUSH_CHUNK_SIZE):
+            chunk = {user_id: pending[user_id] for user_id in user_ids[start:start + _FLUSH_CHUNK_SIZE]}
+            try:
+                updated += await _flush_chunk(session_factory, chunk)
+            except Exception as e:
+                self.requeue({user_id: pending[user_id] for user_id in user_ids[start:]})
+                record_last_seen_flush(result="error", users=0, duration_ms=(time.perf_counter() - started) * 1000)
+                logger.warning(f"last_seen flush failed for {len(user_ids) - start} users: {e}")
+                return updated
+        record_last_seen_flush(result="ok", users=updated, duration_ms=(time.perf_counter() - started) * 1000)
+        return updated
+
+
+async def _flush_chunk(session_factory: Callable[[], Any], pending: dict[int, datetime]) -> int:
+    stmt = (
+        select(User)
+        .where(User.id.in_(sorted(pending)))
+        .order_by(User.id)
+        .execution_options(populate_existing=True)
+    )
+    async with session_factory() as db:
+        for attempt in range(_FLUSH_ATTEMPTS):
+            users = (await db.execute(stmt)).scalars().all()
+            touched = 0
+            for user in users:
+                seen_at = pending[user.id]
+                if user.last_seen_at is None or user.last_seen_at < seen_at:
+                    user.last_seen_at = seen_at
+                    touched += 1
+            if not touched:
+                return 0
+            try:
+                await db.commit()
+                return touched
+            except StaleDataError:
+                # A concurrent user update won; reload and reapply.
+                await db.rollback()
+                if attempt == _FLUSH_ATTEMPTS - 1:
+                    raise
+    return 0
+
+
+last_seen_buffer = LastSeenBuffer()
+
+
+async def run_last_seen_flusher(
+    buffer: LastSeenBuffer = last_seen_buffer,
+    session_factory: Callable[[], Any] | None = None,
+) -> None:
+    """API worker task: flush buffered presence every interval, and once more on shutdown."""
+    if session_factory is None:
+        from core.db import AsyncSessionLocal as session_factory
+
+    interval = max(0.1, float(getattr(settings, "last_seen_flush_interval_seconds", 5.0)))
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            await buffer.flush(session_factory)
+    finally:
+        await buffer.flush(session_factory)
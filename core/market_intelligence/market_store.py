@@ -21,11 +21,24 @@ from .market_contracts import (
     NormalizedMarketObservation,
     derive_event_key,
 )
+from .minute_aggregates import (
+    MINUTE_AGGREGATE_DIMENSIONS,
+    MinuteAggregateSpec,
+    MinuteWindowSummary,
+    summarize_minute_window,
+)
 
 
-MARKET_STORE_SCHEMA_VERSION = 3
+MARKET_STORE_SCHEMA_VERSION = 4
 # Live snapshot/rate engine only needs a short lookback; older facts stay in archive.
 MARKET_STORE_HOT_RETENTION_HOURS = 168
+# Per-minute count/sum/min/max/latest/price sketch of hot facts, kept exact by
+# triggers so window readers need not rescan every raw row.
+MARKET_OBSERVATION_MINUTE_AGGREGATES = MinuteAggregateSpec(
+    source_table="market_observations",
+    aggregate_table="market_observation_minute_aggregates",
+    dimensions=(*MINUTE_AGGREGATE_DIMENSIONS, "quality_state"),
+)
 
 _SCHEMA = """
 PRAGMA foreign_keys = ON;
@@ -159,7 +172,7 @@ SELECT
     quality_policy_version
 FROM market_observations
 WHERE source_family = 'EXTERNAL_MARKET';
-"""
+""" + MARKET_OBSERVATION_MINUTE_AGGREGATES.ddl()
 
 
 class MarketStoreError(RuntimeError):
@@ -264,6 +277,21 @@ def _upgrade_v2_to_v3(connection: sqlite3.Connection) -> None:
     connection.commit()
 
 
+def _upgrade_v3_to_v4(connection: sqlite3.Connection) -> None:
+    """Add the trigger-maintained minute aggregate and backfill it from hot facts."""
+
+    connection.executescript(MARKET_OBSERVATION_MINUTE_AGGREGATES.ddl())
+    MARKET_OBSERVATION_MINUTE_AGGREGATES.rebuild(connection)
+    connection.execute(
+        """
+        UPDATE market_store_metadata
+        SET schema_version = 4
+        WHERE singleton = 1 AND schema_version = 3
+        """
+    )
+    connection.commit()
+
+
 def archive_observations_older_than(
     connection: sqlite3.Connection,
     *,
@@ -363,6 +391,42 @@ def snapshot_input_watermark(connection: sqlite3.Connection) -> dict[str, int |
     }
 
 
+def summarize_observation_window(
+    connection: sqlite3.Connection,
+    *,
+    start_utc: str,
+    end_utc: str,
+    instrument: str,
+    market_label: str | None = None,
+    settlement_term: str | None = None,
+    trade_form: str | None = None,
+    event_type: str | None = None,
+    side: str | None = None,
+    quality_state: str | None = "ELIGIBLE",
+) -> MinuteWindowSummary | None:
+    """Summarize hot facts with ``start < event_time_utc <= end`` per minute buckets.
+
+    Identical to aggregating the raw rows; ``available_at_utc`` is not a
+    bucket dimension, so point-in-time (no leakage) readers keep raw reads.
+    """
+
+    return summarize_minute_window(
+        connection,
+        MARKET_OBSERVATION_MINUTE_AGGREGATES,
+        start_utc=start_utc,
+        end_utc=end_utc,
+        filters={
+            "instrument": instrument,
+            "market_label": market_label,
+            "settlement_term": settlement_term,
+            "trade_form": trade_form,
+            "event_type": event_type,
+            "side": side,
+            "quality_state": quality_state,
+        },
+    )
+
+
 def _utc_now() -> str:
     return (
         datetime.now(timezone.utc)
@@ -449,6 +513,13 @@ def verify_market_store_read_only(connection: sqlite3.Connection) -> None:
             int(row["schema_version"]) >= 3
             and not _table_exists(connection, "market_observations_archive")
         )
+        or (
+            int(row["schema_version"]) >= 4
+            and not _table_exists(
+                connection,
+                MARKET_OBSERVATION_MINUTE_AGGREGATES.aggregate_table,
+            )
+        )
         or not _view_exists(connection, "external_market_observations")
     ):
         raise MarketStoreError("market_store_schema_incomplete")
@@ -476,6 +547,9 @@ def initialize_market_store(connection: sqlite3.Connection) -> None:
             schema_version = 2
         if schema_version == 2:
             _upgrade_v2_to_v3(connection)
+            schema_version = 3
+        if schema_version == 3:
+            _upgrade_v3_to_v4(connection)
             schema_version = MARKET_STORE_SCHEMA_VERSION
         if schema_version != MARKET_STORE_SCHEMA_VERSION:
             raise MarketStoreMigrationRequired("market_store_schema_upgrade_required")
@@ -490,6 +564,10 @@ def initialize_market_store(connection: sqlite3.Connection) -> None:
             not _table_exists(connection, "market_observations")
             or not _table_exists(connection, "market_source_checkpoints")
             or not _table_exists(connection, "market_observations_archive")
+            or not _table_exists(
+                connection,
+                MARKET_OBSERVATION_MINUTE_AGGREGATES.aggregate_table,
+            )
             or not _view_exists(
                 connection,
                 "external_market_observations",
@@ -520,7 +598,11 @@ def upsert_observation(
     connection: sqlite3.Connection,
     observation: MarketObservation,
 ) -> int:
-    """Insert/update one fact by opaque key; callers own transaction boundaries."""
+    """Insert/update one fact by opaque key; callers own transaction boundaries.
+
+    The minute aggregate bucket(s) touched by the row are refreshed by trigger
+    inside the same transaction.
+    """
 
     normalized = observation.normalized()
     cursor = connection.execute(
@@ -0,0 +1,333 @@
+"""Incrementally maintained per-minute price aggregates over a fact table.
+
+SQLite triggers refresh only the touched (dimensions, UTC minute) bucket on
+every insert, update or delete, so an aggregate table cannot drift from its
+source rows whichever writer touched them.  Window readers combine whole
+minutes from the aggregate with raw rows for the two partial edge minutes and
+therefore return the same count/sum/min/max/latest as a full raw scan.
+
+Event times must be ``YYYY-MM-DDTHH:MM:SS...`` UTC text, which is what both
+the Market Store and the legacy collector ``price_events`` table store.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+import sqlite3
+from typing import Mapping
+
+
+MINUTE_AGGREGATE_DIMENSIONS = (
+    "instrument",
+    "market_label",
+    "settlement_term",
+    "trade_form",
+    "event_type",
+    "side",
+)
+
+
+def _minute(event_time_utc: str) -> str:
+    return event_time_utc[:16]
+
+
+@dataclass(frozen=True, slots=True)
+class MinuteAggregateSpec:
+    """Names one source table and the minute aggregate maintained beside it."""
+
+    source_table: str
+    aggregate_table: str
+    dimensions: tuple[str, ...] = MINUTE_AGGREGATE_DIMENSIONS
+
+    def _bucket(self, row: str) -> str:
+        # A range on event_time_utc (not substr()) keeps the source index usable.
+        minute = f"substr({row}.event_time_utc, 1, 16)"
+        clauses = [f"{column} = {row}.{column}" for column in self.dimensions]
+        clauses.append(f"event_time_utc >= {minute}")
+        clauses.append(f"event_time_utc < {minute} || ':60'")
+        return " AND ".join(clauses)
+
+    def _refresh_bucket(self, row: str) -> str:
+        dimensions = ", ".join(self.dimensions)
+        bucket = self._bucket(row)
+        key = " AND ".join(
+            [f"{column} = {row}.{column}" for column in self.dimensions]
+            + [f"minute_utc = substr({row}.event_time_utc, 1, 16)"]
+        )
+        return f"""
+    DELETE FROM {self.aggregate_table} WHERE {key};
+    INSERT INTO {self.aggregate_table}(
+        {dimensions}, minute_utc, sample_count, price_sum, minimum_price,
+        maximum_price, first_event_utc, latest_event_utc, latest_id,
+        latest_price, price_sketch_json
+    )
+    SELECT
+        {dimensions}, substr({row}.event_time_utc, 1, 16), COUNT(*),
+        SUM(price_num), MIN(price_num), MAX(price_num), MIN(event_time_utc),
+        MAX(event_time_utc),
+        (SELECT id FROM {self.source_table} WHERE {bucket}
+         ORDER BY event_time_utc DESC, id DESC LIMIT 1),
+        (SELECT price_num FROM {self.source_table} WHERE {bucket}
+         ORDER BY event_time_utc DESC, id DESC LIMIT 1),
+        (SELECT json_group_array(json_array(price_num, price_count))
+         FROM (
+             SELECT price_num, COUNT(*) AS price_count
+             FROM {self.source_table} WHERE {bucket}
+             GROUP BY price_num ORDER BY price_num
+         ))
+    FROM {self.source_table}
+    WHERE {bucket}
+    GROUP BY {dimensions};"""
+
+    def ddl(self) -> str:
+        """Return idempotent DDL for the aggregate table and its triggers."""
+
+        dimension_columns = "\n".join(f"    {column} TEXT NOT NULL," for column in self.dimensions)
+        dimensions = ", ".join(self.dimensions)
+        watched = ", ".join(("event_time_utc", "price_num", *self.dimensions))
+        table = self.aggregate_table
+        return f"""
+CREATE TABLE IF NOT EXISTS {table} (
+{dimension_columns}
+    minute_utc TEXT NOT NULL,
+    sample_count INTEGER NOT NULL CHECK(sample_count > 0),
+    price_sum REAL NOT NULL,
+    minimum_price REAL NOT NULL,
+    maximum_price REAL NOT NULL,
+    first_event_utc TEXT NOT NULL,
+    latest_event_utc TEXT NOT NULL,
+    latest_id INTEGER NOT NULL,
+    latest_price REAL NOT NULL,
+    price_sketch_json TEXT NOT NULL,
+    PRIMARY KEY({dimensions}, minute_utc)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS {table}_after_insert
+AFTER INSERT ON {self.source_table}
+BEGIN{self._refresh_bucket("NEW")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS {table}_after_delete
+AFTER DELETE ON {self.source_table}
+BEGIN{self._refresh_bucket("OLD")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS {table}_after_update
+AFTER UPDATE OF {watched} ON {self.source_table}
+BEGIN{self._refresh_bucket("OLD")}{self._refresh_bucket("NEW")}
+END;
+"""
+
+    def rebuild(self, connection: sqlite3.Connection) -> int:
+        """Recompute every bucket from the source rows; callers own the transaction.
+
+        Used to backfill a freshly created aggregate and as an offline
+        compactor.  Triggers keep it current afterwards.
+        """
+
+        dimensions = ", ".join(self.dimensions)
+        joined = ", ".join(("minute_utc", *self.dimensions))
+        connection.execute(f"DELETE FROM {self.aggregate_table}")
+        connection.execute(
+            f"""
+            INSERT INTO {self.aggregate_table}(
+                {dimensions}, minute_utc, sample_count, price_sum, minimum_price,
+                maximum_price, first_event_utc, latest_event_utc, latest_id,
+                latest_price, price_sketch_json
+            )
+            WITH bucketed AS (
+                SELECT substr(event_time_utc, 1, 16) AS minute_utc, {dimensions},
+                       id, price_num, event_time_utc
+                FROM {self.source_table}
+            ),
+            totals AS (
+                SELECT {joined}, COUNT(*) AS sample_count, SUM(price_num) AS price_sum,
+                       MIN(price_num) AS minimum_price, MAX(price_num) AS maximum_price,
+                       MIN(event_time_utc) AS first_event_utc,
+                       MAX(event_time_utc) AS latest_event_utc
+                FROM bucketed
+                GROUP BY {joined}
+            ),
+            latest AS (
+                SELECT {joined}, id AS latest_id, price_num AS latest_price,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY {joined}
+                           ORDER BY event_time_utc DESC, id DESC
+                       ) AS row_number
+                FROM bucketed
+            ),
+            prices AS (
+                SELECT {joined}, price_num, COUNT(*) AS price_count
+                FROM bucketed
+                GROUP BY {joined}, price_num
+                ORDER BY price_num
+            ),
+            sketches AS (
+                SELECT {joined},
+                       json_group_array(json_array(price_num, price_count)) AS sketch
+                FROM prices
+                GROUP BY {joined}
+            )
+            SELECT {dimensions}, minute_utc, sample_count, price_sum, minimum_price,
+                   maximum_price, first_event_utc, latest_event_utc, latest_id,
+                   latest_price, sketch
+            FROM totals
+            JOIN latest USING ({joined})
+            JOIN sketches USING ({joined})
+            WHERE latest.row_number = 1
+            """
+        )
+        row = connection.execute(f"SELECT COUNT(*) FROM {self.aggregate_table}").fetchone()
+        return int(row[0] or 0)
+
+
+@dataclass(frozen=True, slots=True)
+class MinuteWindowSummary:
+    """Price summary of ``start < event_time_utc <= end`` for one filter."""
+
+    sample_count: int
+    price_sum: float
+    minimum_price: float
+    maximum_price: float
+    first_event_utc: str
+    latest_event_utc: str
+    latest_id: int
+    latest_price: float
+    latest_dimensions: Mapping[str, str]
+    # (event_type, price, count); event_type is kept so callers can weight it.
+    price_counts: tuple[tuple[str, float, int], ...]
+    aggregated_minutes: int
+
+    @property
+    def average_price(self) -> float:
+        return self.price_sum / self.sample_count
+
+    def weighted_median(self, event_weights: Mapping[str, int] | None = None) -> float:
+        """Lower weighted median, matching the snapshot summary's threshold rule."""
+
+        weights = event_weights or {}
+        ordered = sorted(
+            (price, max(1, int(weights.get(event_type.upper(), 1))) * count)
+            for event_type, price, count in self.price_counts
+        )
+        threshold = (sum(weight for _, weight in ordered) + 1) / 2.0
+        cumulative = 0
+        for price, weight in ordered:
+            cumulative += weight
+            if cumulative >= threshold:
+                return price
+        return ordered[-1][0]
+
+
+def minute_aggregate_available(connection: sqlite3.Connection, spec: MinuteAggregateSpec) -> bool:
+    return connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (spec.aggregate_table,),
+    ).fetchone() is not None
+
+
+def summarize_minute_window(
+    connection: sqlite3.Connection,
+    spec: MinuteAggregateSpec,
+    *,
+    start_utc: str,
+    end_utc: str,
+    filters: Mapping[str, str | None],
+) -> MinuteWindowSummary | None:
+    """Summarize the half-open window from whole-minute buckets plus edge rows.
+
+    ``filters`` may only name aggregate dimensions; ``None`` values are
+    ignored.  Returns ``None`` when no row matches.
+    """
+
+    active = {column: value for column, value in filters.items() if value is not None}
+    unknown = set(active) - set(spec.dimensions)
+    if unknown:
+        raise ValueError(f"not an aggregate dimension: {sorted(unknown)}")
+    dimension_clauses = [f"{column} = ?" for column in active]
+    dimension_values = list(active.values())
+    start_minute = _minute(start_utc)
+    end_minute = _minute(end_utc)
+    dimensions = ", ".join(spec.dimensions)
+
+    buckets = connection.execute(
+        f"""
+        SELECT {dimensions}, sample_count, price_sum, minimum_price, maximum_price,
+               first_event_utc, latest_event_utc, latest_id, latest_price,
+               price_sketch_json
+        FROM {spec.aggregate_table}
+        WHERE {' AND '.join([*dimension_clauses, 'minute_utc > ?', 'minute_utc < ?'])}
+        """,
+        [*dimension_values, start_minute, end_minute],
+    ).fetchall()
+    # Rows inside the first/last minute are read raw: those minutes are only
+    # partly inside the window.
+    edge_rows = connection.execute(
+        f"""
+        SELECT {dimensions}, id, price_num, event_time_utc
+        FROM {spec.source_table}
+        WHERE {' AND '.join([
+            *dimension_clauses,
+            'event_time_utc > ?',
+            'event_time_utc <= ?',
+            '(event_time_utc < ? OR event_time_utc >= ?)',
+        ])}
+        """,
+        [*dimension_values, start_utc, end_utc, f"{start_minute}:60", end_minute],
+    ).fetchall()
+    if not buckets and not edge_rows:
+        return None
+
+    count = 0
+    total = 0.0
+    minimum = maximum = None
+    first = None
+    latest: tuple[str, int, float, Mapping[str, str]] | None = None
+    price_counts: dict[tuple[str, float], int] = {}
+
+    def observe_latest(event_time: str, row_id: int, price: float, row: sqlite3.Row) -> None:
+        nonlocal latest
+        if latest is None or (event_time, row_id) > (latest[0], latest[1]):
+            latest = (event_time, row_id, price, {column: row[column] for column in spec.dimensions})
+
+    for bucket in buckets:
+        count += int(bucket["sample_count"])
+        total += float(bucket["price_sum"])
+        minimum = float(bucket["minimum_price"]) if minimum is None else min(minimum, float(bucket["minimum_price"]))
+        maximum = float(bucket["maximum_price"]) if maximum is None else max(maximum, float(bucket["maximum_price"]))
+        first = str(bucket["first_event_utc"]) if first is None else min(first, str(bucket["first_event_utc"]))
+        observe_latest(
+            str(bucket["latest_event_utc"]), int(bucket["latest_id"]), float(bucket["latest_price"]), bucket
+        )
+        for price, price_count in json.loads(bucket["price_sketch_json"]):
+            key = (str(bucket["event_type"]), float(price))
+            price_counts[key] = price_counts.get(key, 0) + int(price_count)
+    for row in edge_rows:
+        price = float(row["price_num"])
+        event_time = str(row["event_time_utc"])
+        count += 1
+        total += price
+        minimum = price if minimum is None else min(minimum, price)
+        maximum = price if maximum is None else max(maximum, price)
+        first = event_time if first is None else min(first, event_time)
+        observe_latest(event_time, int(row["id"]), price, row)
+        key = (str(row["event_type"]), price)
+        price_counts[key] = price_counts.get(key, 0) + 1
+
+    return MinuteWindowSummary(
+        sample_count=count,
+        price_sum=total,
+        minimum_price=minimum,
+        maximum_price=maximum,
+        first_event_utc=first,
+        latest_event_utc=latest[0],
+        latest_id=latest[1],
+        latest_price=latest[2],
+        latest_dimensions=latest[3],
+        price_counts=tuple(
+            (event_type, price, price_count)
+            for (event_type, price), price_count in sorted(price_counts.items())
+        ),
+        aggregated_minutes=len({bucket["latest_event_utc"][:16] for bucket in buckets}),
+    )
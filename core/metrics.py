@@ -6,6 +6,7 @@ scrapable by Prometheus.
 
 from __future__ import annotations
 
+import atexit
 import re
 import json
 import math
@@ -13,6 +14,7 @@ import os
 import sqlite3
 import threading
 import time
+import weakref
 from collections import defaultdict
 from collections.abc import Iterable, Mapping
 from datetime import datetime
@@ -26,6 +28,7 @@ _HTTP_ROUTE_ID_RE = re.compile(r"/(?:\d+|[0-9a-fA-F-]{16,})(?=/|$)")
 _FILENAME_LABEL_RE = re.compile(r"(?i)\b[\w.-]+\.(?:jpg|jpeg|png|webp|gif|pdf|xlsx?|docx?|zip|mp4|mov|mp3|wav|ogg)\b")
 _HISTOGRAM_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
 _SUPPORTED_BACKENDS = {"memory", "shared_sqlite"}
+_DEFAULT_FLUSH_INTERVAL_SECONDS = 1.0
 
 
 def _coerce_metrics_backend(value: str | None) -> str:
@@ -33,6 +36,14 @@ def _coerce_metrics_backend(value: str | None) -> str:
     return candidate if candidate in _SUPPORTED_BACKENDS else "memory"
 
 
+def _coerce_flush_interval(value: str | None) -> float:
+    try:
+        interval = float(value) if value not in (None, "") else _DEFAULT_FLUSH_INTERVAL_SECONDS
+    except ValueError:
+        return _DEFAULT_FLUSH_INTERVAL_SECONDS
+    return interval if math.isfinite(interval) and interval >= 0 else _DEFAULT_FLUSH_INTERVAL_SECONDS
+
+
 def _sanitize_label_value(value: Any, *, fallback: str = "unknown", max_length: int = 96) -> str:
     raw = str(value if value is not None else fallback).strip() or fallback
     raw = _FILENAME_LABEL_RE.sub("redacted_file", redact_string(raw))
@@ -73,17 +84,49 @@ def _format_labels(labels: Iterable[tuple[str, str]]) -> str:
     return f"{{{rendered}}}"
 
 
+_registries: "weakref.WeakSet[MetricsRegistry]" = weakref.WeakSet()
+
+
+def _reset_registries_after_fork() -> None:
+    for metrics_registry in list(_registries):
+        metrics_registry._after_fork_in_child()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_registries_after_fork)
+
+
 class MetricsRegistry:
+    """Process-local registry with an optional cross-process SQLite aggregate.
+
+    Every update lands in the in-memory maps only.  With the ``shared_sqlite``
+    backend the touched series are also marked dirty, and a daemon thread
+    periodically writes their deltas since the last flush in one transaction
+    over a long-lived connection.  Request and event-loop threads therefore
+    never touch SQLite.  A scrape flushes the scraping process first, so its
+    own samples are never stale.
+    """
+
     def __init__(self) -> None:
         self._lock = threading.RLock()
         self._backend = _coerce_metrics_backend(os.getenv("TRADING_BOT_METRICS_BACKEND"))
         self._service_name = _sanitize_label_value(os.getenv("TRADING_BOT_SERVICE", "app"), max_length=32)
         self._db_path = os.getenv("TRADING_BOT_METRICS_DB", "/tmp/trading_bot_metrics.sqlite3")
+        self._flush_interval = _coerce_flush_interval(os.getenv("TRADING_BOT_METRICS_FLUSH_SECONDS"))
         self._counters: dict[str, dict[tuple[tuple[str, str], ...], float]] = defaultdict(lambda: defaultdict(float))
         self._gauges: dict[str, dict[tuple[tuple[str, str], ...], float]] = defaultdict(dict)
         self._histograms: dict[str, dict[tuple[tuple[str, str], ...], dict[str, Any]]] = defaultdict(dict)
         self._help: dict[str, str] = {}
         self._types: dict[str, str] = {}
+        # Shared backend state: series touched since the last flush and the values already written.
+        self._dirty: set[tuple[str, tuple[tuple[str, str], ...]]] = set()
+        self._flushed: dict[tuple[str, tuple[tuple[str, str], ...], str], float] = {}
+        self._flush_lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._flusher: threading.Thread | None = None
+        self._flusher_pid: int | None = None
+        self._flusher_stop = threading.Event()
+        _registries.add(self)
 
     def _shared_enabled(self) -> bool:
         return self._backend == "shared_sqlite" and bool(self._db_path)
@@ -95,7 +138,7 @@ class MetricsRegistry:
         return self._service_name
 
     def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self._db_path, timeout=1.0)
+        conn = sqlite3.connect(self._db_path, timeout=1.0, check_same_thread=False)
         conn.execute("PRAGMA journal_mode=WAL")
         conn.execute(
             """
@@ -112,54 +155,148 @@ class MetricsRegistry:
         )
         return conn
 
-    def _labels_json(self, labels: Mapping[str, Any]) -> str:
-        return json.dumps(dict(_label_key(labels)), ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    def _connection(self) -> sqlite3.Connection:
+        # Called with ``_flush_lock`` held.
+        if self._conn is None:
+            self._conn = self._connect()
+        return self._conn
 
-    def _upsert_add(self, name: str, metric_type: str, labels: Mapping[str, Any], bucket: str, amount: float, help_text: str) -> None:
-        if not self._shared_enabled():
+    def _close_connection(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None
+
+    def _labels_json(self, labels: Iterable[tuple[str, str]]) -> str:
+        return json.dumps(dict(labels), ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
+    def _mark_dirty(self, name: str, key: tuple[tuple[str, str], ...]) -> None:
+        # Called with ``_lock`` held.
+        self._dirty.add((name, key))
+        if self._flusher_pid != os.getpid():
+            self._start_flusher()
+
+    def _start_flusher(self) -> None:
+        self._flusher_pid = os.getpid()
+        if self._flush_interval <= 0:
             return
-        try:
-            with self._connect() as conn:
-                conn.execute(
-                    """
-                    INSERT INTO metrics(name, metric_type, labels, bucket, value, help)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    ON CONFLICT(name, labels, bucket) DO UPDATE SET
-                        value = value + excluded.value,
-                        metric_type = excluded.metric_type,
-                        help = excluded.help
-                    """,
-                    (name, metric_type, self._labels_json(labels), bucket, float(amount), help_text),
-                )
-        except sqlite3.Error:
-            pass
+        self._flusher_stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="metrics-flusher", daemon=True)
+        self._flusher.start()
+        atexit.register(self.flush)
+
+    def _flush_loop(self) -> None:
+        stop = self._flusher_stop
+        while not stop.wait(self._flush_interval):
+            self.flush()
+
+    def _pending_rows(self, dirty: Iterable[tuple[str, tuple[tuple[str, str], ...]]]) -> tuple[list[tuple], list[tuple]]:
+        """Return ``(add_rows, set_rows)`` for ``dirty`` series. Called with ``_lock`` held."""
+
+        adds: list[tuple] = []
+        sets: list[tuple] = []
+        for name, key in dirty:
+            metric_type = self._types.get(name)
+            help_text = self._help.get(name, name)
+            if metric_type == "gauge":
+                value = self._gauges.get(name, {}).get(key)
+                if value is not None:
+                    sets.append((name, metric_type, key, "", float(value), help_text))
+                continue
+            if metric_type == "counter":
+                samples = [("", float(self._counters.get(name, {}).get(key, 0.0)))]
+            elif metric_type == "histogram":
+                state = self._histograms.get(name, {}).get(key)
+                if state is None:
+                    continue
+                samples = [("sum", float(state["sum"])), ("count", float(state["count"])), ("+Inf", float(state["count"]))]
+                samples.extend((str(bucket), float(count)) for bucket, count in state["buckets"].items())
+            else:
+                continue
+            for bucket, total in samples:
+                delta = total - self._flushed.get((name, key, bucket), 0.0)
+                if delta:
+                    adds.append((name, metric_type, key, bucket, total, help_text, delta))
+        return adds, sets
+
+    def _after_fork_in_child(self) -> None:
+        # The parent flushes everything recorded before the fork; the child only
+        # writes what it records itself.
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._conn = None
+        self._flusher = None
+        self._flusher_pid = None
+        inherited = {(name, key) for name, series in self._counters.items() for key in series}
+        inherited.update((name, key) for name, series in self._histograms.items() for key in series)
+        adds, _sets = self._pending_rows(inherited)
+        for name, _metric_type, key, bucket, total, _help_text, _delta in adds:
+            self._flushed[(name, key, bucket)] = total
+        self._dirty.clear()
+
+    def flush(self) -> None:
+        """Write buffered shared-backend deltas of this process to SQLite."""
 
-    def _upsert_set(self, name: str, metric_type: str, labels: Mapping[str, Any], bucket: str, value: float, help_text: str) -> None:
         if not self._shared_enabled():
             return
-        try:
-            with self._connect() as conn:
-                conn.execute(
-                    """
-                    INSERT INTO metrics(name, metric_type, labels, bucket, value, help)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    ON CONFLICT(name, labels, bucket) DO UPDATE SET
-                        value = excluded.value,
-                        metric_type = excluded.metric_type,
-                        help = excluded.help
-                    """,
-                    (name, metric_type, self._labels_json(labels), bucket, float(value), help_text),
-                )
-        except sqlite3.Error:
-            pass
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                dirty, self._dirty = self._dirty, set()
+                adds, sets = self._pending_rows(dirty)
+            try:
+                conn = self._connection()
+                with conn:
+                    conn.executemany(
+                        """
+                        INSERT INTO metrics(name, metric_type, labels, bucket, value, help)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(name, labels, bucket) DO UPDATE SET
+                            value = value + excluded.value,
+                            metric_type = excluded.metric_type,
+                            help = excluded.help
+                        """,
+                        [
+                            (name, metric_type, self._labels_json(key), bucket, delta, help_text)
+                            for name, metric_type, key, bucket, _total, help_text, delta in adds
+                        ],
+                    )
+                    conn.executemany(
+                        """
+                        INSERT INTO metrics(name, metric_type, labels, bucket, value, help)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(name, labels, bucket) DO UPDATE SET
+                            value = excluded.value,
+                            metric_type = excluded.metric_type,
+                            help = excluded.help
+                        """,
+                        [
+                            (name, metric_type, self._labels_json(key), bucket, value, help_text)
+                            for name, metric_type, key, bucket, value, help_text in sets
+                        ],
+                    )
+            except sqlite3.Error:
+                self._close_connection()
+                with self._lock:
+                    self._dirty |= dirty
+                return
+            for name, _metric_type, key, bucket, total, _help_text, _delta in adds:
+                self._flushed[(name, key, bucket)] = total
 
     def reset(self) -> None:
-        with self._lock:
-            self._counters.clear()
-            self._gauges.clear()
-            self._histograms.clear()
-            self._help.clear()
-            self._types.clear()
+        with self._flush_lock:
+            with self._lock:
+                self._counters.clear()
+                self._gauges.clear()
+                self._histograms.clear()
+                self._help.clear()
+                self._types.clear()
+                self._dirty.clear()
+                self._flushed.clear()
+            self._close_connection()
         if self._shared_enabled():
             for path in (self._db_path, f"{self._db_path}-wal", f"{self._db_path}-shm"):
                 try:
@@ -168,43 +305,32 @@ class MetricsRegistry:
                     pass
 
     def counter(self, name: str, help_text: str, amount: float = 1, **labels: Any) -> None:
-        self._upsert_add(name, "counter", labels, "", amount, help_text)
+        key = _label_key(labels)
         with self._lock:
             self._help.setdefault(name, help_text)
             self._types.setdefault(name, "counter")
-            self._counters[name][_label_key(labels)] += amount
+            self._counters[name][key] += amount
+            if self._shared_enabled():
+                self._mark_dirty(name, key)
+        if self._flush_interval <= 0:
+            self.flush()
 
     def gauge(self, name: str, help_text: str, value: float, **labels: Any) -> None:
-        self._upsert_set(name, "gauge", labels, "", value, help_text)
+        key = _label_key(labels)
         with self._lock:
             self._help.setdefault(name, help_text)
             self._types.setdefault(name, "gauge")
-            self._gauges[name][_label_key(labels)] = value
+            self._gauges[name][key] = value
+            if self._shared_enabled():
+                self._mark_dirty(name, key)
+        if self._flush_interval <= 0:
+            self.flush()
 
     def observe(self, name: str, help_text: str, value: float, **labels: Any) -> None:
-        if self._shared_enabled():
-            updates = [("sum", float(value)), ("count", 1.0), ("+Inf", 1.0)]
-            updates.extend((str(bucket), 1.0) for bucket in _HISTOGRAM_BUCKETS if value <= bucket)
-            try:
-                labels_json = self._labels_json(labels)
-                with self._connect() as conn:
-                    conn.executemany(
-                        """
-                        INSERT INTO metrics(name, metric_type, labels, bucket, value, help)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                        ON CONFLICT(name, labels, bucket) DO UPDATE SET
-                            value = value + excluded.value,
-                            metric_type = excluded.metric_type,
-                            help = excluded.help
-                        """,
-                        [(name, "histogram", labels_json, bucket, amount, help_text) for bucket, amount in updates],
-                    )
-            except sqlite3.Error:
-                pass
+        key = _label_key(labels)
         with self._lock:
             self._help.setdefault(name, help_text)
             self._types.setdefault(name, "histogram")
-            key = _label_key(labels)
             state = self._histograms[name].setdefault(
                 key,
                 {"sum": 0.0, "count": 0, "buckets": {bucket: 0 for bucket in _HISTOGRAM_BUCKETS}},
@@ -214,16 +340,25 @@ class MetricsRegistry:
             for bucket in _HISTOGRAM_BUCKETS:
                 if value <= bucket:
                     state["buckets"][bucket] += 1
+            if self._shared_enabled():
+                self._mark_dirty(name, key)
+        if self._flush_interval <= 0:
+            self.flush()
 
     def _render_shared_prometheus(self) -> str | None:
-        if not self._shared_enabled() or not os.path.exists(self._db_path):
+        if not self._shared_enabled():
+            return None
+        self.flush()
+        if not os.path.exists(self._db_path):
             return None
         try:
-            with self._connect() as conn:
-                rows = conn.execute(
+            with self._flush_lock:
+                rows = self._connection().execute(
                     "SELECT name, metric_type, labels, bucket, value, help FROM metrics ORDER BY name, labels, bucket"
                 ).fetchall()
         except sqlite3.Error:
+            with self._flush_lock:
+                self._close_connection()
             return None
         if not rows:
             return None
@@ -326,6 +461,36 @@ def record_websocket_publish_failure(event_type: str) -> None:
     )
 
 
+def set_realtime_fanout_subscribers(count: int) -> None:
+    registry.gauge(
+        "trading_bot_realtime_fanout_subscribers",
+        "Realtime connections registered with this process's shared Redis subscriber.",
+        max(int(count), 0),
+    )
+
+
+def record_realtime_fanout_frame(event_type: str, recipients: int) -> None:
+    registry.counter(
+        "trading_bot_realtime_fanout_frames_total",
+        "Realtime events decoded once by the shared subscriber, by event type.",
+        event_type=_sanitize_label_value(event_type, max_length=64),
+    )
+    registry.counter(
+        "trading_bot_realtime_fanout_deliveries_total",
+        "Realtime frames queued to connections by the shared subscriber, by event type.",
+        max(int(recipients), 0),
+        event_type=_sanitize_label_value(event_type, max_length=64),
+    )
+
+
+def record_realtime_fanout_eviction(transport: str) -> None:
+    registry.counter(
+        "trading_bot_realtime_fanout_evictions_total",
+        "Realtime connections evicted because their bounded queue was full.",
+        transport=_sanitize_label_value(transport, max_length=16),
+    )
+
+
 def record_bot_update(*, event_type: str, result: str, duration_ms: float) -> None:
     labels = {"event_type": _sanitize_label_value(event_type, max_length=48), "result": normalize_result(result)}
     registry.counter("trading_bot_bot_updates_total", "Bot updates handled by event type and result.", **labels)
@@ -396,6 +561,16 @@ def record_registration_job_health(
         )
 
 
+def observe_telegram_http_phase(*, bot_identity: str, phase: str, duration_ms: float) -> None:
+    registry.observe(
+        "trading_bot_telegram_http_phase_duration_ms",
+        "Telegram Bot API request time by bot identity and phase (connect, tls, server).",
+        max(0.0, float(duration_ms)),
+        bot_identity=_sanitize_label_value(bot_identity, max_length=32),
+        phase=_sanitize_label_value(phase, max_length=16),
+    )
+
+
 def record_registration_completion(*, surface: str, outcome: str) -> None:
     registry.counter(
         "trading_bot_registration_completions_total",
@@ -497,6 +672,29 @@ def record_offer_publication_health(
         )
 
 
+def record_offer_channel_state_plan(
+    *,
+    backlog_depth: int,
+    estimated_drain_seconds: float,
+    edits_saved: int,
+) -> None:
+    registry.gauge(
+        "trading_bot_offer_channel_state_backlog_depth",
+        "Due offer channel-state edits loaded by the last reconciliation plan.",
+        max(int(backlog_depth or 0), 0),
+    )
+    registry.gauge(
+        "trading_bot_offer_channel_state_estimated_drain_seconds",
+        "Estimated seconds to drain the planned offer channel-state backlog.",
+        max(float(estimated_drain_seconds or 0.0), 0.0),
+    )
+    registry.counter(
+        "trading_bot_offer_channel_state_edits_saved_total",
+        "Offer channel-state Telegram edits skipped because the transition was redundant.",
+        amount=max(0, int(edits_saved or 0)),
+    )
+
+
 def record_overtime_lifecycle_event(*, event: str, result: str, count: int = 1) -> None:
     registry.counter(
         "trading_bot_offer_overtime_lifecycle_events_total",
@@ -548,6 +746,79 @@ def record_overtime_reconciliation_health(
     )
 
 
+def record_sync_direct_push(result: str, count: int = 1) -> None:
+    registry.counter(
+        "trading_bot_sync_direct_push_payloads_total",
+        "Direct cross-server push payloads by bounded result.",
+        amount=max(0, int(count)),
+        result=_sanitize_label_value(result, max_length=32),
+    )
+
+
+def record_web_push_fanout(
+    *,
+    sent: int,
+    failed: int,
+    disabled: int,
+    duration_ms: float,
+    throughput_per_second: float,
+    p95_latency_ms: float,
+) -> None:
+    for result, count in (("sent", sent), ("failed", failed), ("disabled", disabled)):
+        registry.counter(
+            "trading_bot_web_push_deliveries_total",
+            "Web Push deliveries made by fan-out, by bounded result.",
+            amount=max(0, int(count or 0)),
+            result=result,
+        )
+    registry.observe(
+        "trading_bot_web_push_fanout_duration_ms",
+        "Wall time of one Web Push fan-out, from first send to last reply.",
+        max(float(duration_ms or 0.0), 0.0),
+    )
+    registry.gauge(
+        "trading_bot_web_push_fanout_throughput_per_second",
+        "Deliveries per second achieved by the last Web Push fan-out.",
+        max(float(throughput_per_second or 0.0), 0.0),
+    )
+    registry.gauge(
+        "trading_bot_web_push_fanout_p95_latency_ms",
+        "p95 single-delivery latency of the last Web Push fan-out.",
+        max(float(p95_latency_ms or 0.0), 0.0),
+    )
+
+
+def set_order_book_size(*, offers: int, books: int) -> None:
+    registry.gauge(
+        "trading_bot_order_book_offers",
+        "Active offers held by this process's order book index.",
+        max(int(offers or 0), 0),
+    )
+    registry.gauge(
+        "trading_bot_order_book_books",
+        "Non-empty (commodity, offer type, settlement type) books in the index.",
+        max(int(books or 0), 0),
+    )
+
+
+def record_order_book_parity(*, missing: int, unexpected: int, mismatched: int) -> None:
+    for issue, count in (("missing", missing), ("unexpected", unexpected), ("mismatched", mismatched)):
+        registry.gauge(
+            "trading_bot_order_book_parity_drift",
+            "Offers on which the last order book parity check disagreed with the database.",
+            max(int(count or 0), 0),
+            issue=issue,
+        )
+
+
+def set_sync_direct_push_queue_depth(depth: int) -> None:
+    registry.gauge(
+        "trading_bot_sync_direct_push_queue_depth",
+        "Direct cross-server push payloads waiting in this process.",
+        max(int(depth), 0),
+    )
+
+
 def record_sync_conflict(*, server_mode: str, table: str, reason: str) -> None:
     registry.counter(
         "trading_bot_sync_conflicts_total",
@@ -558,6 +829,17 @@ def record_sync_conflict(*, server_mode: str, table: str, reason: str) -> None:
     )
 
 
+def record_sync_bulk_apply(*, server_mode: str, table: str, result: str, count: int = 1) -> None:
+    registry.counter(
+        "trading_bot_sync_bulk_apply_rows_total",
+        "Sync receive rows offered to a multi-row upsert, by table and result.",
+        amount=max(0, int(count)),
+        server_mode=_sanitize_label_value(server_mode, max_length=16),
+        table=_sanitize_label_value(table, max_length=64),
+        result=_sanitize_label_value(result, max_length=32),
+    )
+
+
 def record_sync_source_authority_rejection(*, server_mode: str, table: str, reason: str) -> None:
     registry.counter(
         "trading_bot_sync_source_authority_rejections_total",
@@ -632,6 +914,106 @@ def record_business_action(*, action: str, result: str) -> None:
     )
 
 
+def record_bot_message_deletes(result: str, count: int = 1) -> None:
+    registry.counter(
+        "trading_bot_bot_message_deletes_total",
+        "Scheduled bot message deletions by result.",
+        amount=max(0, int(count)),
+        result=_sanitize_label_value(result, max_length=32),
+    )
+
+
+def set_bot_message_delete_backlog(*, pending: int, overdue: int) -> None:
+    registry.gauge(
+        "trading_bot_bot_message_delete_pending",
+        "Bot message deletions waiting in the durable schedule.",
+        max(0, int(pending)),
+    )
+    registry.gauge(
+        "trading_bot_bot_message_delete_overdue",
+        "Scheduled bot message deletions more than a minute past due.",
+        max(0, int(overdue)),
+    )
+
+
+def record_bot_auth_access_cache(result: str) -> None:
+    registry.counter(
+        "trading_bot_bot_auth_access_cache_total",
+        "Bot AuthMiddleware access verdict cache lookups by result.",
+        result=_sanitize_label_value(result, max_length=32),
+    )
+
+
+def set_trading_settings_snapshot_age(seconds: float) -> None:
+    registry.gauge(
+        "trading_bot_trading_settings_snapshot_age_seconds",
+        "Seconds since this process last reloaded its in-process trading settings snapshot.",
+        max(float(seconds or 0.0), 0.0),
+    )
+
+
+def record_api_principal_cache(result: str) -> None:
+    registry.counter(
+        "trading_bot_api_principal_cache_total",
+        "get_current_user verified-session cache lookups by result.",
+        result=_sanitize_label_value(result, max_length=32),
+    )
+
+
+def record_last_seen_flush(*, result: str, users: int, duration_ms: float) -> None:
+    result_label = _sanitize_label_value(result, max_length=32)
+    registry.counter(
+        "trading_bot_last_seen_flushed_users_total",
+        "Users whose buffered last_seen_at was written by the write-behind flush.",
+        max(int(users or 0), 0),
+        result=result_label,
+    )
+    registry.observe(
+        "trading_bot_last_seen_flush_duration_ms",
+        "Write-behind last_seen_at flush time by result.",
+        max(float(duration_ms or 0.0), 0.0),
+        result=result_label,
+    )
+
+
+def record_cache_request(family: str, result: str) -> None:
+    registry.counter(
+        "trading_bot_cache_requests_total",
+        "core.cache cached() lookups by key family and result (hit, stale, miss, coalesced).",
+        family=_sanitize_label_value(family, max_length=32),
+        result=_sanitize_label_value(result, max_length=32),
+    )
+
+
+def record_cache_refresh(family: str, result: str) -> None:
+    registry.counter(
+        "trading_bot_cache_refreshes_total",
+        "core.cache cached() reloads by key family and result (loaded, refreshed, peer, error).",
+        family=_sanitize_label_value(family, max_length=32),
+        result=_sanitize_label_value(result, max_length=32),
+    )
+
+
+def record_local_cache(family: str, result: str) -> None:
+    registry.counter(
+        "trading_bot_cache_local_total",
+        "core.cache process-local L1 lookups and drops by key family and result.",
+        family=_sanitize_label_value(family, max_length=32),
+        result=_sanitize_label_value(result, max_length=32),
+    )
+
+
+def record_telegram_offer_edits_coalesced(count: int) -> None:
+    """Count queued Offer channel edits superseded before any dispatch."""
+    if int(count or 0) <= 0:
+        return
+    registry.counter(
+        "trading_bot_telegram_offer_edits_coalesced_total",
+        "Queued Telegram Offer channel edits superseded by a newer render.",
+        amount=int(count),
+    )
+
+
 def record_telegram_delivery_retention(report: Mapping[str, Any]) -> None:
     """Publish bounded retention health without job, route, or payload labels."""
     registry.counter(
@@ -11,6 +11,7 @@ interact with expired offers and see the right history marker.
 import asyncio
 import logging
 import time
+from collections import Counter
 from datetime import timedelta
 from types import SimpleNamespace
 
@@ -45,6 +46,8 @@ logger = logging.getLogger(__name__)
 CHECK_INTERVAL = 2.0
 MIN_DEADLINE_SLEEP_SECONDS = 0.1
 STALE_EXPIRY_RETRY_ATTEMPTS = 1
+NEXT_DEADLINE_SCAN_LIMIT = 256
+EXPIRED_CHANNEL_STATE_CONCURRENCY = 4
 _loop_errors = RepeatedErrorLogger(every=10)
 REMOTE_CHANNEL_EXPIRY_PRESENTATION_TTL_SECONDS = 60 * 60
 REMOTE_CHANNEL_EXPIRY_PRESENTATION_MAX_KEYS = 5000
@@ -230,25 +233,21 @@ async def expire_stale_offers() -> int:
         logger.info(f"⏰ Auto-expired {count} offers: {offer_ids}")
         
         # Apply terminal channel state on foreign and remove interactive buttons.
-        for offer in expiry_result.expired_offers:
-            await apply_offer_channel_state(offer, reason="auto_expire_time_limit")
+        await _apply_expired_channel_states(expiry_result.expired_offers)
         
-        # Publish realtime events for each expired offer
+        # Publish realtime events for the whole cycle in one Redis round trip
         try:
-            from core.events import publish_event_sync
-            for offer_id in offer_ids:
-                publish_event_sync("offer:expired", {"id": offer_id})
+            from core.events import publish_events_sync
+            publish_events_sync("offer:expired", [{"id": offer_id} for offer_id in offer_ids])
         except Exception as e:
             logger.warning(f"Failed to publish expire events: {e}")
         
         # Update Redis cache for affected users
         try:
-            from core.cache import decr_active_offer_count
-            user_ids = set(o.user_id for o in expiry_result.expired_offers if o.user_id)
-            for uid in user_ids:
-                user_expired_count = sum(1 for o in expiry_result.expired_offers if o.user_id == uid)
-                for _ in range(user_expired_count):
-                    await decr_active_offer_count(uid)
+            from core.cache import decr_active_offer_counts
+            expired_by_user = Counter(o.user_id for o in expiry_result.expired_offers if o.user_id)
+            if expired_by_user:
+                await decr_active_offer_counts(dict(expired_by_user))
         except Exception as e:
             logger.debug(f"Failed to update offer count cache: {e}")
 
@@ -266,6 +265,41 @@ async def expire_stale_offers() -> int:
     return count
 
 
+async def _apply_expired_channel_states(offers) -> None:
+    """Apply terminal channel state for one cycle's expired offers with bounded concurrency."""
+    if not offers:
+        return
+    semaphore = asyncio.Semaphore(EXPIRED_CHANNEL_STATE_CONCURRENCY)
+
+    async def apply(offer):
+        async with semaphore:
+            return await apply_offer_channel_state(offer, reason="auto_expire_time_limit")
+
+    results = await asyncio.gather(*(apply(offer) for offer in offers), return_exceptions=True)
+    for offer, result in zip(offers, results):
+        if isinstance(result, Exception):
+            logger.warning(
+                "Failed to apply expired channel state for offer %s: %s",
+                getattr(offer, "id", None),
+                result,
+                extra={"event": "offer_expiry.channel_state_failed", "offer_id": getattr(offer, "id", None)},
+            )
+
+
+def _final_deadline_due(cutoff):
+    """SQL filter for offers whose normal-plus-overtime lifetime ended by ``now``.
+
+    ``cutoff`` is ``now - normal_lifetime``.  The ``created_at`` bound keeps
+    the scan on the partial ACTIVE ``created_at`` index.  The overtime term,
+    at most ten minutes per the snapshot range check, then drops offers that
+    are still inside their overtime window.
+    """
+    return (
+        Offer.created_at <= cutoff,
+        Offer.created_at + Offer.overtime_minutes_snapshot * timedelta(minutes=1) <= cutoff,
+    )
+
+
 async def _offer_ids_with_final_tail_requests(session, offer_ids: list[int]) -> set[int]:
     if not offer_ids:
         return set()
@@ -288,8 +322,8 @@ async def _load_local_stale_active_offers(session, *, now, normal_lifetime_minut
     """Load home-server offers whose final lifetime has ended, minus final-tail holds."""
     from core.offer_lifecycle import project_offer_lifecycle
 
-    # Wide net: anything past the normal-only cutoff may be terminal, or still
-    # inside overtime. Exact eligibility comes from the shared projection.
+    # Only rows whose final deadline has passed are loaded. Final-tail holds
+    # still come from the shared projection.
     earliest_possible_cutoff = now - timedelta(minutes=normal_lifetime_minutes)
     stmt = (
         select(Offer)
@@ -297,7 +331,7 @@ async def _load_local_stale_active_offers(session, *, now, normal_lifetime_minut
         .where(
             Offer.status == OfferStatus.ACTIVE,
             Offer.home_server == current_server(),
-            Offer.created_at <= earliest_possible_cutoff,
+            *_final_deadline_due(earliest_possible_cutoff),
         )
     )
     result = await session.execute(stmt)
@@ -349,7 +383,7 @@ async def apply_remote_stale_channel_state(
             Offer.home_server.isnot(None),
             Offer.home_server != current_server(),
             Offer.channel_message_id.isnot(None),
-            Offer.created_at <= earliest_possible_cutoff,
+            *_final_deadline_due(earliest_possible_cutoff),
         )
         .limit(100)
     )
@@ -396,7 +430,14 @@ async def apply_remote_stale_channel_state(
 
 
 async def get_next_expiry_delay_seconds() -> float:
-    """Return a low-cost deadline-aware sleep interval for the expiry loop."""
+    """Return a low-cost deadline-aware sleep interval for the expiry loop.
+
+    The final deadline is ``created_at + normal + overtime``, with overtime
+    capped at ten minutes.  So only the oldest active offers can hold the
+    soonest deadline.  They are read in ``created_at``
+    order from the partial ACTIVE index, and the read stops once no later row
+    can be sooner.
+    """
     from core.offer_lifecycle import compute_lifecycle_deadlines
     from core.trading_settings import get_trading_settings_async
 
@@ -407,10 +448,13 @@ async def get_next_expiry_delay_seconds() -> float:
 
     async with AsyncSessionLocal() as session:
         result = await session.execute(
-            select(Offer.created_at, Offer.overtime_minutes_snapshot).where(
+            select(Offer.created_at, Offer.overtime_minutes_snapshot)
+            .where(
                 Offer.status == OfferStatus.ACTIVE,
                 Offer.home_server == current_server(),
             )
+            .order_by(Offer.created_at.asc())
+            .limit(NEXT_DEADLINE_SCAN_LIMIT)
         )
         rows = result.all()
 
@@ -419,16 +463,24 @@ async def get_next_expiry_delay_seconds() -> float:
 
     now = utc_now_naive()
     soonest_final = None
+    normal_deadline = None
     for created_at, overtime_snapshot in rows:
-        _normal_deadline, final_deadline = compute_lifecycle_deadlines(
+        normal_deadline, final_deadline = compute_lifecycle_deadlines(
             created_at,
             normal_lifetime_minutes=expiry_minutes,
             overtime_minutes_snapshot=int(overtime_snapshot or 0),
         )
         if final_deadline is None:
             continue
+        if soonest_final is not None and normal_deadline >= soonest_final:
+            break
         if soonest_final is None or final_deadline < soonest_final:
             soonest_final = final_deadline
+    else:
+        # Every row fitted inside one overtime window. Unread rows cannot
+        # expire before the last row's normal deadline, so wake no later.
+        if len(rows) >= NEXT_DEADLINE_SCAN_LIMIT and normal_deadline is not None and soonest_final is not None:
+            soonest_final = min(soonest_final, normal_deadline)
 
     if soonest_final is None:
         return CHECK_INTERVAL
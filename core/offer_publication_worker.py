@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import math
 import time
 from collections.abc import Mapping
 from dataclasses import dataclass
@@ -16,6 +17,7 @@ from core.background_job_authority import JOB_OFFER_TELEGRAM_PUBLICATION, assert
 from core.config import settings
 from core.db import AsyncSessionLocal
 from core.job_logging import RepeatedErrorLogger, duration_ms_since, job_context
+from core.metrics import record_offer_channel_state_plan
 from core.services.cross_server_recovery_service import active_publication_is_gated
 from core.services.offer_publication_reconciliation_service import reconcile_offer_publications
 from core.services.offer_publication_state_service import (
@@ -44,6 +46,9 @@ _CHANNEL_STATE_RETRY_METADATA_KEY = "channel_state_reconciliation_attempt_count"
 _CHANNEL_STATE_RETRY_VERSION_METADATA_KEY = "channel_state_reconciliation_attempt_offer_version_id"
 _CHANNEL_STATE_RETRY_AT_METADATA_KEY = CHANNEL_STATE_REFRESH_AT_METADATA_KEY
 _CHANNEL_STATE_LOCK_PREFIX = "offer-channel-state-reconciliation"
+_CHANNEL_STATE_PRIORITY_TERMINAL = 0
+_CHANNEL_STATE_PRIORITY_QUANTITY = 1
+_CHANNEL_STATE_PRIORITY_OTHER = 2
 
 
 @dataclass(frozen=True, slots=True)
@@ -80,6 +85,12 @@ class OfferChannelStateCycleReport:
     backlog_due: int = 0
     backlog_oldest_age_seconds: float | None = None
     backlog_oldest_due_age_seconds: float | None = None
+    collapsed: int = 0
+    deferred: int = 0
+    plan_depth: int = 0
+    plan_channels: int = 0
+    edits_saved: int = 0
+    estimated_drain_seconds: float = 0.0
 
 
 @dataclass(slots=True)
@@ -96,6 +107,24 @@ class OfferChannelStateBacklog:
     oldest_due_age_seconds: float | None = None
 
 
+@dataclass(frozen=True, slots=True)
+class OfferChannelStatePlan:
+    """Edits one channel-state cycle executes, in order, plus what it skips.
+
+    ``collapsed`` candidates need no Telegram call: the channel message already
+    shows their terminal state, so the worker only records the new version.
+    ``duplicates`` repeated an offer already in the plan and are dropped.
+    """
+
+    edits: tuple[OfferChannelStateCandidate, ...] = ()
+    collapsed: tuple[OfferChannelStateCandidate, ...] = ()
+    duplicates: int = 0
+    deferred: int = 0
+    depth: int = 0
+    channels: int = 0
+    estimated_drain_seconds: float = 0.0
+
+
 def _worker_interval_seconds() -> float:
     return max(0.2, float(getattr(settings, "offer_publication_worker_interval_seconds", 1.0)))
 
@@ -106,6 +135,11 @@ def _worker_batch_limit(limit: int | None = None) -> int:
     return max(1, int(getattr(settings, "offer_publication_worker_batch_limit", 25)))
 
 
+def _channel_state_plan_limit(edit_budget: int) -> int:
+    configured = _coerce_int(getattr(settings, "offer_publication_worker_channel_state_plan_limit", 2000))
+    return max(int(edit_budget), configured or 0, 1)
+
+
 def _bounded_setting_seconds(setting_name: str, *, default: float, minimum: float, maximum: float) -> float:
     try:
         value = float(getattr(settings, setting_name, default))
@@ -588,6 +622,99 @@ def _schedule_channel_state_retry(
     return delay
 
 
+def _channel_state_channel_key(candidate: OfferChannelStateCandidate) -> int | None:
+    return _coerce_int(getattr(candidate.state, "telegram_chat_id", None)) or _coerce_int(settings.channel_id)
+
+
+def _channel_state_priority(candidate: OfferChannelStateCandidate) -> int:
+    offer = candidate.offer
+    if _is_terminal_offer(offer):
+        return _CHANNEL_STATE_PRIORITY_TERMINAL
+    remaining = _coerce_int(getattr(offer, "remaining_quantity", None))
+    if remaining is not None and remaining != _coerce_int(getattr(offer, "quantity", None)):
+        return _CHANNEL_STATE_PRIORITY_QUANTITY
+    return _CHANNEL_STATE_PRIORITY_OTHER
+
+
+def _channel_state_transition_is_redundant(candidate: OfferChannelStateCandidate) -> bool:
+    """True when the channel message already shows the offer's terminal state.
+
+    Only the version moved (for example a late metadata write after expiry),
+    so the edit would render the same text Telegram already has.
+    """
+    offer = candidate.offer
+    state = candidate.state
+    if state is None or not _is_terminal_offer(offer):
+        return False
+    state_message_id = _coerce_int(getattr(state, "telegram_message_id", None))
+    return (
+        str(getattr(getattr(state, "status", None), "value", getattr(state, "status", None)) or "")
+        == OfferPublicationStatus.DISABLED.value
+        and str(getattr(state, "last_known_offer_status", None) or "").lower() == _offer_status_value(offer)
+        and state_message_id is not None
+        and state_message_id == _coerce_int(getattr(offer, "channel_message_id", None))
+        and _channel_state_next_retry_at(state) is None
+    )
+
+
+def plan_channel_state_edits(
+    candidates: list[OfferChannelStateCandidate],
+    *,
+    edit_budget: int,
+    spacing_seconds: float,
+    interval_seconds: float,
+) -> OfferChannelStatePlan:
+    """Allocate one cycle's per-channel edit budget across the loaded due backlog.
+
+    Candidates arrive oldest first.  Each channel gets ``edit_budget`` edits:
+    terminal offers first so expired buttons stop taking taps, then offers
+    whose remaining quantity moved, then everything else, oldest first within
+    a tier.  Channels are interleaved so one busy channel cannot starve
+    another.  The drain estimate covers only the loaded window.
+    """
+    budget = max(1, int(edit_budget))
+    seen: set[str] = set()
+    duplicates = 0
+    collapsed: list[OfferChannelStateCandidate] = []
+    by_channel: dict[int | None, list[tuple[int, int, OfferChannelStateCandidate]]] = {}
+    for index, candidate in enumerate(candidates):
+        offer_key = str(getattr(candidate.offer, "offer_public_id", None) or id(candidate.offer))
+        if offer_key in seen:
+            duplicates += 1
+            continue
+        seen.add(offer_key)
+        if _channel_state_transition_is_redundant(candidate):
+            collapsed.append(candidate)
+            continue
+        by_channel.setdefault(_channel_state_channel_key(candidate), []).append(
+            (_channel_state_priority(candidate), index, candidate)
+        )
+
+    queues: list[list[OfferChannelStateCandidate]] = []
+    deferred = 0
+    drain_seconds = 0.0
+    for pending in by_channel.values():
+        pending.sort(key=lambda item: (item[0], item[1]))
+        queues.append([item[2] for item in pending[:budget]])
+        deferred += max(0, len(pending) - budget)
+        cycles = math.ceil(len(pending) / budget)
+        drain_seconds = max(
+            drain_seconds,
+            max(0, len(pending) - cycles) * max(0.0, spacing_seconds) + (cycles - 1) * max(0.0, interval_seconds),
+        )
+
+    edits = [queue[position] for position in range(budget) for queue in queues if position < len(queue)]
+    return OfferChannelStatePlan(
+        edits=tuple(edits),
+        collapsed=tuple(collapsed),
+        duplicates=duplicates,
+        deferred=deferred,
+        depth=len(candidates),
+        channels=len(by_channel),
+        estimated_drain_seconds=drain_seconds,
+    )
+
+
 async def run_offer_channel_state_cycle(*, limit: int | None = None) -> OfferChannelStateCycleReport:
     """Repair Telegram channel presentation for offers already published to the channel."""
     assert_background_job_authority(JOB_OFFER_TELEGRAM_PUBLICATION)
@@ -604,12 +731,40 @@ async def run_offer_channel_state_cycle(*, limit: int | None = None) -> OfferCha
     response_counts: dict[str, int] = {}
     backlog = OfferChannelStateBacklog()
 
+    collapsed = 0
+    edit_budget = _worker_batch_limit(limit)
+    spacing_seconds = _channel_edit_spacing_seconds()
+    last_edit_at: dict[int | None, float] = {}
+
     async with AsyncSessionLocal() as db:
         candidates = await _load_channel_state_reconciliation_candidates(
             db,
-            limit=_worker_batch_limit(limit),
+            limit=_channel_state_plan_limit(edit_budget),
         )
-        for index, candidate in enumerate(candidates):
+        plan = plan_channel_state_edits(
+            candidates,
+            edit_budget=edit_budget,
+            spacing_seconds=spacing_seconds,
+            interval_seconds=_worker_interval_seconds(),
+        )
+        for candidate in plan.collapsed:
+            if not await _try_acquire_channel_state_lock(db, candidate.offer):
+                skipped_locked += 1
+                await db.commit()
+                continue
+            state = await _ensure_channel_state_candidate_state(db, candidate)
+            if not _channel_state_candidate_still_due(
+                candidate, now=utc_now()
+            ) or not _channel_state_transition_is_redundant(candidate):
+                # Anything that stopped being redundant is reloaded as an edit next cycle.
+                skipped_recent += 1
+                await db.commit()
+                continue
+            collapsed += 1
+            _mark_channel_state_applied(state, candidate.offer, now=utc_now(), error_code=state.error_code)
+            await db.commit()
+
+        for candidate in plan.edits:
             offer = candidate.offer
             if not await _try_acquire_channel_state_lock(db, offer):
                 skipped_locked += 1
@@ -622,6 +777,13 @@ async def run_offer_channel_state_cycle(*, limit: int | None = None) -> OfferCha
                 await db.commit()
                 continue
             _prepare_channel_state_candidate_state(state, offer)
+            channel_key = _channel_state_channel_key(candidate)
+            previous_edit_at = last_edit_at.get(channel_key)
+            if previous_edit_at is not None and spacing_seconds > 0:
+                wait_seconds = spacing_seconds - (time.monotonic() - previous_edit_at)
+                if wait_seconds > 0:
+                    await asyncio.sleep(wait_seconds)
+            last_edit_at[channel_key] = time.monotonic()
             processed += 1
             result = await apply_offer_channel_state_with_result(
                 offer,
@@ -662,13 +824,13 @@ async def run_offer_channel_state_cycle(*, limit: int | None = None) -> OfferCha
             if result.response_class == "429":
                 break
 
-            if index < len(candidates) - 1:
-                spacing_seconds = _channel_edit_spacing_seconds()
-                if spacing_seconds > 0:
-                    await asyncio.sleep(spacing_seconds)
-
         backlog = await _channel_state_backlog(db)
 
+    record_offer_channel_state_plan(
+        backlog_depth=plan.depth,
+        estimated_drain_seconds=plan.estimated_drain_seconds,
+        edits_saved=plan.duplicates + collapsed,
+    )
     return OfferChannelStateCycleReport(
         processed=processed,
         applied=applied,
@@ -685,6 +847,12 @@ async def run_offer_channel_state_cycle(*, limit: int | None = None) -> OfferCha
         backlog_due=backlog.due,
         backlog_oldest_age_seconds=backlog.oldest_age_seconds,
         backlog_oldest_due_age_seconds=backlog.oldest_due_age_seconds,
+        collapsed=collapsed,
+        deferred=plan.deferred,
+        plan_depth=plan.depth,
+        plan_channels=plan.channels,
+        edits_saved=plan.duplicates + collapsed,
+        estimated_drain_seconds=plan.estimated_drain_seconds,
     )
 
 
@@ -717,6 +885,7 @@ async def offer_telegram_publication_loop() -> None:
                     or channel_state_report.processed
                     or channel_state_report.applied
                     or channel_state_report.failed
+                    or channel_state_report.collapsed
                 ):
                     logger.info(
                         "Offer Telegram publication worker cycle completed",
@@ -753,6 +922,14 @@ async def offer_telegram_publication_loop() -> None:
                             "channel_state_cooldown_seconds": channel_state_report.cooldown_seconds,
                             "channel_state_response_counts": dict(channel_state_report.response_counts),
                             "channel_state_skipped_locked": channel_state_report.skipped_locked,
+                            "channel_state_collapsed": channel_state_report.collapsed,
+                            "channel_state_deferred": channel_state_report.deferred,
+                            "channel_state_plan_depth": channel_state_report.plan_depth,
+                            "channel_state_plan_channels": channel_state_report.plan_channels,
+                            "channel_state_edits_saved": channel_state_report.edits_saved,
+                            "channel_state_estimated_drain_seconds": (
+                                channel_state_report.estimated_drain_seconds
+                            ),
                             "channel_state_backlog_total": channel_state_report.backlog_total,
                             "channel_state_backlog_due": channel_state_report.backlog_due,
                             "channel_state_backlog_oldest_age_seconds": (
@@ -0,0 +1,477 @@
+"""In-process index of the active order book.
+
+The index answers the hot read questions about ACTIVE offers without a
+Postgres round trip: comparable prices for the offer price checks, best
+price and price quantiles per book, whether any other offer is still live,
+and the newest-first order used by the market listings.  Offers are grouped
+into books by ``(commodity_id, offer_type, settlement_type)``.
+
+How it stays current:
+
+- ``listen_order_book_events`` is a per-worker task.  Once its Redis
+  subscription to the ``events:offer:*`` realtime channels is up, it rebuilds
+  the index from one bulk SELECT and marks it ``ready``.
+- An offer event only marks that offer dirty.  Dirty offers are re-read from
+  Postgres in one batched query, so the shape of an event payload, a publish
+  made before commit, or a rolled-back transaction cannot corrupt the index.
+  The ORM hooks publish during flush, so every dirty offer is read a second
+  time after ``order_book_refresh_settle_seconds``.
+- Every ``order_book_reconcile_interval_seconds`` the listener runs
+  ``check_order_book_parity`` against the database and repairs any drift.
+
+Consumers must check ``order_book.ready`` and fall back to their SQL when it
+is false; the index is cleared whenever the subscription drops.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import math
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import select
+
+from core.config import settings
+from core.metrics import record_order_book_parity, set_order_book_size
+from core.offer_settlement import settlement_type_value
+
+logger = logging.getLogger(__name__)
+
+ORDER_BOOK_EVENT_PATTERN = "events:offer:*"
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+OrderBookKey = tuple[int, str, str]
+
+
+def _enum_text(value: Any) -> str:
+    return str(getattr(value, "value", value) or "").lower()
+
+
+def _created_at_us(created_at: datetime | None) -> int:
+    if created_at is None:
+        return 0
+    if created_at.tzinfo is None:
+        # Naive timestamps are UTC throughout the codebase.
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return (created_at - _EPOCH) // _MICROSECOND
+
+
+@dataclass(frozen=True, slots=True)
+class OrderBookEntry:
+    offer_id: int
+    user_id: int | None
+    commodity_id: int
+    offer_type: str
+    settlement_type: str
+    quantity: int
+    price: int
+    exclude_from_competitive_price: bool
+    created_at_us: int
+    overtime_minutes: int
+
+    @classmethod
+    def from_row(cls, row: Any) -> "OrderBookEntry":
+        return cls(
+            offer_id=int(row.id),
+            user_id=int(row.user_id) if row.user_id is not None else None,
+            commodity_id=int(row.commodity_id),
+            offer_type=_enum_text(row.offer_type),
+            settlement_type=settlement_type_value(row.settlement_type),
+            quantity=int(row.quantity or 0),
+            price=int(row.price or 0),
+            exclude_from_competitive_price=bool(row.exclude_from_competitive_price),
+            created_at_us=_created_at_us(row.created_at),
+            overtime_minutes=int(row.overtime_minutes_snapshot or 0),
+        )
+
+    @property
+    def key(self) -> OrderBookKey:
+        return (self.commodity_id, self.offer_type, self.settlement_type)
+
+    @property
+    def lifetime_base_epoch(self) -> float:
+        """Epoch seconds at which the offer's lifetime would end with a zero normal lifetime."""
+        return self.created_at_us / 1_000_000 + self.overtime_minutes * 60
+
+
+class OrderBook:
+    """Active offers of one (commodity, offer type, settlement type), kept sorted by price and quantity."""
+
+    def __init__(self, key: OrderBookKey) -> None:
+        self.key = key
+        self._entries: dict[int, OrderBookEntry] = {}
+        self._by_price: list[tuple[int, int]] = []
+        self._by_quantity: list[tuple[int, int, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, entry: OrderBookEntry) -> None:
+        self._entries[entry.offer_id] = entry
+        insort(self._by_price, (entry.price, entry.offer_id))
+        insort(self._by_quantity, (entry.quantity, entry.price, entry.offer_id))
+
+    def remove(self, entry: OrderBookEntry) -> None:
+        self._entries.pop(entry.offer_id, None)
+        del self._by_price[bisect_left(self._by_price, (entry.price, entry.offer_id))]
+        del self._by_quantity[bisect_left(self._by_quantity, (entry.quantity, entry.price, entry.offer_id))]
+
+    def best_price(self) -> int | None:
+        """Lowest ask in a sell book, highest bid in a buy book."""
+        if not self._by_price:
+            return None
+        return self._by_price[-1 if self.key[1] == "buy" else 0][0]
+
+    def price_quantile(self, fraction: float) -> int | None:
+        """Nearest-rank price quantile, ``fraction`` in [0, 1]."""
+        if not self._by_price:
+            return None
+        fraction = min(max(float(fraction), 0.0), 1.0)
+        rank = max(1, math.ceil(fraction * len(self._by_price)))
+        return self._by_price[rank - 1][0]
+
+    def quantity_range(self, min_quantity: int, max_quantity: int) -> Iterator[OrderBookEntry]:
+        """Entries with ``min_quantity <= quantity <= max_quantity``, by quantity then price."""
+        start = bisect_left(self._by_quantity, (int(min_quantity),))
+        stop = bisect_right(self._by_quantity, (int(max_quantity), math.inf))
+        for _, _, offer_id in self._by_quantity[start:stop]:
+            yield self._entries[offer_id]
+
+
+class OrderBookIndex:
+    """All books plus the cross-book orderings (lifetime end, newest first)."""
+
+    def __init__(self) -> None:
+        self._entries: dict[int, OrderBookEntry] = {}
+        self._books: dict[OrderBookKey, OrderBook] = {}
+        self._lifetimes: list[tuple[float, int]] = []
+        # Ascending order of (-created_at, -id) is the listings' newest-first order.
+        self._recency: list[tuple[int, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, offer_id: object) -> bool:
+        return offer_id in self._entries
+
+    @property
+    def book_count(self) -> int:
+        return len(self._books)
+
+    def entries(self) -> dict[int, OrderBookEntry]:
+        return dict(self._entries)
+
+    def get(self, offer_id: int) -> OrderBookEntry | None:
+        return self._entries.get(int(offer_id))
+
+    def book(self, commodity_id: int, offer_type: Any, settlement_type: Any) -> OrderBook | None:
+        return self._books.get((int(commodity_id), _enum_text(offer_type), settlement_type_value(settlement_type)))
+
+    def upsert(self, entry: OrderBookEntry) -> None:
+        current = self._entries.get(entry.offer_id)
+        if current == entry:
+            return
+        if current is not None:
+            self._remove(current)
+        self._entries[entry.offer_id] = entry
+        book = self._books.get(entry.key)
+        if book is None:
+            book = self._books[entry.key] = OrderBook(entry.key)
+        book.add(entry)
+        insort(self._lifetimes, (entry.lifetime_base_epoch, entry.offer_id))
+        insort(self._recency, (-entry.created_at_us, -entry.offer_id))
+
+    def discard(self, offer_id: int) -> None:
+        current = self._entries.get(int(offer_id))
+        if current is not None:
+            self._remove(current)
+
+    def replace_all(self, entries: Iterable[OrderBookEntry]) -> None:
+        self.clear()
+        for entry in entries:
+            self.upsert(entry)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._books.clear()
+        self._lifetimes.clear()
+        self._recency.clear()
+
+    def _remove(self, entry: OrderBookEntry) -> None:
+        del self._entries[entry.offer_id]
+        book = self._books[entry.key]
+        book.remove(entry)
+        if not len(book):
+            del self._books[entry.key]
+        del self._lifetimes[bisect_left(self._lifetimes, (entry.lifetime_base_epoch, entry.offer_id))]
+        del self._recency[bisect_left(self._recency, (-entry.created_at_us, -entry.offer_id))]
+
+    def comparable_prices(
+        self,
+        *,
+        commodity_id: int,
+        offer_type: Any,
+        settlement_type: Any,
+        min_quantity: int,
+        max_quantity: int,
+        exclude_user_id: int | None = None,
+    ) -> list[int]:
+        """Prices the competitive-price checks compare against (see trade_service)."""
+        book = self.book(commodity_id, offer_type, settlement_type)
+        if book is None:
+            return []
+        return [
+            entry.price
+            for entry in book.quantity_range(min_quantity, max_quantity)
+            if not entry.exclude_from_competitive_price
+            and (exclude_user_id is None or entry.user_id != exclude_user_id)
+        ]
+
+    def has_other_live_offer(self, offer_id: int, *, normal_lifetime_minutes: int, now_epoch: float) -> bool:
+        """Whether any active offer other than ``offer_id`` is still inside its final lifetime."""
+        offer_id = int(offer_id)
+        own = self._entries.get(offer_id)
+        if normal_lifetime_minutes <= 0:
+            return len(self._entries) - (own is not None) > 0
+        threshold = now_epoch - int(normal_lifetime_minutes) * 60
+        live = len(self._lifetimes) - bisect_right(self._lifetimes, (threshold, math.inf))
+        if own is not None and own.lifetime_base_epoch > threshold:
+            live -= 1
+        return live > 0
+
+    def newest_offer_ids(
+        self,
+        *,
+        offer_type: str | None = None,
+        settlement_type: str | None = None,
+        commodity_id: int | None = None,
+        user_id: int | None = None,
+        before: tuple[datetime, int] | None = None,
+        skip: int = 0,
+        limit: int,
+    ) -> list[int]:
+        """Offer ids newest first, matching the listing filters, after an optional (created_at, id) cursor."""
+        start = 0
+        if before is not None:
+            start = bisect_right(self._recency, (-_created_at_us(before[0]), -int(before[1])))
+        remaining_skip = max(0, int(skip))
+        offer_ids: list[int] = []
+        for _, negative_id in self._recency[start:]:
+            entry = self._entries[-negative_id]
+            if (
+                (offer_type and entry.offer_type != offer_type)
+                or (settlement_type and entry.settlement_type != settlement_type)
+                or (commodity_id and entry.commodity_id != commodity_id)
+                or (user_id is not None and entry.user_id != user_id)
+            ):
+                continue
+            if remaining_skip:
+                remaining_skip -= 1
+                continue
+            offer_ids.append(entry.offer_id)
+            if len(offer_ids) >= limit:
+                break
+        return offer_ids
+
+
+@dataclass(frozen=True, slots=True)
+class OrderBookParityReport:
+    checked: int
+    missing: tuple[int, ...]
+    unexpected: tuple[int, ...]
+    mismatched: tuple[int, ...]
+
+    @property
+    def ok(self) -> bool:
+        return not (self.missing or self.unexpected or self.mismatched)
+
+
+def _order_book_columns():
+    from models.offer import Offer
+
+    return (
+        Offer.id,
+        Offer.user_id,
+        Offer.commodity_id,
+        Offer.offer_type,
+        Offer.settlement_type,
+        Offer.quantity,
+        Offer.price,
+        Offer.exclude_from_competitive_price,
+        Offer.created_at,
+        Offer.overtime_minutes_snapshot,
+    )
+
+
+async def load_active_order_book_entries(db) -> list[OrderBookEntry]:
+    """Every ACTIVE offer, in one query."""
+    from models.offer import Offer, OfferStatus
+
+    result = await db.execute(select(*_order_book_columns()).where(Offer.status == OfferStatus.ACTIVE))
+    return [OrderBookEntry.from_row(row) for row in result.all()]
+
+
+async def load_order_book_entries_by_id(db, offer_ids: Iterable[int]) -> dict[int, OrderBookEntry]:
+    """The ACTIVE subset of ``offer_ids``, in one query; absent ids are no longer in the book."""
+    from models.offer import Offer, OfferStatus
+
+    ids = sorted({int(offer_id) for offer_id in offer_ids})
+    if not ids:
+        return {}
+    result = await db.execute(
+        select(*_order_book_columns()).where(Offer.id.in_(ids), Offer.status == OfferStatus.ACTIVE)
+    )
+    return {entry.offer_id: entry for entry in map(OrderBookEntry.from_row, result.all())}
+
+
+async def check_order_book_parity(db, index: OrderBookIndex, *, repair: bool = False) -> OrderBookParityReport:
+    """Compare ``index`` with the ACTIVE offers in the database; optionally replace it with them."""
+    expected = {entry.offer_id: entry for entry in await load_active_order_book_entries(db)}
+    actual = index.entries()
+    report = OrderBookParityReport(
+        checked=len(expected),
+        missing=tuple(sorted(expected.keys() - actual.keys())),
+        unexpected=tuple(sorted(actual.keys() - expected.keys())),
+        mismatched=tuple(
+            sorted(offer_id for offer_id in expected.keys() & actual.keys() if expected[offer_id] != actual[offer_id])
+        ),
+    )
+    record_order_book_parity(
+        missing=len(report.missing),
+        unexpected=len(report.unexpected),
+        mismatched=len(report.mismatched),
+    )
+    if repair and not report.ok:
+        index.replace_all(expected.values())
+    return report
+
+
+def _event_offer_id(data: Any) -> int | None:
+    try:
+        payload = json.loads(data) if isinstance(data, (str, bytes, bytearray)) else data
+        offer_id = payload.get("id") if isinstance(payload, dict) else None
+        return int(offer_id) if offer_id is not None and not isinstance(offer_id, bool) else None
+    except (TypeError, ValueError):
+        return None
+
+
+class OrderBookService:
+    """The process-wide index plus its dirty-offer refresh schedule."""
+
+    def __init__(self) -> None:
+        self.index = OrderBookIndex()
+        self.ready = False
+        self._due: list[tuple[float, int]] = []
+
+    def mark_dirty(self, offer_id: int, *, now: float | None = None) -> None:
+        now = time.monotonic() if now is None else now
+        debounce = max(0.0, float(getattr(settings, "order_book_refresh_debounce_ms", 50))) / 1000
+        settle = max(debounce, float(getattr(settings, "order_book_refresh_settle_seconds", 1.0)))
+        heapq.heappush(self._due, (now + debounce, int(offer_id)))
+        heapq.heappush(self._due, (now + settle, int(offer_id)))
+
+    def seconds_until_due(self, *, now: float | None = None) -> float | None:
+        if not self._due:
+            return None
+        now = time.monotonic() if now is None else now
+        return max(0.0, self._due[0][0] - now)
+
+    def pop_due(self, *, now: float | None = None) -> set[int]:
+        now = time.monotonic() if now is None else now
+        offer_ids: set[int] = set()
+        while self._due and self._due[0][0] <= now:
+            offer_ids.add(heapq.heappop(self._due)[1])
+        return offer_ids
+
+    def apply_refresh(self, offer_ids: Iterable[int], active: dict[int, OrderBookEntry]) -> None:
+        for offer_id in offer_ids:
+            entry = active.get(int(offer_id))
+            if entry is None:
+                self.index.discard(offer_id)
+            else:
+                self.index.upsert(entry)
+        set_order_book_size(offers=len(self.index), books=self.index.book_count)
+
+    async def rebuild(self, db) -> None:
+        self.index.replace_all(await load_active_order_book_entries(db))
+        self._due.clear()
+        set_order_book_size(offers=len(self.index), books=self.index.book_count)
+
+    def reset(self) -> None:
+        self.ready = False
+        self.index.clear()
+        self._due.clear()
+
+
+order_book = OrderBookService()
+
+
+def is_order_book_enabled() -> bool:
+    return bool(getattr(settings, "order_book_index_enabled", False))
+
+
+async def listen_order_book_events(service: OrderBookService = order_book, *, retry_seconds: float = 1.0) -> None:
+    """Per-worker task: keep ``service`` current while subscribed to offer events."""
+    from core.db import AsyncSessionLocal
+    from core.redis import RedisSubscription, listen_redis_subscription
+
+    reconcile_interval = max(1.0, float(getattr(settings, "order_book_reconcile_interval_seconds", 60.0)))
+    next_reconcile = 0.0
+
+    async def rebuild() -> None:
+        nonlocal next_reconcile
+        async with AsyncSessionLocal() as db:
+            await service.rebuild(db)
+        service.ready = True
+        next_reconcile = time.monotonic() + reconcile_interval
+        logger.info(
+            "Order book index ready",
+            extra={"event": "order_book.ready", "offer_count": len(service.index)},
+        )
+
+    def mark_dirty(data: Any) -> None:
+        offer_id = _event_offer_id(data)
+        if offer_id is not None:
+            service.mark_dirty(offer_id)
+
+    async def refresh_due() -> None:
+        nonlocal next_reconcile
+        due = service.pop_due()
+        if due:
+            async with AsyncSessionLocal() as db:
+                service.apply_refresh(due, await load_order_book_entries_by_id(db, due))
+        if time.monotonic() >= next_reconcile:
+            async with AsyncSessionLocal() as db:
+                report = await check_order_book_parity(db, service.index, repair=True)
+            if not report.ok:
+                logger.warning(
+                    "Order book index drifted from the database and was repaired",
+                    extra={
+                        "event": "order_book.parity_repaired",
+                        "missing": len(report.missing),
+                        "unexpected": len(report.unexpected),
+                        "mismatched": len(report.mismatched),
+                    },
+                )
+            next_reconcile = time.monotonic() + reconcile_interval
+
+    await listen_redis_subscription(
+        RedisSubscription(
+            name="order_book",
+            patterns=(ORDER_BOOK_EVENT_PATTERN,),
+            on_message=mark_dirty,
+            on_subscribed=rebuild,
+            on_idle=refresh_due,
+            on_reset=service.reset,
+            poll_timeout=service.seconds_until_due,
+        ),
+        retry_seconds=retry_seconds,
+    )
@@ -0,0 +1,185 @@
+# core/principal_cache.py
+"""Short-lived cache of verified API sessions for ``api.deps.get_current_user``.
+
+Every authenticated request still loads its ``User`` row, so endpoints keep a
+live ORM object and the access checks always read fresh columns.  The Redis
+blacklist lookup and the ``user_sessions`` read are what this cache skips.
+
+An entry is keyed by the token's session id and is reused only when all of
+these hold:
+
+- the invalidation listener is subscribed (``active``), so no revocation can
+  be missed while the cache serves hits;
+- it is younger than ``api_principal_cache_ttl_seconds``;
+- the freshly loaded user row still has the same version token (id and the
+  role/status fields), so a committed role change, block or deletion misses.
+  ``sync_version`` is left out: presence-only writes such as the
+  ``last_seen_at`` flush bump it without touching access;
+- no ``events:principal:invalidated`` signal named the session or the user.
+  The signal is published after commit for session and user changes (see
+  ``core.events.setup_principal_invalidation_events``).
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import json
+import logging
+import time
+from typing import Any, Callable, Iterable
+
+from core.config import settings
+from core.metrics import record_api_principal_cache
+
+logger = logging.getLogger(__name__)
+
+PRINCIPAL_INVALIDATED_CHANNEL = "events:principal:invalidated"
+
+# User columns whose committed change must discard the user's cached sessions.
+PRINCIPAL_USER_FIELDS = (
+    "role",
+    "is_deleted",
+    "account_status",
+    "messenger_blocked_at",
+    "messenger_grace_expires_at",
+    "must_change_password",
+    "trading_restricted_until",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class PrincipalCacheEntry:
+    user_id: int
+    token: tuple
+    expires_at: float
+
+
+def principal_token(user: Any) -> tuple:
+    """Fields that, when changed on the user row, must re-verify the session."""
+    return tuple(getattr(user, field, None) for field in ("id", *PRINCIPAL_USER_FIELDS))
+
+
+class PrincipalCache:
+    """Process-local LRU of verified sessions keyed by session id."""
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float,
+        max_entries: int = 50000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self.max_entries = max(1, int(max_entries))
+        self._clock = clock
+        self._entries: OrderedDict[str, PrincipalCacheEntry] = OrderedDict()
+        # Bumped on every invalidation, so a session verified across one is not stored.
+        self.generation = 0
+        # True only while the invalidation listener is subscribed.
+        self.active = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.active and self.ttl_seconds > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, session_id: str) -> PrincipalCacheEntry | None:
+        """Unexpired entry for ``session_id``; check it with ``vouches_for``."""
+        if not self.enabled:
+            return None
+        entry = self._entries.get(session_id)
+        if entry is None:
+            record_api_principal_cache("miss")
+            return None
+        if entry.expires_at <= self._clock():
+            self._entries.pop(session_id, None)
+            record_api_principal_cache("stale")
+            return None
+        return entry
+
+    def vouches_for(self, session_id: str, entry: PrincipalCacheEntry, user: Any) -> bool:
+        if entry.user_id == getattr(user, "id", None) and entry.token == principal_token(user):
+            self._entries.move_to_end(session_id)
+            record_api_principal_cache("hit")
+            return True
+        self._entries.pop(session_id, None)
+        record_api_principal_cache("stale")
+        return False
+
+    def put(self, session_id: str, user: Any, *, generation: int | None = None) -> None:
+        if not self.enabled or (generation is not None and generation != self.generation):
+            return
+        self._entries[session_id] = PrincipalCacheEntry(
+            user_id=int(getattr(user, "id")),
+            token=principal_token(user),
+            expires_at=self._clock() + self.ttl_seconds,
+        )
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, *, session_ids: Iterable[str] = (), user_ids: Iterable[int] = ()) -> int:
+        self.generation += 1
+        user_id_set = {int(value) for value in user_ids}
+        doomed = {str(value) for value in session_ids if str(value) in self._entries}
+        if user_id_set:
+            doomed.update(key for key, entry in self._entries.items() if entry.user_id in user_id_set)
+        for key in doomed:
+            del self._entries[key]
+        if doomed:
+            record_api_principal_cache("invalidated")
+        return len(doomed)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=getattr(settings, "api_principal_cache_ttl_seconds", 30.0),
+    max_entries=getattr(settings, "api_principal_cache_max_entries", 50000),
+)
+
+
+def apply_principal_invalidation(cache: PrincipalCache, raw_payload: Any) -> int:
+    data = raw_payload.decode("utf-8") if isinstance(raw_payload, bytes) else str(raw_payload)
+    try:
+        payload = json.loads(data)
+    except (TypeError, ValueError):
+        return 0
+    if not isinstance(payload, dict):
+        return 0
+    return cache.invalidate(
+        session_ids=payload.get("session_ids") or (),
+        user_ids=payload.get("user_ids") or (),
+    )
+
+
+async def listen_principal_invalidations(
+    cache: PrincipalCache = principal_cache,
+    *,
+    retry_seconds: float = 1.0,
+) -> None:
+    """API worker task: drop cached sessions named by committed invalidation events."""
+    from core.redis import RedisSubscription, listen_redis_subscription
+
+    def activate() -> None:
+        cache.active = True
+
+    def reset() -> None:
+        # Sessions may have been revoked while we were not listening.
+        cache.active = False
+        cache.clear()
+
+    await listen_redis_subscription(
+        RedisSubscription(
+            name="principal_cache",
+            channels=(PRINCIPAL_INVALIDATED_CHANNEL,),
+            on_message=lambda data: apply_principal_invalidation(cache, data),
+            on_subscribed=activate,
+            on_reset=reset,
+        ),
+        retry_seconds=retry_seconds,
+    )
@@ -0,0 +1,144 @@
+"""Per-connection batching and delta encoding for the ``batch.v1`` realtime protocol.
+
+A WebSocket client opts in with ``/ws?protocol=batch.v1`` and may add
+``&since=<event_id>`` to resume after a reconnect.  The server acknowledges
+with one ``{"type": "protocol", ...}`` frame and then, instead of one frame
+per event, sends at most one frame per ``realtime_batch_interval_ms``::
+
+    {"type": "batch", "events": [...], "last_event_id": "..."}
+
+Each entry looks like a v0 frame (``type``, ``event_id``, ``data``) with two
+differences:
+
+- every ``offer:*`` event for the same offer inside one window is merged into
+  a single entry that keeps the newest ``event_id`` and event type;
+- once this connection has been sent an offer, later entries for it carry
+  ``delta`` (the changed fields plus ``id``) instead of the full ``data``.
+
+Market and notification events pass through unchanged and in order.
+"""
+
+from __future__ import annotations
+
+import json
+from collections import OrderedDict
+from typing import Any
+
+from core.realtime_fanout import RealtimeFrame
+
+REALTIME_BATCH_PROTOCOL = "batch.v1"
+OFFER_EVENT_PREFIX = "offer:"
+OFFER_CREATED_EVENT = "offer:created"
+TERMINAL_OFFER_EVENT_TYPES = frozenset({"offer:expired", "offer:cancelled", "offer:completed", "offer:deleted"})
+DEFAULT_MAX_KNOWN_OFFERS = 2000
+DEFAULT_DEDUP_SIZE = 512
+
+
+def encode_realtime_message(message: dict) -> str:
+    # Same encoding as the v0 pre-rendered frames.
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class RealtimeBatchEncoder:
+    """Collects one connection's frames and renders them as ``batch`` messages."""
+
+    def __init__(
+        self,
+        *,
+        max_known_offers: int = DEFAULT_MAX_KNOWN_OFFERS,
+        dedup_size: int = DEFAULT_DEDUP_SIZE,
+    ) -> None:
+        self.max_known_offers = max(1, int(max_known_offers))
+        self.dedup_size = max(1, int(dedup_size))
+        # Offer fields as the client last received them, LRU by offer id.
+        self._known: OrderedDict[Any, dict] = OrderedDict()
+        self._seen: OrderedDict[str, None] = OrderedDict()
+        self._pending: list[dict] = []
+        self._pending_offers: dict[Any, dict] = {}
+        self.last_event_id: str | None = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def add(self, frame: RealtimeFrame) -> bool:
+        """Queue a frame for the next batch; False when its ``event_id`` was already queued."""
+        event_id = frame.event_id
+        if event_id:
+            if event_id in self._seen:
+                return False
+            self._seen[event_id] = None
+            while len(self._seen) > self.dedup_size:
+                self._seen.popitem(last=False)
+            self.last_event_id = event_id
+
+        data = frame.data
+        offer_id = (
+            data.get("id")
+            if frame.event_type.startswith(OFFER_EVENT_PREFIX) and not frame.private and isinstance(data, dict)
+            else None
+        )
+        if offer_id is None:
+            self._pending.append({"type": frame.event_type, "event_id": event_id, "data": data})
+            return True
+
+        entry = self._pending_offers.get(offer_id)
+        if entry is None:
+            entry = {
+                "type": frame.event_type,
+                "event_id": event_id,
+                "data": dict(data),
+                "offer_id": offer_id,
+                "created": frame.event_type == OFFER_CREATED_EVENT,
+            }
+            self._pending_offers[offer_id] = entry
+            self._pending.append(entry)
+            return True
+
+        entry["data"].update(data)
+        entry["event_id"] = event_id or entry["event_id"]
+        entry["created"] = entry["created"] or frame.event_type == OFFER_CREATED_EVENT
+        # An update right after a creation in the same window still reads as a creation.
+        entry["type"] = (
+            OFFER_CREATED_EVENT
+            if entry["created"] and frame.event_type not in TERMINAL_OFFER_EVENT_TYPES
+            else frame.event_type
+        )
+        return True
+
+    def drain(self) -> str | None:
+        """Render and clear the queued events; None when nothing is queued."""
+        if not self._pending:
+            return None
+        events = [self._render(entry) for entry in self._pending]
+        self._pending = []
+        self._pending_offers = {}
+        message: dict[str, Any] = {"type": "batch", "events": events}
+        if self.last_event_id:
+            message["last_event_id"] = self.last_event_id
+        return encode_realtime_message(message)
+
+    def _render(self, entry: dict) -> dict:
+        rendered: dict[str, Any] = {"type": entry["type"]}
+        if entry.get("event_id"):
+            rendered["event_id"] = entry["event_id"]
+        if "offer_id" not in entry:
+            rendered["data"] = entry["data"]
+            return rendered
+
+        offer_id = entry["offer_id"]
+        data = entry["data"]
+        known = self._known.pop(offer_id, None)
+        if known is None or entry["type"] == OFFER_CREATED_EVENT:
+            rendered["data"] = data
+            known = dict(data)
+        else:
+            delta = {key: value for key, value in data.items() if key not in known or known[key] != value}
+            delta["id"] = offer_id
+            rendered["delta"] = delta
+            known.update(data)
+        if entry["type"] not in TERMINAL_OFFER_EVENT_TYPES:
+            self._known[offer_id] = known
+            while len(self._known) > self.max_known_offers:
+                self._known.popitem(last=False)
+        return rendered
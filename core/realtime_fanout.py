@@ -0,0 +1,258 @@
+"""Process-wide Redis pub/sub fan-out for realtime WebSocket and SSE clients.
+
+One subscriber per API worker listens to every public ``events:*`` channel
+and the ``notifications:*`` pattern.  Each message is decoded and projected
+exactly once by the injected frame builder; the pre-serialized frame is then
+offered to every registered connection through a bounded queue.  A connection
+whose queue is full is evicted instead of slowing the shared listener down.
+
+With ``history_size`` set, the hub also remembers the last public frames so a
+reconnecting client can resume after the ``event_id`` it saw last.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from core.metrics import (
+    record_realtime_fanout_eviction,
+    record_realtime_fanout_frame,
+    set_realtime_fanout_subscribers,
+)
+
+logger = logging.getLogger(__name__)
+
+PUBLIC_CHANNEL_PREFIX = "events:"
+NOTIFICATION_CHANNEL_PREFIX = "notifications:"
+NOTIFICATION_CHANNEL_PATTERN = f"{NOTIFICATION_CHANNEL_PREFIX}*"
+DEFAULT_SUBSCRIBER_QUEUE_SIZE = 256
+LISTENER_POLL_TIMEOUT_SECONDS = 1.0
+LISTENER_RETRY_SECONDS = (0.5, 1, 2, 5)
+
+
+@dataclass(frozen=True, slots=True)
+class RealtimeFrame:
+    """A decoded event rendered once for every transport."""
+
+    event_type: str
+    event_id: str | None
+    websocket_text: str
+    sse_text: str
+    private: bool = False
+    # Projected payload, for consumers that re-encode frames (batch.v1).
+    data: Any = None
+
+
+# Sentinel queued after eviction so the consumer closes its connection.
+EVICTED = None
+
+
+@dataclass(eq=False, slots=True)
+class RealtimeSubscription:
+    user_id: int | None
+    event_types: frozenset[str]
+    transport: str
+    queue: asyncio.Queue = field(repr=False)
+    evicted: bool = False
+
+    async def next_frame(self) -> RealtimeFrame | None:
+        """Wait for the next frame; None means the hub evicted this subscriber."""
+        return await self.queue.get()
+
+
+FrameBuilder = Callable[[str, str], "RealtimeFrame | None"]
+
+
+class RealtimeFanoutHub:
+    def __init__(
+        self,
+        *,
+        redis_factory: Callable[[], Any],
+        public_event_types: Iterable[str],
+        frame_builder: FrameBuilder,
+        queue_size: int = DEFAULT_SUBSCRIBER_QUEUE_SIZE,
+        history_size: int = 0,
+    ) -> None:
+        self._redis_factory = redis_factory
+        self._public_channels = tuple(
+            f"{PUBLIC_CHANNEL_PREFIX}{event_type}" for event_type in dict.fromkeys(public_event_types)
+        )
+        self._frame_builder = frame_builder
+        self._queue_size = max(1, int(queue_size))
+        self._subscribers: set[RealtimeSubscription] = set()
+        self._user_subscribers: dict[int, set[RealtimeSubscription]] = {}
+        self._listener_task: asyncio.Task | None = None
+        self._history: deque[RealtimeFrame] = deque(maxlen=max(0, int(history_size)))
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(
+        self,
+        *,
+        user_id: int | None,
+        event_types: Iterable[str],
+        transport: str,
+    ) -> RealtimeSubscription:
+        subscription = RealtimeSubscription(
+            user_id=int(user_id) if user_id else None,
+            event_types=frozenset(event_types),
+            transport=transport,
+            queue=asyncio.Queue(maxsize=self._queue_size),
+        )
+        self._subscribers.add(subscription)
+        if subscription.user_id is not None:
+            self._user_subscribers.setdefault(subscription.user_id, set()).add(subscription)
+        set_realtime_fanout_subscribers(self.subscriber_count)
+        self._ensure_listener()
+        return subscription
+
+    def unsubscribe(self, subscription: RealtimeSubscription) -> None:
+        self._subscribers.discard(subscription)
+        if subscription.user_id is not None:
+            user_subscriptions = self._user_subscribers.get(subscription.user_id)
+            if user_subscriptions is not None:
+                user_subscriptions.discard(subscription)
+                if not user_subscriptions:
+                    self._user_subscribers.pop(subscription.user_id, None)
+        set_realtime_fanout_subscribers(self.subscriber_count)
+
+    def dispatch(self, channel: str, raw_data: str) -> int:
+        """Route one Redis message; returns the number of queues it reached."""
+        if channel.startswith(NOTIFICATION_CHANNEL_PREFIX):
+            try:
+                user_id = int(channel[len(NOTIFICATION_CHANNEL_PREFIX):])
+            except ValueError:
+                return 0
+            targets = self._user_subscribers.get(user_id)
+            if not targets:
+                # Other workers own this user's sockets; skip decoding entirely.
+                return 0
+            frame = self._frame_builder(channel, raw_data)
+            if frame is None:
+                return 0
+            return self._offer(frame, tuple(targets))
+
+        if not self._subscribers and not self._history.maxlen:
+            return 0
+        frame = self._frame_builder(channel, raw_data)
+        if frame is None:
+            return 0
+        if self._history.maxlen and frame.event_id:
+            self._history.append(frame)
+        return self._offer(
+            frame,
+            tuple(
+                subscription
+                for subscription in self._subscribers
+                if frame.event_type in subscription.event_types
+            ),
+        )
+
+    def frames_since(self, event_id: str) -> list[RealtimeFrame] | None:
+        """Public frames dispatched after ``event_id``; None when it is no longer remembered."""
+        frames: list[RealtimeFrame] = []
+        for frame in reversed(self._history):
+            if frame.event_id == event_id:
+                frames.reverse()
+                return frames
+            frames.append(frame)
+        return None
+
+    def _offer(self, frame: RealtimeFrame, targets: tuple[RealtimeSubscription, ...]) -> int:
+        delivered = 0
+        for subscription in targets:
+            if subscription.evicted:
+                continue
+            try:
+                subscription.queue.put_nowait(frame)
+                delivered += 1
+            except asyncio.QueueFull:
+                self._evict(subscription)
+        record_realtime_fanout_frame(frame.event_type if not frame.private else "notification", delivered)
+        return delivered
+
+    def _evict(self, subscription: RealtimeSubscription) -> None:
+        subscription.evicted = True
+        self.unsubscribe(subscription)
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(EVICTED)
+        record_realtime_fanout_eviction(subscription.transport)
+        logger.warning(
+            "Evicted slow realtime consumer",
+            extra={
+                "event": "realtime.fanout.slow_consumer_evicted",
+                "transport": subscription.transport,
+                "user_id": subscription.user_id,
+                "queue_size": self._queue_size,
+            },
+        )
+
+    def _ensure_listener(self) -> None:
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.create_task(self._listen_forever())
+
+    async def _listen_forever(self) -> None:
+        attempt = 0
+        while True:
+            try:
+                await self._listen_once()
+                attempt = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                delay = LISTENER_RETRY_SECONDS[min(attempt, len(LISTENER_RETRY_SECONDS) - 1)]
+                attempt += 1
+                logger.error(
+                    "Realtime fan-out listener failed; resubscribing",
+                    extra={
+                        "event": "realtime.fanout.listener_error",
+                        "error_class": type(exc).__name__,
+                        "retry_in_seconds": delay,
+                    },
+                )
+                await asyncio.sleep(delay)
+
+    async def _listen_once(self) -> None:
+        async with self._redis_factory() as redis_client:
+            pubsub = redis_client.pubsub()
+            try:
+                await pubsub.subscribe(*self._public_channels)
+                await pubsub.psubscribe(NOTIFICATION_CHANNEL_PATTERN)
+                logger.info(
+                    "Realtime fan-out listener subscribed",
+                    extra={
+                        "event": "realtime.fanout.listener_subscribed",
+                        "channel_count": len(self._public_channels),
+                    },
+                )
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True,
+                        timeout=LISTENER_POLL_TIMEOUT_SECONDS,
+                    )
+                    if not message or message.get("type") not in {"message", "pmessage"}:
+                        continue
+                    raw_channel = message.get("channel", "")
+                    channel = raw_channel.decode("utf-8") if isinstance(raw_channel, bytes) else str(raw_channel)
+                    raw_data = message.get("data", "")
+                    data = raw_data.decode("utf-8") if isinstance(raw_data, bytes) else str(raw_data)
+                    self.dispatch(channel, data)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    async def stop(self) -> None:
+        task, self._listener_task = self._listener_task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
@@ -5,11 +5,15 @@ Redis Client Manager - مدیریت بهینه اتصال Redis
 این ماژول از یک کلاینت global استفاده می‌کند که در startup ایجاد
 و در shutdown بسته می‌شود. این رویکرد بهینه‌تر از ساخت کلاینت در هر درخواست است.
 """
+import asyncio
+import inspect
 import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 import redis.asyncio as redis
 from redis.asyncio import Redis
 from redis.asyncio.connection import ConnectionPool
-from typing import AsyncGenerator, Optional
+from typing import Any, AsyncGenerator, Optional
 
 from core.config import settings
 
@@ -20,6 +24,8 @@ __all__ = [
     "get_redis_client",
     "get_redis",
     "check_redis_connection",
+    "RedisSubscription",
+    "listen_redis_subscription",
 ]
 
 logger = logging.getLogger(__name__)
@@ -103,4 +109,86 @@ async def check_redis_connection() -> bool:
         return True
     except Exception as e:
         logger.error(f"Redis connection failed: {e}")
-        return False
\ No newline at end of file
+        return False
+
+
+# ===== Pub/Sub Listener =====
+
+@dataclass(frozen=True)
+class RedisSubscription:
+    """
+    کانال‌ها و callbackهای listener pub/sub یک قابلیت
+
+    on_subscribed پس از برقراری اشتراک اجرا می‌شود (همگام‌سازی و فعال‌سازی)،
+    on_message داده هر پیام کانال/الگو را می‌گیرد، on_idle پس از هر نوبت
+    خواندن اجرا می‌شود و on_reset هر بار که اشتراک قطع شود؛ چون ممکن است
+    پیامی از دست رفته باشد، قابلیت باید تا اشتراک بعدی غیرفعال بماند.
+    """
+
+    name: str
+    on_message: Callable[[Any], Awaitable[None] | None]
+    channels: tuple[str, ...] = ()
+    patterns: tuple[str, ...] = ()
+    on_subscribed: Callable[[], Awaitable[None] | None] | None = None
+    on_idle: Callable[[], Awaitable[None] | None] | None = None
+    on_reset: Callable[[], None] | None = None
+    # Seconds until on_idle has work due; caps the next read timeout.
+    poll_timeout: Callable[[], float | None] | None = None
+
+
+async def _run_callback(callback: Callable[..., Any] | None, *args: Any) -> None:
+    if callback is None:
+        return
+    result = callback(*args)
+    if inspect.isawaitable(result):
+        await result
+
+
+async def listen_redis_subscription(
+    subscription: RedisSubscription,
+    *,
+    retry_seconds: float = 1.0,
+    poll_seconds: float = 1.0,
+) -> None:
+    """
+    حلقه مشترک listenerهای pub/sub: هر قابلیت وظیفه و اتصال خودش را دارد
+
+    اگر اتصال یا یکی از callbackها خطا بدهد، on_reset اجرا می‌شود و پس از
+    retry_seconds دوباره مشترک می‌شود؛ قابلیت‌های دیگر تحت تأثیر قرار نمی‌گیرند.
+    """
+    while True:
+        redis_client = redis.Redis(connection_pool=pool)
+        pubsub = redis_client.pubsub()
+        try:
+            # Subscribe before the feature resyncs, so nothing published in
+            # between is missed.
+            if subscription.channels:
+                await pubsub.subscribe(*subscription.channels)
+            if subscription.patterns:
+                await pubsub.psubscribe(*subscription.patterns)
+            await _run_callback(subscription.on_subscribed)
+            logger.info(f"🔔 Redis listener subscribed: {subscription.name}")
+            while True:
+                due = subscription.poll_timeout() if subscription.poll_timeout is not None else None
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=poll_seconds if due is None else min(poll_seconds, due),
+                )
+                if message and message.get("type") in ("message", "pmessage"):
+                    await _run_callback(subscription.on_message, message.get("data", ""))
+                await _run_callback(subscription.on_idle)
+        except Exception as e:
+            logger.warning(f"Redis listener ({subscription.name}) stopped: {e}")
+        finally:
+            if subscription.on_reset is not None:
+                subscription.on_reset()
+            try:
+                if subscription.channels:
+                    await pubsub.unsubscribe(*subscription.channels)
+                if subscription.patterns:
+                    await pubsub.punsubscribe(*subscription.patterns)
+                await pubsub.close()
+                await redis_client.aclose()
+            except Exception as e:
+                logger.debug(f"Redis listener ({subscription.name}) cleanup error: {e}")
+        await asyncio.sleep(retry_seconds)
@@ -18,6 +18,12 @@ from sqlalchemy import case, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import aliased, joinedload
 
+from core.chat_search import (
+    chat_search_content_expression,
+    chat_search_like_pattern,
+    clamp_chat_search_limit,
+    normalize_chat_search_text,
+)
 from core.enums import ChatMemberRole, ChatMembershipStatus, ChatType, MessageType
 from core.services.accountant_relation_service import get_active_accountant_relation_for_accountant
 from core.services.customer_relation_service import (
@@ -827,20 +833,32 @@ async def build_direct_message_search_stmt(
     query_text: str,
     other_user_id: int | None = None,
     limit: int = 50,
+    before_id: int | None = None,
 ):
-    """Build the direct-message search query for one user or one direct thread."""
+    """Build the direct-message search query for one user or one direct thread.
+
+    Content is matched through the normalized trigram-indexed expression, and
+    pages are keyset-paginated on ``(created_at, id)`` below ``before_id``.
+    """
+    normalized_query = normalize_chat_search_text(query_text)
+    conditions = [
+        sa.or_(
+            Message.sender_id == current_user_id,
+            Message.receiver_id == current_user_id,
+        ),
+        chat_search_content_expression(Message.content).like(chat_search_like_pattern(normalized_query))
+        if normalized_query
+        else sa.false(),
+        Message.is_deleted.is_(False),
+    ]
+    if before_id is not None:
+        cursor_created_at = select(Message.created_at).where(Message.id == before_id).scalar_subquery()
+        conditions.append(sa.tuple_(Message.created_at, Message.id) < sa.tuple_(cursor_created_at, before_id))
     stmt = (
         select(Message)
-        .where(
-            sa.or_(
-                Message.sender_id == current_user_id,
-                Message.receiver_id == current_user_id,
-            ),
-            Message.content.ilike(f"%{query_text}%"),
-            Message.is_deleted.is_(False),
-        )
-        .order_by(Message.created_at.desc())
-        .limit(limit)
+        .where(*conditions)
+        .order_by(Message.created_at.desc(), Message.id.desc())
+        .limit(clamp_chat_search_limit(limit))
         .options(*build_direct_message_read_options())
     )
     if other_user_id is None:
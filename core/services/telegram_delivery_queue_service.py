@@ -6,7 +6,7 @@ is held open while calling Telegram.
 """
 from __future__ import annotations
 
-from collections.abc import Awaitable, Callable, Mapping
+from collections.abc import Awaitable, Callable, Mapping, Sequence
 from dataclasses import dataclass, replace
 from datetime import datetime, timedelta, timezone
 import hashlib
@@ -72,6 +72,7 @@ from models.telegram_delivery_runtime_gate import TelegramDeliveryRuntimeGate
 TELEGRAM_DELIVERY_QUEUE_WORKER_ID = "telegram-delivery-queue-v1"
 TELEGRAM_PRIMARY_BOT_IDENTITY = "primary"
 TELEGRAM_CHANNEL_EDITOR_BOT_IDENTITY = "channel_editor"
+MAX_TELEGRAM_DELIVERY_CLAIM_BATCH = 100
 TELEGRAM_PUBLISHER_BOT_IDENTITIES = frozenset(TELEGRAM_PUBLISHER_IDENTITIES)
 SUPPORTED_TELEGRAM_BOT_IDENTITIES = frozenset(
     {
@@ -1107,25 +1108,15 @@ async def enqueue_telegram_delivery_job(
     return TelegramDeliveryEnqueueResult(job=record, created=created)
 
 
-async def claim_next_telegram_delivery_job(
+async def _claim_filters_and_order(
     db: AsyncSession,
     *,
-    current_server: str,
-    bot_identity: str,
-    worker_id: str,
-    request_timeout_seconds: float,
-    lease_seconds: float,
-    allowed_destination_classes: set[TelegramDestinationClass] | None = None,
-    maximum_effective_priority: int | None = None,
-    now: datetime | None = None,
-) -> TelegramDeliveryJobRecord | None:
-    _require_foreign(current_server)
-    lane_identity = str(bot_identity or "").strip()
-    if lane_identity not in SUPPORTED_TELEGRAM_BOT_IDENTITIES:
-        raise TelegramDeliveryQueueValidationError("telegram_bot_identity_not_allowlisted")
-    if float(lease_seconds) < float(request_timeout_seconds) + MINIMUM_LEASE_MARGIN_SECONDS:
-        raise TelegramDeliveryQueueValidationError("lease_must_cover_request_timeout_plus_margin")
-    current_time = await _transition_time(db, now)
+    lane_identity: str,
+    current_time: datetime,
+    allowed_destination_classes: set[TelegramDestinationClass] | None,
+    maximum_effective_priority: int | None,
+) -> tuple[list[Any], tuple[Any, ...]]:
+    """Build the claimability predicate and fairness order for one lane."""
     normalized_destination_classes: tuple[TelegramDestinationClass, ...] | None = None
     if allowed_destination_classes is not None:
         normalized_destination_classes = tuple(
@@ -1333,17 +1324,75 @@ async def claim_next_telegram_delivery_job(
                 "maximum_effective_priority_invalid"
             )
         claim_filters.append(effective_priority <= normalized_maximum_priority)
+    ordering = (
+        effective_priority.asc(),
+        effective_rank.asc(),
+        offer_edit_freshness_bucket.asc(),
+        offer_edit_source_order.desc().nullslast(),
+        TelegramDeliveryJobRecord.delivery_deadline_at.asc().nullslast(),
+        TelegramDeliveryJobRecord.enqueued_seq.asc(),
+    )
+    return claim_filters, ordering
+
+
+def _validate_claim_request(
+    current_server: str,
+    bot_identity: str,
+    request_timeout_seconds: float,
+    lease_seconds: float,
+) -> str:
+    _require_foreign(current_server)
+    lane_identity = str(bot_identity or "").strip()
+    if lane_identity not in SUPPORTED_TELEGRAM_BOT_IDENTITIES:
+        raise TelegramDeliveryQueueValidationError("telegram_bot_identity_not_allowlisted")
+    if float(lease_seconds) < float(request_timeout_seconds) + MINIMUM_LEASE_MARGIN_SECONDS:
+        raise TelegramDeliveryQueueValidationError("lease_must_cover_request_timeout_plus_margin")
+    return lane_identity
+
+
+def _lease_claimed_record(
+    record: TelegramDeliveryJobRecord,
+    *,
+    worker_id: str,
+    lease_started_at: datetime,
+    lease_seconds: float,
+) -> None:
+    record.state = TelegramDeliveryState.LEASED
+    record.worker_id = str(worker_id)
+    record.lease_token = int(record.lease_token or 0) + 1
+    record.lease_until = lease_started_at + timedelta(seconds=float(lease_seconds))
+    record.dispatch_started_at = None
+    record.attempt_count = int(record.attempt_count or 0) + 1
+    record.updated_at = lease_started_at
+
+
+async def claim_next_telegram_delivery_job(
+    db: AsyncSession,
+    *,
+    current_server: str,
+    bot_identity: str,
+    worker_id: str,
+    request_timeout_seconds: float,
+    lease_seconds: float,
+    allowed_destination_classes: set[TelegramDestinationClass] | None = None,
+    maximum_effective_priority: int | None = None,
+    now: datetime | None = None,
+) -> TelegramDeliveryJobRecord | None:
+    lane_identity = _validate_claim_request(
+        current_server, bot_identity, request_timeout_seconds, lease_seconds
+    )
+    current_time = await _transition_time(db, now)
+    claim_filters, ordering = await _claim_filters_and_order(
+        db,
+        lane_identity=lane_identity,
+        current_time=current_time,
+        allowed_destination_classes=allowed_destination_classes,
+        maximum_effective_priority=maximum_effective_priority,
+    )
     stmt = (
         select(TelegramDeliveryJobRecord)
         .where(*claim_filters)
-        .order_by(
-            effective_priority.asc(),
-            effective_rank.asc(),
-            offer_edit_freshness_bucket.asc(),
-            offer_edit_source_order.desc().nullslast(),
-            TelegramDeliveryJobRecord.delivery_deadline_at.asc().nullslast(),
-            TelegramDeliveryJobRecord.enqueued_seq.asc(),
-        )
+        .order_by(*ordering)
         .with_for_update(skip_locked=True)
         .limit(1)
     )
@@ -1354,17 +1403,134 @@ async def claim_next_telegram_delivery_job(
     # at an earlier selection/fairness query.  ``clock_timestamp`` advances
     # during a transaction, unlike ``now()``/``transaction_timestamp()``.
     lease_started_at = await _transition_time(db, now)
-    record.state = TelegramDeliveryState.LEASED
-    record.worker_id = str(worker_id)
-    record.lease_token = int(record.lease_token or 0) + 1
-    record.lease_until = lease_started_at + timedelta(seconds=float(lease_seconds))
-    record.dispatch_started_at = None
-    record.attempt_count = int(record.attempt_count or 0) + 1
-    record.updated_at = lease_started_at
+    _lease_claimed_record(
+        record,
+        worker_id=worker_id,
+        lease_started_at=lease_started_at,
+        lease_seconds=lease_seconds,
+    )
     await db.flush()
     return record
 
 
+async def claim_telegram_delivery_jobs(
+    db: AsyncSession,
+    *,
+    current_server: str,
+    bot_identity: str,
+    worker_id: str,
+    request_timeout_seconds: float,
+    lease_seconds: float,
+    max_jobs: int,
+    allowed_destination_classes: set[TelegramDestinationClass] | None = None,
+    maximum_effective_priority: int | None = None,
+    now: datetime | None = None,
+) -> list[TelegramDeliveryJobRecord]:
+    """Lease up to ``max_jobs`` jobs for distinct destinations in one round-trip.
+
+    Each destination contributes only its best job under the single-claim
+    fairness order, and the batch is that order's prefix across destinations,
+    so no two leased jobs can contend for one destination gate.  The feeder
+    fairness state and every blocker predicate are evaluated once per batch.
+    """
+    lane_identity = _validate_claim_request(
+        current_server, bot_identity, request_timeout_seconds, lease_seconds
+    )
+    if (
+        isinstance(max_jobs, bool)
+        or not isinstance(max_jobs, int)
+        or not 1 <= max_jobs <= MAX_TELEGRAM_DELIVERY_CLAIM_BATCH
+    ):
+        raise TelegramDeliveryQueueValidationError("claim_batch_size_invalid")
+    current_time = await _transition_time(db, now)
+    claim_filters, ordering = await _claim_filters_and_order(
+        db,
+        lane_identity=lane_identity,
+        current_time=current_time,
+        allowed_destination_classes=allowed_destination_classes,
+        maximum_effective_priority=maximum_effective_priority,
+    )
+    best_per_destination = (
+        select(TelegramDeliveryJobRecord.id)
+        .where(*claim_filters)
+        .distinct(TelegramDeliveryJobRecord.destination_key)
+        .order_by(TelegramDeliveryJobRecord.destination_key, *ordering)
+    )
+    # The claim predicate is repeated on the locking query so PostgreSQL
+    # rechecks it against any row version committed by a concurrent claimer.
+    stmt = (
+        select(TelegramDeliveryJobRecord)
+        .where(TelegramDeliveryJobRecord.id.in_(best_per_destination), *claim_filters)
+        .order_by(*ordering)
+        .with_for_update(skip_locked=True)
+        .limit(max_jobs)
+    )
+    records = list((await db.execute(stmt)).scalars().all())
+    if not records:
+        return []
+    lease_started_at = await _transition_time(db, now)
+    for record in records:
+        _lease_claimed_record(
+            record,
+            worker_id=worker_id,
+            lease_started_at=lease_started_at,
+            lease_seconds=lease_seconds,
+        )
+    await db.flush()
+    return records
+
+
+async def renew_unstarted_telegram_delivery_leases(
+    db: AsyncSession,
+    *,
+    current_server: str,
+    leases: Sequence[tuple[int, int]],
+    worker_id: str,
+    request_timeout_seconds: float,
+    lease_seconds: float,
+    now: datetime | None = None,
+) -> set[int]:
+    """Restart the lease clock of claimed jobs that are still waiting to dispatch.
+
+    ``leases`` holds ``(job_id, lease_token)`` pairs.  A batch claim leases
+    every job at once but dispatches them in turn, so the jobs still waiting
+    are renewed before each dispatch and none ages past one request.  Only a
+    live, unstarted lease held by ``worker_id`` under the same token is
+    renewed; the ids of the renewed jobs are returned.
+    """
+    _require_foreign(current_server)
+    if float(lease_seconds) < float(request_timeout_seconds) + MINIMUM_LEASE_MARGIN_SECONDS:
+        raise TelegramDeliveryQueueValidationError("lease_must_cover_request_timeout_plus_margin")
+    tokens = {int(job_id): int(lease_token) for job_id, lease_token in leases}
+    if not tokens:
+        return set()
+    current_time = await _transition_time(db, now)
+    records = (
+        await db.execute(
+            select(TelegramDeliveryJobRecord)
+            .where(TelegramDeliveryJobRecord.id.in_(sorted(tokens)))
+            .order_by(TelegramDeliveryJobRecord.id)
+            .with_for_update()
+        )
+    ).scalars().all()
+    renewed: set[int] = set()
+    for record in records:
+        if (
+            _enum_value(record.state) != TelegramDeliveryState.LEASED.value
+            or record.worker_id != str(worker_id)
+            or int(record.lease_token or 0) != tokens[int(record.id)]
+            or record.lease_until is None
+            or record.lease_until <= current_time
+            or record.dispatch_started_at is not None
+        ):
+            continue
+        record.lease_until = current_time + timedelta(seconds=float(lease_seconds))
+        record.updated_at = current_time
+        renewed.add(int(record.id))
+    await db.flush()
+    return renewed
+
+
 async def mark_telegram_delivery_dispatch_started(
     db: AsyncSession,
     *,
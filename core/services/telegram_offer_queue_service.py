@@ -86,6 +86,7 @@ class TelegramOfferQueueHandoffResult:
     action: TelegramDeliveryAction | None
     queue_result: TelegramDeliveryEnqueueResult | None
     skipped_reason: str | None = None
+    coalesced_edits: int = 0
 
 
 @dataclass(slots=True)
@@ -316,7 +317,31 @@ async def _supersede_obsolete_offer_jobs(
     offer_public_id: str,
     source_version: int,
     now: datetime,
+    rerender_action: TelegramDeliveryAction | None = None,
 ) -> int:
+    """Supersede undispatched jobs for the Offer's channel message.
+
+    Every queued job for an older source version is replaced by the render
+    about to be enqueued.  A lifecycle re-render (``rerender_action``) also
+    replaces same-version ACTIVE feeder edits of another action: it renders the
+    same version at a later phase, and its success records that version as
+    rendered, so the skipped edit is never needed.  Returns the number of
+    superseded edits, i.e. Telegram edit requests saved.
+    """
+    obsolete = TelegramDeliveryJobRecord.source_version < source_version
+    if rerender_action is not None:
+        obsolete = or_(
+            obsolete,
+            and_(
+                TelegramDeliveryJobRecord.source_version == source_version,
+                TelegramDeliveryJobRecord.action_kind.in_(
+                    tuple(
+                        (OFFER_ACTIVE_EDIT_ACTIONS & _OFFER_EDIT_FEEDER_ACTIONS)
+                        - {rerender_action}
+                    )
+                ),
+            ),
+        )
     rows = list(
         (
             await db.execute(
@@ -324,7 +349,7 @@ async def _supersede_obsolete_offer_jobs(
                 .where(
                     TelegramDeliveryJobRecord.source_natural_id == offer_public_id,
                     TelegramDeliveryJobRecord.action_kind.in_(tuple(OFFER_FRESHNESS_ACTIONS)),
-                    TelegramDeliveryJobRecord.source_version < source_version,
+                    obsolete,
                     TelegramDeliveryJobRecord.state.in_(
                         (
                             TelegramDeliveryState.PENDING,
@@ -340,10 +365,18 @@ async def _supersede_obsolete_offer_jobs(
     for row in rows:
         row.state = TelegramDeliveryState.SUPERSEDED
         row.next_retry_at = None
-        row.outcome_reason = "offer_queue_newer_source_version"
+        row.outcome_reason = (
+            "offer_queue_newer_source_version"
+            if int(row.source_version) < source_version
+            else "offer_queue_newer_render"
+        )
         row.terminal_at = now
         row.updated_at = now
-    return len(rows)
+    return sum(
+        1
+        for row in rows
+        if TelegramDeliveryAction(row.action_kind) not in OFFER_PUBLISH_ACTIONS
+    )
 
 
 async def _offer_edit_first_enqueued_at(
@@ -424,7 +457,7 @@ async def enqueue_current_offer_delivery(
 
     selected_action = action or offer_delivery_action(offer, state)
     if selected_action is None:
-        await _supersede_obsolete_offer_jobs(
+        coalesced_edits = await _supersede_obsolete_offer_jobs(
             db,
             offer_public_id=offer_public_id,
             source_version=source_version,
@@ -435,6 +468,7 @@ async def enqueue_current_offer_delivery(
             action=None,
             queue_result=None,
             skipped_reason="offer_not_publishable_and_never_published",
+            coalesced_edits=coalesced_edits,
         )
     if selected_action not in OFFER_FRESHNESS_ACTIONS:
         raise TelegramOfferQueueError("telegram_offer_queue_action_not_supported")
@@ -464,11 +498,16 @@ async def enqueue_current_offer_delivery(
                 skipped_reason="offer_publication_deadline_passed",
             )
 
-    await _supersede_obsolete_offer_jobs(
+    coalesced_edits = await _supersede_obsolete_offer_jobs(
         db,
         offer_public_id=offer_public_id,
         source_version=source_version,
         now=current_time,
+        rerender_action=(
+            selected_action
+            if selected_action in _LIFECYCLE_CHANNEL_EDIT_ACTIONS.values()
+            else None
+        ),
     )
     is_publish = selected_action in OFFER_PUBLISH_ACTIONS
     queue_bot_identity = configured_offer_edit_bot_identity()
@@ -560,6 +599,7 @@ async def enqueue_current_offer_delivery(
         offer_public_id=offer_public_id,
         action=selected_action,
         queue_result=queue_result,
+        coalesced_edits=coalesced_edits,
     )
 
 
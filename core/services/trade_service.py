@@ -596,6 +596,18 @@ async def _get_comparable_active_prices(
     offer_type_enum = OfferType.SELL if offer_type == "sell" else OfferType.BUY
     normalized_settlement_type = normalize_settlement_type(settlement_type)
 
+    from core.order_book import order_book
+
+    if order_book.ready:
+        return order_book.index.comparable_prices(
+            commodity_id=commodity_id,
+            offer_type=offer_type_enum,
+            settlement_type=normalized_settlement_type,
+            min_quantity=min_qty,
+            max_quantity=max_qty,
+            exclude_user_id=user_id,
+        )
+
     stmt = select(Offer.price).where(
         Offer.commodity_id == commodity_id,
         Offer.offer_type == offer_type_enum,
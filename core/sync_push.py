@@ -4,7 +4,15 @@ Direct HTTP helper for narrow cross-server relay paths.
 
 Database sync must not use this helper from flush-time model events. Committed
 database changes are delivered by sync_worker from durable change_log rows.
+
+Calls made on an event loop go through an asyncio pipeline owned by that
+loop: a bounded queue, a short micro-batching window and one persistent
+``httpx.AsyncClient`` (HTTP/2 when ``h2`` is installed) with a bounded number
+of concurrent batches.  Calls without a running loop keep the thread-pool
+path.  Either way a rejected, dropped or failed push is never retried here.
 """
+import asyncio
+import importlib.util
 import json
 import time
 import hmac
@@ -15,6 +23,7 @@ import threading
 from concurrent.futures import ThreadPoolExecutor
 import httpx
 
+from core.metrics import record_sync_direct_push, set_sync_direct_push_queue_depth
 from core.sync_transport import assert_runtime_sync_transport_allowed, runtime_sync_tls_verify_setting
 
 logger = logging.getLogger(__name__)
@@ -127,33 +136,37 @@ def _peer_response_is_success(response) -> bool:
     return payload.get("status") in {"success", "ok"} and errors == 0
 
 
+def _signed_sync_request(items: list[dict], api_key: str) -> tuple[str, dict[str, str]]:
+    timestamp = int(time.time())
+    json_body = json.dumps(items, sort_keys=True, default=str)
+
+    message = f"{timestamp}:{json_body}"
+    signature = hmac.new(
+        api_key.encode(),
+        message.encode(),
+        hashlib.sha256
+    ).hexdigest()
+    return json_body, {
+        "Content-Type": "application/json",
+        "X-API-Key": api_key,
+        "X-Timestamp": str(timestamp),
+        "X-Signature": signature
+    }
+
+
 def _do_push(payload: dict, target_url: str, api_key: str):
     """
     Synchronous HTTP push — runs in thread pool.
     Caller decides whether the payload has any durable retry source.
     """
     try:
-        timestamp = int(time.time())
-        items = [payload]
-        json_body = json.dumps(items, sort_keys=True, default=str)
-
-        message = f"{timestamp}:{json_body}"
-        signature = hmac.new(
-            api_key.encode(),
-            message.encode(),
-            hashlib.sha256
-        ).hexdigest()
+        json_body, headers = _signed_sync_request([payload], api_key)
 
         client = _get_client()
         response = client.post(
             f"{target_url}/api/sync/receive",
             content=json_body,
-            headers={
-                "Content-Type": "application/json",
-                "X-API-Key": api_key,
-                "X-Timestamp": str(timestamp),
-                "X-Signature": signature
-            }
+            headers=headers,
         )
 
         if _peer_response_is_success(response):
@@ -168,6 +181,197 @@ def _do_push(payload: dict, target_url: str, api_key: str):
         logger.warning("⚡ Direct push error: %s; retry is caller-owned", e)
 
 
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def _pipeline_setting(name: str, default: float, minimum: float) -> float:
+    from core.config import settings
+
+    try:
+        return max(float(getattr(settings, name, default)), minimum)
+    except (TypeError, ValueError):
+        return default
+
+
+class DirectPushPipeline:
+    """Loop-owned micro-batching sender for direct relay payloads."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.queue_size = int(_pipeline_setting("sync_direct_push_queue_size", 1000, 1))
+        self.batch_size = int(_pipeline_setting("sync_direct_push_batch_size", 50, 1))
+        self.batch_window_seconds = (
+            _pipeline_setting("sync_direct_push_batch_window_ms", 20.0, 0.0) / 1000
+        )
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._in_flight = asyncio.Semaphore(
+            int(_pipeline_setting("sync_direct_push_max_in_flight", 8, 1))
+        )
+        self._sends: set[asyncio.Task] = set()
+        self._sender_task: asyncio.Task | None = None
+        self._client: httpx.AsyncClient | None = None
+        self._client_verify_setting = None
+        # Sends still running on each client; a replaced client closes once its own drain.
+        self._client_sends: dict[httpx.AsyncClient, int] = {}
+
+    def submit(self, payload: dict, target_url: str, api_key: str) -> bool:
+        """Queue one payload without blocking; False when backpressure drops it."""
+        try:
+            self._queue.put_nowait((payload, target_url, api_key))
+        except asyncio.QueueFull:
+            record_sync_direct_push("dropped_queue_full")
+            logger.warning("⚡ Direct push queue full (%s); retry is caller-owned", self.queue_size)
+            return False
+        set_sync_direct_push_queue_depth(self._queue.qsize())
+        if self._sender_task is None or self._sender_task.done():
+            self._sender_task = self.loop.create_task(self._run())
+        return True
+
+    async def _next_batch(self, batch: list[tuple[dict, str, str]]) -> None:
+        batch.append(await self._queue.get())
+        deadline = self.loop.time() + self.batch_window_seconds
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - self.loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        set_sync_direct_push_queue_depth(self._queue.qsize())
+
+    async def _run(self) -> None:
+        batch: list[tuple[dict, str, str]] = []
+        handed_off = 0
+        try:
+            while True:
+                batch, handed_off = [], 0
+                await self._next_batch(batch)
+                groups: dict[tuple[str, str], list[dict]] = {}
+                for payload, target_url, api_key in batch:
+                    groups.setdefault((target_url, api_key), []).append(payload)
+                for (target_url, api_key), payloads in groups.items():
+                    if _target_is_in_cooldown(target_url):
+                        record_sync_direct_push("dropped_cooldown", len(payloads))
+                    else:
+                        # Waiting here is the backpressure: the queue fills
+                        # while every allowed batch is still in flight.
+                        await self._in_flight.acquire()
+                        task = self.loop.create_task(self._send(target_url, api_key, payloads))
+                        self._sends.add(task)
+                        task.add_done_callback(self._sends.discard)
+                    handed_off += len(payloads)
+        except asyncio.CancelledError:
+            # Payloads already taken off the queue are no longer in qsize(),
+            # so aclose() cannot see them; count the undispatched ones here.
+            if len(batch) > handed_off:
+                record_sync_direct_push("dropped_shutdown", len(batch) - handed_off)
+            raise
+
+    async def _acquire_client(self) -> httpx.AsyncClient:
+        assert_runtime_sync_transport_allowed()
+        verify_setting = runtime_sync_tls_verify_setting()
+        retired = None
+        if (
+            self._client is None
+            or self._client.is_closed
+            or self._client_verify_setting != verify_setting
+        ):
+            retired = self._client
+            self._client = httpx.AsyncClient(
+                timeout=5.0,
+                http2=_http2_available(),
+                verify=verify_setting,
+                limits=httpx.Limits(
+                    max_connections=5,
+                    max_keepalive_connections=5,
+                    keepalive_expiry=30
+                )
+            )
+            self._client_verify_setting = verify_setting
+        client = self._client
+        self._client_sends[client] = self._client_sends.get(client, 0) + 1
+        if retired is not None and not retired.is_closed and retired not in self._client_sends:
+            await retired.aclose()
+        return client
+
+    async def _release_client(self, client: httpx.AsyncClient) -> None:
+        remaining = self._client_sends.pop(client) - 1
+        if remaining:
+            self._client_sends[client] = remaining
+        elif client is not self._client:
+            await client.aclose()
+
+    async def _send(self, target_url: str, api_key: str, payloads: list[dict]) -> None:
+        client = None
+        try:
+            json_body, headers = _signed_sync_request(payloads, api_key)
+            client = await self._acquire_client()
+            response = await client.post(
+                f"{target_url}/api/sync/receive",
+                content=json_body,
+                headers=headers,
+            )
+            if _peer_response_is_success(response):
+                _clear_target_cooldown(target_url)
+                record_sync_direct_push("sent", len(payloads))
+                logger.info("⚡ Direct push OK: %s payload(s)", len(payloads))
+            else:
+                _mark_target_cooldown(target_url, f"peer rejected status={response.status_code}")
+                record_sync_direct_push("failed", len(payloads))
+                logger.warning("⚡ Direct push failed (%s); retry is caller-owned", response.status_code)
+        except Exception as e:
+            _mark_target_cooldown(target_url, str(e))
+            record_sync_direct_push("failed", len(payloads))
+            logger.warning("⚡ Direct push error: %s; retry is caller-owned", e)
+        finally:
+            self._in_flight.release()
+            if client is not None:
+                await self._release_client(client)
+
+    async def aclose(self) -> None:
+        """Stop batching, let in-flight batches finish and close the client."""
+        if self._sender_task is not None:
+            self._sender_task.cancel()
+            await asyncio.gather(self._sender_task, return_exceptions=True)
+        if self._sends:
+            await asyncio.gather(*tuple(self._sends), return_exceptions=True)
+        dropped = self._queue.qsize()
+        if dropped:
+            record_sync_direct_push("dropped_shutdown", dropped)
+        set_sync_direct_push_queue_depth(0)
+        if self._client is not None:
+            await self._client.aclose()
+
+
+_pipeline: DirectPushPipeline | None = None
+
+
+def _loop_pipeline() -> DirectPushPipeline | None:
+    """Return the pipeline bound to the running loop, or None off-loop."""
+    global _pipeline
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    if _pipeline is None or _pipeline.loop is not loop:
+        _pipeline = DirectPushPipeline(loop)
+    return _pipeline
+
+
+async def shutdown_direct_push_pipeline() -> None:
+    global _pipeline
+    pipeline, _pipeline = _pipeline, None
+    if pipeline is not None:
+        await pipeline.aclose()
+
+
 def push_sync_direct(payload: dict):
     """
     Submit a non-blocking direct HTTP relay payload.
@@ -191,6 +395,11 @@ def push_sync_direct(payload: dict):
     if _target_is_in_cooldown(target_url):
         return
 
+    pipeline = _loop_pipeline()
+    if pipeline is not None:
+        pipeline.submit(payload, target_url, api_key)
+        return
+
     try:
         _executor.submit(_do_push, payload, target_url, api_key)
     except Exception as e:
@@ -0,0 +1,143 @@
+"""Batch natural-key resolution for bulk ``/api/sync/receive`` batches.
+
+A catch-up batch localizes the same kinds of references over and over
+(``offer_public_id`` -> ``offers.id``, ``trade_number`` -> ``trades.id``,
+``commodity_name`` -> ``commodities.id`` ...).  The receiver registers every
+value it will need up front and the cache resolves each kind with one
+``IN (...)`` query instead of one SELECT per item.
+
+Only positive mappings are served.  A miss always falls back to the caller's
+own SELECT, so rows inserted earlier in the same batch are still found.  Once
+the receiver starts writing a table, that table's kinds go stale and are
+bypassed while the table is being written.  The first lookup from a later
+table re-resolves them in one query.
+"""
+from __future__ import annotations
+
+from contextvars import ContextVar, Token
+import logging
+from typing import Any
+
+from sqlalchemy import select
+
+
+logger = logging.getLogger(__name__)
+
+SYNC_REFERENCE_IN_CHUNK_SIZE = 1000
+
+_sync_reference_cache: ContextVar["SyncReferenceCache | None"] = ContextVar(
+    "sync_reference_cache", default=None
+)
+
+
+def _kind(model: Any, key: str) -> tuple[str, str]:
+    return str(getattr(model, "__tablename__", "") or ""), key
+
+
+def _normalize(model: Any, key: str, value: Any) -> Any | None:
+    """Return ``value`` when the batched IN query compares it like the per-item SELECT would."""
+
+    if value is None or value == "" or isinstance(value, bool):
+        return None
+    column = getattr(model, key, None)
+    try:
+        python_type = column.type.python_type
+    except (AttributeError, NotImplementedError):
+        return None
+    if python_type not in (int, str) or not isinstance(value, python_type):
+        return None
+    return value
+
+
+class SyncReferenceCache:
+    """Request-scoped ``natural key -> local id`` resolver shared by the sync localizers."""
+
+    def __init__(self) -> None:
+        self._models: dict[tuple[str, str], Any] = {}
+        self._wanted: dict[tuple[str, str], set[Any]] = {}
+        self._resolved: dict[tuple[str, str], dict[Any, int]] = {}
+        self._stale: set[tuple[str, str]] = set()
+        self._active_table: str | None = None
+        self.disabled = False
+        self.queries = 0
+        self.hits = 0
+
+    def want(self, model: Any, key: str, value: Any) -> None:
+        normalized = _normalize(model, key, value)
+        if normalized is None:
+            return
+        kind = _kind(model, key)
+        self._models[kind] = model
+        self._wanted.setdefault(kind, set()).add(normalized)
+        self._stale.add(kind)
+
+    def begin_write(self, table: str | None) -> None:
+        """Mark ``table`` as being written; its cached mappings are re-resolved later."""
+
+        self._active_table = table
+        for kind in self._wanted:
+            if kind[0] == table:
+                self._stale.add(kind)
+
+    async def lookup(self, db: Any, model: Any, key: str, value: Any) -> int | None:
+        if self.disabled:
+            return None
+        kind = _kind(model, key)
+        normalized = _normalize(model, key, value)
+        wanted = self._wanted.get(kind)
+        if normalized is None or not wanted or normalized not in wanted:
+            return None
+        if kind[0] == self._active_table:
+            return None
+        if kind in self._stale and not await self._refresh(db, kind):
+            return None
+        local_id = self._resolved.get(kind, {}).get(normalized)
+        if local_id is not None:
+            self.hits += 1
+        return local_id
+
+    async def _refresh(self, db: Any, kind: tuple[str, str]) -> bool:
+        model = self._models[kind]
+        column = getattr(model, kind[1])
+        values = sorted(self._wanted[kind], key=str)
+        resolved: dict[Any, int] = {}
+        try:
+            # A failed statement must not abort the receiver's transaction.
+            async with db.begin_nested():
+                for start in range(0, len(values), SYNC_REFERENCE_IN_CHUNK_SIZE):
+                    result = await db.execute(
+                        select(column, model.id).where(
+                            column.in_(values[start : start + SYNC_REFERENCE_IN_CHUNK_SIZE])
+                        )
+                    )
+                    self.queries += 1
+                    for natural_value, local_id in result.all():
+                        if local_id is not None:
+                            resolved[natural_value] = int(local_id)
+        except Exception as exc:
+            self.disabled = True
+            logger.warning(
+                "Sync reference prefetch failed; falling back to per-item lookups",
+                extra={
+                    "event": "sync.reference_prefetch_failed",
+                    "table": kind[0],
+                    "natural_key": kind[1],
+                    "error_type": type(exc).__name__,
+                },
+            )
+            return False
+        self._resolved[kind] = resolved
+        self._stale.discard(kind)
+        return True
+
+
+def current_sync_reference_cache() -> SyncReferenceCache | None:
+    return _sync_reference_cache.get()
+
+
+def bind_sync_reference_cache(cache: SyncReferenceCache | None) -> Token:
+    return _sync_reference_cache.set(cache)
+
+
+def reset_sync_reference_cache(token: Token) -> None:
+    _sync_reference_cache.reset(token)
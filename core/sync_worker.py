@@ -60,6 +60,7 @@ SYNC_OUTBOUND_TABLE_PRIORITY = (
     "user_blocks",
 )
 SYNC_CHANGE_LOG_POLL_DRAIN_LIMIT = 100
+SYNC_WORKER_MAX_BATCH_SIZE = 200
 SYNC_PEER_REJECTION_MAX_ATTEMPTS = 5
 SYNC_PEER_REJECTION_BACKOFF_SECONDS = (1, 5, 15, 30)
 SYNC_TRANSIENT_PROTOCOL_REJECTION_REASONS = frozenset({"registry_fingerprint_mismatch"})
@@ -93,6 +94,28 @@ class SyncDeliveryFailureState:
     next_attempt_at: datetime | None
 
 
+@dataclass(frozen=True, slots=True)
+class SyncBatchItemOutcome:
+    item: dict
+    delivered: bool
+    terminal_rejection_reason: str | None = None
+    peer_rejection_reason: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class SyncBatchDeliveryResult:
+    claimed: int
+    delivered: int = 0
+    terminal_rejected: int = 0
+    rejected: int = 0
+    attributed: bool = True
+    marked_change_logs: int = 0
+
+    @property
+    def clean(self) -> bool:
+        return self.attributed and self.rejected == 0
+
+
 def summarize_queue_payload(payload: str) -> dict:
     payload_bytes = payload.encode("utf-8", errors="replace")
     return {
@@ -248,6 +271,96 @@ def peer_response_is_policy_forbidden_no_sync(response) -> bool:
     return _single_item_partial_rejection_reason(response) == "policy_forbidden:no-sync"
 
 
+def single_item_delivery_outcome(response, item: dict) -> SyncBatchItemOutcome:
+    """Classify a one-item response with the same rules as the legacy path."""
+    if peer_response_is_success(response):
+        return SyncBatchItemOutcome(item=item, delivered=True)
+    terminal_rejection_detail = terminal_policy_rejection_detail_for_item(response, item)
+    if terminal_rejection_detail is not None:
+        return SyncBatchItemOutcome(
+            item=item,
+            delivered=True,
+            terminal_rejection_reason=str(terminal_rejection_detail.get("reason") or "unknown"),
+        )
+    return SyncBatchItemOutcome(
+        item=item,
+        delivered=False,
+        peer_rejection_reason=peer_rejection_reason_for_item(response, item),
+    )
+
+
+def batch_delivery_outcomes(response, items: list[dict]) -> list[SyncBatchItemOutcome] | None:
+    """Attribute a batch response to each outgoing item.
+
+    Returns None when the receiver answer cannot be attributed item by item
+    (non-200, malformed body, or error details that do not account for every
+    counted error).  Callers must then fall back to one-item delivery so a
+    single poison row is isolated by the normal backoff/quarantine rules.
+    """
+    if len(items) == 1:
+        return [single_item_delivery_outcome(response, items[0])]
+    if getattr(response, "status_code", None) != 200:
+        return None
+    try:
+        payload = response.json()
+    except Exception:
+        return None
+    if not isinstance(payload, dict):
+        return None
+    try:
+        error_count = int(payload.get("errors") or 0)
+    except (TypeError, ValueError):
+        return None
+    status = payload.get("status")
+    if status in {"success", "ok"} and error_count == 0:
+        return [SyncBatchItemOutcome(item=item, delivered=True) for item in items]
+    if status != "partial":
+        return None
+
+    error_items = payload.get("error_items")
+    if not isinstance(error_items, list) or len(error_items) != error_count:
+        return None
+    errors_by_identity: dict[tuple[str, str], dict] = {}
+    for error_item in error_items:
+        if not isinstance(error_item, dict):
+            return None
+        table = error_item.get("table")
+        record_id = error_item.get("record_id")
+        if table is None or record_id is None:
+            return None
+        errors_by_identity[(str(table), str(record_id))] = error_item
+
+    outcomes = []
+    matched_errors = 0
+    for item in items:
+        error_item = errors_by_identity.get((str(item.get("table")), str(item.get("id"))))
+        if error_item is None:
+            outcomes.append(SyncBatchItemOutcome(item=item, delivered=True))
+            continue
+        matched_errors += 1
+        terminal_reason = _terminal_policy_rejection_reason(error_item)
+        if terminal_reason is not None:
+            outcomes.append(
+                SyncBatchItemOutcome(item=item, delivered=True, terminal_rejection_reason=terminal_reason)
+            )
+            continue
+        reason = error_item.get("reason")
+        outcomes.append(
+            SyncBatchItemOutcome(
+                item=item,
+                delivered=False,
+                peer_rejection_reason=(
+                    reason.strip()[:120]
+                    if isinstance(reason, str) and reason.strip()
+                    else "peer_partial_rejection"
+                ),
+            )
+        )
+    if matched_errors != error_count:
+        return None
+    return outcomes
+
+
 def deserialize_change_log_data(raw_data):
     return deserialize_sync_data(raw_data)
 
@@ -280,48 +393,69 @@ def change_log_entry_to_sync_item(entry) -> dict:
     return item
 
 
-async def fetch_next_unsynced_change_log_item() -> dict | None:
-    """Read the oldest committed unsynced change_log row without relying on Redis wake-up."""
-    from core.db import AsyncSessionLocal
-    from models.change_log import ChangeLog
-
-    older_change = aliased(ChangeLog)
+def _deliverable_change_log_stmt(change_log_model, *, limit: int):
+    """Select deliverable rows: oldest unsynced per aggregate, in outbound priority order."""
+    older_change = aliased(change_log_model)
     older_unsynced_same_aggregate = exists(
         select(1).where(
             older_change.synced.is_(False),
-            older_change.table_name == ChangeLog.table_name,
-            older_change.record_id == ChangeLog.record_id,
-            older_change.id < ChangeLog.id,
+            older_change.table_name == change_log_model.table_name,
+            older_change.record_id == change_log_model.record_id,
+            older_change.id < change_log_model.id,
         )
     )
     table_priority = case(
         *[
-            (ChangeLog.table_name == table_name, priority)
+            (change_log_model.table_name == table_name, priority)
             for priority, table_name in enumerate(SYNC_OUTBOUND_TABLE_PRIORITY)
         ],
         else_=len(SYNC_OUTBOUND_TABLE_PRIORITY),
     )
-    async with AsyncSessionLocal() as db:
-        result = await db.execute(
-            select(ChangeLog)
-            .where(
-                ChangeLog.synced.is_(False),
-                ChangeLog.quarantined_at.is_(None),
-                or_(
-                    ChangeLog.next_delivery_attempt_at.is_(None),
-                    ChangeLog.next_delivery_attempt_at <= utc_now(),
-                ),
-                ~older_unsynced_same_aggregate,
-            )
-            .order_by(table_priority, ChangeLog.id.asc())
-            .limit(1)
+    return (
+        select(change_log_model)
+        .where(
+            change_log_model.synced.is_(False),
+            change_log_model.quarantined_at.is_(None),
+            or_(
+                change_log_model.next_delivery_attempt_at.is_(None),
+                change_log_model.next_delivery_attempt_at <= utc_now(),
+            ),
+            ~older_unsynced_same_aggregate,
         )
+        .order_by(table_priority, change_log_model.id.asc())
+        .limit(limit)
+    )
+
+
+async def fetch_next_unsynced_change_log_item() -> dict | None:
+    """Read the oldest committed unsynced change_log row without relying on Redis wake-up."""
+    from core.db import AsyncSessionLocal
+    from models.change_log import ChangeLog
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(_deliverable_change_log_stmt(ChangeLog, limit=1))
         entry = result.scalars().first()
         if entry is None:
             return None
         return change_log_entry_to_sync_item(entry)
 
 
+async def fetch_unsynced_change_log_batch(limit: int) -> list[dict]:
+    """Read up to ``limit`` deliverable change_log rows with one query.
+
+    The older-unsynced guard admits only the head row of each aggregate, so a
+    batch never carries two changes of the same record and per-aggregate order
+    is preserved exactly as in single-row delivery.
+    """
+    from core.db import AsyncSessionLocal
+    from models.change_log import ChangeLog
+
+    bounded_limit = max(1, int(limit))
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(_deliverable_change_log_stmt(ChangeLog, limit=bounded_limit))
+        return [change_log_entry_to_sync_item(entry) for entry in result.scalars().all()]
+
+
 async def mark_change_log_delivered(item: dict) -> int:
     """Mark the local change_log row delivered only after the peer accepts it.
 
@@ -366,6 +500,38 @@ async def mark_change_log_delivered(item: dict) -> int:
         return int(result.rowcount or 0)
 
 
+async def mark_change_log_batch_delivered(items: list[dict]) -> int:
+    """Mark every peer-accepted row of one batch delivered in a single UPDATE."""
+    from core.db import AsyncSessionLocal
+    from models.change_log import ChangeLog
+
+    change_log_ids = sorted(
+        {
+            change_log_id
+            for change_log_id in (coerce_positive_int(item.get("change_log_id")) for item in items)
+            if change_log_id is not None
+        }
+    )
+    if not change_log_ids:
+        return 0
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(ChangeLog)
+            .where(
+                ChangeLog.synced.is_(False),
+                ChangeLog.id.in_(change_log_ids),
+            )
+            .values(
+                synced=True,
+                verified=True,
+                next_delivery_attempt_at=None,
+                quarantined_at=None,
+            )
+        )
+        await db.commit()
+        return int(result.rowcount or 0)
+
+
 async def record_change_log_delivery_failure(
     item: dict,
     *,
@@ -446,20 +612,18 @@ async def requeue_if_needed(
         await redis_client.rpush(retry_queue, payload)
 
 
-async def send_sync_item(
+async def send_sync_batch(
     client: httpx.AsyncClient,
-    item: dict,
+    items: list[dict],
     target_url: str,
     api_key: str,
     *,
     timeout_seconds: float = 10.0,
 ):
-    """Send item to target server with security headers"""
+    """Sign and post several sync items to the peer as one receive body."""
     timestamp = int(time.time())
-    # Prepare payload as list (batch of 1)
-    payload = [item]
-    json_body = json.dumps(payload, sort_keys=True)
-    
+    json_body = json.dumps(list(items), sort_keys=True)
+
     # Create HMAC signature
     message = f"{timestamp}:{json_body}"
     signature = hmac.new(
@@ -467,7 +631,7 @@ async def send_sync_item(
         message.encode(),
         hashlib.sha256
     ).hexdigest()
-    
+
     response = await client.post(
         f"{target_url}/api/sync/receive",
         content=json_body,
@@ -481,6 +645,256 @@ async def send_sync_item(
     )
     return response
 
+
+async def send_sync_item(
+    client: httpx.AsyncClient,
+    item: dict,
+    target_url: str,
+    api_key: str,
+    *,
+    timeout_seconds: float = 10.0,
+):
+    """Send item to target server with security headers"""
+    # Prepare payload as list (batch of 1)
+    return await send_sync_batch(
+        client,
+        [item],
+        target_url,
+        api_key,
+        timeout_seconds=timeout_seconds,
+    )
+
+
+def configured_sync_worker_batch_size() -> int:
+    """Rows per peer request; 1 keeps the historical one-row delivery loop."""
+    try:
+        batch_size = int(getattr(settings, "sync_worker_batch_size", 1) or 1)
+    except (TypeError, ValueError):
+        return 1
+    return max(1, min(batch_size, SYNC_WORKER_MAX_BATCH_SIZE))
+
+
+async def _settle_batch_outcomes(
+    outcomes: list[SyncBatchItemOutcome],
+    *,
+    run_id: str | None,
+    iteration: int,
+) -> tuple[int, int, int, int]:
+    accepted = [outcome.item for outcome in outcomes if outcome.delivered]
+    marked_count = 0
+    if accepted:
+        try:
+            marked_count = await mark_change_log_batch_delivered(accepted)
+        except Exception as marker_err:
+            raise SyncDeliveryMarkerError(error_type=type(marker_err).__name__) from marker_err
+
+    terminal_rejected = 0
+    rejected = 0
+    for outcome in outcomes:
+        item = outcome.item
+        if outcome.terminal_rejection_reason is not None:
+            terminal_rejected += 1
+            record_sync_terminal_policy_rejection(
+                server_mode=current_server(),
+                table=str(item.get("table") or "unknown"),
+                reason=outcome.terminal_rejection_reason,
+            )
+            logger.warning(
+                "Dropped terminal policy-rejected sync item.",
+                extra={
+                    "event": "job.item.dropped_terminal_policy_rejection",
+                    "job_name": "sync_worker",
+                    "run_id": run_id,
+                    "iteration": iteration,
+                    "table": item.get("table"),
+                    "record_id": item.get("id"),
+                    "peer_rejection_reason": outcome.terminal_rejection_reason,
+                },
+            )
+            continue
+        if outcome.delivered:
+            continue
+        rejected += 1
+        failure_state = None
+        if outcome.peer_rejection_reason is not None:
+            try:
+                failure_state = await record_change_log_delivery_failure(
+                    item,
+                    reason=outcome.peer_rejection_reason,
+                )
+            except Exception as failure_record_err:
+                logger.error(
+                    "Could not persist sync delivery failure state",
+                    extra={
+                        "event": "job.item.failure_state_error",
+                        "job_name": "sync_worker",
+                        "run_id": run_id,
+                        "iteration": iteration,
+                        "error_type": type(failure_record_err).__name__,
+                    },
+                )
+        logger.error(
+            "❌ Sync batch item rejected by peer",
+            extra={
+                "event": "job.item.failed",
+                "job_name": "sync_worker",
+                "run_id": run_id,
+                "iteration": iteration,
+                "table": item.get("table"),
+                "record_id": item.get("id"),
+                "change_log_id": item.get("change_log_id"),
+                "peer_rejection_reason": outcome.peer_rejection_reason,
+                "delivery_attempt_count": (
+                    failure_state.attempt_count if failure_state is not None else None
+                ),
+                "change_log_quarantined": (
+                    failure_state.quarantined if failure_state is not None else False
+                ),
+            },
+        )
+        if failure_state is not None and failure_state.quarantined:
+            logger.critical(
+                "Sync change-log row quarantined after repeated peer rejection",
+                extra={
+                    "event": "job.item.quarantined",
+                    "job_name": "sync_worker",
+                    "run_id": run_id,
+                    "change_log_id": failure_state.change_log_id,
+                    "table": item.get("table"),
+                    "record_id": item.get("id"),
+                    "delivery_attempt_count": failure_state.attempt_count,
+                    "peer_rejection_reason": outcome.peer_rejection_reason,
+                },
+            )
+    return len(accepted) - terminal_rejected, terminal_rejected, rejected, marked_count
+
+
+async def deliver_change_log_batch(
+    client: httpx.AsyncClient,
+    target_url: str,
+    api_key: str,
+    *,
+    batch_size: int,
+    iteration: int = 0,
+) -> SyncBatchDeliveryResult:
+    """Claim up to ``batch_size`` deliverable rows and deliver them in one request.
+
+    Rows are marked delivered (or backed off) from the per-item receiver
+    answer.  A response that cannot be attributed item by item leaves every
+    row pending; the caller then replays those rows through one-item delivery,
+    where the receiver's source-sequence watermark turns already-applied rows
+    into idempotent duplicates.
+    """
+    items = await fetch_unsynced_change_log_batch(batch_size)
+    if not items:
+        return SyncBatchDeliveryResult(claimed=0)
+
+    start_time = time.perf_counter()
+    with job_context("sync_worker", iteration=iteration, origin_queue="change_log", sync_batch_size=len(items)) as run_id:
+        response = await send_sync_batch(client, items, target_url, api_key)
+        outcomes = batch_delivery_outcomes(response, items)
+        if outcomes is None:
+            logger.warning(
+                "Sync batch response could not be attributed per item; rows stay pending",
+                extra={
+                    "event": "job.batch.unattributed_response",
+                    "job_name": "sync_worker",
+                    "run_id": run_id,
+                    "iteration": iteration,
+                    "sync_batch_size": len(items),
+                    "duration_ms": duration_ms_since(start_time),
+                    **summarize_peer_response(response),
+                },
+            )
+            return SyncBatchDeliveryResult(claimed=len(items), attributed=False)
+
+        delivered, terminal_rejected, rejected, marked_count = await _settle_batch_outcomes(
+            outcomes,
+            run_id=run_id,
+            iteration=iteration,
+        )
+        logger.info(
+            "✅ Sync batch delivered to peer.",
+            extra={
+                "event": "job.batch.delivered",
+                "job_name": "sync_worker",
+                "run_id": run_id,
+                "iteration": iteration,
+                "sync_batch_size": len(items),
+                "delivered": delivered,
+                "terminal_rejected": terminal_rejected,
+                "rejected": rejected,
+                "marked_change_logs": marked_count,
+                "duration_ms": duration_ms_since(start_time),
+            },
+        )
+    return SyncBatchDeliveryResult(
+        claimed=len(items),
+        delivered=delivered,
+        terminal_rejected=terminal_rejected,
+        rejected=rejected,
+        marked_change_logs=marked_count,
+    )
+
+
+def next_batch_poll_drain_remaining(
+    result: SyncBatchDeliveryResult,
+    *,
+    remaining: int,
+    batch_size: int,
+) -> int:
+    """Rows left in the bounded backlog drain after one batch cycle."""
+    if not result.clean or result.claimed < batch_size:
+        # A short batch means the deliverable backlog is empty; a rejection
+        # stops the drain exactly like a failed single-row delivery.
+        return 0
+    return max(0, remaining - result.claimed)
+
+
+async def run_change_log_batch_cycle(
+    client: httpx.AsyncClient,
+    target_url: str,
+    api_key: str,
+    *,
+    batch_size: int,
+    iteration: int,
+) -> SyncBatchDeliveryResult:
+    """Deliver one batch and apply the worker's backoff rules to its outcome."""
+    try:
+        result = await deliver_change_log_batch(
+            client,
+            target_url,
+            api_key,
+            batch_size=batch_size,
+            iteration=iteration,
+        )
+    except SyncDeliveryMarkerError as marker_err:
+        logger.error(
+            "❌ Sync delivery marker failed after peer acceptance",
+            extra={
+                "event": "job.item.marker_failed",
+                "job_name": "sync_worker",
+                "iteration": iteration,
+                "error_type": marker_err.error_type,
+            },
+        )
+        await asyncio.sleep(1)
+        return SyncBatchDeliveryResult(claimed=0, attributed=False)
+    except httpx.RequestError as req_err:
+        _loop_errors.log(
+            logger,
+            "❌ Network error during sync: %s",
+            req_err,
+            job_name="sync_worker",
+            metric_recorded=True,
+        )
+        await asyncio.sleep(5)
+        return SyncBatchDeliveryResult(claimed=0, attributed=False)
+    if not result.clean:
+        await asyncio.sleep(1)
+    return result
+
+
 async def main():
     assert_background_job_authority(JOB_SYNC_WORKER)
     logger.info("🚀 Starting Sync Worker...")
@@ -507,6 +921,13 @@ async def main():
     if not target_url or not api_key:
         logger.warning(f"⚠️ Sync Worker not fully configured. URL={target_url}, API_Key={'***' if api_key else 'None'}")
     
+    # Batched delivery claims several aggregate heads per request.  After a
+    # batch answer that cannot be attributed per item, the same number of
+    # rows is replayed through the one-row path to isolate the culprit.
+    batch_size = configured_sync_worker_batch_size()
+    batch_mode = batch_size > 1 and bool(target_url) and bool(api_key)
+    single_item_fallback_remaining = 0
+
     assert_runtime_sync_transport_allowed()
     async with httpx.AsyncClient(verify=runtime_sync_tls_verify_setting()) as client:
         iteration = 0
@@ -539,7 +960,18 @@ async def main():
                             },
                         )
                 should_requeue = True
+                use_batch = batch_mode and single_item_fallback_remaining <= 0
                 if poll_drain_remaining > 0:
+                    if use_batch:
+                        batch_result = await run_change_log_batch_cycle(
+                            client, target_url, api_key, batch_size=batch_size, iteration=iteration
+                        )
+                        single_item_fallback_remaining = 0 if batch_result.attributed else batch_result.claimed
+                        poll_drain_remaining = next_batch_poll_drain_remaining(
+                            batch_result, remaining=poll_drain_remaining, batch_size=batch_size
+                        )
+                        continue
+                    single_item_fallback_remaining = max(0, single_item_fallback_remaining - 1)
                     data = await fetch_next_unsynced_change_log_item()
                     if data is None:
                         poll_drain_remaining = 0
@@ -554,6 +986,16 @@ async def main():
                     # delivery must be built from committed change_log rows.
                     res = await r.blpop(queue_poll_order(iteration), timeout=5)
                     if not res:
+                        if use_batch:
+                            batch_result = await run_change_log_batch_cycle(
+                                client, target_url, api_key, batch_size=batch_size, iteration=iteration
+                            )
+                            single_item_fallback_remaining = 0 if batch_result.attributed else batch_result.claimed
+                            poll_drain_remaining = next_batch_poll_drain_remaining(
+                                batch_result, remaining=SYNC_CHANGE_LOG_POLL_DRAIN_LIMIT, batch_size=batch_size
+                            )
+                            continue
+                        single_item_fallback_remaining = max(0, single_item_fallback_remaining - 1)
                         data = await fetch_next_unsynced_change_log_item()
                         if data is None:
                             continue
@@ -563,7 +1005,29 @@ async def main():
                         should_requeue = False
                     else:
                         origin_queue, payload = res
+                        if origin_queue == queue_name and use_batch:
+                            batch_result = await run_change_log_batch_cycle(
+                                client, target_url, api_key, batch_size=batch_size, iteration=iteration
+                            )
+                            if batch_result.claimed == 0 and batch_result.attributed:
+                                logger.info(
+                                    "Dropped outbound sync wake-up with no committed change_log row.",
+                                    extra={
+                                        "event": "job.item.outbound_wakeup_no_committed_change",
+                                        "job_name": "sync_worker",
+                                        "origin_queue": origin_queue,
+                                        **summarize_queue_payload(payload),
+                                    },
+                                )
+                            single_item_fallback_remaining = 0 if batch_result.attributed else batch_result.claimed
+                            poll_drain_remaining = next_batch_poll_drain_remaining(
+                                batch_result,
+                                remaining=max(poll_drain_remaining, SYNC_CHANGE_LOG_POLL_DRAIN_LIMIT),
+                                batch_size=batch_size,
+                            )
+                            continue
                         if origin_queue == queue_name:
+                            single_item_fallback_remaining = max(0, single_item_fallback_remaining - 1)
                             data = await fetch_next_unsynced_change_log_item()
                             if data is None:
                                 logger.info(
@@ -261,7 +261,7 @@ class TelegramDeliveryCredentialRegistry:
         }
 
     def build_gateway_calls(self) -> dict[str, Any]:
-        def bind(credential: TelegramDeliveryCredential):
+        def bind(identity: str, credential: TelegramDeliveryCredential):
             async def call(
                 method,
                 payload,
@@ -275,6 +275,7 @@ class TelegramDeliveryCredentialRegistry:
                     timeout=timeout,
                     bot_token=credential.token,
                     idempotency_key=idempotency_key,
+                    bot_identity=identity,
                 )
 
             return call
@@ -282,7 +283,7 @@ class TelegramDeliveryCredentialRegistry:
         calls: dict[str, Any] = {}
         for identity in self.bot_identities:
             credential = self.resolve(identity)
-            calls[identity] = bind(credential)
+            calls[identity] = bind(identity, credential)
         return calls
 
 
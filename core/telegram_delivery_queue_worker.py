@@ -8,6 +8,7 @@ Stage 3 freshness and feeder work keeps runtime capability false.
 from __future__ import annotations
 
 import asyncio
+from collections import deque
 from collections.abc import Awaitable, Callable, Mapping, Sequence
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -35,11 +36,12 @@ from core.services.telegram_delivery_queue_service import (
     SUPPORTED_TELEGRAM_BOT_IDENTITIES,
     TELEGRAM_CHANNEL_EDITOR_BOT_IDENTITY,
     TELEGRAM_DELIVERY_QUEUE_WORKER_ID,
+    MAX_TELEGRAM_DELIVERY_CLAIM_BATCH,
     TELEGRAM_PRIMARY_BOT_IDENTITY,
     TelegramDeliveryDispatchDeferredError,
     TelegramDeliveryQueueValidationError,
     apply_telegram_delivery_freshness_result,
-    claim_next_telegram_delivery_job,
+    claim_telegram_delivery_jobs,
     defer_unstarted_telegram_delivery_lease,
     load_active_telegram_limiter_evidence,
     load_incomplete_telegram_resume_destination_keys,
@@ -49,6 +51,7 @@ from core.services.telegram_delivery_queue_service import (
     record_telegram_provider_outcome_apply_failure,
     recover_expired_telegram_delivery_leases,
     release_unstarted_telegram_delivery_lease,
+    renew_unstarted_telegram_delivery_leases,
     apply_telegram_delivery_provider_outcome,
     telegram_delivery_database_now,
 )
@@ -128,6 +131,7 @@ _PROVIDER_OUTCOME_PERSISTENCE_RETRY_MAX_SECONDS = 5.0
 _DISPATCH_MARK_TRANSIENT_RETRY_ATTEMPTS = 3
 _DISPATCH_MARK_TRANSIENT_RETRY_BASE_SECONDS = 0.05
 _RETENTION_INTERVAL_SECONDS = 3600.0
+_LANE_HTTP_POOL_HEADROOM = 2
 # Provider responses that have been received but not yet committed are an
 # in-process fail-stop barrier.  Slots from the same role must not claim past a
 # known provider fact, and lease recovery must not race that fact into an
@@ -574,6 +578,11 @@ def _worker_batch_limit(limit: int | None = None) -> int:
     return max(1, int(configured))
 
 
+def _claim_batch_size() -> int:
+    configured = getattr(settings, "telegram_delivery_queue_worker_claim_batch_size", 4)
+    return max(1, min(MAX_TELEGRAM_DELIVERY_CLAIM_BATCH, int(configured)))
+
+
 def _worker_interval_seconds() -> float:
     return max(
         0.1,
@@ -912,6 +921,73 @@ async def _defer_for_dispatch_limit(
         return deferred
 
 
+async def _next_leased_job(
+    leased: deque[TelegramDeliveryJobRecord],
+    *,
+    lane_identity: str,
+    worker_id: str,
+    max_jobs: int,
+    allowed_destination_classes: set[TelegramDestinationClass] | None,
+    maximum_effective_priority: int | None,
+) -> TelegramDeliveryJobRecord | None:
+    """Take the next job of the slot's claim batch, claiming a batch when empty.
+
+    Every job of a batch is leased at claim time but dispatched in turn, so the
+    jobs still waiting have their leases renewed before each one is taken.  A
+    job whose lease was lost meanwhile is dropped; lease recovery owns it.
+    """
+    while leased:
+        async with AsyncSessionLocal() as db:
+            renewed = await renew_unstarted_telegram_delivery_leases(
+                db,
+                current_server=current_server(),
+                leases=[(int(job.id), int(job.lease_token)) for job in leased],
+                worker_id=worker_id,
+                request_timeout_seconds=_request_timeout_seconds(),
+                lease_seconds=_lease_seconds(),
+            )
+            await db.commit()
+        waiting = [job for job in leased if int(job.id) in renewed]
+        leased.clear()
+        leased.extend(waiting)
+        if leased:
+            return leased.popleft()
+    async with AsyncSessionLocal() as db:
+        jobs = await claim_telegram_delivery_jobs(
+            db,
+            current_server=current_server(),
+            bot_identity=lane_identity,
+            worker_id=worker_id,
+            request_timeout_seconds=_request_timeout_seconds(),
+            lease_seconds=_lease_seconds(),
+            max_jobs=max_jobs,
+            allowed_destination_classes=allowed_destination_classes,
+            maximum_effective_priority=maximum_effective_priority,
+        )
+        if not jobs:
+            await db.rollback()
+            return None
+        await db.commit()
+    leased.extend(jobs[1:])
+    return jobs[0]
+
+
+async def _return_unreached_claims(
+    leased: deque[TelegramDeliveryJobRecord],
+    *,
+    worker_id: str,
+) -> None:
+    while leased:
+        job = leased.popleft()
+        await _defer_for_dispatch_limit(
+            job_id=int(job.id),
+            worker_id=worker_id,
+            lease_token=int(job.lease_token),
+            retry_seconds=0.001,
+            reason="claim_batch_unreached",
+        )
+
+
 async def _release_unused_rate_limit_probe(
     *,
     dispatch_limiter: TelegramDeliveryDispatchLimiter,
@@ -1176,22 +1252,20 @@ async def run_telegram_delivery_queue_cycle(
             stale_fence_count=0,
         )
 
-    for _ in range(_worker_batch_limit(limit)):
-        async with AsyncSessionLocal() as db:
-            job = await claim_next_telegram_delivery_job(
-                db,
-                current_server=current_server(),
-                bot_identity=lane_identity,
-                worker_id=active_worker_id,
-                request_timeout_seconds=_request_timeout_seconds(),
-                lease_seconds=_lease_seconds(),
-                allowed_destination_classes=allowed_destination_classes,
-                maximum_effective_priority=maximum_effective_priority,
-            )
-            if job is None:
-                await db.rollback()
-                break
-            await db.commit()
+    # Jobs of the current claim batch that are leased but not yet reached.
+    leased: deque[TelegramDeliveryJobRecord] = deque()
+    budget = _worker_batch_limit(limit)
+    for index in range(budget):
+        job = await _next_leased_job(
+            leased,
+            lane_identity=lane_identity,
+            worker_id=active_worker_id,
+            max_jobs=min(budget - index, _claim_batch_size()),
+            allowed_destination_classes=allowed_destination_classes,
+            maximum_effective_priority=maximum_effective_priority,
+        )
+        if job is None:
+            break
 
         job_id = int(job.id)
         lease_token = int(job.lease_token)
@@ -1601,6 +1675,9 @@ async def run_telegram_delivery_queue_cycle(
         # treating a future observation as a member of the current window.
         await dispatch_limiter.observe(job, limiter_decision, now=utc_now())
 
+    # A cycle that stopped early hands the rest of its batch straight back.
+    await _return_unreached_claims(leased, worker_id=active_worker_id)
+
     return TelegramDeliveryQueueCycleReport(
         bot_identity=lane_identity,
         processed_count=processed_count,
@@ -1633,7 +1710,7 @@ async def _telegram_delivery_queue_lane_slot_loop(
             "slot_index": slot_index,
             "maximum_effective_priority": maximum_effective_priority,
             "interval_seconds": idle_poll_interval,
-            "batch_limit": 1,
+            "batch_limit": _claim_batch_size(),
         },
     )
     iteration = 0
@@ -1647,7 +1724,7 @@ async def _telegram_delivery_queue_lane_slot_loop(
             try:
                 report = await run_telegram_delivery_queue_cycle(
                     bot_identity=lane.bot_identity,
-                    limit=1,
+                    limit=_claim_batch_size(),
                     freshness_validator=lane.freshness_validator,
                     lifecycle_feedback=lane.lifecycle_feedback,
                     gateway_call=lane.gateway_call,
@@ -1713,6 +1790,17 @@ async def _telegram_delivery_queue_lane_slot_loop(
             )
 
 
+def _size_lane_http_pool(
+    bot_identity: str,
+    slot_plan: tuple[tuple[str, int | None], ...],
+) -> None:
+    """Give each lane slot a keep-alive connection, plus headroom for retries."""
+    telegram_gateway.telegram_http_clients.configure_identity(
+        bot_identity,
+        max_connections=len(slot_plan) + _LANE_HTTP_POOL_HEADROOM,
+    )
+
+
 async def telegram_delivery_queue_lane_loop(
     lane: TelegramDeliveryQueueLaneSpec,
 ) -> None:
@@ -1720,6 +1808,7 @@ async def telegram_delivery_queue_lane_loop(
     assert_background_job_authority(JOB_TELEGRAM_DELIVERY_QUEUE)
     _assert_queue_runtime_owner()
     slot_plan = _lane_slot_plan(lane.bot_identity)
+    _size_lane_http_pool(lane.bot_identity, slot_plan)
     logger.info(
         "Telegram delivery execution lane started",
         extra={
@@ -1789,6 +1878,7 @@ async def telegram_delivery_private_only_lane_loop(
         return
 
     slot_plan = _lane_slot_plan(lane.bot_identity)
+    _size_lane_http_pool(lane.bot_identity, slot_plan)
     tasks = [
         asyncio.create_task(
             _telegram_delivery_queue_lane_slot_loop(
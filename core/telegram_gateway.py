@@ -2,22 +2,33 @@
 
 Telegram execution is foreign-only. Iran may create durable product data or
 sync intent, but it must not call Telegram directly.
+
+Bot API calls reuse long-lived keep-alive HTTP clients from
+``telegram_http_clients``, one per bot identity and token (and per event loop
+for the async path), so a busy lane does not pay a TCP and TLS handshake per
+message.  Each request records connect, TLS and server time per identity.
 """
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Mapping
 from dataclasses import dataclass
 import base64
 import binascii
 import hashlib
+import importlib.util
 import json
 import logging
 import os
+import threading
+import time
 from typing import Any, Optional
+import weakref
 
 import httpx
 
 from core.config import settings
+from core.metrics import observe_telegram_http_phase
 from core.server_routing import SERVER_FOREIGN, current_server
 from core.telegram_delivery_runtime_policy import (
     TelegramProviderAuthorityError,
@@ -31,6 +42,7 @@ TELEGRAM_MESSAGE_NOT_MODIFIED = "message is not modified"
 _MISSING = object()
 _CORRELATION_HASH_DOMAIN = b"telegram-delivery-correlation-v1\x00"
 _MAX_DOCUMENT_BYTES = 5 * 1024 * 1024
+DEFAULT_TELEGRAM_BOT_IDENTITY = "default"
 
 
 class TelegramGatewaySurfaceError(RuntimeError):
@@ -60,6 +72,183 @@ class TelegramGatewayResult:
         return None
 
 
+class _TelegramRequestTrace:
+    """httpcore trace callback that splits one request into connect, TLS and server time."""
+
+    __slots__ = ("bot_identity", "_started")
+
+    def __init__(self, bot_identity: str) -> None:
+        self.bot_identity = bot_identity
+        self._started: dict[str, float] = {}
+
+    def __call__(self, event_name: str, _info: Any = None) -> None:
+        now = time.perf_counter()
+        if event_name.endswith("send_request_headers.started"):
+            self._started["server"] = now
+        elif event_name.endswith("receive_response_headers.complete"):
+            self._observe("server", now)
+        elif event_name == "connection.connect_tcp.started":
+            self._started["connect"] = now
+        elif event_name == "connection.connect_tcp.complete":
+            self._observe("connect", now)
+        elif event_name == "connection.start_tls.started":
+            self._started["tls"] = now
+        elif event_name == "connection.start_tls.complete":
+            self._observe("tls", now)
+
+    async def async_callback(self, event_name: str, info: Any = None) -> None:
+        self(event_name, info)
+
+    def _observe(self, phase: str, now: float) -> None:
+        started = self._started.pop(phase, None)
+        if started is not None:
+            observe_telegram_http_phase(
+                bot_identity=self.bot_identity,
+                phase=phase,
+                duration_ms=(now - started) * 1000,
+            )
+
+
+class _TracingAsyncTransport(httpx.AsyncHTTPTransport):
+    def __init__(self, *, bot_identity: str, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.bot_identity = bot_identity
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.extensions["trace"] = _TelegramRequestTrace(self.bot_identity).async_callback
+        return await super().handle_async_request(request)
+
+
+class _TracingTransport(httpx.HTTPTransport):
+    def __init__(self, *, bot_identity: str, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.bot_identity = bot_identity
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.extensions["trace"] = _TelegramRequestTrace(self.bot_identity)
+        return super().handle_request(request)
+
+
+@dataclass(slots=True)
+class _PooledTelegramClient:
+    client: Any
+    # The factory that built the client; a different installed factory
+    # (a test double, or a reloaded httpx) gets a fresh client.
+    factory: Any
+
+
+def _telegram_http2_enabled() -> bool:
+    if not bool(getattr(settings, "telegram_http2_enabled", False)):
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning(
+            "Telegram HTTP/2 requested but the h2 package is not installed; using HTTP/1.1",
+            extra={"event": "telegram.gateway_http2_unavailable"},
+        )
+        return False
+    return True
+
+
+class TelegramHttpClientRegistry:
+    """Long-lived Bot API HTTP clients keyed by bot identity and token."""
+
+    def __init__(self) -> None:
+        self._async_clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[tuple[str, str], _PooledTelegramClient]
+        ] = weakref.WeakKeyDictionary()
+        self._sync_clients: dict[tuple[str, str], _PooledTelegramClient] = {}
+        self._connection_limits: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def configure_identity(self, bot_identity: str, *, max_connections: int) -> None:
+        """Size the pool for ``bot_identity``; applies to clients built afterwards."""
+        self._connection_limits[str(bot_identity)] = max(1, int(max_connections))
+
+    def connection_limit(self, bot_identity: str) -> int:
+        configured = self._connection_limits.get(str(bot_identity))
+        if configured is not None:
+            return configured
+        return max(1, int(getattr(settings, "telegram_http_max_connections", 8)))
+
+    def _transport_options(self, bot_identity: str) -> dict[str, Any]:
+        max_connections = self.connection_limit(bot_identity)
+        return {
+            "bot_identity": bot_identity,
+            "http2": _telegram_http2_enabled(),
+            "limits": httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=float(getattr(settings, "telegram_http_keepalive_expiry_seconds", 60.0)),
+            ),
+        }
+
+    def async_client(self, token: str, *, bot_identity: str) -> httpx.AsyncClient:
+        key = (bot_identity, _delivery_correlation_hash(token) or "")
+        clients = self._async_clients.setdefault(asyncio.get_running_loop(), {})
+        pooled = clients.get(key)
+        if pooled is None or pooled.factory is not httpx.AsyncClient:
+            pooled = _PooledTelegramClient(
+                client=httpx.AsyncClient(
+                    transport=_TracingAsyncTransport(**self._transport_options(bot_identity)),
+                ),
+                factory=httpx.AsyncClient,
+            )
+            clients[key] = pooled
+        return pooled.client
+
+    def sync_client(self, token: str, *, bot_identity: str) -> httpx.Client:
+        key = (bot_identity, _delivery_correlation_hash(token) or "")
+        with self._lock:
+            pooled = self._sync_clients.get(key)
+            if pooled is None or pooled.factory is not httpx.Client:
+                pooled = _PooledTelegramClient(
+                    client=httpx.Client(transport=_TracingTransport(**self._transport_options(bot_identity))),
+                    factory=httpx.Client,
+                )
+                self._sync_clients[key] = pooled
+            return pooled.client
+
+    async def aclose(self) -> None:
+        """Close the current loop's async clients and every sync client."""
+        try:
+            clients = self._async_clients.pop(asyncio.get_running_loop(), {})
+        except RuntimeError:
+            clients = {}
+        for pooled in clients.values():
+            try:
+                await pooled.client.aclose()
+            except Exception as exc:
+                logger.debug(
+                    "Telegram HTTP client close failed",
+                    extra={"event": "telegram.gateway_client_close_failed", "error_class": type(exc).__name__},
+                )
+        self.close_sync()
+
+    def close_sync(self) -> None:
+        with self._lock:
+            clients, self._sync_clients = self._sync_clients, {}
+        for pooled in clients.values():
+            try:
+                pooled.client.close()
+            except Exception as exc:
+                logger.debug(
+                    "Telegram HTTP client close failed",
+                    extra={"event": "telegram.gateway_client_close_failed", "error_class": type(exc).__name__},
+                )
+
+
+telegram_http_clients = TelegramHttpClientRegistry()
+
+
+async def close_telegram_http_clients() -> None:
+    """Shutdown hook for processes that call the Bot API through this gateway."""
+    await telegram_http_clients.aclose()
+
+
+def _client_identity(bot_identity: Optional[str]) -> str:
+    return str(bot_identity or DEFAULT_TELEGRAM_BOT_IDENTITY)
+
+
 def assert_telegram_execution_surface(*, operation: str = "telegram") -> None:
     server = current_server()
     if server != SERVER_FOREIGN:
@@ -200,6 +389,7 @@ async def post_telegram_method(
     timeout: float = 10,
     bot_token: Optional[str] = None,
     idempotency_key: Optional[str] = None,
+    bot_identity: Optional[str] = None,
 ) -> TelegramGatewayResult:
     """Execute one Telegram Bot API method through the approved async path."""
     assert_telegram_execution_surface(operation=method)
@@ -214,21 +404,21 @@ async def post_telegram_method(
 
     response = None
     try:
-        async with httpx.AsyncClient() as client:
-            if method == "sendDocument":
-                data, files = _document_multipart_payload(payload)
-                response = await client.post(
-                    f"{TELEGRAM_API_BASE_URL}/bot{token}/{method}",
-                    data=data,
-                    files=files,
-                    timeout=timeout,
-                )
-            else:
-                response = await client.post(
-                    f"{TELEGRAM_API_BASE_URL}/bot{token}/{method}",
-                    json=_json_request_payload(payload),
-                    timeout=timeout,
-                )
+        client = telegram_http_clients.async_client(token, bot_identity=_client_identity(bot_identity))
+        if method == "sendDocument":
+            data, files = _document_multipart_payload(payload)
+            response = await client.post(
+                f"{TELEGRAM_API_BASE_URL}/bot{token}/{method}",
+                data=data,
+                files=files,
+                timeout=timeout,
+            )
+        else:
+            response = await client.post(
+                f"{TELEGRAM_API_BASE_URL}/bot{token}/{method}",
+                json=_json_request_payload(payload),
+                timeout=timeout,
+            )
     except Exception as exc:
         received_response = (
             response if response is not None else getattr(exc, "response", None)
@@ -273,6 +463,7 @@ def post_telegram_method_sync(
     timeout: float = 10,
     bot_token: Optional[str] = None,
     idempotency_key: Optional[str] = None,
+    bot_identity: Optional[str] = None,
 ) -> TelegramGatewayResult:
     """Execute one Telegram Bot API method through the approved sync path."""
     assert_telegram_execution_surface(operation=method)
@@ -287,16 +478,17 @@ def post_telegram_method_sync(
 
     response = None
     try:
+        client = telegram_http_clients.sync_client(token, bot_identity=_client_identity(bot_identity))
         if method == "sendDocument":
             data, files = _document_multipart_payload(payload)
-            response = httpx.post(
+            response = client.post(
                 f"{TELEGRAM_API_BASE_URL}/bot{token}/{method}",
                 data=data,
                 files=files,
                 timeout=timeout,
             )
         else:
-            response = httpx.post(
+            response = client.post(
                 f"{TELEGRAM_API_BASE_URL}/bot{token}/{method}",
                 json=_json_request_payload(payload),
                 timeout=timeout,
@@ -13,6 +13,7 @@ from core.background_job_authority import (
 from core.config import settings
 from core.db import AsyncSessionLocal
 from core.job_logging import RepeatedErrorLogger, duration_ms_since, job_context
+from core.metrics import record_telegram_offer_edits_coalesced
 from core.server_routing import current_server
 from core.services.cross_server_recovery_service import active_publication_is_gated
 from core.services.telegram_offer_queue_service import (
@@ -44,6 +45,7 @@ class TelegramOfferQueueFeederReport:
     deduplicated: int = 0
     skipped: int = 0
     invalid: int = 0
+    coalesced_edits: int = 0
     publication_gated: bool = False
 
 
@@ -74,11 +76,12 @@ async def _handoff_candidates(
     expected_channel_id: int,
     offer_expiry_minutes: int,
     now,
-) -> tuple[int, int, int, int]:
+) -> tuple[int, int, int, int, int]:
     handed_off = 0
     deduplicated = 0
     skipped = 0
     invalid = 0
+    coalesced = 0
     for candidate in candidates:
         try:
             # Keep all candidate row locks until the batch commit, while one
@@ -93,6 +96,7 @@ async def _handoff_candidates(
                     offer_expiry_minutes=offer_expiry_minutes,
                     now=now,
                 )
+            coalesced += result.coalesced_edits
             if result.queue_result is None:
                 skipped += 1
             elif result.queue_result.created:
@@ -112,7 +116,7 @@ async def _handoff_candidates(
                 },
             )
     await db.commit()
-    return handed_off, deduplicated, skipped, invalid
+    return handed_off, deduplicated, skipped, invalid, coalesced
 
 
 async def _handoff_lifecycle_candidates(
@@ -121,11 +125,12 @@ async def _handoff_lifecycle_candidates(
     expected_channel_id: int,
     offer_expiry_minutes: int,
     now,
-) -> tuple[int, int, int, int]:
+) -> tuple[int, int, int, int, int]:
     handed_off = 0
     deduplicated = 0
     skipped = 0
     invalid = 0
+    coalesced = 0
     try:
         async with db.begin_nested():
             results = await enqueue_offer_lifecycle_channel_handoffs(
@@ -146,9 +151,10 @@ async def _handoff_lifecycle_candidates(
             },
         )
         await db.commit()
-        return handed_off, deduplicated, skipped, invalid
+        return handed_off, deduplicated, skipped, invalid, coalesced
 
     for result in results:
+        coalesced += result.coalesced_edits
         if result.queue_result is None:
             skipped += 1
         elif result.queue_result.created:
@@ -156,7 +162,7 @@ async def _handoff_lifecycle_candidates(
         else:
             deduplicated += 1
     await db.commit()
-    return handed_off, deduplicated, skipped, invalid
+    return handed_off, deduplicated, skipped, invalid, coalesced
 
 
 async def run_telegram_offer_queue_handoff_cycle() -> TelegramOfferQueueFeederReport:
@@ -175,9 +181,9 @@ async def run_telegram_offer_queue_handoff_cycle() -> TelegramOfferQueueFeederRe
         raise RuntimeError("telegram_offer_queue_expiry_invalid")
 
     publication_gated = await active_publication_is_gated()
-    publication_counts = (0, 0, 0, 0)
-    edit_counts = (0, 0, 0, 0)
-    lifecycle_counts = (0, 0, 0, 0)
+    publication_counts = (0, 0, 0, 0, 0)
+    edit_counts = (0, 0, 0, 0, 0)
+    lifecycle_counts = (0, 0, 0, 0, 0)
     async with AsyncSessionLocal() as db:
         if not publication_gated:
             publication_now = await telegram_delivery_database_now(db)
@@ -222,6 +228,9 @@ async def run_telegram_offer_queue_handoff_cycle() -> TelegramOfferQueueFeederRe
             now=lifecycle_now,
         )
 
+    # Counted only after every handoff batch committed its supersession.
+    coalesced_edits = publication_counts[4] + edit_counts[4] + lifecycle_counts[4]
+    record_telegram_offer_edits_coalesced(coalesced_edits)
     return TelegramOfferQueueFeederReport(
         publication_handoffs=publication_counts[0],
         edit_handoffs=edit_counts[0],
@@ -229,6 +238,7 @@ async def run_telegram_offer_queue_handoff_cycle() -> TelegramOfferQueueFeederRe
         deduplicated=publication_counts[1] + edit_counts[1] + lifecycle_counts[1],
         skipped=publication_counts[2] + edit_counts[2] + lifecycle_counts[2],
         invalid=publication_counts[3] + edit_counts[3] + lifecycle_counts[3],
+        coalesced_edits=coalesced_edits,
         publication_gated=publication_gated,
     )
 
@@ -251,6 +261,7 @@ async def telegram_offer_queue_handoff_loop() -> None:
                         report.deduplicated,
                         report.skipped,
                         report.invalid,
+                        report.coalesced_edits,
                     )
                 ):
                     logger.info(
@@ -266,6 +277,7 @@ async def telegram_offer_queue_handoff_loop() -> None:
                             "deduplicated": report.deduplicated,
                             "skipped": report.skipped,
                             "invalid": report.invalid,
+                            "coalesced_edits": report.coalesced_edits,
                             "publication_gated": report.publication_gated,
                             "duration_ms": duration_ms_since(started),
                         },
@@ -11,6 +11,7 @@ import json
 import logging
 import time
 import asyncio
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from threading import Thread
@@ -26,6 +27,7 @@ __all__ = [
     "save_trading_settings_async",
     "get_setting",
     "update_setting_async",
+    "run_trading_settings_snapshot",
 ]
 
 logger = logging.getLogger(__name__)
@@ -37,6 +39,9 @@ SETTINGS_FILE = Path(__file__).parent.parent / "trading_settings.json"
 REDIS_CACHE_KEY = "trading_settings:cache"
 CACHE_TTL_SECONDS = 60  # کش هر 60 ثانیه منقضی می‌شود
 
+# اعلام تغییر تنظیمات به snapshot درون‌پردازه‌ای workerها
+SETTINGS_CHANGED_CHANNEL = "events:trading_settings:changed"
+
 
 class TradingSettings(BaseModel):
     """تنظیمات سیستم معاملاتی"""
@@ -105,6 +110,20 @@ _sync_redis_client: Any = None
 _sync_engine: Any = None
 
 
+# ===== IN-PROCESS SNAPSHOT =====
+# run_trading_settings_snapshot این snapshot را تازه نگه می‌دارد؛ خواندن آن فقط
+# یک ارجاع global است، بدون قفل و بدون round-trip به Redis.
+@dataclass(frozen=True, slots=True)
+class TradingSettingsSnapshot:
+    settings: TradingSettings
+    loaded_at: float
+
+
+_snapshot: TradingSettingsSnapshot | None = None
+# True only while the snapshot task is subscribed to change signals.
+_snapshot_live = False
+
+
 def _is_local_settings_cache_fresh(current_time: float) -> bool:
     return _fallback_cache is not None and (current_time - _fallback_timestamp) < CACHE_TTL_SECONDS
 
@@ -347,6 +366,10 @@ async def get_trading_settings_async() -> TradingSettings:
     
     این تابع برای استفاده در context های async است.
     """
+    snapshot = _snapshot
+    if _snapshot_live and snapshot is not None:
+        return snapshot.settings
+
     current_time = time.time()
     if _is_local_settings_cache_fresh(current_time):
         return _fallback_cache  # type: ignore[return-value]
@@ -379,8 +402,16 @@ def get_trading_settings() -> TradingSettings:
     این تابع ابتدا Redis cache مشترک بین workerها را بررسی می‌کند.
     fallback cache فقط زمانی استفاده می‌شود که Redis در دسترس نباشد.
     برای بهترین عملکرد، از get_trading_settings_async() استفاده کنید.
+
+    وقتی run_trading_settings_snapshot در این پردازه فعال است، snapshot
+    درون‌پردازه‌ای بدون فراخوانی شبکه برگردانده می‌شود؛ این مسیر از handlerهای
+    async صدا زده می‌شود و نباید event loop را block کند.
     """
     global _fallback_cache, _fallback_timestamp
+
+    snapshot = _snapshot
+    if _snapshot_live and snapshot is not None:
+        return snapshot.settings
     
     current_time = time.time()
 
@@ -418,12 +449,83 @@ async def refresh_settings_cache_async() -> None:
     # بروزرسانی fallback cache
     _store_local_settings_cache(settings)
 
+    # snapshot این پردازه فوراً و بقیه پردازه‌ها با اعلام Redis
+    _install_snapshot(settings)
+    await _publish_settings_changed()
+
 
 def refresh_settings_cache() -> None:
     """بروزرسانی فوری کش تنظیمات (sync fallback)"""
     _store_local_settings_cache(load_trading_settings())
 
 
+def _install_snapshot(settings: TradingSettings) -> None:
+    global _snapshot
+    _snapshot = TradingSettingsSnapshot(settings=settings, loaded_at=time.monotonic())
+
+
+async def _publish_settings_changed() -> None:
+    try:
+        from core.redis import get_redis_client
+
+        await get_redis_client().publish(SETTINGS_CHANGED_CHANNEL, "1")
+    except Exception as e:
+        logger.debug(f"Failed to publish trading settings change: {e}")
+
+
+async def _reload_snapshot() -> None:
+    """خواندن تنظیمات از کش Redis (یا DB) و جایگزینی snapshot"""
+    settings = await _get_from_redis_cache()
+    if settings is None:
+        settings = await load_trading_settings_async()
+        await _set_redis_cache(settings)
+    _store_local_settings_cache(settings)
+    _install_snapshot(settings)
+
+
+async def run_trading_settings_snapshot(
+    *,
+    refresh_seconds: float = CACHE_TTL_SECONDS,
+    retry_seconds: float = 1.0,
+) -> None:
+    """
+    وظیفه پس‌زمینه هر پردازه: نگه‌داشتن snapshot تنظیمات
+
+    با هر اعلام SETTINGS_CHANGED_CHANNEL و حداکثر هر refresh_seconds دوباره
+    بارگذاری می‌شود. تا وقتی اشتراک برقرار نیست snapshot استفاده نمی‌شود و
+    خواننده‌ها به مسیر Redis برمی‌گردند، پس اعلامی از دست نمی‌رود.
+    """
+    from core.metrics import set_trading_settings_snapshot_age
+    from core.redis import RedisSubscription, listen_redis_subscription
+
+    async def go_live() -> None:
+        global _snapshot_live
+        await _reload_snapshot()
+        _snapshot_live = True
+
+    async def refresh_if_stale() -> None:
+        if _snapshot is None or time.monotonic() - _snapshot.loaded_at >= refresh_seconds:
+            await _reload_snapshot()
+        if _snapshot is not None:
+            set_trading_settings_snapshot_age(time.monotonic() - _snapshot.loaded_at)
+
+    def reset() -> None:
+        global _snapshot_live
+        _snapshot_live = False
+
+    await listen_redis_subscription(
+        RedisSubscription(
+            name="trading_settings",
+            channels=(SETTINGS_CHANGED_CHANNEL,),
+            on_message=lambda _data: _reload_snapshot(),
+            on_subscribed=go_live,
+            on_idle=refresh_if_stale,
+            on_reset=reset,
+        ),
+        retry_seconds=retry_seconds,
+    )
+
+
 async def save_trading_settings_async(settings_dict: dict) -> bool:
     """
     ذخیره تنظیمات در دیتابیس (async) با استفاده از ORM.
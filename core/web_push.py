@@ -1,4 +1,11 @@
-"""Web Push notification helpers."""
+"""Web Push notification helpers.
+
+Deliveries go through one engine: VAPID headers are signed once per push
+service origin and reused until shortly before they expire, and sends run on
+a bounded worker pool that shares one keep-alive HTTP session.  Market-offer
+fan-out loads every target subscription in one query, releases the database
+session while sending, and writes subscription state back in bulk.
+"""
 
 from __future__ import annotations
 
@@ -6,23 +13,37 @@ import asyncio
 import hashlib
 import json
 import logging
+import math
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from types import SimpleNamespace
+from typing import Any, Iterable, Sequence
+from urllib.parse import urlsplit
 
-from sqlalchemy import func, or_, select
+from sqlalchemy import case, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.config import settings
 from core.enums import NotificationCategory, NotificationLevel
 from core.market_presence import load_market_page_user_ids
+from core.metrics import record_web_push_fanout
 from core.server_routing import SERVER_IRAN, current_server
 from models.notification import Notification
 from models.push_subscription import PushSubscription
 
 try:
-    from pywebpush import WebPushException, webpush
+    import requests
+    from py_vapid import Vapid
+    from pywebpush import WebPushException, WebPusher, webpush
 except ImportError:  # pragma: no cover - exercised in environments without optional dependency
+    requests = None  # type: ignore[assignment]
+    Vapid = None  # type: ignore[assignment]
     WebPushException = None  # type: ignore[assignment]
+    WebPusher = None  # type: ignore[assignment]
     webpush = None  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
@@ -30,6 +51,11 @@ logger = logging.getLogger(__name__)
 TERMINAL_PUSH_STATUS_CODES = {404, 410}
 WEB_PUSH_EXECUTION_SERVER = SERVER_IRAN
 WEB_PUSH_DISABLED_RESULT = {"total": 0, "sent": 0, "failed": 0, "disabled": 0}
+# pywebpush signs for 12 hours; re-sign an hour early so clock skew never
+# turns a cached header into a 403.
+VAPID_TOKEN_LIFETIME_SECONDS = 12 * 60 * 60
+VAPID_TOKEN_REFRESH_MARGIN_SECONDS = 60 * 60
+WEB_PUSH_STATE_UPDATE_CHUNK_SIZE = 500
 
 
 def hash_endpoint(endpoint: str) -> str:
@@ -199,14 +225,14 @@ def build_market_offer_push_payload(offer: Any) -> dict[str, Any]:
     )
 
 
-def _subscription_info(subscription: PushSubscription) -> dict[str, Any]:
-    return {
-        "endpoint": subscription.endpoint,
-        "keys": {
-            "p256dh": subscription.p256dh,
-            "auth": subscription.auth,
-        },
-    }
+def _subscription_target(subscription: PushSubscription, user_id: int) -> WebPushTarget:
+    return WebPushTarget(
+        subscription_id=int(subscription.id),
+        user_id=int(user_id),
+        endpoint=subscription.endpoint,
+        p256dh=subscription.p256dh,
+        auth=subscription.auth,
+    )
 
 
 def _response_status_code(exc: BaseException) -> int | None:
@@ -223,6 +249,293 @@ def _response_error_text(exc: BaseException) -> str:
     return str(exc)[:500]
 
 
+@dataclass(frozen=True, slots=True)
+class WebPushTarget:
+    subscription_id: int
+    user_id: int
+    endpoint: str
+    p256dh: str
+    auth: str
+
+    @property
+    def subscription_info(self) -> dict[str, Any]:
+        return {"endpoint": self.endpoint, "keys": {"p256dh": self.p256dh, "auth": self.auth}}
+
+
+@dataclass(frozen=True, slots=True)
+class WebPushOutcome:
+    subscription_id: int
+    user_id: int
+    latency_ms: float
+    status_code: int | None = None
+    error: str | None = None
+
+    @property
+    def sent(self) -> bool:
+        return self.error is None
+
+    @property
+    def disables_subscription(self) -> bool:
+        return self.status_code in TERMINAL_PUSH_STATUS_CODES
+
+
+@dataclass(frozen=True, slots=True)
+class WebPushFanoutReport:
+    outcomes: tuple[WebPushOutcome, ...]
+    duration_seconds: float
+
+    @property
+    def total(self) -> int:
+        return len(self.outcomes)
+
+    @property
+    def sent(self) -> int:
+        return sum(outcome.sent for outcome in self.outcomes)
+
+    @property
+    def failed(self) -> int:
+        return self.total - self.sent
+
+    @property
+    def disabled(self) -> int:
+        return sum(outcome.disables_subscription for outcome in self.outcomes if not outcome.sent)
+
+    @property
+    def throughput_per_second(self) -> float:
+        if not self.outcomes or self.duration_seconds <= 0:
+            return 0.0
+        return self.total / self.duration_seconds
+
+    @property
+    def p95_latency_ms(self) -> float:
+        return _nearest_rank_percentile([outcome.latency_ms for outcome in self.outcomes], 0.95)
+
+    def summary(self) -> dict[str, int]:
+        return {"total": self.total, "sent": self.sent, "failed": self.failed, "disabled": self.disabled}
+
+
+def _nearest_rank_percentile(values: Sequence[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return float(ordered[max(0, math.ceil(fraction * len(ordered)) - 1)])
+
+
+def _endpoint_origin(endpoint: str) -> str:
+    parts = urlsplit(endpoint)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class WebPushVapidSigner:
+    """Signs VAPID headers once per push service origin and reuses them until near expiry."""
+
+    def __init__(self, private_key: str, subject: str) -> None:
+        self.private_key = private_key
+        self.subject = subject
+        self._vapid: Any = None
+        self._headers: dict[str, tuple[float, dict[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def headers_for(self, endpoint: str) -> dict[str, str]:
+        origin = _endpoint_origin(endpoint)
+        now = time.time()
+        with self._lock:
+            cached = self._headers.get(origin)
+            if cached is not None and cached[0] - VAPID_TOKEN_REFRESH_MARGIN_SECONDS > now:
+                return dict(cached[1])
+            if self._vapid is None:
+                self._vapid = Vapid.from_string(private_key=self.private_key)
+            expires_at = int(now) + VAPID_TOKEN_LIFETIME_SECONDS
+            headers = dict(self._vapid.sign({"sub": self.subject, "aud": origin, "exp": expires_at}))
+            self._headers[origin] = (float(expires_at), headers)
+            return dict(headers)
+
+
+_vapid_signer: WebPushVapidSigner | None = None
+_web_push_http_session: Any = None
+_web_push_executor: ThreadPoolExecutor | None = None
+_web_push_executor_size = 0
+_web_push_pool_lock = threading.Lock()
+
+
+def _web_push_concurrency() -> int:
+    return max(1, int(getattr(settings, "web_push_fanout_concurrency", 16) or 1))
+
+
+def get_web_push_vapid_signer() -> WebPushVapidSigner:
+    global _vapid_signer
+    private_key = str(settings.web_push_vapid_private_key or "")
+    subject = str(settings.web_push_vapid_subject or "")
+    signer = _vapid_signer
+    if signer is None or signer.private_key != private_key or signer.subject != subject:
+        signer = _vapid_signer = WebPushVapidSigner(private_key, subject)
+    return signer
+
+
+def _web_push_pool() -> tuple[Any, ThreadPoolExecutor]:
+    global _web_push_http_session, _web_push_executor, _web_push_executor_size
+    concurrency = _web_push_concurrency()
+    with _web_push_pool_lock:
+        if _web_push_executor is None or _web_push_executor_size != concurrency:
+            if _web_push_executor is not None:
+                _web_push_executor.shutdown(wait=False)
+            if _web_push_http_session is not None:
+                _web_push_http_session.close()
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=concurrency)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _web_push_http_session = session
+            _web_push_executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="web-push")
+            _web_push_executor_size = concurrency
+        return _web_push_http_session, _web_push_executor
+
+
+def close_web_push_pool() -> None:
+    """Release the shared HTTP session and worker threads."""
+    global _web_push_http_session, _web_push_executor, _web_push_executor_size
+    with _web_push_pool_lock:
+        session, executor = _web_push_http_session, _web_push_executor
+        _web_push_http_session, _web_push_executor, _web_push_executor_size = None, None, 0
+    if executor is not None:
+        executor.shutdown(wait=False)
+    if session is not None:
+        session.close()
+
+
+def _post_web_push(
+    session: Any,
+    subscription_info: dict[str, Any],
+    data: str,
+    headers: dict[str, str],
+    ttl: int,
+    timeout: float,
+) -> None:
+    response = WebPusher(subscription_info, requests_session=session).send(
+        data,
+        headers,
+        ttl=ttl,
+        timeout=timeout,
+    )
+    if response.status_code > 202:
+        raise WebPushException(
+            f"Push failed: {response.status_code} {response.reason}",
+            response=response,
+        )
+
+
+async def deliver_web_push(
+    targets: Sequence[WebPushTarget],
+    payload: dict[str, Any],
+) -> WebPushFanoutReport:
+    """Send one payload to every target with bounded concurrency; never raises per target."""
+    if not targets:
+        return WebPushFanoutReport(outcomes=(), duration_seconds=0.0)
+
+    session, executor = _web_push_pool()
+    signer = get_web_push_vapid_signer()
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(_web_push_concurrency())
+    data = json.dumps(payload, ensure_ascii=False)
+    ttl = max(0, int(settings.web_push_ttl_seconds))
+    timeout = max(1.0, float(settings.web_push_timeout_seconds))
+
+    async def send(target: WebPushTarget) -> WebPushOutcome:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                headers = signer.headers_for(target.endpoint)
+                await loop.run_in_executor(
+                    executor,
+                    _post_web_push,
+                    session,
+                    target.subscription_info,
+                    data,
+                    headers,
+                    ttl,
+                    timeout,
+                )
+            except Exception as exc:
+                status_code = _response_status_code(exc)
+                logger.warning(
+                    "Web Push delivery failed",
+                    extra={
+                        "event": "web_push.delivery_failed",
+                        "user_id": target.user_id,
+                        "subscription_id": target.subscription_id,
+                        "status_code": status_code,
+                    },
+                )
+                return WebPushOutcome(
+                    subscription_id=target.subscription_id,
+                    user_id=target.user_id,
+                    latency_ms=(time.perf_counter() - started) * 1000,
+                    status_code=status_code,
+                    error=_response_error_text(exc),
+                )
+            return WebPushOutcome(
+                subscription_id=target.subscription_id,
+                user_id=target.user_id,
+                latency_ms=(time.perf_counter() - started) * 1000,
+            )
+
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(send(target) for target in targets))
+    return WebPushFanoutReport(outcomes=tuple(outcomes), duration_seconds=time.perf_counter() - started)
+
+
+def _chunks(values: Sequence[int], size: int) -> Iterable[Sequence[int]]:
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+async def apply_web_push_outcomes(
+    db: AsyncSession,
+    outcomes: Iterable[WebPushOutcome],
+    *,
+    now: datetime | None = None,
+) -> None:
+    """Write subscription success/failure state with one UPDATE per outcome group.
+
+    Failures are grouped by status code, never by error text: each row's
+    error detail is written through a ``CASE`` on its id within the group.
+    """
+    now = now or datetime.now(timezone.utc)
+    sent_ids: list[int] = []
+    failures: dict[tuple[int | None, bool], dict[int, str | None]] = defaultdict(dict)
+    for outcome in outcomes:
+        if outcome.sent:
+            sent_ids.append(outcome.subscription_id)
+        else:
+            failures[(outcome.status_code, outcome.disables_subscription)][outcome.subscription_id] = outcome.error
+
+    for ids in _chunks(sent_ids, WEB_PUSH_STATE_UPDATE_CHUNK_SIZE):
+        await db.execute(
+            update(PushSubscription)
+            .where(PushSubscription.id.in_(ids))
+            .values(last_success_at=now, failure_count=0, last_error=None)
+            .execution_options(synchronize_session=False)
+        )
+    for (_status_code, disable), errors in failures.items():
+        values: dict[str, Any] = {
+            "last_failure_at": now,
+            "failure_count": PushSubscription.failure_count + 1,
+        }
+        if disable:
+            values["enabled"] = False
+        for ids in _chunks(list(errors), WEB_PUSH_STATE_UPDATE_CHUNK_SIZE):
+            await db.execute(
+                update(PushSubscription)
+                .where(PushSubscription.id.in_(ids))
+                .values(
+                    last_error=case({key: errors[key] for key in ids}, value=PushSubscription.id),
+                    **values,
+                )
+                .execution_options(synchronize_session=False)
+            )
+    await db.commit()
+
+
 async def send_web_push_to_user(
     db: AsyncSession,
     user_id: int,
@@ -260,51 +573,27 @@ async def send_web_push_to_user(
     if not subscriptions:
         return disabled_web_push_result()
 
+    report = await deliver_web_push(
+        [_subscription_target(subscription, user_id) for subscription in subscriptions],
+        payload,
+    )
     now = datetime.now(timezone.utc)
-    sent = 0
-    failed = 0
-    disabled = 0
-    data = json.dumps(payload, ensure_ascii=False)
-    vapid_claims = {"sub": settings.web_push_vapid_subject}
-
-    for subscription in subscriptions:
-        try:
-            await asyncio.to_thread(
-                webpush,
-                subscription_info=_subscription_info(subscription),
-                data=data,
-                vapid_private_key=settings.web_push_vapid_private_key,
-                vapid_claims=dict(vapid_claims),
-                ttl=max(0, int(settings.web_push_ttl_seconds)),
-                timeout=max(1.0, float(settings.web_push_timeout_seconds)),
-            )
-        except Exception as exc:
-            failed += 1
-            status_code = _response_status_code(exc)
-            subscription.last_failure_at = now
-            subscription.failure_count = int(subscription.failure_count or 0) + 1
-            subscription.last_error = _response_error_text(exc)
-            if status_code in TERMINAL_PUSH_STATUS_CODES:
-                subscription.enabled = False
-                disabled += 1
-            logger.warning(
-                "Web Push delivery failed",
-                extra={
-                    "event": "web_push.delivery_failed",
-                    "user_id": user_id,
-                    "subscription_id": subscription.id,
-                    "status_code": status_code,
-                },
-            )
+    by_id = {subscription.id: subscription for subscription in subscriptions}
+    for outcome in report.outcomes:
+        subscription = by_id[outcome.subscription_id]
+        if outcome.sent:
+            subscription.last_success_at = now
+            subscription.failure_count = 0
+            subscription.last_error = None
             continue
-
-        sent += 1
-        subscription.last_success_at = now
-        subscription.failure_count = 0
-        subscription.last_error = None
+        subscription.last_failure_at = now
+        subscription.failure_count = int(subscription.failure_count or 0) + 1
+        subscription.last_error = outcome.error
+        if outcome.disables_subscription:
+            subscription.enabled = False
 
     await db.commit()
-    return {"total": len(subscriptions), "sent": sent, "failed": failed, "disabled": disabled}
+    return report.summary()
 
 
 async def load_market_offer_push_target_user_ids(
@@ -342,6 +631,68 @@ async def load_market_offer_push_target_user_ids(
     return target_user_ids
 
 
+async def load_web_push_fanout_targets(
+    db: AsyncSession,
+    user_ids: Iterable[int],
+) -> list[WebPushTarget]:
+    """Load every enabled subscription of ``user_ids`` in one query.
+
+    Users suppressed by production test isolation are dropped here, against
+    one isolation config read, instead of one user lookup per target.
+    """
+    from core.production_test_isolation import get_isolation_config, user_matches_isolation_allowlist
+    from models.user import User
+
+    ids = sorted({int(user_id) for user_id in user_ids if user_id is not None})
+    if not ids:
+        return []
+    result = await db.execute(
+        select(
+            PushSubscription.id,
+            PushSubscription.user_id,
+            PushSubscription.endpoint,
+            PushSubscription.p256dh,
+            PushSubscription.auth,
+            User.account_name,
+            User.mobile_number,
+        )
+        .join(User, User.id == PushSubscription.user_id)
+        .where(
+            PushSubscription.enabled == True,
+            PushSubscription.user_id.in_(ids),
+        )
+        .order_by(PushSubscription.id)
+    )
+    isolation = await get_isolation_config()
+    targets: list[WebPushTarget] = []
+    suppressed_user_ids: set[int] = set()
+    for row in result.all():
+        if isolation.enabled and not user_matches_isolation_allowlist(
+            SimpleNamespace(id=row.user_id, account_name=row.account_name, mobile_number=row.mobile_number),
+            isolation,
+        ):
+            suppressed_user_ids.add(int(row.user_id))
+            continue
+        targets.append(
+            WebPushTarget(
+                subscription_id=int(row.id),
+                user_id=int(row.user_id),
+                endpoint=row.endpoint,
+                p256dh=row.p256dh,
+                auth=row.auth,
+            )
+        )
+    if suppressed_user_ids:
+        logger.warning(
+            "Suppressed Web Push during production test isolation",
+            extra={
+                "event": "production_test_isolation.web_push_suppressed",
+                "suppressed_user_count": len(suppressed_user_ids),
+            },
+        )
+    return targets
+
+
 async def is_first_active_market_offer(db: AsyncSession, offer_id: int) -> bool:
     from core.trading_settings import get_trading_settings_async
     from core.utils import utc_now_naive
@@ -351,6 +702,16 @@ async def is_first_active_market_offer(db: AsyncSession, offer_id: int) -> bool:
 
     trading_settings = await get_trading_settings_async()
     expiry_minutes = int(getattr(trading_settings, "offer_expiry_minutes", 0) or 0)
+
+    from core.order_book import order_book
+
+    if order_book.ready:
+        return not order_book.index.has_other_live_offer(
+            offer_id,
+            normal_lifetime_minutes=expiry_minutes,
+            now_epoch=utc_now_naive().replace(tzinfo=timezone.utc).timestamp(),
+        )
+
     live_offer_filters = [
         Offer.status == OfferStatus.ACTIVE,
         Offer.id != int(offer_id),
@@ -445,23 +806,37 @@ async def send_market_offer_web_push(offer_id: int) -> None:
             return
 
         payload = build_market_offer_push_payload(offer)
-        totals = {"total": 0, "sent": 0, "failed": 0, "disabled": 0}
-        for user_id in target_user_ids:
-            result = await send_web_push_to_user(db, user_id, payload)
-            for key in totals:
-                totals[key] += int(result.get(key, 0) or 0)
-        logger.info(
-            "Market offer Web Push completed",
-            extra={
-                "event": "web_push.market_offer.completed",
-                "offer_id": offer.id,
-                "target_user_count": len(target_user_ids),
-                "subscription_total": totals["total"],
-                "sent": totals["sent"],
-                "failed": totals["failed"],
-                "disabled": totals["disabled"],
-            },
-        )
+        offer_id = offer.id
+        targets = await load_web_push_fanout_targets(db, target_user_ids)
+
+    # Sends run without a database session; state is written back in bulk.
+    report = await deliver_web_push(targets, payload)
+    if report.outcomes:
+        async with AsyncSessionLocal() as db:
+            await apply_web_push_outcomes(db, report.outcomes)
+    record_web_push_fanout(
+        sent=report.sent,
+        failed=report.failed,
+        disabled=report.disabled,
+        duration_ms=report.duration_seconds * 1000,
+        throughput_per_second=report.throughput_per_second,
+        p95_latency_ms=report.p95_latency_ms,
+    )
+    logger.info(
+        "Market offer Web Push completed",
+        extra={
+            "event": "web_push.market_offer.completed",
+            "offer_id": offer_id,
+            "target_user_count": len(target_user_ids),
+            "subscription_total": report.total,
+            "sent": report.sent,
+            "failed": report.failed,
+            "disabled": report.disabled,
+            "duration_ms": round(report.duration_seconds * 1000, 1),
+            "throughput_per_second": round(report.throughput_per_second, 1),
+            "p95_latency_ms": round(report.p95_latency_ms, 1),
+        },
+    )
 
 
 def schedule_market_offer_web_push(offer_id: int) -> None:
@@ -20,6 +20,13 @@ from api.routers import customers
 from core.config import settings
 from core.deployment_surface import allowed_cors_origins
 from core.redis import init_redis, close_redis, get_redis_client
+from core.telegram_gateway import close_telegram_http_clients
+from core.web_push import close_web_push_pool
+from core.order_book import is_order_book_enabled, listen_order_book_events
+from core.cache import listen_cache_invalidations
+from core.last_seen import run_last_seen_flusher
+from core.principal_cache import listen_principal_invalidations
+from core.trading_settings import run_trading_settings_snapshot
 from core.db import AsyncSessionLocal, init_db
 from core.events import setup_event_listeners
 from core.server_routing import SERVER_FOREIGN, normalize_server
@@ -31,6 +38,7 @@ from core.connectivity import connectivity_monitor_loop
 from core.market_schedule_loop import market_schedule_loop
 from core.offer_expiry import offer_expiry_loop
 from core.session_expiry import session_expiry_loop
+from core.sync_push import shutdown_direct_push_pipeline
 from core.trade_delivery_worker import telegram_trade_delivery_loop, webapp_trade_delivery_loop
 from core.sms import validate_iran_sms_fallback_runtime, validate_non_iran_sms_isolation
 from core.telegram_delivery_runtime_policy import (
@@ -393,6 +401,18 @@ async def lifespan(app: FastAPI):
         except Exception:
             await session.rollback()
             raise
+    # Per-worker: the L1 in front of Redis is used only while this is subscribed.
+    cache_invalidation_task = asyncio.create_task(listen_cache_invalidations())
+    # Per-worker: get_current_user reuses verified sessions only while this is subscribed.
+    principal_invalidation_task = asyncio.create_task(listen_principal_invalidations())
+    # Per-worker: writes the last_seen_at touches buffered by get_current_user.
+    last_seen_flush_task = asyncio.create_task(run_last_seen_flusher())
+    # Per-worker: get_trading_settings() serves the snapshot only while this is subscribed.
+    trading_settings_snapshot_task = asyncio.create_task(run_trading_settings_snapshot())
+    # Per-worker: readers use the order book only while it is subscribed and built.
+    order_book_task = None
+    if is_order_book_enabled():
+        order_book_task = asyncio.create_task(listen_order_book_events())
     background_leader_task = None
     if settings.background_jobs_enabled:
         background_leader_task = _start_background_leader_task(redis_client)
@@ -413,6 +433,22 @@ async def lifespan(app: FastAPI):
         if background_leader_task is not None:
             background_leader_task.cancel()
             await asyncio.gather(background_leader_task, return_exceptions=True)
+        cache_invalidation_task.cancel()
+        await asyncio.gather(cache_invalidation_task, return_exceptions=True)
+        principal_invalidation_task.cancel()
+        await asyncio.gather(principal_invalidation_task, return_exceptions=True)
+        # Cancelling the flusher writes the last buffered touches before the DB goes away.
+        last_seen_flush_task.cancel()
+        await asyncio.gather(last_seen_flush_task, return_exceptions=True)
+        trading_settings_snapshot_task.cancel()
+        await asyncio.gather(trading_settings_snapshot_task, return_exceptions=True)
+        if order_book_task is not None:
+            order_book_task.cancel()
+            await asyncio.gather(order_book_task, return_exceptions=True)
+        await realtime.realtime_fanout_hub.stop()
+        await shutdown_direct_push_pipeline()
+        await close_telegram_http_clients()
+        close_web_push_pool()
         await close_redis()
 
 app = FastAPI(
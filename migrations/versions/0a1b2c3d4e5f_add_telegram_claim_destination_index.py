@@ -0,0 +1,34 @@
+"""add Telegram per-destination claim index
+
+Revision ID: 0a1b2c3d4e5f
+Revises: ff5a6b7c8d9e
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0a1b2c3d4e5f"
+down_revision: Union[str, Sequence[str], None] = "ff5a6b7c8d9e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_telegram_delivery_jobs_claim_destination",
+        "telegram_delivery_jobs",
+        ["bot_identity", "destination_key", "priority", "priority_rank", "enqueued_seq"],
+        unique=False,
+        postgresql_where=sa.text("state IN ('pending', 'pending_retry')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_telegram_delivery_jobs_claim_destination",
+        table_name="telegram_delivery_jobs",
+    )
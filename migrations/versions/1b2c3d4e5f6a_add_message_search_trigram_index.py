@@ -0,0 +1,59 @@
+"""add normalized trigram index for chat message search
+
+Revision ID: 1b2c3d4e5f6a
+Revises: 0a1b2c3d4e5f
+Create Date: 2026-10-17 12:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "1b2c3d4e5f6a"
+down_revision: Union[str, Sequence[str], None] = "0a1b2c3d4e5f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_INDEX_NAME = "ix_messages_content_search_trgm"
+# Must match core.chat_search.CHAT_SEARCH_* exactly; translate() drops the
+# trailing source characters that have no target.
+_FOLDED_CHARS = "يىكۀةأإٱ\u200c۰۱۲۳۴۵۶۷۸۹٠١٢٣٤٥٦٧٨٩" "ـ\u200d\u200e\u200f"
+_FOLDED_TARGETS = "ییکههااا 01234567890123456789"
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION chat_search_normalize(value text)
+        RETURNS text
+        LANGUAGE sql
+        IMMUTABLE
+        PARALLEL SAFE
+        RETURNS NULL ON NULL INPUT
+        AS $$
+            SELECT lower(btrim(regexp_replace(
+                translate(value, '{_FOLDED_CHARS}', '{_FOLDED_TARGETS}'),
+                '\\s+', ' ', 'g'
+            )))
+        $$
+        """
+    )
+    # Chat search used to run content ILIKE '%q%' over the whole table.  The
+    # trigram index on the normalized expression serves the same substring
+    # match; it is built concurrently so message writes continue during deploy.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+            f"{_INDEX_NAME} ON messages "
+            "USING gin (chat_search_normalize(content) gin_trgm_ops) "
+            "WHERE is_deleted = false"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {_INDEX_NAME}")
+    op.execute("DROP FUNCTION IF EXISTS chat_search_normalize(text)")
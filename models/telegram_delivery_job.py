@@ -120,6 +120,15 @@ class TelegramDeliveryJobRecord(Base):
             "enqueued_seq",
             postgresql_where=text("state IN ('pending', 'pending_retry')"),
         ),
+        Index(
+            "ix_telegram_delivery_jobs_claim_destination",
+            "bot_identity",
+            "destination_key",
+            "priority",
+            "priority_rank",
+            "enqueued_seq",
+            postgresql_where=text("state IN ('pending', 'pending_retry')"),
+        ),
         Index(
             "ix_telegram_delivery_jobs_offer_edit_order",
             "bot_identity",
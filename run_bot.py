@@ -33,6 +33,10 @@ from bot.handlers.telegram_publisher_channel_callbacks import (
     build_publisher_channel_callback_router,
 )
 from core.db import init_db, AsyncSessionLocal
+from core.redis import close_redis, init_redis
+from core.telegram_gateway import close_telegram_http_clients
+from core.cache import listen_cache_invalidations
+from core.trading_settings import run_trading_settings_snapshot
 from core.events import setup_event_listeners
 from bot.middlewares import (
     AuthMiddleware,
@@ -42,8 +46,10 @@ from bot.middlewares import (
 )
 from bot.middlewares.logging_context import BotLoggingContextMiddleware
 from bot.middlewares.telegram_bot_identity import TelegramBotIdentityMiddleware
+from bot.message_delete_scheduler import run_message_delete_scheduler
 from bot.telegram_command_menu import configure_interactive_bot_command_menu
 from bot.utils.trade_suggestion_messages import listen_trade_suggestion_events
+from bot.access_cache import bot_access_cache, listen_bot_access_invalidations
 from core.logging_config import configure_logging
 from core.offer_publication_worker import offer_telegram_publication_loop
 from core.telegram_admin_broadcast_worker import telegram_admin_broadcast_delivery_loop
@@ -343,6 +349,8 @@ async def main():
 
     # Initialize Database
     await init_db()
+    # Shared Redis client used by core.cache (commodity catalog, counters)
+    await init_redis()
 
     # Register SQLAlchemy event listeners for sync & realtime events
     setup_event_listeners()
@@ -361,7 +369,7 @@ async def main():
     dp.update.outer_middleware(TradeContentionGateMiddleware())
 
     # Auth: inject user into handler data for ALL updates (must be before routers)
-    auth_mw = AuthMiddleware(AsyncSessionLocal)
+    auth_mw = AuthMiddleware(AsyncSessionLocal, access_cache=bot_access_cache)
     dp.update.outer_middleware(auth_mw)
     dp.update.outer_middleware(BotLoggingContextMiddleware())
     dp.update.outer_middleware(StaleNavigationHandoffMiddleware())
@@ -402,6 +410,14 @@ async def main():
             polling_coro=supervise_pollers(dp.start_polling(bot), *publisher_pollers),
             child_coroutines=[
                 listen_trade_suggestion_events(bot),
+                listen_bot_access_invalidations(bot_access_cache),
+                listen_cache_invalidations(),
+                run_trading_settings_snapshot(),
+                *(
+                    (run_message_delete_scheduler(bot, settings_obj=settings),)
+                    if telegram_runtime.mode == TelegramDeliveryRuntimeMode.LEGACY
+                    else ()
+                ),
                 *(() if publisher_dispatcher is None else (publisher_dispatcher(),)),
                 *(
                     worker_factory()
@@ -417,6 +433,8 @@ async def main():
             *(publisher_bot.session.close() for publisher_bot in publisher_bots),
             return_exceptions=True,
         )
+        await close_telegram_http_clients()
+        await close_redis()
 
 if __name__ == "__main__":
     try:
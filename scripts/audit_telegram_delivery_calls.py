@@ -110,6 +110,8 @@ EPHEMERAL_OTP_EXECUTION_FILES = frozenset(
 )
 LEGACY_OWNER_FILES = frozenset(
     {
+        # run_bot starts the durable delete scheduler only in legacy mode.
+        "bot/message_delete_scheduler.py",
         "core/offer_publication_worker.py",
         "core/telegram_admin_broadcast_worker.py",
         "core/telegram_notification_outbox_worker.py",
@@ -134,7 +136,8 @@ EXPECTED_RUNTIME_INVENTORY_COUNTS = {
     # are gated by configured_telegram_delivery_runtime(), plus Queue-v1
     # producer exits that keep legacy OTP/sync send unreachable.
     "legacy_mode_guarded": 75,
-    "legacy_owner_guarded": 13,
+    # Includes the two legacy-only durable bot message delete calls.
+    "legacy_owner_guarded": 15,
     "legacy_parameter_guarded": 2,
     "non_delivery_timer": 5,
     "non_message_control": 2,
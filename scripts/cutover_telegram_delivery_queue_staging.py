@@ -68,7 +68,7 @@ FOREIGN_ENV_FILE = REPO_ROOT / ".env.staging"
 IRAN_ENV_FILE = f"{IRAN_WORKDIR}/.env.staging"
 STAGING_DB_NAME = "trading_bot_staging"
 RESTORE_DB_NAME = "telegram_queue_stage3_cutover_restore_test"
-EXPECTED_SCHEMA_HEAD = "ff5a6b7c8d9e"
+EXPECTED_SCHEMA_HEAD = "1b2c3d4e5f6a"
 DEFAULT_ARTIFACT_DIR = Path("/tmp/telegram-queue-cutover-staging")
 FOREIGN_STAGING_PROJECT = "trading_bot_staging"
 IRAN_STAGING_PROJECT = "trading_bot_staging_iran"
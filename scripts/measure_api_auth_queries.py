@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Measure database work and latency per authenticated API request.
+
+The benchmark seeds ``--users`` STANDARD users, each with one active web
+session, in a scratch PostgreSQL database that is already upgraded to the
+Alembic head.  It then replays ``--requests`` calls of
+``api.deps.get_current_user`` with access tokens of a ``--hot-users`` subset,
+one database session per request as ``get_db`` provides.  Two runs are made:
+
+- ``before``: no principal cache, and presence committed inside the request
+  the way ``get_current_user`` did before the write-behind buffer;
+- ``after``: ``PrincipalCache`` in front of the session checks and
+  ``LastSeenBuffer`` flushed every ``--requests-per-flush`` requests.
+
+Each statement the engine executes and each commit is counted.  The Redis
+blacklist lookup is replaced by a counter, so Redis is not needed; its count
+is reported as ``blacklist_lookups``.  The database name must start with
+``api_auth_`` so the benchmark can never truncate a runtime database.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import sqlalchemy as sa  # noqa: E402
+from sqlalchemy import event, select, text  # noqa: E402
+from sqlalchemy.engine import make_url  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from api import deps  # noqa: E402
+from core import security  # noqa: E402
+from core.enums import UserRole  # noqa: E402
+from core.last_seen import LastSeenBuffer  # noqa: E402
+from core.principal_cache import PrincipalCache  # noqa: E402
+from models.session import Platform, UserSession  # noqa: E402
+from models.user import User  # noqa: E402
+
+_SCRATCH_PREFIX = "api_auth_"
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure get_current_user database work per request.")
+    parser.add_argument("--database-url", required=True, help="Async owner URL of a scratch api_auth_* database.")
+    parser.add_argument("--users", type=int, default=5000, help="Seeded users, one active session each.")
+    parser.add_argument("--hot-users", type=int, default=200, help="Users the replayed requests come from.")
+    parser.add_argument("--requests", type=int, default=5000, help="Replayed requests per run.")
+    parser.add_argument("--ttl-seconds", type=float, default=30.0, help="Principal cache TTL for the after run.")
+    parser.add_argument("--requests-per-flush", type=int, default=200, help="Requests between last_seen flushes.")
+    return parser.parse_args()
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _seed_users_stmt(count: int):
+    series = sa.func.generate_series(1, count).table_valued("n").alias("series")
+    suffix = sa.cast(series.c.n, sa.String)
+    return sa.insert(User).from_select(
+        ["account_name", "mobile_number", "full_name", "address", "role"],
+        select(
+            sa.literal(_SCRATCH_PREFIX) + suffix,
+            sa.literal("09") + sa.func.lpad(suffix, 9, "0"),
+            sa.literal("api auth ") + suffix,
+            sa.literal("api auth fixture"),
+            sa.literal(UserRole.STANDARD.name),
+        ),
+    )
+
+
+def _seed_sessions_stmt():
+    return sa.insert(UserSession).from_select(
+        ["id", "user_id", "device_name", "home_server", "platform", "is_primary", "is_active"],
+        select(
+            sa.func.gen_random_uuid(),
+            User.id,
+            sa.literal("bench"),
+            sa.literal("foreign"),
+            sa.cast(sa.literal(Platform.WEB.value), UserSession.__table__.c.platform.type),
+            sa.true(),
+            sa.true(),
+        ),
+    )
+
+
+async def _replay(Session, counters: dict, tokens: list[str], args: argparse.Namespace, mode: str) -> dict:
+    cache = PrincipalCache(ttl_seconds=args.ttl_seconds if mode == "after" else 0)
+    cache.active = True
+    buffer = LastSeenBuffer()
+    blacklist = AsyncMock(return_value=False)
+    for key in counters:
+        counters[key] = 0
+    latencies: list[float] = []
+    with patch.object(deps, "principal_cache", cache), patch.object(deps, "last_seen_buffer", buffer), patch(
+        "core.services.session_service.is_session_blacklisted", blacklist
+    ):
+        for index in range(max(1, args.requests)):
+            token = tokens[index % len(tokens)]
+            started = time.perf_counter()
+            async with Session() as db:
+                user = await deps.get_current_user(db=db, token=token)
+                if mode == "before":
+                    touched = buffer.drain()
+                    if touched:
+                        user.last_seen_at = touched[user.id]
+                        await db.commit()
+            latencies.append(time.perf_counter() - started)
+            if mode == "after" and (index + 1) % max(1, args.requests_per_flush) == 0:
+                await buffer.flush(Session)
+        if mode == "after":
+            await buffer.flush(Session)
+    requests = max(1, args.requests)
+    return {
+        "mode": mode,
+        "requests": requests,
+        "queries": counters["queries"],
+        "queries_per_request": round(counters["queries"] / requests, 3),
+        "commits_per_request": round(counters["commits"] / requests, 3),
+        "blacklist_lookups_per_request": round(blacklist.await_count / requests, 3),
+        "median_request_ms": round(statistics.median(latencies) * 1000, 3),
+        "p99_request_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    database = make_url(args.database_url).database or ""
+    if not database.startswith(_SCRATCH_PREFIX):
+        raise SystemExit(f"refusing non-scratch database {database!r}; expected {_SCRATCH_PREFIX}*")
+    engine = create_async_engine(args.database_url)
+    Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+    counters = {"queries": 0, "commits": 0}
+
+    def count_statement(*_args, **_kwargs):
+        counters["queries"] += 1
+
+    def count_commit(*_args, **_kwargs):
+        counters["commits"] += 1
+
+    try:
+        async with engine.begin() as connection:
+            await connection.execute(text("TRUNCATE TABLE users RESTART IDENTITY CASCADE"))
+            await connection.execute(_seed_users_stmt(max(1, args.users)))
+            await connection.execute(_seed_sessions_stmt())
+        async with engine.begin() as connection:
+            await connection.execute(text("ANALYZE users"))
+            await connection.execute(text("ANALYZE user_sessions"))
+            hot_users = max(1, min(args.hot_users, args.users))
+            rows = (
+                await connection.execute(
+                    select(UserSession.user_id, UserSession.id).order_by(UserSession.user_id).limit(hot_users)
+                )
+            ).all()
+        tokens = [security.create_access_token(subject=user_id, session_id=str(session_id)) for user_id, session_id in rows]
+
+        event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+        event.listen(engine.sync_engine, "commit", count_commit)
+        results = []
+        for mode in ("before", "after"):
+            # Both runs start from users that have never been seen.
+            async with engine.begin() as connection:
+                await connection.execute(sa.update(User).values(last_seen_at=None))
+            results.append(await _replay(Session, counters, tokens, args, mode))
+    finally:
+        await engine.dispose()
+    return {"users": args.users, "hot_users": args.hot_users, "results": results}
+
+
+def main() -> int:
+    print(json.dumps(asyncio.run(_run(_parse_args())), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Measure database queries and latency per Telegram update in AuthMiddleware.
+
+The benchmark seeds ``--users`` linked STANDARD users in a scratch PostgreSQL
+database that is already upgraded to the Alembic head.  It then replays
+``--updates`` callback updates from a ``--hot-users`` subset through
+``bot.middlewares.auth.AuthMiddleware`` with a no-op handler, which mimics
+rapid inline-button taps during market open.  Two runs are made: one without
+the access cache and one with ``BotAccessCache``.  Each statement the engine
+executes is counted.
+
+The registration-activation and bot-access checks run only when direct
+registration is ready, so the benchmark forces that gate on.  The database
+name must start with ``bot_auth_`` so the benchmark can never truncate a
+runtime database.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import datetime, timezone
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import sqlalchemy as sa  # noqa: E402
+from aiogram.types import CallbackQuery, Chat, Message, User as TelegramUser  # noqa: E402
+from sqlalchemy import event, select, text  # noqa: E402
+from sqlalchemy.engine import make_url  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from bot.access_cache import BotAccessCache  # noqa: E402
+from bot.middlewares import auth as auth_middleware  # noqa: E402
+from core.enums import UserRole  # noqa: E402
+from models.user import User  # noqa: E402
+
+_SCRATCH_PREFIX = "bot_auth_"
+_TELEGRAM_ID_BASE = 7_000_000_000
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure AuthMiddleware queries per update.")
+    parser.add_argument("--database-url", required=True, help="Async owner URL of a scratch bot_auth_* database.")
+    parser.add_argument("--users", type=int, default=5000, help="Seeded linked users.")
+    parser.add_argument("--hot-users", type=int, default=200, help="Users the replayed taps come from.")
+    parser.add_argument("--updates", type=int, default=5000, help="Replayed updates per run.")
+    parser.add_argument("--ttl-seconds", type=float, default=10.0, help="Access cache TTL for the cached run.")
+    return parser.parse_args()
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _seed_users_stmt(count: int):
+    series = sa.func.generate_series(1, count).table_valued("n").alias("series")
+    suffix = sa.cast(series.c.n, sa.String)
+    return sa.insert(User).from_select(
+        ["account_name", "mobile_number", "full_name", "address", "telegram_id", "role"],
+        select(
+            sa.literal(_SCRATCH_PREFIX) + suffix,
+            sa.literal("09") + sa.func.lpad(suffix, 9, "0"),
+            sa.literal("bot auth ") + suffix,
+            sa.literal("bot auth fixture"),
+            sa.literal(_TELEGRAM_ID_BASE) + series.c.n,
+            sa.literal(UserRole.STANDARD.name),
+        ),
+    )
+
+
+def _callback_update(index: int, telegram_id: int) -> CallbackQuery:
+    telegram_user = TelegramUser(id=telegram_id, is_bot=False, first_name="bench")
+    message = Message(
+        message_id=index + 1,
+        date=datetime.now(timezone.utc),
+        chat=Chat(id=telegram_id, type="private"),
+        from_user=telegram_user,
+        text="menu",
+    )
+    return CallbackQuery(
+        id=str(index),
+        from_user=telegram_user,
+        chat_instance="bench",
+        message=message,
+        data="bench:noop",
+    )
+
+
+async def _replay(Session, counter: list[int], args: argparse.Namespace, cache: BotAccessCache | None) -> dict:
+    middleware = auth_middleware.AuthMiddleware(Session, access_cache=cache)
+
+    async def handler(_event, _data):
+        return None
+
+    hot_users = max(1, min(args.hot_users, args.users))
+    updates = [
+        _callback_update(index, _TELEGRAM_ID_BASE + 1 + index % hot_users)
+        for index in range(max(1, args.updates))
+    ]
+    counter[0] = 0
+    latencies: list[float] = []
+    for update in updates:
+        started = time.perf_counter()
+        await middleware(handler, update, {})
+        latencies.append(time.perf_counter() - started)
+    return {
+        "mode": "uncached" if cache is None else f"cached_ttl_{cache.ttl_seconds:g}s",
+        "updates": len(updates),
+        "queries": counter[0],
+        "queries_per_update": round(counter[0] / len(updates), 3),
+        "median_update_ms": round(statistics.median(latencies) * 1000, 3),
+        "p99_update_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    database = make_url(args.database_url).database or ""
+    if not database.startswith(_SCRATCH_PREFIX):
+        raise SystemExit(f"refusing non-scratch database {database!r}; expected {_SCRATCH_PREFIX}*")
+    engine = create_async_engine(args.database_url)
+    Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+    counter = [0]
+
+    def count_statement(*_args, **_kwargs):
+        counter[0] += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+    try:
+        async with engine.begin() as connection:
+            await connection.execute(text("TRUNCATE TABLE users RESTART IDENTITY CASCADE"))
+            await connection.execute(_seed_users_stmt(max(1, args.users)))
+        async with engine.begin() as connection:
+            await connection.execute(text("ANALYZE users"))
+
+        with patch.object(auth_middleware, "direct_registration_runtime_ready", return_value=True):
+            results = [
+                await _replay(Session, counter, args, None),
+                await _replay(Session, counter, args, BotAccessCache(ttl_seconds=args.ttl_seconds)),
+            ]
+    finally:
+        await engine.dispose()
+    return {"users": args.users, "hot_users": args.hot_users, "results": results}
+
+
+def main() -> int:
+    print(json.dumps(asyncio.run(_run(_parse_args())), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""Measure chat message search latency on a seeded ``messages`` table.
+
+The scratch PostgreSQL database must already be upgraded to the Alembic head,
+so ``chat_search_normalize`` and ``ix_messages_content_search_trgm`` exist.
+The benchmark truncates ``users`` and ``messages`` and seeds ``--users``
+users.  It then inserts ``--messages`` direct messages, whose texts mix
+Persian and Arabic letter forms, ZWNJ, and Persian and ASCII digits.  Each
+query in ``--queries`` runs through two statements:
+
+- ``legacy_ilike``: the previous ``content ILIKE '%q%'`` statement.
+- ``trigram``: ``build_direct_message_search_stmt``, for the first page and
+  for the keyset page after it.
+
+Every query is run with the search scoped to one user.  The report gives the
+median and p99 latency, the hit counts, and whether the plan used the trigram
+index.
+
+The database name must start with ``chat_search_`` so the benchmark can never
+truncate a runtime database.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import sqlalchemy as sa  # noqa: E402
+from sqlalchemy import select, text  # noqa: E402
+from sqlalchemy.engine import make_url  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from core.services.chat_service import (  # noqa: E402
+    build_direct_message_read_options,
+    build_direct_message_search_stmt,
+)
+from models.message import Message  # noqa: E402
+from models.user import User  # noqa: E402
+
+_SCRATCH_PREFIX = "chat_search_"
+_INDEX_NAME = "ix_messages_content_search_trgm"
+_DEFAULT_QUERIES = "سکه امامی,ربع بهار,۱۸۷,فروش فردا,tether,نیم‌سکه"
+_SEED_MESSAGES = text(
+    """
+    INSERT INTO messages (
+        sender_id, receiver_id, content, message_type, is_read, created_at,
+        is_deleted, edit_history, reactions, mentions, mention_all
+    )
+    SELECT
+        1 + (series.n % :users),
+        1 + ((series.n * 7 + 1) % :users),
+        (ARRAY['خرید', 'فروش', 'ف', 'خ', 'سلام', 'لطفا'])[1 + series.n % 6] || ' ' ||
+        (ARRAY['سكه امامي', 'سکه امامی', 'ربع‌بهار', 'ربع بهار', 'نیم سکه', 'نيم‌سكه', 'tether', 'USDT'])[1 + (series.n / 7) % 8] || ' ' ||
+        (ARRAY['۱۸۷۵۰۰', '187600', '٥١٣٠٠', 'فردا', 'امروز', 'نقدی'])[1 + (series.n / 53) % 6] || ' ' ||
+        md5(series.n::text),
+        'TEXT', true,
+        now() - make_interval(secs => series.n),
+        (series.n % 50 = 0), '[]', '[]', '[]', false
+    FROM generate_series(1, :count) AS series(n)
+    """
+)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure chat message search latency.")
+    parser.add_argument("--database-url", required=True, help="Async owner URL of a scratch chat_search_* database.")
+    parser.add_argument("--messages", type=int, default=2_000_000, help="Seeded message rows.")
+    parser.add_argument("--users", type=int, default=500, help="Seeded users messages are spread over.")
+    parser.add_argument("--queries", default=_DEFAULT_QUERIES, help="Comma-separated search terms.")
+    parser.add_argument("--limit", type=int, default=50, help="Page size.")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query and statement.")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse the rows seeded by a previous run.")
+    return parser.parse_args()
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _seed_users_stmt(count: int):
+    # from_select renders the model's scalar Python defaults (role, limits,
+    # home_server, ...) as literal columns, so only the required ones are named.
+    series = sa.func.generate_series(1, count).table_valued("n").alias("series")
+    suffix = sa.cast(series.c.n, sa.String)
+    return sa.insert(User).from_select(
+        ["account_name", "mobile_number", "full_name", "address"],
+        select(
+            sa.literal(_SCRATCH_PREFIX) + suffix,
+            sa.literal("09") + sa.func.lpad(suffix, 9, "0"),
+            sa.literal("chat search ") + suffix,
+            sa.literal("chat search fixture"),
+        ),
+    )
+
+
+def _legacy_stmt(user_id: int, query: str, limit: int):
+    return (
+        select(Message)
+        .where(
+            sa.or_(Message.sender_id == user_id, Message.receiver_id == user_id),
+            Message.content.ilike(f"%{query}%"),
+            Message.is_deleted.is_(False),
+        )
+        .order_by(Message.created_at.desc())
+        .limit(limit)
+        .options(*build_direct_message_read_options())
+    )
+
+
+async def _seed(engine, args: argparse.Namespace) -> None:
+    async with engine.begin() as connection:
+        await connection.execute(text("TRUNCATE TABLE messages, users RESTART IDENTITY CASCADE"))
+        await connection.execute(_seed_users_stmt(max(2, args.users)))
+        await connection.execute(_SEED_MESSAGES, {"count": max(1, args.messages), "users": max(2, args.users)})
+    async with engine.begin() as connection:
+        await connection.execute(text("ANALYZE users"))
+        await connection.execute(text("ANALYZE messages"))
+
+
+async def _timed(Session, stmt, repeat: int) -> tuple[list[float], list]:
+    samples: list[float] = []
+    rows: list = []
+    for _ in range(max(1, repeat)):
+        async with Session() as db:
+            started = time.perf_counter()
+            rows = (await db.execute(stmt)).unique().scalars().all()
+            samples.append(time.perf_counter() - started)
+    return samples, rows
+
+
+async def _uses_index(engine, stmt) -> bool:
+    sql = str(stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    async with engine.connect() as connection:
+        plan = (await connection.exec_driver_sql(f"EXPLAIN {sql}")).scalars().all()
+    return any(_INDEX_NAME in line for line in plan)
+
+
+def _summary(samples: list[float], rows: list) -> dict:
+    return {
+        "hits": len(rows),
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "p99_ms": round(_percentile(samples, 0.99) * 1000, 3),
+    }
+
+
+async def _measure(engine, Session, *, user_id: int, query: str, args: argparse.Namespace) -> dict:
+    legacy_samples, legacy_rows = await _timed(Session, _legacy_stmt(user_id, query, args.limit), args.repeat)
+    first_stmt = await build_direct_message_search_stmt(
+        None,
+        current_user_id=user_id,
+        query_text=query,
+        limit=args.limit,
+    )
+    first_samples, first_rows = await _timed(Session, first_stmt, args.repeat)
+    report = {
+        "query": query,
+        "legacy_ilike": _summary(legacy_samples, legacy_rows),
+        "trigram_first_page": _summary(first_samples, first_rows),
+        "trigram_index_used": await _uses_index(engine, first_stmt),
+    }
+    if first_rows:
+        next_stmt = await build_direct_message_search_stmt(
+            None,
+            current_user_id=user_id,
+            query_text=query,
+            limit=args.limit,
+            before_id=first_rows[-1].id,
+        )
+        report["trigram_next_page"] = _summary(*await _timed(Session, next_stmt, args.repeat))
+    return report
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    database = make_url(args.database_url).database or ""
+    if not database.startswith(_SCRATCH_PREFIX):
+        raise SystemExit(f"refusing non-scratch database {database!r}; expected {_SCRATCH_PREFIX}*")
+    engine = create_async_engine(args.database_url)
+    Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+    try:
+        if not args.skip_seed:
+            await _seed(engine, args)
+        results = [
+            await _measure(engine, Session, user_id=1, query=query.strip(), args=args)
+            for query in str(args.queries).split(",")
+            if query.strip()
+        ]
+    finally:
+        await engine.dispose()
+    return {"messages": args.messages, "users": args.users, "limit": args.limit, "results": results}
+
+
+def main() -> int:
+    print(json.dumps(asyncio.run(_run(_parse_args())), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
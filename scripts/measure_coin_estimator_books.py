@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Measure coin estimator refresh wall time for 1-4 books, serial vs parallel.
+
+Book 1 is the main model; books 2-4 add the previous-live shadow, the
+morning-reopen research shadow and the ML residual shadow.  Each cycle uses a
+fresh snapshot timestamp so the model-independent caches start cold exactly
+as they do in production.  Without ``--market-db``/``--conversation-db`` the
+estimator's synthetic test fixtures are used; pass runtime copies for real
+numbers.  The first cycle of every configuration (imports, worker spawn)
+is excluded as warm-up.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+ESTIMATOR_ROOT = REPO_ROOT / "apps" / "coin_rate_estimator"
+for path in (REPO_ROOT, ESTIMATOR_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import live_server  # noqa: E402
+from coin_estimator import load_model  # noqa: E402
+from live_server import StateStore, prepare_calibration_store, refresh_estimate  # noqa: E402
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure estimator cycle wall time per book count.")
+    parser.add_argument("--market-db", type=Path)
+    parser.add_argument("--conversation-db", type=Path)
+    parser.add_argument("--model", type=Path, help="Main model JSON (synthetic model by default).")
+    parser.add_argument("--shadow-model", type=Path, help="Previous-live shadow model (defaults to --model).")
+    parser.add_argument("--research-model", type=Path, help="Research shadow model (defaults to --model).")
+    parser.add_argument("--ml-artifact", type=Path, help="ML residual joblib artifact (synthesized if sklearn exists).")
+    parser.add_argument("--end", help="Snapshot end time in ISO format (fixture time by default).")
+    parser.add_argument("--cycles", type=int, default=5, help="Measured cycles per configuration.")
+    parser.add_argument("--workers", type=int, default=3, help="Book worker processes in parallel mode.")
+    return parser.parse_args()
+
+
+def _synthetic_inputs(root: Path) -> dict:
+    from test_estimator import make_conversation_db, make_market_db, model
+
+    market_db = root / "market.sqlite3"
+    conversation_db = root / "conversation.sqlite3"
+    make_market_db(market_db)
+    make_conversation_db(conversation_db)
+    model_path = root / "model.json"
+    model_path.write_text(json.dumps(model()), encoding="utf-8")
+    return {
+        "market_db": market_db,
+        "conversation_db": conversation_db,
+        "model": model_path,
+        "end": datetime(2026, 7, 20, 10, 2, tzinfo=timezone.utc),
+    }
+
+
+def _synthetic_ml_artifact(root: Path) -> Path | None:
+    try:
+        import joblib
+        from sklearn.dummy import DummyRegressor
+    except ImportError:
+        return None
+    keys = ["tehran_hour", "tehran_minute_of_day", "is_morning_open"]
+    regressor = DummyRegressor(strategy="constant", constant=0.002)
+    regressor.fit([[9.0, 570.0, 1.0], [10.0, 600.0, 0.0]], [0.002, 0.002])
+    path = root / "ml.joblib"
+    joblib.dump({"sklearn_model": regressor, "feature_keys": keys, "shadow_version": "BENCH"}, path)
+    return path
+
+
+def _measure(inputs: dict, books: int, *, parallel: bool, cycles: int, root: Path) -> dict:
+    run_root = root / f"{'parallel' if parallel else 'serial'}-{books}"
+    run_root.mkdir()
+    calibration_db = run_root / "online_calibration.sqlite3"
+    prepare_calibration_store(calibration_db, inputs["conversation_db"])
+    missing = run_root / "missing"
+    challengers = [inputs["shadow_model"], inputs["research_model"], inputs["ml_artifact"]]
+    enabled = [path if index < books - 1 else missing for index, path in enumerate(challengers)]
+    os.environ["COIN_RATE_ESTIMATOR_PARALLEL_BOOKS"] = "1" if parallel else "0"
+    model = load_model(inputs["model"])
+    durations = []
+    for cycle in range(cycles + 1):
+        started = time.perf_counter()
+        refresh_estimate(
+            model,
+            inputs["market_db"],
+            inputs["conversation_db"],
+            run_root / "state.json",
+            StateStore(),
+            calibration_db=calibration_db,
+            end=inputs["end"] + timedelta(seconds=cycle),
+            shadow_model_path=enabled[0],
+            shadow_state_path=run_root / "shadow-state.json",
+            research_shadow_model_path=enabled[1],
+            research_shadow_state_path=run_root / "research-state.json",
+            ml_shadow_model_path=enabled[2],
+            ml_shadow_state_path=run_root / "ml-state.json",
+        )
+        durations.append(time.perf_counter() - started)
+    durations = durations[1:]
+    return {
+        "books": books,
+        "mode": "parallel" if parallel else "serial",
+        "cycles": len(durations),
+        "median_seconds": round(statistics.median(durations), 4),
+        "min_seconds": round(min(durations), 4),
+    }
+
+
+def main() -> int:
+    args = _parse_args()
+    os.environ["COIN_RATE_ESTIMATOR_BOOK_WORKERS"] = str(max(1, args.workers))
+    root = Path(tempfile.mkdtemp(prefix="coin-books-bench-"))
+    try:
+        if args.market_db is None:
+            inputs = _synthetic_inputs(root)
+        else:
+            inputs = {
+                "market_db": args.market_db,
+                "conversation_db": args.conversation_db,
+                "model": args.model,
+                "end": datetime.now(timezone.utc).replace(microsecond=0),
+            }
+        if args.model is not None:
+            inputs["model"] = args.model
+        if args.end:
+            inputs["end"] = datetime.fromisoformat(args.end).astimezone(timezone.utc)
+        inputs["shadow_model"] = args.shadow_model or inputs["model"]
+        inputs["research_model"] = args.research_model or inputs["model"]
+        inputs["ml_artifact"] = args.ml_artifact or _synthetic_ml_artifact(root) or root / "missing-ml"
+        results = []
+        for books in range(1, 5):
+            for parallel in (False, True):
+                results.append(_measure(inputs, books, parallel=parallel, cycles=max(1, args.cycles), root=root))
+        serial = {row["books"]: row["median_seconds"] for row in results if row["mode"] == "serial"}
+        for row in results:
+            row["speedup_vs_serial"] = (
+                round(serial[row["books"]] / row["median_seconds"], 2) if row["median_seconds"] else None
+            )
+        print(json.dumps({"workers": args.workers, "results": results}, ensure_ascii=False, indent=2))
+    finally:
+        live_server.shutdown_book_pool()
+        shutil.rmtree(root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Measure per-observation metrics overhead under a multi-worker setup.
+
+Each backend runs in ``--workers`` spawned processes, matching the way
+``uvicorn --workers`` starts API workers.  Every worker records
+``record_http_request`` in a loop, so each observation is one counter plus one
+histogram update.  ``registry_update_us`` times the same pair of registry
+calls with fixed label values.  That skips route normalization, so backend
+differences are easier to see.  The backends are:
+
+- ``memory``: process-local registry, the production default.
+- ``shared_sqlite``: the same in-memory update plus a dirty mark.  Deltas are
+  flushed by the background thread.
+- ``shared_sqlite_write_through``: ``TRADING_BOT_METRICS_FLUSH_SECONDS=0``.
+  Every update is written to SQLite inline, which is the cost the hot path
+  used to pay.
+
+For the shared backends, the merged ``/metrics`` total is checked against the
+number of observations.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKENDS = {
+    "memory": {"TRADING_BOT_METRICS_BACKEND": "memory"},
+    "shared_sqlite": {"TRADING_BOT_METRICS_BACKEND": "shared_sqlite"},
+    "shared_sqlite_write_through": {
+        "TRADING_BOT_METRICS_BACKEND": "shared_sqlite",
+        "TRADING_BOT_METRICS_FLUSH_SECONDS": "0",
+    },
+}
+ROUTES = ("/api/offers", "/api/trades/{id}", "/api/chat/messages", "/api/users/me")
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure metrics backend overhead per observation.")
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes per backend (API_WORKERS).")
+    parser.add_argument("--iterations", type=int, default=20000, help="Observations per worker.")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), action="append", help="Backends to run (default: all).")
+    parser.add_argument(
+        "--budget-us",
+        type=float,
+        default=25.0,
+        help="Allowed per-observation registry cost of shared_sqlite over memory.",
+    )
+    return parser.parse_args()
+
+
+def _worker(env: dict[str, str], iterations: int, start, results) -> None:
+    os.environ.update(env)
+    sys.path.insert(0, str(ROOT))
+    from core.metrics import record_http_request, registry
+
+    labels = [{"method": "GET", "route": route, "status_class": "2xx"} for route in ROUTES]
+    start.wait()
+    started = time.perf_counter()
+    for index in range(iterations):
+        registry.counter("trading_bot_benchmark_total", "Benchmark counter.", **labels[index % len(labels)])
+        registry.observe("trading_bot_benchmark_ms", "Benchmark histogram.", float(index % 300), **labels[index % len(labels)])
+    registry_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for index in range(iterations):
+        record_http_request(
+            method="GET",
+            route=ROUTES[index % len(ROUTES)],
+            status_code=200 if index % 20 else 500,
+            duration_ms=float(index % 300),
+        )
+    request_elapsed = time.perf_counter() - started
+    registry.flush()
+    results.put((registry_elapsed, request_elapsed))
+
+
+def _merged_request_total(env: dict[str, str]) -> float:
+    os.environ.update(env)
+    sys.path.insert(0, str(ROOT))
+    from core.metrics import MetricsRegistry
+
+    body = MetricsRegistry().render_prometheus()
+    pattern = r"^trading_bot_http_requests_total\{.*\} (\S+)$"
+    return sum(float(value) for value in re.findall(pattern, body, re.M))
+
+
+def _run_backend(name: str, workers: int, iterations: int, db_path: str) -> dict:
+    env = {**BACKENDS[name], "TRADING_BOT_METRICS_DB": db_path, "TRADING_BOT_SERVICE": "api"}
+    context = multiprocessing.get_context("spawn")
+    start = context.Event()
+    results = context.Queue()
+    processes = [context.Process(target=_worker, args=(env, iterations, start, results)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    start.set()
+    elapsed = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    report = {
+        "registry_update_us": round(max(item[0] for item in elapsed) / iterations * 1e6, 2),
+        "record_http_request_us": round(max(item[1] for item in elapsed) / iterations * 1e6, 2),
+    }
+    if env["TRADING_BOT_METRICS_BACKEND"] == "shared_sqlite":
+        with context.Pool(1) as pool:
+            merged = pool.apply(_merged_request_total, (env,))
+        report["merged_requests_total"] = merged
+        report["merged_total_matches"] = merged == workers * iterations
+    return report
+
+
+def main() -> int:
+    args = _parse_args()
+    backends = args.backend or list(BACKENDS)
+    report: dict = {"workers": args.workers, "iterations_per_worker": args.iterations, "backends": {}}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name in backends:
+            db_path = os.path.join(tmpdir, f"{name}.sqlite3")
+            report["backends"][name] = _run_backend(name, max(1, args.workers), max(1, args.iterations), db_path)
+
+    results = report["backends"]
+    acceptable = all(item.get("merged_total_matches", True) for item in results.values())
+    if "memory" in results and "shared_sqlite" in results:
+        overhead = results["shared_sqlite"]["registry_update_us"] - results["memory"]["registry_update_us"]
+        report["shared_sqlite_overhead_us"] = round(overhead, 2)
+        acceptable = acceptable and overhead <= args.budget_us
+    report["budget_us"] = args.budget_us
+    report["acceptable"] = acceptable
+    print(json.dumps(report, indent=2))
+    return 0 if report["acceptable"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
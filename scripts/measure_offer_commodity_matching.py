@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Measure commodity matching cost per parsed offer text.
+
+Compares the historical per-name loop with the precompiled
+``core.commodity_matcher.CommodityMatcher``.  The historical loop sorts the
+catalog and compiles one regex per name or alias on every message.  The run
+fails when the two disagree on any text.
+
+``--corpus`` accepts a UTF-8 file with one offer text per line, or an
+estimator review SQLite database with a ``raw_offer_text`` column, for example
+an export of real channel offers.  Without it, the built-in sample of offer
+shapes seen in the channels is used.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sqlite3
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.commodity_matcher import (  # noqa: E402
+    COMMODITY_BOUNDARY_CHARS,
+    CommodityMatcher,
+    catalog_name_map,
+    commodity_matcher_for_catalog,
+    has_bahar_qualifier_conflict,
+    normalize_commodity_phrase,
+)
+
+CATALOG = [
+    {"id": 1, "name": "امام", "aliases": ["امامی", "تمام"]},
+    {"id": 2, "name": "بهار", "aliases": ["آزادی", "ت پ", "ت.پ", "تاریخ پایین"]},
+    {"id": 3, "name": "ربع بهار", "aliases": ["ربع", "ربع‌بهار"]},
+    {"id": 4, "name": "نیم بهار", "aliases": ["نیم", "نیم‌بهار"]},
+    {"id": 5, "name": "ربع تاریخ پایین", "aliases": ["ربع ت.پ", "ربع پ", "ربع پایین"]},
+    {"id": 6, "name": "نیم تاریخ پایین", "aliases": ["نیم ت.پ", "نیم پ", "نیم پایین"]},
+    {"id": 7, "name": "یک گرمی", "aliases": ["مرکزی", "یک گرمی مرکزی"]},
+]
+SAMPLE_OFFERS = (
+    "خ امام 30تا 187500",
+    "ف بهار 10تا 176200",
+    "خ ف ربع بهار 20تا 51300",
+    "ف ف نیم بهار 15تا 92400 5 5 5",
+    "خرید تمام 40تا 187600",
+    "فروش ربع پایین 10 تا 44100",
+    "خ نیم ت.پ 12تا 88300",
+    "ف یک گرمی مرکزی 30تا 24100",
+    "خ 30تا 187500",
+    "ف پک 5تا 96000",
+    "خرید فردا آزادی 25تا 176900",
+    "ف ربع‌بهار 10تا 51250",
+)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure per-offer commodity matching latency.")
+    parser.add_argument("--corpus", type=Path, help="Offer texts (one per line) or a review SQLite DB.")
+    parser.add_argument("--repeat", type=int, default=200, help="Passes over the corpus per implementation.")
+    return parser.parse_args()
+
+
+def _load_corpus(path: Path | None) -> list[str]:
+    if path is None:
+        return list(SAMPLE_OFFERS)
+    if path.suffix in {".sqlite", ".sqlite3", ".db"}:
+        connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            return [str(row[0]) for row in connection.execute("SELECT raw_offer_text FROM offers") if row[0]]
+        finally:
+            connection.close()
+    return [line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+def _legacy_match(text: str, name_to_commodity: dict) -> tuple | None:
+    normalized_text = normalize_commodity_phrase(text)
+    names = sorted(
+        (name for name in name_to_commodity if normalize_commodity_phrase(name)),
+        key=lambda item: len(normalize_commodity_phrase(item)),
+        reverse=True,
+    )
+    for name in names:
+        phrase = r"\s+".join(re.escape(part) for part in normalize_commodity_phrase(name).split())
+        pattern = re.compile(rf"(?<![{COMMODITY_BOUNDARY_CHARS}]){phrase}(?![{COMMODITY_BOUNDARY_CHARS}])")
+        for match in pattern.finditer(normalized_text):
+            if has_bahar_qualifier_conflict(normalized_text, match.start(), name):
+                continue
+            return name_to_commodity[name]
+    return None
+
+
+def _time_per_text(corpus: list[str], repeat: int, function) -> list[float]:
+    samples = []
+    for _ in range(max(1, repeat)):
+        for text in corpus:
+            started = time.perf_counter()
+            function(text)
+            samples.append(time.perf_counter() - started)
+    return samples
+
+
+def _summary(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "median_us": round(statistics.median(ordered) * 1e6, 2),
+        "p99_us": round(ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))] * 1e6, 2),
+    }
+
+
+def main() -> int:
+    args = _parse_args()
+    corpus = _load_corpus(args.corpus)
+    name_map = catalog_name_map(CATALOG)
+    matcher = CommodityMatcher(name_map)
+    mismatches = [text for text in corpus if matcher.match(text) != _legacy_match(text, name_map)]
+
+    # Clear the re module cache so the legacy loop pays the per-name compiles it
+    # pays in production once the cache churns.
+    def legacy(text: str):
+        re.purge()
+        return _legacy_match(text, name_map)
+
+    legacy_samples = _time_per_text(corpus, args.repeat, legacy)
+    matcher_samples = _time_per_text(
+        corpus, args.repeat, lambda text: commodity_matcher_for_catalog(CATALOG).match(text)
+    )
+    print(
+        json.dumps(
+            {
+                "texts": len(corpus),
+                "catalog_phrases": len(matcher),
+                "mismatches": mismatches,
+                "legacy_per_name_regex": _summary(legacy_samples),
+                "precompiled_matcher": _summary(matcher_samples),
+            },
+            ensure_ascii=False,
+            indent=2,
+        )
+    )
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
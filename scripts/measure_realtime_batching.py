@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Measure realtime frames and bytes per market-page client per minute.
+
+The benchmark replays a synthetic busy minute of public offer events.  It
+spreads ``--events-per-second`` events over ``--offers`` active offers: new
+offers, partial fills that shrink ``remaining_quantity`` and ``lot_sizes``,
+and expiries.  Every event goes through the same projection and frame
+builder the realtime router uses.
+
+Two modes are reported:
+
+- ``v0``: one WebSocket frame per event, as sent today;
+- ``batch.v1``: the opt-in protocol, which coalesces events every
+  ``--interval-ms`` and sends deltas for offers the client already holds.
+
+Nothing touches Redis or the database; the numbers are per connected client.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from api.routers.realtime import (  # noqa: E402
+    _redis_public_event_payload,
+    build_realtime_frame,
+    project_public_event_payload,
+)
+from core.realtime_batching import REALTIME_BATCH_PROTOCOL, RealtimeBatchEncoder  # noqa: E402
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure realtime frames and bytes per client per minute.")
+    parser.add_argument("--offers", type=int, default=150, help="Active offers the events are spread over.")
+    parser.add_argument("--events-per-second", type=float, default=40.0, help="Public offer events per second.")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Replayed duration.")
+    parser.add_argument("--interval-ms", type=int, default=250, help="batch.v1 coalescing interval.")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for the event mix.")
+    return parser.parse_args()
+
+
+def _offer_payload(offer_id: int, remaining: int) -> dict:
+    return {
+        "id": offer_id,
+        "offer_public_id": f"ofr_{offer_id:08d}",
+        "public_link": f"https://example.invalid/offers/ofr_{offer_id:08d}",
+        "offer_type": "sell" if offer_id % 2 else "buy",
+        "settlement_type": "cash",
+        "commodity_id": 1 + offer_id % 6,
+        "commodity_name": "سکه امامی",
+        "quantity": 50,
+        "remaining_quantity": remaining,
+        "price": 187_000 + offer_id % 40 * 100,
+        "status": "active",
+        "created_at": "2026-10-17T08:00:00",
+        "notes": "تحویل فوری",
+        "is_wholesale": False,
+        "lot_sizes": [5] * max(1, remaining // 5),
+        "original_lot_sizes": [5] * 10,
+        "lifecycle_phase": "normal",
+        "expires_at_ts": 1_792_000_000 + offer_id,
+        "normal_deadline_ts": 1_792_000_000 + offer_id,
+        "final_deadline_ts": 1_792_000_300 + offer_id,
+        "timer_total_seconds": 300,
+        "accepts_new_public_interaction": True,
+        "accepts_automatic_trade": True,
+        "accepts_overtime_request": False,
+        "overtime_trade_committed": False,
+    }
+
+
+def _events(args: argparse.Namespace) -> list[tuple[float, str, dict]]:
+    rng = random.Random(args.seed)
+    remaining = {offer_id: 50 for offer_id in range(1, max(1, args.offers) + 1)}
+    next_offer_id = len(remaining) + 1
+    count = max(1, int(args.events_per_second * args.seconds))
+    events: list[tuple[float, str, dict]] = []
+    for index in range(count):
+        at = index / max(args.events_per_second, 0.001)
+        roll = rng.random()
+        if roll < 0.1 or not remaining:
+            offer_id, next_offer_id = next_offer_id, next_offer_id + 1
+            remaining[offer_id] = 50
+            events.append((at, "offer:created", _offer_payload(offer_id, 50)))
+            continue
+        offer_id = rng.choice(list(remaining))
+        if roll < 0.18 or remaining[offer_id] <= 5:
+            remaining.pop(offer_id)
+            payload = {**_offer_payload(offer_id, 0), "status": "expired", "expire_reason": "timeout"}
+            events.append((at, "offer:expired", payload))
+            continue
+        remaining[offer_id] -= 5
+        events.append((at, "offer:updated", _offer_payload(offer_id, remaining[offer_id])))
+    return events
+
+
+def _frames(events: list[tuple[float, str, dict]]):
+    for index, (at, event_type, payload) in enumerate(events):
+        public = project_public_event_payload(event_type, payload) or {}
+        raw = json.dumps(_redis_public_event_payload(public, event_id=f"{index:012x}"), ensure_ascii=False)
+        yield at, build_realtime_frame(f"events:{event_type}", raw)
+
+
+def _per_minute(value: float, seconds: float) -> float:
+    return round(value * 60.0 / max(seconds, 0.001), 1)
+
+
+def main() -> int:
+    args = _parse_args()
+    events = _events(args)
+    frames = list(_frames(events))
+    interval = max(1, args.interval_ms) / 1000
+
+    v0_bytes = sum(len(frame.websocket_text.encode("utf-8")) for _, frame in frames)
+
+    encoder = RealtimeBatchEncoder()
+    batch_frames = 0
+    batch_bytes = 0
+    window_end: float | None = None
+    for at, frame in frames:
+        if window_end is not None and at >= window_end:
+            text = encoder.drain()
+            batch_frames += 1
+            batch_bytes += len(text.encode("utf-8"))
+            window_end = None
+        encoder.add(frame)
+        if window_end is None:
+            window_end = at + interval
+    text = encoder.drain()
+    if text is not None:
+        batch_frames += 1
+        batch_bytes += len(text.encode("utf-8"))
+
+    report = {
+        "events": len(frames),
+        "seconds": args.seconds,
+        "interval_ms": args.interval_ms,
+        "results": [
+            {
+                "mode": "v0",
+                "frames_per_minute": _per_minute(len(frames), args.seconds),
+                "bytes_per_minute": _per_minute(v0_bytes, args.seconds),
+            },
+            {
+                "mode": REALTIME_BATCH_PROTOCOL,
+                "frames_per_minute": _per_minute(batch_frames, args.seconds),
+                "bytes_per_minute": _per_minute(batch_bytes, args.seconds),
+            },
+        ],
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
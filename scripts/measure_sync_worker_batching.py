@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Measure sync worker delivery throughput (rows/sec) versus peer round-trip time.
+
+The peer and the change_log are simulated in-process: each request sleeps for
+the configured RTT and each claim/marker query sleeps for the configured DB
+latency.  Serialization, HMAC signing and per-item response attribution use
+the real sync worker code, so the numbers isolate what batching saves.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from core.sync_worker import batch_delivery_outcomes, send_sync_batch
+
+
+class _SimulatedResponse:
+    status_code = 200
+    headers = {"content-type": "application/json"}
+
+    def __init__(self, processed: int) -> None:
+        self._payload = {"status": "success", "processed": processed}
+        self.text = json.dumps(self._payload)
+
+    def json(self) -> dict:
+        return self._payload
+
+
+class _SimulatedPeer:
+    def __init__(self, rtt_seconds: float) -> None:
+        self.rtt_seconds = rtt_seconds
+        self.requests = 0
+
+    async def post(self, url, *, content, headers, timeout):
+        self.requests += 1
+        await asyncio.sleep(self.rtt_seconds)
+        return _SimulatedResponse(len(json.loads(content)))
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure batched sync delivery throughput versus RTT.")
+    parser.add_argument("--rows", type=int, default=400, help="Backlog rows delivered per measurement.")
+    parser.add_argument("--rtt-ms", default="5,25,80,150", help="Comma-separated peer round-trip times.")
+    parser.add_argument("--batch-sizes", default="1,10,50,100", help="Comma-separated batch sizes.")
+    parser.add_argument("--db-ms", type=float, default=1.0, help="Simulated latency of each claim/marker query.")
+    return parser.parse_args()
+
+
+def _csv_numbers(raw: str, cast):
+    return [cast(part) for part in str(raw).split(",") if part.strip()]
+
+
+def _backlog(rows: int) -> list[dict]:
+    return [
+        {
+            "type": "db_change",
+            "operation": "UPDATE",
+            "table": "offers" if index % 3 else "trades",
+            "id": index,
+            "data": {"id": index, "status": "active", "remaining_quantity": index % 50},
+            "hash": f"bench-{index}",
+            "change_log_id": 10_000 + index,
+        }
+        for index in range(1, rows + 1)
+    ]
+
+
+async def _measure(rows: int, rtt_ms: float, batch_size: int, db_ms: float) -> dict:
+    backlog = _backlog(rows)
+    peer = _SimulatedPeer(rtt_ms / 1000)
+    db_seconds = db_ms / 1000
+    delivered = 0
+    started = time.perf_counter()
+    for offset in range(0, len(backlog), batch_size):
+        await asyncio.sleep(db_seconds)  # claim query
+        items = backlog[offset:offset + batch_size]
+        response = await send_sync_batch(peer, items, "https://peer.bench", "bench-key")
+        outcomes = batch_delivery_outcomes(response, items) or []
+        await asyncio.sleep(db_seconds)  # delivered marker
+        delivered += sum(1 for outcome in outcomes if outcome.delivered)
+    elapsed = time.perf_counter() - started
+    return {
+        "rtt_ms": rtt_ms,
+        "batch_size": batch_size,
+        "rows": delivered,
+        "requests": peer.requests,
+        "seconds": round(elapsed, 4),
+        "rows_per_second": round(delivered / elapsed, 1) if elapsed > 0 else None,
+    }
+
+
+async def _run(args: argparse.Namespace) -> list[dict]:
+    results = []
+    for rtt_ms in _csv_numbers(args.rtt_ms, float):
+        for batch_size in _csv_numbers(args.batch_sizes, int):
+            results.append(await _measure(max(1, args.rows), rtt_ms, max(1, batch_size), args.db_ms))
+    return results
+
+
+def main() -> int:
+    args = _parse_args()
+    results = asyncio.run(_run(args))
+    baseline = {row["rtt_ms"]: row["rows_per_second"] for row in results if row["batch_size"] == 1}
+    for row in results:
+        single = baseline.get(row["rtt_ms"])
+        row["speedup_vs_single_row"] = (
+            round(row["rows_per_second"] / single, 1) if single and row["rows_per_second"] else None
+        )
+    print(json.dumps({"db_ms": args.db_ms, "results": results}, ensure_ascii=False, sort_keys=True, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
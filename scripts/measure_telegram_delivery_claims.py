@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Measure Telegram delivery queue claim throughput and p99 claim latency.
+
+Each scenario truncates the queue in a scratch PostgreSQL database already
+upgraded to the Alembic head, seeds ``--queued`` pending primary-lane jobs
+spread over ``--destinations`` destinations, and then calls either
+``claim_next_telegram_delivery_job`` (one job per transaction) or
+``claim_telegram_delivery_jobs`` (up to ``--batch-size`` distinct-destination
+jobs per transaction).  Claimed jobs stay leased, so later calls walk deeper
+into the fairness order exactly as a draining worker would.
+
+The database name must start with ``telegram_queue_`` so the benchmark can
+never truncate a runtime queue.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.engine import make_url  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from core.services.telegram_delivery_queue_service import (  # noqa: E402
+    claim_next_telegram_delivery_job,
+    claim_telegram_delivery_jobs,
+    enqueue_telegram_delivery_job,
+)
+from core.telegram_delivery_queue_contract import (  # noqa: E402
+    TelegramDeliveryAction,
+    TelegramDestinationClass,
+    TelegramFeederKind,
+)
+
+_SCRATCH_PREFIX = "telegram_queue_"
+_CLONE_JOBS = text(
+    """
+    INSERT INTO telegram_delivery_jobs (
+        dedupe_key, feeder_kind, feeder_rank, source_natural_id, source_version,
+        action_kind, bot_identity, destination_key, destination_class, method,
+        payload, template_version, payload_hash, priority, priority_rank, run_id
+    )
+    SELECT
+        template.dedupe_key || ':' || series.n,
+        template.feeder_kind, template.feeder_rank,
+        template.source_natural_id || '-' || series.n, template.source_version,
+        template.action_kind, template.bot_identity,
+        'private:bench-' || (series.n % :destinations),
+        template.destination_class, template.method, template.payload,
+        template.template_version, template.payload_hash,
+        template.priority, (series.n % 4)::smallint, template.run_id
+    FROM telegram_delivery_jobs AS template
+    CROSS JOIN generate_series(1, :count) AS series(n)
+    WHERE template.id = :template_id
+    """
+)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure Telegram queue claims/sec and p99 claim latency.")
+    parser.add_argument("--database-url", required=True, help="Async owner URL of a scratch telegram_queue_* database.")
+    parser.add_argument("--queued", default="10000,50000,100000", help="Comma-separated queue depths.")
+    parser.add_argument("--destinations", type=int, default=2000, help="Distinct destinations in the seeded queue.")
+    parser.add_argument("--batch-size", type=int, default=25, help="Jobs per batch claim call.")
+    parser.add_argument("--calls", type=int, default=200, help="Measured claim calls per scenario.")
+    return parser.parse_args()
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def _seed(engine, Session, queued: int, destinations: int) -> None:
+    async with engine.begin() as connection:
+        await connection.execute(text("TRUNCATE TABLE telegram_delivery_jobs RESTART IDENTITY CASCADE"))
+    async with Session() as db:
+        template = await enqueue_telegram_delivery_job(
+            db,
+            current_server="foreign",
+            feeder=TelegramFeederKind.DIRECT,
+            source_natural_id="claim-bench",
+            source_version=1,
+            action=TelegramDeliveryAction.GENERAL_IMMEDIATE,
+            bot_identity="primary",
+            destination_key="private:bench-template",
+            destination_class=TelegramDestinationClass.PRIVATE,
+            method="sendMessage",
+            payload={"chat_id": 1001, "text": "claim benchmark"},
+            template_version="claim-bench-v1",
+            run_id="claim-bench",
+        )
+        await db.execute(
+            _CLONE_JOBS,
+            {"template_id": template.job.id, "count": queued - 1, "destinations": max(1, destinations)},
+        )
+        await db.commit()
+    async with engine.begin() as connection:
+        await connection.execute(text("ANALYZE telegram_delivery_jobs"))
+
+
+async def _claim(Session, batch_size: int | None) -> int:
+    async with Session() as db:
+        common = {
+            "current_server": "foreign",
+            "bot_identity": "primary",
+            "worker_id": "claim-bench",
+            "request_timeout_seconds": 10,
+            "lease_seconds": 600,
+        }
+        if batch_size is None:
+            claimed = 0 if await claim_next_telegram_delivery_job(db, **common) is None else 1
+        else:
+            claimed = len(await claim_telegram_delivery_jobs(db, max_jobs=batch_size, **common))
+        await db.commit()
+    return claimed
+
+
+async def _measure(engine, Session, *, queued: int, args: argparse.Namespace, batch_size: int | None) -> dict:
+    await _seed(engine, Session, queued, args.destinations)
+    latencies: list[float] = []
+    claimed = 0
+    started = time.perf_counter()
+    for _ in range(max(1, args.calls)):
+        call_started = time.perf_counter()
+        claimed += await _claim(Session, batch_size)
+        latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+    return {
+        "queued": queued,
+        "mode": "single" if batch_size is None else f"batch-{batch_size}",
+        "calls": len(latencies),
+        "claimed": claimed,
+        "claims_per_second": round(claimed / elapsed, 1) if elapsed else None,
+        "median_claim_ms": round(statistics.median(latencies) * 1000, 3),
+        "p99_claim_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    database = make_url(args.database_url).database or ""
+    if not database.startswith(_SCRATCH_PREFIX):
+        raise SystemExit(f"refusing non-scratch database {database!r}; expected {_SCRATCH_PREFIX}*")
+    engine = create_async_engine(args.database_url)
+    Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+    results = []
+    try:
+        for queued in (int(part) for part in str(args.queued).split(",") if part.strip()):
+            for batch_size in (None, max(1, args.batch_size)):
+                results.append(await _measure(engine, Session, queued=queued, args=args, batch_size=batch_size))
+        async with engine.begin() as connection:
+            await connection.execute(text("TRUNCATE TABLE telegram_delivery_jobs RESTART IDENTITY CASCADE"))
+    finally:
+        await engine.dispose()
+    return {"destinations": args.destinations, "results": results}
+
+
+def main() -> int:
+    print(json.dumps(asyncio.run(_run(_parse_args())), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
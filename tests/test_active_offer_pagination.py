@@ -9,6 +9,7 @@ from sqlalchemy.dialects import postgresql
 from api.routers import offers as offers_module
 from api.routers import sync as sync_module
 from api.routers.realtime import REALTIME_SOURCE_SYNC_APPLY
+from core.order_book import OrderBookEntry, OrderBookService
 from models.offer import Offer, OfferStatus
 
 
@@ -39,6 +40,16 @@ class CapturingDB:
         return FakeExecuteResult(self.values)
 
 
+class SequencedDB(CapturingDB):
+    def __init__(self, *results):
+        super().__init__([])
+        self.results = list(results)
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return FakeExecuteResult(self.results.pop(0))
+
+
 def response_for(offer_id: int) -> offers_module.OfferResponse:
     return offers_module.OfferResponse(
         id=offer_id,
@@ -230,6 +241,106 @@ class ActiveOfferPageEndpointTests(unittest.IsolatedAsyncioTestCase):
         self.assertIn("LIMIT 2", compile_sql(db.statements[0]))
 
 
+    async def test_ready_order_book_picks_page_ids_and_sql_only_loads_them(self):
+        created_at = datetime(2026, 7, 14, 10, 30, tzinfo=timezone.utc)
+        service = OrderBookService()
+        for offer_id, owner_id in ((50, 11), (51, 11), (52, 12), (53, 11)):
+            service.index.upsert(
+                OrderBookEntry(
+                    offer_id=offer_id,
+                    user_id=owner_id,
+                    commodity_id=7,
+                    offer_type="buy",
+                    settlement_type="cash",
+                    quantity=10,
+                    price=100_000,
+                    exclude_from_competitive_price=False,
+                    created_at_us=int(created_at.timestamp() * 1_000_000),
+                    overtime_minutes=0,
+                )
+            )
+        service.ready = True
+        db = CapturingDB([SimpleNamespace(id=53, created_at=created_at)])
+        user = SimpleNamespace(id=11)
+        context = SimpleNamespace(owner_user=user, actor_user=user, is_accountant_context=False)
+
+        with patch.object(offers_module, "order_book", service), patch(
+            "core.trading_settings.get_trading_settings_async",
+            new=AsyncMock(return_value=SimpleNamespace()),
+        ), patch.object(
+            offers_module,
+            "_serialize_offer_responses",
+            new=AsyncMock(return_value=[response_for(53)]),
+        ):
+            response = await offers_module.get_active_offer_page(
+                offer_type="buy",
+                settlement_type="cash",
+                commodity_id=7,
+                own_only=True,
+                cursor=None,
+                limit=1,
+                db=db,
+                current_user=user,
+                context=context,
+            )
+
+        self.assertTrue(response.has_more)
+        sql = compile_sql(db.statements[0])
+        self.assertIn("offers.id IN (53)", sql)
+        self.assertIn("offers.status = 'ACTIVE'", sql)
+        self.assertNotIn("LIMIT", sql)
+
+    async def test_stale_order_book_page_falls_back_to_sql(self):
+        created_at = datetime(2026, 7, 14, 10, 30, tzinfo=timezone.utc)
+        service = OrderBookService()
+        for offer_id in (51, 52, 53):
+            service.index.upsert(
+                OrderBookEntry(
+                    offer_id=offer_id,
+                    user_id=11,
+                    commodity_id=7,
+                    offer_type="buy",
+                    settlement_type="cash",
+                    quantity=10,
+                    price=100_000,
+                    exclude_from_competitive_price=False,
+                    created_at_us=int(created_at.timestamp() * 1_000_000),
+                    overtime_minutes=0,
+                )
+            )
+        service.ready = True
+        fallback_rows = [SimpleNamespace(id=51, created_at=created_at), SimpleNamespace(id=50, created_at=created_at)]
+        db = SequencedDB([], fallback_rows)
+        user = SimpleNamespace(id=11)
+        context = SimpleNamespace(owner_user=user, actor_user=user, is_accountant_context=False)
+
+        with patch.object(offers_module, "order_book", service), patch(
+            "core.trading_settings.get_trading_settings_async",
+            new=AsyncMock(return_value=SimpleNamespace()),
+        ), patch.object(
+            offers_module,
+            "_serialize_offer_responses",
+            new=AsyncMock(return_value=[response_for(51)]),
+        ):
+            response = await offers_module.get_active_offer_page(
+                offer_type="buy",
+                settlement_type="cash",
+                commodity_id=7,
+                own_only=False,
+                cursor=None,
+                limit=1,
+                db=db,
+                current_user=user,
+                context=context,
+            )
+
+        # Offer 53 closed before its dirty refresh; the page still moves on.
+        self.assertEqual([item.id for item in response.items], [51])
+        self.assertTrue(response.has_more)
+        self.assertIn("offers.id IN (53)", compile_sql(db.statements[0]))
+        self.assertIn("LIMIT 2", compile_sql(db.statements[1]))
+
+
 class ActiveOfferRealtimeIdentityTests(unittest.IsolatedAsyncioTestCase):
     async def test_synced_terminal_event_carries_public_identity_when_available(self):
         offer = SimpleNamespace(
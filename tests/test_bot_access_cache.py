@@ -0,0 +1,186 @@
+import json
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bot import access_cache
+from bot.access_cache import BotAccessCache, apply_bot_access_invalidation
+from bot.middlewares import auth as auth_middleware
+from core import events
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_user(**overrides):
+    values = {
+        "id": 42,
+        "telegram_id": 10,
+        "sync_version": 3,
+        "updated_at": "2026-10-17T08:00:00",
+        "is_deleted": False,
+        "account_status": "active",
+        "role": "عادی",
+        "mobile_number": "09120000000",
+        "address": "x",
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+ALLOWED = SimpleNamespace(allowed=True, reason=None)
+
+
+class BotAccessCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.cache = BotAccessCache(ttl_seconds=10, max_entries=2, clock=self.clock)
+        patcher = patch.object(access_cache, "record_bot_auth_access_cache")
+        self.record = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def results(self):
+        return [call.args[0] for call in self.record.call_args_list]
+
+    def test_hit_requires_same_user_version_and_fresh_entry(self):
+        user = make_user()
+        self.assertIsNone(self.cache.get(10, user))
+        self.cache.put(10, user, activation_block=None, access_decision=ALLOWED)
+
+        self.assertIs(self.cache.get(10, make_user()).access_decision, ALLOWED)
+        self.assertIsNone(self.cache.get(10, make_user(sync_version=4)))
+
+        self.cache.put(10, user, activation_block=None, access_decision=ALLOWED)
+        self.clock.now += 10
+        self.assertIsNone(self.cache.get(10, user))
+        self.assertEqual(self.results(), ["miss", "hit", "stale", "stale"])
+
+    def test_invalidation_by_user_or_telegram_id(self):
+        self.cache.put(10, make_user(), activation_block=None, access_decision=ALLOWED)
+        self.cache.put(11, make_user(id=43, telegram_id=11), activation_block=None, access_decision=ALLOWED)
+
+        self.assertEqual(apply_bot_access_invalidation(self.cache, json.dumps({"user_ids": [43]})), 1)
+        self.assertEqual(apply_bot_access_invalidation(self.cache, b'{"telegram_ids": [10]}'), 1)
+        self.assertEqual(apply_bot_access_invalidation(self.cache, "not json"), 0)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_verdict_computed_across_an_invalidation_is_not_stored(self):
+        generation = self.cache.generation
+        self.cache.invalidate(user_ids=[42])
+
+        self.cache.put(10, make_user(), activation_block=None, access_decision=ALLOWED, generation=generation)
+
+        self.assertEqual(len(self.cache), 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        for telegram_id in (1, 2):
+            self.cache.put(telegram_id, make_user(id=telegram_id), activation_block=None, access_decision=ALLOWED)
+        self.cache.get(1, make_user(id=1))
+        self.cache.put(3, make_user(id=3), activation_block=None, access_decision=ALLOWED)
+
+        self.assertIsNotNone(self.cache.get(1, make_user(id=1)))
+        self.assertIsNone(self.cache.get(2, make_user(id=2)))
+
+    def test_zero_ttl_disables_the_cache(self):
+        cache = BotAccessCache(ttl_seconds=0)
+        cache.put(10, make_user(), activation_block=None, access_decision=ALLOWED)
+
+        self.assertFalse(cache.enabled)
+        self.assertEqual(len(cache), 0)
+
+
+class _AsyncSessionContext:
+    def __init__(self, session):
+        self._session = session
+
+    async def __aenter__(self):
+        return self._session
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class AuthMiddlewareAccessCacheTests(unittest.IsolatedAsyncioTestCase):
+    async def test_repeated_updates_reuse_the_cached_verdict(self):
+        user = make_user()
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=user)))
+        cache = BotAccessCache(ttl_seconds=30)
+        middleware = auth_middleware.AuthMiddleware(
+            session_pool=MagicMock(return_value=_AsyncSessionContext(session)),
+            access_cache=cache,
+        )
+        handler = AsyncMock(return_value="ok")
+        event = SimpleNamespace(from_user=SimpleNamespace(id=10, username=None))
+
+        with patch.object(
+            auth_middleware, "_get_event_and_from_user", return_value=(event, event.from_user)
+        ), patch.object(auth_middleware, "direct_registration_runtime_ready", return_value=True), patch.object(
+            auth_middleware, "registration_activation_block_for_user", new=AsyncMock(return_value=None)
+        ) as activation, patch.object(
+            auth_middleware, "evaluate_bot_access", new=AsyncMock(return_value=ALLOWED)
+        ) as evaluate, patch.object(
+            auth_middleware, "is_user_global_web_locked", return_value=False
+        ), patch.object(
+            auth_middleware, "user_requires_bot_onboarding", return_value=False
+        ), patch.object(access_cache, "record_bot_auth_access_cache"):
+            for _ in range(3):
+                self.assertEqual(await middleware(handler, event, {}), "ok")
+            cache.invalidate(user_ids=[42])
+            self.assertEqual(await middleware(handler, event, {}), "ok")
+
+        self.assertEqual(activation.await_count, 2)
+        self.assertEqual(evaluate.await_count, 2)
+        self.assertEqual(session.execute.await_count, 4)
+        self.assertEqual(handler.await_count, 4)
+
+
+class BotAccessInvalidationEventTests(unittest.TestCase):
+    def test_committed_relation_change_publishes_affected_users(self):
+        from models.customer_relation import CustomerRelation
+        from models.telegram_registration_intent import TelegramRegistrationIntent
+
+        session = SimpleNamespace(
+            info={},
+            new=[CustomerRelation(customer_user_id=7)],
+            dirty=[TelegramRegistrationIntent(projected_user_id=8, telegram_id=900)],
+            deleted=[SimpleNamespace()],
+            in_nested_transaction=lambda: False,
+        )
+        events.collect_bot_access_invalidations(session, None)
+
+        with patch.object(events, "publish_event_sync") as publish:
+            events.publish_bot_access_invalidations_after_commit(session)
+            events.publish_bot_access_invalidations_after_commit(session)
+
+        publish.assert_called_once_with(
+            events.BOT_ACCESS_INVALIDATED_EVENT,
+            {"user_ids": [7, 8], "telegram_ids": [900]},
+        )
+
+    def test_rollback_discards_pending_invalidations(self):
+        from models.accountant_relation import AccountantRelation
+
+        session = SimpleNamespace(
+            info={},
+            new=[AccountantRelation(accountant_user_id=5)],
+            dirty=[],
+            deleted=[],
+            in_nested_transaction=lambda: False,
+        )
+        events.collect_bot_access_invalidations(session, None)
+        events.clear_bot_access_invalidations_after_rollback(session)
+
+        with patch.object(events, "publish_event_sync") as publish:
+            events.publish_bot_access_invalidations_after_commit(session)
+
+        publish.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,219 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+
+from bot import message_manager
+from bot.message_delete_scheduler import MESSAGE_DELETE_SCHEDULE_KEY, MessageDeleteScheduler
+
+
+class FakeSortedSetRedis:
+    def __init__(self):
+        self.zsets = {}
+
+    def _zset(self, key):
+        return self.zsets.setdefault(key, {})
+
+    def pipeline(self, transaction=False):
+        redis = self
+        ops = []
+
+        class Pipeline:
+            def zadd(self, key, mapping):
+                ops.append(("zadd", key, mapping))
+
+            def zrem(self, key, *members):
+                ops.append(("zrem", key, members))
+
+            async def execute(self):
+                for op, key, arg in ops:
+                    if op == "zadd":
+                        await redis.zadd(key, arg)
+                    else:
+                        await redis.zrem(key, *arg)
+
+        return Pipeline()
+
+    async def zadd(self, key, mapping, xx=False):
+        zset = self._zset(key)
+        for member, score in mapping.items():
+            if xx and member not in zset:
+                continue
+            zset[member] = float(score)
+
+    async def zrem(self, key, *members):
+        zset = self._zset(key)
+        for member in members:
+            zset.pop(member, None)
+
+    def _ordered(self, key):
+        return sorted(self._zset(key).items(), key=lambda item: (item[1], item[0]))
+
+    async def zrangebyscore(self, key, low, high, start=0, num=None):
+        members = [member for member, score in self._ordered(key) if score <= float(high)]
+        return members[start : None if num is None else start + num]
+
+    async def zrange(self, key, start, stop, withscores=False):
+        items = self._ordered(key)[start : stop + 1]
+        return items if withscores else [member for member, _score in items]
+
+    async def zcard(self, key):
+        return len(self._zset(key))
+
+    async def zcount(self, key, low, high):
+        return sum(1 for _member, score in self._ordered(key) if score <= float(high))
+
+
+class Clock:
+    def __init__(self, now=1_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class MessageDeleteSchedulerTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.redis = FakeSortedSetRedis()
+        self.clock = Clock()
+        self.bot = AsyncMock()
+        self.anchors = set()
+        for target in ("record_bot_message_deletes", "set_bot_message_delete_backlog"):
+            patcher = patch(f"bot.message_delete_scheduler.{target}")
+            setattr(self, target, patcher.start())
+            self.addCleanup(patcher.stop)
+
+    def scheduler(self, **kwargs):
+        return MessageDeleteScheduler(
+            self.bot,
+            self.redis,
+            is_anchor=lambda chat_id, message_id: (chat_id, message_id) in self.anchors,
+            clock=self.clock,
+            **kwargs,
+        )
+
+    def pending(self):
+        return self.redis.zsets.get(MESSAGE_DELETE_SCHEDULE_KEY, {})
+
+    async def test_due_messages_are_deleted_in_one_call_per_chat(self):
+        scheduler = self.scheduler()
+        for message_id in (11, 12, 13):
+            scheduler.schedule(-100, message_id, 60)
+        scheduler.schedule(7, 70, 60)
+        scheduler.schedule(7, 71, 600)
+
+        next_due = await scheduler.run_once()
+        self.assertEqual(next_due, 1_060.0)
+        self.assertEqual(len(self.pending()), 5)
+        self.bot.delete_messages.assert_not_awaited()
+
+        self.clock.now = 1_061.0
+        next_due = await scheduler.run_once()
+
+        self.bot.delete_messages.assert_awaited_once_with(-100, [11, 12, 13])
+        self.bot.delete_message.assert_awaited_once_with(7, 70)
+        self.assertEqual(list(self.pending()), ["7:71"])
+        self.assertEqual(next_due, 1_600.0)
+        self.set_bot_message_delete_backlog.assert_called_with(pending=1, overdue=0)
+
+    async def test_schedule_survives_a_restart(self):
+        first = self.scheduler()
+        first.schedule(5, 50, 120)
+        first.schedule(5, 51, 120)
+        await first.flush_pending()
+
+        self.clock.now += 500
+        restarted = self.scheduler()
+        await restarted.run_once()
+
+        self.bot.delete_messages.assert_awaited_once_with(5, [50, 51])
+        self.assertEqual(self.pending(), {})
+        self.set_bot_message_delete_backlog.assert_called_with(pending=0, overdue=0)
+
+    async def test_anchor_messages_are_never_deleted(self):
+        scheduler = self.scheduler()
+        scheduler.schedule(3, 30, 10)
+        scheduler.schedule(3, 31, 10)
+        scheduler.cancel(3, 31)
+        self.anchors.add((3, 30))
+
+        self.clock.now += 20
+        await scheduler.run_once()
+
+        self.bot.delete_message.assert_not_awaited()
+        self.bot.delete_messages.assert_not_awaited()
+        self.assertEqual(self.pending(), {})
+        self.record_bot_message_deletes.assert_called_once_with("anchor_skipped", 1)
+
+    async def test_limiter_wait_defers_the_chat_batch(self):
+        limiter = SimpleNamespace(
+            acquire=AsyncMock(return_value=SimpleNamespace(allowed=False, retry_after_seconds=4.0)),
+        )
+        scheduler = self.scheduler(limiter=limiter)
+        scheduler.schedule(-200, 1, 0)
+        scheduler.schedule(-200, 2, 0)
+
+        await scheduler.run_once()
+
+        job = limiter.acquire.await_args.args[0]
+        self.assertEqual(job.bot_identity, "primary")
+        self.assertEqual(job.destination_key, "chat:-200")
+        self.bot.delete_messages.assert_not_awaited()
+        self.assertEqual(self.pending(), {"-200:1": 1_004.0, "-200:2": 1_004.0})
+        self.record_bot_message_deletes.assert_called_once_with("deferred", 2)
+
+    async def test_retry_after_extends_the_destination_cooldown(self):
+        limiter = SimpleNamespace(
+            acquire=AsyncMock(return_value=SimpleNamespace(allowed=True, retry_after_seconds=None)),
+            extend_destination_cooldown=AsyncMock(),
+        )
+        self.bot.delete_messages = AsyncMock(
+            side_effect=TelegramRetryAfter(method="deleteMessages", message="slow down", retry_after=9)
+        )
+        scheduler = self.scheduler(limiter=limiter)
+        scheduler.schedule(8, 1, 0)
+        scheduler.schedule(8, 2, 0)
+
+        await scheduler.run_once()
+
+        limiter.extend_destination_cooldown.assert_awaited_once()
+        self.assertEqual(limiter.extend_destination_cooldown.await_args.args[0].destination_key, "private:chat:8")
+        self.assertEqual(self.pending(), {"8:1": 1_009.0, "8:2": 1_009.0})
+
+    async def test_gone_messages_are_dropped_from_the_schedule(self):
+        self.bot.delete_message = AsyncMock(side_effect=TelegramBadRequest(method="deleteMessage", message="gone"))
+        scheduler = self.scheduler()
+        scheduler.schedule(9, 90, 0)
+
+        await scheduler.run_once()
+
+        self.assertEqual(self.pending(), {})
+        self.record_bot_message_deletes.assert_called_once_with("gone", 1)
+
+
+class MessageManagerSchedulerRoutingTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        message_manager._anchor_messages.clear()
+        self.calls = []
+        self.scheduler = SimpleNamespace(
+            schedule=lambda *args: self.calls.append(("schedule", *args)),
+            cancel=lambda *args: self.calls.append(("cancel", *args)),
+        )
+        message_manager.install_delete_scheduler(self.scheduler)
+        self.addCleanup(message_manager.install_delete_scheduler, None)
+
+    async def test_installed_scheduler_replaces_per_message_tasks(self):
+        with patch("bot.message_manager.asyncio.create_task") as create_task:
+            message_manager.schedule_delete(AsyncMock(), 1, 2, message_manager.DeleteDelay.INVITATION)
+            message_manager.set_anchor(1, 3)
+
+        create_task.assert_not_called()
+        self.assertEqual(
+            self.calls,
+            [("schedule", 1, 2, message_manager.DeleteDelay.INVITATION.value), ("cancel", 1, 3)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -287,7 +287,14 @@ class ChatRouterDirectReadEndpointTests(unittest.IsolatedAsyncioTestCase):
         ) as serialize_mock:
             result = await search_messages(q="hello", chat_id=9, limit=15, db=db, current_user=current_user)
 
-        build_mock.assert_awaited_once_with(db, current_user_id=5, query_text="hello", other_user_id=9, limit=15)
+        build_mock.assert_awaited_once_with(
+            db,
+            current_user_id=5,
+            query_text="hello",
+            other_user_id=9,
+            limit=15,
+            before_id=None,
+        )
         serialize_mock.assert_awaited_once()
         self.assertIs(result, serialized)
 
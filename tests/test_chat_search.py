@@ -0,0 +1,59 @@
+import importlib.util
+import unittest
+from pathlib import Path
+
+from core.chat_search import (
+    CHAT_SEARCH_DROPPED_CHARS,
+    CHAT_SEARCH_FOLDED_CHARS,
+    CHAT_SEARCH_FOLDED_TARGETS,
+    CHAT_SEARCH_MAX_LIMIT,
+    chat_search_like_pattern,
+    clamp_chat_search_limit,
+    normalize_chat_search_text,
+)
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+MIGRATION_PATH = REPO_ROOT / "migrations/versions/1b2c3d4e5f6a_add_message_search_trigram_index.py"
+
+
+def load_migration():
+    spec = importlib.util.spec_from_file_location("message_search_migration", MIGRATION_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class ChatSearchNormalizationTests(unittest.TestCase):
+    def test_folds_arabic_letters_digits_and_zwnj(self):
+        cases = {
+            "سكه امامي": "سکه امامی",
+            "ربع‌بهار": "ربع بهار",
+            "  نيم  سـكه ۱۸۷۵۰۰ ": "نیم سکه 187500",
+            "قیمت ٥١٣٠٠": "قیمت 51300",
+            "‏USDT‎ Tether": "usdt tether",
+            "‌ \t": "",
+        }
+        for raw, expected in cases.items():
+            with self.subTest(raw=raw):
+                self.assertEqual(normalize_chat_search_text(raw), expected)
+
+    def test_like_pattern_escapes_wildcards(self):
+        self.assertEqual(chat_search_like_pattern("50%_off\\"), "%50\\%\\_off\\\\%")
+
+    def test_limit_is_bounded(self):
+        self.assertEqual(clamp_chat_search_limit(None), 50)
+        self.assertEqual(clamp_chat_search_limit(0), 1)
+        self.assertEqual(clamp_chat_search_limit(10_000), CHAT_SEARCH_MAX_LIMIT)
+
+    def test_sql_function_uses_the_same_translation(self):
+        migration = load_migration()
+
+        self.assertEqual(len(CHAT_SEARCH_FOLDED_CHARS), len(CHAT_SEARCH_FOLDED_TARGETS))
+        self.assertEqual(migration._FOLDED_CHARS, CHAT_SEARCH_FOLDED_CHARS + CHAT_SEARCH_DROPPED_CHARS)
+        self.assertEqual(migration._FOLDED_TARGETS, CHAT_SEARCH_FOLDED_TARGETS)
+        self.assertEqual(migration.down_revision, "0a1b2c3d4e5f")
+
+
+if __name__ == "__main__":
+    unittest.main()
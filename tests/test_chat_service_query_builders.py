@@ -65,7 +65,7 @@ class ChatServiceQueryBuilderTests(unittest.IsolatedAsyncioTestCase):
 
         lookup_mock.assert_not_awaited()
         sql = compile_sql(stmt)
-        self.assertIn("ILIKE '%%hello%%'", sql)
+        self.assertIn("chat_search_normalize(messages.content) LIKE '%%hello%%'", sql)
         self.assertIn("LIMIT 25", sql)
         self.assertIn("messages.sender_id = 10", sql)
         self.assertIn("messages.receiver_id = 10", sql)
@@ -89,6 +89,31 @@ class ChatServiceQueryBuilderTests(unittest.IsolatedAsyncioTestCase):
         lookup_mock.assert_awaited_once_with(db, 10, 20)
         self.assertIn("1 = 1", compile_sql(stmt))
 
+    async def test_build_direct_message_search_stmt_normalizes_query_and_paginates_by_keyset(self):
+        stmt = await build_direct_message_search_stmt(
+            object(),
+            current_user_id=10,
+            query_text="  سكه\u200cي ۱۲%_ ",
+            limit=5000,
+            before_id=900,
+        )
+
+        sql = compile_sql(stmt)
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        self.assertIn("chat_search_normalize(messages.content) LIKE", sql)
+        self.assertIn("%سکه ی 12\\%\\_%", params.values())
+        self.assertIn("(messages.created_at, messages.id) < ((SELECT messages.created_at", sql)
+        self.assertIn("WHERE messages.id = 900), 900)", sql)
+        self.assertIn("ORDER BY messages.created_at DESC, messages.id DESC", sql)
+        self.assertIn("LIMIT 100", sql)
+
+    async def test_build_direct_message_search_stmt_matches_nothing_for_blank_query(self):
+        stmt = await build_direct_message_search_stmt(object(), current_user_id=10, query_text=" \u200c ")
+
+        sql = compile_sql(stmt)
+        self.assertIn("false", sql)
+        self.assertNotIn("LIKE", sql)
+
     async def test_build_direct_message_history_statements_supports_before_id_pagination(self):
         db = object()
         fake_condition = sa.text("1 = 1")
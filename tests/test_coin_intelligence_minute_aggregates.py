@@ -0,0 +1,237 @@
+"""Parity tests for the trigger-maintained Market Store minute aggregate."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import random
+import sqlite3
+import tempfile
+import unittest
+
+from core.market_intelligence.market_contracts import MarketObservation, derive_event_key
+from core.market_intelligence.market_snapshot import _event_weight, _weighted_median
+from core.market_intelligence.market_store import (
+    MARKET_OBSERVATION_MINUTE_AGGREGATES,
+    connect_market_store,
+    initialize_market_store,
+    summarize_observation_window,
+    upsert_observation,
+)
+
+
+BASE = datetime(2026, 8, 4, 5, 30, tzinfo=timezone.utc)
+
+
+def _iso(value: datetime) -> str:
+    return value.isoformat().replace("+00:00", "Z")
+
+
+def _observation(index: int, *, offset_seconds: int, price: int, **overrides: object) -> MarketObservation:
+    values: dict[str, object] = {
+        "event_key": derive_event_key("aggregate-test", str(index)),
+        "source_code": "GROUP_1",
+        "source_family": "GROUP",
+        "event_time_utc": _iso(BASE + timedelta(seconds=offset_seconds)),
+        "available_at_utc": _iso(BASE + timedelta(seconds=offset_seconds + 1)),
+        "instrument": "COIN_IMAM",
+        "market_label": "COIN_MARKET",
+        "settlement_term": "CASH",
+        "trade_form": "PHYSICAL",
+        "event_type": "OFFER",
+        "side": "BUY",
+        "price": str(price),
+        "price_unit": "PROJECT_THOUSAND_TOMAN",
+        "currency": "IRT",
+        "parse_confidence": 0.98,
+        "parser_version": "group-parser-v3",
+        "quality_state": "ELIGIBLE",
+        "quality_policy_version": "quality-v2",
+    }
+    values.update(overrides)
+    return MarketObservation(**values)  # type: ignore[arg-type]
+
+
+def _raw_window(
+    connection: sqlite3.Connection, *, start_utc: str, end_utc: str, **filters: str
+) -> dict[str, object] | None:
+    clauses = ["event_time_utc > ?", "event_time_utc <= ?"]
+    parameters: list[object] = [start_utc, end_utc]
+    for column, value in filters.items():
+        clauses.append(f"{column} = ?")
+        parameters.append(value)
+    where = " AND ".join(clauses)
+    row = connection.execute(
+        f"""
+        SELECT AVG(price_num) AS average_price, MIN(price_num) AS minimum_price,
+               MAX(price_num) AS maximum_price, COUNT(*) AS sample_count,
+               MIN(event_time_utc) AS first_event_utc
+        FROM market_observations WHERE {where}
+        """,
+        parameters,
+    ).fetchone()
+    if not row["sample_count"]:
+        return None
+    latest = connection.execute(
+        f"""
+        SELECT id, price_num, event_time_utc, event_type, side
+        FROM market_observations WHERE {where}
+        ORDER BY event_time_utc DESC, id DESC LIMIT 1
+        """,
+        parameters,
+    ).fetchone()
+    weighted = _weighted_median(
+        (float(item["price_num"]), _event_weight(str(item["event_type"])))
+        for item in connection.execute(
+            f"SELECT price_num, event_type FROM market_observations WHERE {where}",
+            parameters,
+        )
+    )
+    return {
+        "average_price": float(row["average_price"]),
+        "minimum_price": float(row["minimum_price"]),
+        "maximum_price": float(row["maximum_price"]),
+        "sample_count": int(row["sample_count"]),
+        "first_event_utc": str(row["first_event_utc"]),
+        "latest_id": int(latest["id"]),
+        "latest_price": float(latest["price_num"]),
+        "latest_event_utc": str(latest["event_time_utc"]),
+        "latest_event_type": str(latest["event_type"]),
+        "weighted_median_price": weighted,
+    }
+
+
+def _aggregated_window(
+    connection: sqlite3.Connection, *, start_utc: str, end_utc: str, **filters: str
+) -> dict[str, object] | None:
+    summary = summarize_observation_window(
+        connection, start_utc=start_utc, end_utc=end_utc, quality_state=None, **filters
+    )
+    if summary is None:
+        return None
+    return {
+        "average_price": summary.average_price,
+        "minimum_price": summary.minimum_price,
+        "maximum_price": summary.maximum_price,
+        "sample_count": summary.sample_count,
+        "first_event_utc": summary.first_event_utc,
+        "latest_id": summary.latest_id,
+        "latest_price": summary.latest_price,
+        "latest_event_utc": summary.latest_event_utc,
+        "latest_event_type": summary.latest_dimensions["event_type"],
+        "weighted_median_price": summary.weighted_median({"TRADE": 3}),
+    }
+
+
+def _aggregate_rows(connection: sqlite3.Connection) -> list[tuple[object, ...]]:
+    return [
+        tuple(row)
+        for row in connection.execute(
+            f"""
+            SELECT * FROM {MARKET_OBSERVATION_MINUTE_AGGREGATES.aggregate_table}
+            ORDER BY instrument, market_label, settlement_term, trade_form,
+                     event_type, side, quality_state, minute_utc
+            """
+        )
+    ]
+
+
+class MarketStoreMinuteAggregateTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.connection = connect_market_store(Path(self._tmpdir.name) / "market.sqlite3")
+        initialize_market_store(self.connection)
+
+    def tearDown(self) -> None:
+        self.connection.close()
+        self._tmpdir.cleanup()
+
+    def _populate(self, count: int = 400) -> None:
+        generator = random.Random(7)
+        for index in range(count):
+            upsert_observation(
+                self.connection,
+                _observation(
+                    index,
+                    offset_seconds=generator.randrange(0, 12 * 60),
+                    price=generator.randrange(186_000, 188_000, 50),
+                    market_label=generator.choice(("COIN_MARKET", "COIN_FLOOR")),
+                    event_type=generator.choice(("OFFER", "TRADE")),
+                    side=generator.choice(("BUY", "SELL")),
+                ),
+            )
+        # Conflicting re-upserts move rows across minutes and dimensions.
+        for index in range(0, count, 9):
+            upsert_observation(
+                self.connection,
+                _observation(
+                    index,
+                    offset_seconds=generator.randrange(0, 12 * 60),
+                    price=generator.randrange(186_000, 188_000, 50),
+                    side="SELL",
+                    event_type="TRADE",
+                ),
+            )
+        self.connection.execute("DELETE FROM market_observations WHERE id % 13 = 0")
+        self.connection.commit()
+
+    def test_window_summaries_match_raw_rows(self) -> None:
+        self._populate()
+        generator = random.Random(11)
+        filters_options = (
+            {"instrument": "COIN_IMAM"},
+            {"instrument": "COIN_IMAM", "market_label": "COIN_MARKET"},
+            {"instrument": "COIN_IMAM", "event_type": "TRADE", "side": "SELL"},
+        )
+        compared = 0
+        for _ in range(200):
+            start = BASE + timedelta(seconds=generator.randrange(-90, 12 * 60))
+            end = start + timedelta(seconds=generator.choice((30, 60, 90, 150, 300, 900)))
+            for filters in filters_options:
+                window = {"start_utc": _iso(start), "end_utc": _iso(end), **filters}
+                raw = _raw_window(self.connection, **window)
+                self.assertEqual(_aggregated_window(self.connection, **window), raw, window)
+                compared += raw is not None
+        self.assertGreater(compared, 300)
+
+    def test_triggers_match_a_full_rebuild(self) -> None:
+        self._populate()
+        maintained = _aggregate_rows(self.connection)
+
+        MARKET_OBSERVATION_MINUTE_AGGREGATES.rebuild(self.connection)
+
+        self.assertGreater(len(maintained), 12)
+        self.assertEqual(_aggregate_rows(self.connection), maintained)
+
+    def test_v3_store_upgrade_backfills_the_aggregate(self) -> None:
+        table = MARKET_OBSERVATION_MINUTE_AGGREGATES.aggregate_table
+        self.connection.executescript(
+            f"""
+            DROP TRIGGER {table}_after_insert;
+            DROP TRIGGER {table}_after_delete;
+            DROP TRIGGER {table}_after_update;
+            DROP TABLE {table};
+            UPDATE market_store_metadata SET schema_version = 3 WHERE singleton = 1;
+            """
+        )
+        self._populate(60)
+
+        initialize_market_store(self.connection)
+
+        self.assertEqual(
+            self.connection.execute("SELECT schema_version FROM market_store_metadata").fetchone()[0],
+            4,
+        )
+        window = {"start_utc": _iso(BASE - timedelta(minutes=1)), "end_utc": _iso(BASE + timedelta(minutes=13))}
+        summary = summarize_observation_window(
+            self.connection, instrument="COIN_IMAM", quality_state=None, **window
+        )
+        self.assertGreater(summary.aggregated_minutes, 10)
+        self.assertEqual(
+            _aggregated_window(self.connection, instrument="COIN_IMAM", **window),
+            _raw_window(self.connection, instrument="COIN_IMAM", **window),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -246,7 +246,7 @@ class PublicTelegramIngestionTests(unittest.TestCase):
         row = self.connection.execute(
             "SELECT schema_version FROM market_store_metadata"
         ).fetchone()
-        self.assertEqual(row["schema_version"], 3)
+        self.assertEqual(row["schema_version"], 4)
         self.assertIsNotNone(
             self.connection.execute(
                 "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'market_source_checkpoints'"
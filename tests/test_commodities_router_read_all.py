@@ -38,34 +38,49 @@ def make_commodity(cid, name, aliases):
     return SimpleNamespace(id=cid, name=name, aliases=[SimpleNamespace(id=a[0], alias=a[1], commodity_id=cid) for a in aliases])
 
 
+class _AsyncSessionContext:
+    def __init__(self, session):
+        self._session = session
+
+    async def __aenter__(self):
+        return self._session
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
 class CommoditiesRouterReadAllTests(unittest.IsolatedAsyncioTestCase):
     async def test_read_all_commodities_returns_cache_hit_without_db_query(self):
         cached = [{"id": 1, "name": "Gold", "aliases": []}]
-        db = FakeDB()
 
-        with patch("core.cache.get_cached_commodities", new=AsyncMock(return_value=cached)), patch(
-            "core.cache.set_cached_commodities", new=AsyncMock()
-        ) as set_cache:
-            result = await read_all_commodities(db=db)
+        with patch("core.cache.cached", new=AsyncMock(return_value=cached)) as cached_lookup, patch(
+            "api.routers.commodities.AsyncSessionLocal"
+        ) as session_factory:
+            result = await read_all_commodities()
 
         self.assertEqual(result, cached)
-        self.assertEqual(db.execute_calls, 0)
-        set_cache.assert_not_awaited()
+        session_factory.assert_not_called()
+        self.assertEqual(cached_lookup.await_args.args[0], "cache:commodities:all")
+        self.assertTrue(cached_lookup.await_args.kwargs["lock"])
 
-    async def test_read_all_commodities_loads_from_db_and_caches_serialized_payload(self):
+    async def test_read_all_commodities_loads_serialized_payload_on_miss(self):
         commodities = [make_commodity(1, "Gold", [(10, "طلای آبشده")])]
         db = FakeDB(FakeExecuteResult(commodities))
 
-        with patch("core.cache.get_cached_commodities", new=AsyncMock(return_value=None)), patch(
-            "core.cache.set_cached_commodities", new=AsyncMock()
-        ) as set_cache:
-            result = await read_all_commodities(db=db)
+        async def miss(key, loader, **kwargs):
+            return await loader()
+
+        with patch("core.cache.cached", new=miss), patch(
+            "api.routers.commodities.AsyncSessionLocal", return_value=_AsyncSessionContext(db)
+        ):
+            result = await read_all_commodities()
 
-        self.assertEqual(result, commodities)
-        set_cache.assert_awaited_once_with(
-            [{"id": 1, "name": "Gold", "aliases": [{"id": 10, "alias": "طلای آبشده", "commodity_id": 1}]}]
+        self.assertEqual(
+            result,
+            [{"id": 1, "name": "Gold", "aliases": [{"id": 10, "alias": "طلای آبشده", "commodity_id": 1}]}],
         )
+        self.assertEqual(db.execute_calls, 1)
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
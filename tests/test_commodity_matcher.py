@@ -0,0 +1,113 @@
+import random
+import re
+import unittest
+from unittest.mock import patch
+
+from core import commodity_matcher
+from core.commodity_matcher import (
+    COMMODITY_BOUNDARY_CHARS,
+    CommodityMatcher,
+    catalog_name_map,
+    commodity_matcher_for_catalog,
+    has_bahar_qualifier_conflict,
+    invalidate_commodity_matcher,
+    normalize_commodity_phrase,
+)
+
+
+CATALOG = [
+    {"id": 1, "name": "امام", "aliases": ["امامی", "تمام"]},
+    {"id": 2, "name": "بهار", "aliases": ["آزادی", "ت پ", "ت.پ", "تاریخ پایین"]},
+    {"id": 3, "name": "ربع بهار", "aliases": ["ربع", "ربع‌بهار"]},
+    {"id": 4, "name": "نیم بهار", "aliases": ["نیم", "نیم‌بهار"]},
+    {"id": 5, "name": "ربع تاریخ پایین", "aliases": ["ربع ت.پ", "ربع پ", "ربع پایین"]},
+    {"id": 6, "name": "نیم تاریخ پایین", "aliases": ["نیم ت.پ", "نیم پ", "نیم پایین"]},
+    {"id": 7, "name": "یک گرمی", "aliases": ["مرکزی", "یک گرمی مرکزی"]},
+]
+
+
+def legacy_match(text, name_to_commodity):
+    """The per-name loop the bot parser ran before the matcher was precompiled."""
+    normalized_text = normalize_commodity_phrase(text)
+    names = sorted(
+        (name for name in name_to_commodity if normalize_commodity_phrase(name)),
+        key=lambda item: len(normalize_commodity_phrase(item)),
+        reverse=True,
+    )
+    for name in names:
+        phrase = r"\s+".join(re.escape(part) for part in normalize_commodity_phrase(name).split())
+        pattern = re.compile(rf"(?<![{COMMODITY_BOUNDARY_CHARS}]){phrase}(?![{COMMODITY_BOUNDARY_CHARS}])")
+        for match in pattern.finditer(normalized_text):
+            if has_bahar_qualifier_conflict(normalized_text, match.start(), name):
+                continue
+            return name_to_commodity[name]
+    return None
+
+
+class CommodityMatcherTests(unittest.TestCase):
+    def setUp(self):
+        invalidate_commodity_matcher()
+        self.addCleanup(invalidate_commodity_matcher)
+        self.name_map = catalog_name_map(CATALOG)
+        self.matcher = CommodityMatcher(self.name_map)
+
+    def test_matches_longest_standalone_phrase(self):
+        cases = {
+            "خ امام 30تا 187500": (1, "امام"),
+            "ف ربع بهار 10تا 51300": (3, "ربع بهار"),
+            "ف ربع‌بهار 10تا 51300": (3, "ربع بهار"),
+            "خ نیم ت.پ 12تا 88300": (6, "نیم تاریخ پایین"),
+            "ف یک گرمی مرکزی 30تا 24100": (7, "یک گرمی"),
+            "خ امامها 30تا 187500": None,
+            "خ 30تا 187500": None,
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(self.matcher.match(text), expected)
+
+    def test_qualified_bahar_never_resolves_to_full_bahar(self):
+        matcher = CommodityMatcher({"بهار": (2, "بهار")})
+
+        self.assertIsNone(matcher.match("ف ربع بهار 10تا"))
+        self.assertIsNone(matcher.match("ف نیم‌بهار 10تا"))
+        self.assertEqual(matcher.match("ف ربع بهار بهار 10تا"), (2, "بهار"))
+        self.assertEqual(matcher.match("ف بهار 10تا"), (2, "بهار"))
+
+    def test_matches_the_per_name_loop_on_generated_texts(self):
+        rng = random.Random(11)
+        phrases = list(self.name_map) + ["پک", "فردا", "امامی‌ها", "ربع‌", "نیم پ"]
+        fillers = ["خ", "ف", "خرید", "فروش", "30تا", "10 تا", "187500", "5 5 5", "‌", ".", ""]
+        for _ in range(500):
+            parts = [rng.choice(fillers if rng.random() < 0.5 else phrases) for _ in range(rng.randint(1, 7))]
+            text = rng.choice([" ", "", "  "]).join(parts)
+            with self.subTest(text=text):
+                self.assertEqual(self.matcher.match(text), legacy_match(text, self.name_map))
+
+    def test_matcher_is_rebuilt_only_when_the_catalog_changes(self):
+        first = commodity_matcher_for_catalog(CATALOG)
+        self.assertIs(commodity_matcher_for_catalog([dict(item) for item in CATALOG]), first)
+
+        changed = [dict(item) for item in CATALOG]
+        changed[0] = {**changed[0], "aliases": ["امامی", "تمام", "امامی جدید"]}
+        rebuilt = commodity_matcher_for_catalog(changed)
+
+        self.assertIsNot(rebuilt, first)
+        self.assertEqual(rebuilt.match("خ امامی جدید 30تا"), (1, "امام"))
+
+    def test_invalidate_drops_the_cached_matcher(self):
+        first = commodity_matcher_for_catalog(CATALOG)
+        invalidate_commodity_matcher()
+
+        with patch.object(commodity_matcher, "CommodityMatcher", wraps=CommodityMatcher) as build:
+            second = commodity_matcher_for_catalog(CATALOG)
+
+        build.assert_called_once()
+        self.assertIsNot(second, first)
+
+    def test_empty_catalog_matches_nothing(self):
+        self.assertIsNone(CommodityMatcher({}).match("خ امام 30تا"))
+        self.assertIsNone(commodity_matcher_for_catalog([]).match("خ امام 30تا"))
+
+
+if __name__ == "__main__":
+    unittest.main()
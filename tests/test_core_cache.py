@@ -1,3 +1,4 @@
+import asyncio
 import json
 from datetime import datetime
 import unittest
@@ -73,13 +74,58 @@ class CoreCacheTests(unittest.IsolatedAsyncioTestCase):
             self.assertIsNone(await cache.cache_incr('counter'))
             self.assertIsNone(await cache.cache_decr('counter'))
 
+    async def test_cache_decr_many_pipelines_and_floors_values(self):
+        class Pipeline:
+            def __init__(self, results):
+                self.results = results
+                self.calls = []
+
+            def decrby(self, key, amount):
+                self.calls.append(('decrby', key, amount))
+
+            def set(self, key, value):
+                self.calls.append(('set', key, value))
+
+            async def execute(self):
+                return self.results
+
+        pipelines = [Pipeline([3, -1]), Pipeline([True])]
+        redis_client = AsyncMock()
+        redis_client.pipeline = lambda transaction: pipelines.pop(0) if pipelines else None
+        first, second = pipelines
+
+        with patch('core.cache._get_redis', AsyncMock(return_value=redis_client)):
+            values = await cache.decr_active_offer_counts({11: 2, 22: 3})
+
+        self.assertEqual(values, {11: 3, 22: 0})
+        self.assertEqual(
+            first.calls,
+            [('decrby', 'user:11:active_offer_count', 2), ('decrby', 'user:22:active_offer_count', 3)],
+        )
+        self.assertEqual(second.calls, [('set', 'user:22:active_offer_count', 0)])
+
+        broken_client = AsyncMock()
+        broken_client.pipeline = lambda transaction: (_ for _ in ()).throw(RuntimeError('boom'))
+        with patch('core.cache._get_redis', AsyncMock(return_value=broken_client)):
+            self.assertEqual(await cache.cache_decr_many({'counter': 1}), {})
+
+        with patch('core.cache._get_redis', AsyncMock(return_value=None)):
+            self.assertEqual(await cache.cache_decr_many({'counter': 1}), {})
+
     async def test_cache_delete_pattern_and_high_level_wrappers(self):
         redis_client = AsyncMock()
         redis_client.scan_iter = lambda match: _scan_keys('price_avg:1:buy:a', 'price_avg:1:sell:b')
-        with patch('core.cache._get_redis', AsyncMock(return_value=redis_client)):
+        order = []
+        redis_client.delete = AsyncMock(side_effect=lambda *keys: order.append('delete'))
+        broadcast = AsyncMock(side_effect=lambda **kwargs: order.append('broadcast'))
+        with patch('core.cache._get_redis', AsyncMock(return_value=redis_client)), patch(
+            'core.cache.broadcast_cache_invalidation', broadcast
+        ):
             deleted = await cache.cache_delete_pattern('price_avg:*')
         self.assertEqual(deleted, 2)
         redis_client.delete.assert_awaited_once_with('price_avg:1:buy:a', 'price_avg:1:sell:b')
+        broadcast.assert_awaited_once_with(patterns=['price_avg:*'])
+        self.assertEqual(order, ['delete', 'broadcast'])
 
         empty_redis = AsyncMock()
         empty_redis.scan_iter = lambda match: _scan_keys()
@@ -159,5 +205,331 @@ class CoreCacheTests(unittest.IsolatedAsyncioTestCase):
                 self.assertEqual(await cache.get_cached_admin_market_current(), (False, None))
 
 
+class FakeTTLRedis:
+    """Just enough of redis.asyncio for cached(): values with a remaining TTL and NX locks."""
+
+    def __init__(self):
+        self.values = {}
+        self.pttls = {}
+        self.fail_reads = False
+        self.reads = 0
+        self.published = []
+
+    def pipeline(self, transaction=False):
+        redis = self
+
+        class Pipeline:
+            def __init__(self):
+                self.ops = []
+
+            def get(self, key):
+                self.ops.append(('get', key))
+
+            def pttl(self, key):
+                self.ops.append(('pttl', key))
+
+            async def execute(self):
+                if redis.fail_reads:
+                    raise RuntimeError('down')
+                redis.reads += 1
+                return [
+                    redis.values.get(key) if op == 'get' else redis.pttls.get(key, -2)
+                    for op, key in self.ops
+                ]
+
+        return Pipeline()
+
+    async def setex(self, key, ttl, value):
+        self.values[key] = value
+        self.pttls[key] = ttl * 1000
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        self.pttls[key] = px if px is not None else -1
+        return True
+
+    async def publish(self, channel, message):
+        self.published.append((channel, json.loads(message)))
+
+    async def eval(self, script, numkeys, key, token):
+        if self.values.get(key) == token:
+            del self.values[key]
+            self.pttls.pop(key, None)
+            return 1
+        return 0
+
+    def put(self, key, value, remaining_seconds):
+        self.values[key] = json.dumps(value)
+        self.pttls[key] = int(remaining_seconds * 1000)
+
+
+def slow(outcome):
+    """Loader body that yields to the loop before finishing, so callers overlap."""
+
+    async def load():
+        await asyncio.sleep(0.001)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return load
+
+
+class CachedSingleFlightTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.redis = FakeTTLRedis()
+        patchers = [
+            patch('core.cache._get_redis', AsyncMock(return_value=self.redis)),
+            patch('core.cache.record_cache_request'),
+            patch('core.cache.record_cache_refresh'),
+            patch('core.cache._RELOAD_LOCK_POLL_SECONDS', 0.001),
+        ]
+        _, self.requests, self.refreshes, _ = [patcher.start() for patcher in patchers]
+        for patcher in patchers:
+            self.addCleanup(patcher.stop)
+
+    def results(self, recorder):
+        return [call.args for call in recorder.call_args_list]
+
+    async def test_concurrent_misses_share_one_load(self):
+        release = asyncio.Event()
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await release.wait()
+            return [{'id': 1}]
+
+        waiters = [
+            asyncio.create_task(cache.cached('cache:commodities:all', loader, ttl=300, stale_ttl=60))
+            for _ in range(20)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+
+        self.assertEqual(await asyncio.gather(*waiters), [[{'id': 1}]] * 20)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.redis.pttls['cache:commodities:all'], 360_000)
+        self.assertEqual(
+            self.results(self.requests).count(('commodities', 'coalesced')), 19
+        )
+        self.assertEqual(self.results(self.refreshes), [('commodities', 'loaded')])
+        self.assertEqual(cache._inflight, {})
+
+    async def test_fresh_value_is_a_hit_and_stale_value_refreshes_in_background(self):
+        self.redis.put('price_avg:1:buy:small', 100.0, remaining_seconds=50)
+        loader = AsyncMock(return_value=125.0)
+
+        self.assertEqual(await cache.cached('price_avg:1:buy:small', loader, ttl=60, stale_ttl=30), 100.0)
+        loader.assert_not_awaited()
+
+        self.redis.put('price_avg:1:buy:small', 100.0, remaining_seconds=10)
+        self.assertEqual(await cache.cached('price_avg:1:buy:small', loader, ttl=60, stale_ttl=30), 100.0)
+        self.assertEqual(await cache.cached('price_avg:1:buy:small', loader, ttl=60, stale_ttl=30), 100.0)
+        await asyncio.gather(*cache._refresh_tasks)
+
+        loader.assert_awaited_once()
+        self.assertEqual(json.loads(self.redis.values['price_avg:1:buy:small']), 125.0)
+        self.assertEqual(
+            self.results(self.requests),
+            [('price_avg', 'hit'), ('price_avg', 'stale'), ('price_avg', 'stale')],
+        )
+        self.assertEqual(self.results(self.refreshes), [('price_avg', 'refreshed')])
+
+    async def test_failed_background_refresh_keeps_serving_the_stale_value(self):
+        self.redis.put('cache:commodities:all', [{'id': 1}], remaining_seconds=5)
+        loader = AsyncMock(side_effect=RuntimeError('db down'))
+
+        self.assertEqual(await cache.cached('cache:commodities:all', loader, ttl=300, stale_ttl=60), [{'id': 1}])
+        await asyncio.gather(*cache._refresh_tasks)
+
+        self.assertEqual(json.loads(self.redis.values['cache:commodities:all']), [{'id': 1}])
+        self.assertEqual(self.results(self.refreshes), [('commodities', 'error')])
+
+    async def test_miss_waits_for_the_process_holding_the_reload_lock(self):
+        self.redis.values['lock:cache:commodities:all'] = 'peer'
+        loader = AsyncMock(return_value=['local'])
+
+        async def peer_writes():
+            await asyncio.sleep(0.005)
+            self.redis.put('cache:commodities:all', ['peer'], remaining_seconds=300)
+
+        writer = asyncio.create_task(peer_writes())
+        value = await cache.cached('cache:commodities:all', loader, ttl=300, lock=True, lock_timeout=1.0)
+        await writer
+
+        self.assertEqual(value, ['peer'])
+        loader.assert_not_awaited()
+        self.assertEqual(self.results(self.refreshes), [('commodities', 'peer')])
+
+    async def test_reload_lock_is_released_and_errors_reach_every_waiter(self):
+        loader = AsyncMock(return_value=['fresh'])
+        self.assertEqual(await cache.cached('cache:commodities:all', loader, ttl=300, lock=True), ['fresh'])
+        self.assertNotIn('lock:cache:commodities:all', self.redis.values)
+
+        failing = AsyncMock(side_effect=slow(RuntimeError('db down')))
+        waiters = [
+            asyncio.create_task(cache.cached('price_avg:9:sell:large', failing, ttl=60)) for _ in range(3)
+        ]
+        outcomes = await asyncio.gather(*waiters, return_exceptions=True)
+
+        self.assertTrue(all(isinstance(outcome, RuntimeError) for outcome in outcomes))
+        failing.assert_awaited_once()
+        self.assertEqual(cache._inflight, {})
+
+    async def test_without_redis_the_loader_still_runs_once_per_burst(self):
+        self.redis.fail_reads = True
+        loader = AsyncMock(side_effect=slow(3))
+
+        values = await asyncio.gather(*(cache.cached('price_avg:2:buy:x', loader, ttl=60) for _ in range(5)))
+
+        self.assertEqual(values, [3] * 5)
+        loader.assert_awaited_once()
+
+    async def test_typed_wrappers_use_family_ttls_and_the_reload_lock(self):
+        loader = AsyncMock()
+        with patch('core.cache.cached', AsyncMock(return_value=[])) as cached_lookup:
+            await cache.get_or_load_commodities(loader)
+            await cache.get_or_load_price_average(1, 'buy', 'small', loader)
+
+        cached_lookup.assert_any_await(
+            cache.CacheKeys.COMMODITIES_ALL,
+            loader,
+            ttl=cache.CacheTTL.COMMODITIES,
+            stale_ttl=cache.CacheTTL.COMMODITIES_STALE,
+            family='commodities',
+            lock=True,
+        )
+        cached_lookup.assert_any_await(
+            'price_avg:1:buy:small',
+            loader,
+            ttl=cache.CacheTTL.PRICE_AVG,
+            stale_ttl=cache.CacheTTL.PRICE_AVG_STALE,
+            family='price_avg',
+            lock=True,
+        )
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class LocalCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.local = cache.LocalCache(
+            budgets={'commodities': 100, 'price_avg': 30}, max_age_seconds=30, clock=self.clock
+        )
+        self.local.active = True
+        patcher = patch('core.cache.record_local_cache')
+        self.record = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_only_budgeted_families_are_enabled_while_listening(self):
+        self.assertTrue(self.local.enabled_for('commodities'))
+        self.assertFalse(self.local.enabled_for('user'))
+        self.local.active = False
+        self.assertFalse(self.local.enabled_for('commodities'))
+
+    def test_entry_age_is_capped_by_max_age_and_redis_ttl(self):
+        self.local.put('price_avg:1', 'price_avg', 5.0, size=3, remaining=10)
+        self.local.put('cache:commodities:all', 'commodities', [1], size=3, remaining=None)
+
+        self.clock.now += 9
+        self.assertEqual(self.local.get('price_avg:1', 'price_avg'), (5.0, 1))
+        self.clock.now += 1
+        self.assertIsNone(self.local.get('price_avg:1', 'price_avg'))
+        self.assertEqual(self.local.get('cache:commodities:all', 'commodities'), ([1], None))
+        self.clock.now += 20
+        self.assertIsNone(self.local.get('cache:commodities:all', 'commodities'))
+        self.assertEqual(self.local.size_of('price_avg'), 0)
+
+    def test_family_budget_evicts_least_recently_used(self):
+        for index in range(3):
+            self.local.put(f'price_avg:{index}', 'price_avg', index, size=10, remaining=60)
+        self.local.get('price_avg:0', 'price_avg')
+        self.local.put('price_avg:3', 'price_avg', 3, size=10, remaining=60)
+        self.local.put('price_avg:big', 'price_avg', 'x', size=31, remaining=60)
+
+        self.assertIsNotNone(self.local.get('price_avg:0', 'price_avg'))
+        self.assertIsNone(self.local.get('price_avg:1', 'price_avg'))
+        self.assertIsNone(self.local.get('price_avg:big', 'price_avg'))
+        self.assertEqual(self.local.size_of('price_avg'), 30)
+
+    def test_invalidation_by_key_and_pattern_and_stale_generation(self):
+        self.local.put('price_avg:1:buy:a', 'price_avg', 1, size=1, remaining=60)
+        self.local.put('price_avg:2:buy:a', 'price_avg', 2, size=1, remaining=60)
+        self.local.put('cache:commodities:all', 'commodities', [], size=2, remaining=60)
+        generation = self.local.generation
+
+        self.assertEqual(self.local.invalidate(patterns=['price_avg:1:*']), 1)
+        self.assertEqual(self.local.invalidate(keys=['cache:commodities:all']), 1)
+        self.local.put('cache:commodities:all', 'commodities', ['old'], size=5, remaining=60, generation=generation)
+
+        self.assertEqual(len(self.local), 1)
+        self.assertIsNotNone(self.local.get('price_avg:2:buy:a', 'price_avg'))
+
+    def test_broadcasts_from_this_process_are_ignored(self):
+        self.local.put('cache:commodities:all', 'commodities', [], size=2, remaining=60)
+        own = json.dumps({'origin': cache._PROCESS_ORIGIN, 'keys': ['cache:commodities:all']})
+        other = json.dumps({'origin': 'peer', 'keys': ['cache:commodities:all']}).encode()
+
+        self.assertEqual(cache.apply_cache_invalidation(self.local, own), 0)
+        self.assertEqual(cache.apply_cache_invalidation(self.local, 'not json'), 0)
+        self.assertEqual(cache.apply_cache_invalidation(self.local, other), 1)
+
+
+class LocalCacheIntegrationTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.redis = FakeTTLRedis()
+        self.local = cache.LocalCache(budgets={'commodities': 1000}, max_age_seconds=30)
+        self.local.active = True
+        patchers = [
+            patch('core.cache._get_redis', AsyncMock(return_value=self.redis)),
+            patch('core.cache.local_cache', self.local),
+            patch('core.cache.record_local_cache'),
+            patch('core.cache.record_cache_request'),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_repeated_reads_are_served_from_memory_until_a_write(self):
+        self.redis.put('cache:commodities:all', [{'id': 1}], remaining_seconds=300)
+
+        first = await cache.get_cached_commodities()
+        second = await cache.get_cached_commodities()
+        self.assertIs(first, second)
+        self.assertEqual(self.redis.reads, 1)
+
+        self.assertTrue(await cache.set_cached_commodities([{'id': 2}]))
+        self.assertEqual(await cache.get_cached_commodities(), [{'id': 2}])
+        self.assertEqual(self.redis.reads, 2)
+        self.assertEqual(
+            self.redis.published,
+            [(
+                cache.LOCAL_CACHE_INVALIDATED_CHANNEL,
+                {'origin': cache._PROCESS_ORIGIN, 'keys': ['cache:commodities:all'], 'patterns': []},
+            )],
+        )
+
+    async def test_unbudgeted_keys_bypass_memory_and_broadcasts(self):
+        self.redis.get = AsyncMock(return_value='3')
+
+        self.assertEqual(await cache.get_active_offer_count(9), 3)
+        self.assertEqual(await cache.get_active_offer_count(9), 3)
+        self.assertTrue(await cache.set_active_offer_count(9, 4))
+
+        self.assertEqual(self.redis.get.await_count, 2)
+        self.assertEqual(self.redis.published, [])
+        self.assertEqual(len(self.local), 0)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -611,6 +611,31 @@ class CoreEventsTests(unittest.TestCase):
             events.publish_event_sync('offer:updated', {'id': 2})
         logger.error.assert_called_once()
 
+    def test_publish_events_sync_uses_one_pipeline(self):
+        class Pipeline(_FakeSyncRedis):
+            executed = 0
+
+            def execute(self):
+                Pipeline.executed += 1
+
+        pipeline = Pipeline()
+        sync_redis = SimpleNamespace(pipeline=lambda transaction: pipeline)
+        with patch('core.events._get_sync_redis', return_value=sync_redis), patch.object(events, 'logger') as logger:
+            events.publish_events_sync('offer:expired', [{'id': 1}, {'id': 2}])
+            events.publish_events_sync('offer:expired', [])
+        self.assertEqual(
+            pipeline.publish_calls,
+            [('events:offer:expired', '{"id": 1}'), ('events:offer:expired', '{"id": 2}')],
+        )
+        self.assertEqual(Pipeline.executed, 1)
+        logger.info.assert_called_once()
+
+        failing = Pipeline(publish_error=RuntimeError('publish down'))
+        with patch('core.events._get_sync_redis', return_value=SimpleNamespace(pipeline=lambda transaction: failing)), \
+             patch.object(events, 'logger') as logger:
+            events.publish_events_sync('offer:expired', [{'id': 3}])
+        logger.error.assert_called_once()
+
     def test_offer_trade_and_user_event_listeners(self):
         registry = {}
         now = datetime(2025, 1, 1, 12, 0, 0)
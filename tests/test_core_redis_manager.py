@@ -1,5 +1,6 @@
+import asyncio
 import unittest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from core import redis as redis_manager
 
@@ -70,5 +71,98 @@ class CoreRedisManagerTests(unittest.IsolatedAsyncioTestCase):
         self.assertFalse(await redis_manager.check_redis_connection())
 
 
+class FakeListenerPubSub:
+    def __init__(self, messages, *, fail_after=False):
+        self.messages = list(messages)
+        self.fail_after = fail_after
+        self.drained = asyncio.Event()
+        self.subscribed = []
+        self.psubscribed = []
+        self.closed = False
+
+    async def subscribe(self, *channels):
+        self.subscribed.extend(channels)
+
+    async def psubscribe(self, *patterns):
+        self.psubscribed.extend(patterns)
+
+    async def get_message(self, ignore_subscribe_messages=True, timeout=1.0):
+        if self.messages:
+            return self.messages.pop(0)
+        if self.fail_after:
+            raise ConnectionError('lost')
+        self.drained.set()
+        await asyncio.sleep(timeout)
+        return None
+
+    async def unsubscribe(self, *channels):
+        return None
+
+    async def punsubscribe(self, *patterns):
+        return None
+
+    async def close(self):
+        self.closed = True
+
+
+class RedisListenerTests(unittest.IsolatedAsyncioTestCase):
+    async def test_listener_delivers_channel_and_pattern_messages_to_the_feature(self):
+        pubsub = FakeListenerPubSub([
+            {'type': 'message', 'channel': 'events:a', 'data': 'one'},
+            {'type': 'pmessage', 'pattern': 'events:b:*', 'channel': 'events:b:1', 'data': 'two'},
+        ])
+        client = MagicMock(pubsub=MagicMock(return_value=pubsub), aclose=AsyncMock())
+        seen = []
+        on_idle = MagicMock()
+        subscription = redis_manager.RedisSubscription(
+            name='feature',
+            channels=('events:a',),
+            patterns=('events:b:*',),
+            on_message=AsyncMock(side_effect=seen.append),
+            on_idle=on_idle,
+        )
+
+        with patch('core.redis.redis.Redis', return_value=client):
+            task = asyncio.create_task(redis_manager.listen_redis_subscription(subscription, poll_seconds=0.01))
+            await asyncio.wait_for(pubsub.drained.wait(), timeout=1)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        self.assertEqual(pubsub.subscribed, ['events:a'])
+        self.assertEqual(pubsub.psubscribed, ['events:b:*'])
+        self.assertEqual(seen, ['one', 'two'])
+        self.assertGreaterEqual(on_idle.call_count, 2)
+        self.assertTrue(pubsub.closed)
+        client.aclose.assert_awaited_once()
+
+    async def test_failure_resets_the_feature_and_resubscribes(self):
+        broken = FakeListenerPubSub([], fail_after=True)
+        healthy = FakeListenerPubSub([])
+        clients = [
+            MagicMock(pubsub=MagicMock(return_value=broken), aclose=AsyncMock()),
+            MagicMock(pubsub=MagicMock(return_value=healthy), aclose=AsyncMock()),
+        ]
+        events = []
+        subscription = redis_manager.RedisSubscription(
+            name='feature',
+            channels=('events:a',),
+            on_message=lambda data: None,
+            on_subscribed=lambda: events.append('subscribed'),
+            on_reset=lambda: events.append('reset'),
+        )
+
+        with patch('core.redis.redis.Redis', side_effect=clients):
+            task = asyncio.create_task(
+                redis_manager.listen_redis_subscription(subscription, retry_seconds=0, poll_seconds=0.01)
+            )
+            await asyncio.wait_for(healthy.drained.wait(), timeout=1)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        self.assertEqual(events, ['subscribed', 'reset', 'subscribed', 'reset'])
+        self.assertTrue(broken.closed)
+        clients[0].aclose.assert_awaited_once()
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -35,6 +35,12 @@ class CoreTradingSettingsRuntimeTests(unittest.IsolatedAsyncioTestCase):
         trading_settings._async_cache_lock_loop = None
         trading_settings._sync_redis_client = None
         trading_settings._sync_engine = None
+        trading_settings._snapshot = None
+        trading_settings._snapshot_live = False
+
+    def tearDown(self):
+        trading_settings._snapshot = None
+        trading_settings._snapshot_live = False
 
     async def test_trading_settings_properties(self):
         settings = trading_settings.TradingSettings(invitation_expiry_days=3, offer_min_quantity=7)
@@ -350,6 +356,82 @@ class CoreTradingSettingsRuntimeTests(unittest.IsolatedAsyncioTestCase):
         self.assertIs(trading_settings._fallback_cache, settings)
         self.assertEqual(trading_settings._fallback_timestamp, 77)
 
+    async def test_live_snapshot_is_served_without_redis_round_trips(self):
+        snapshot = trading_settings.TradingSettings(max_active_offers=9)
+        trading_settings._install_snapshot(snapshot)
+
+        with patch('core.trading_settings._get_from_redis_cache_sync', return_value=None) as sync_redis:
+            self.assertIsNot(trading_settings.get_trading_settings(), snapshot)
+        sync_redis.assert_called_once_with()
+
+        trading_settings._snapshot_live = True
+        with patch('core.trading_settings._get_from_redis_cache_sync') as sync_redis, patch(
+            'core.trading_settings._get_from_redis_cache', AsyncMock()
+        ) as async_redis:
+            self.assertIs(trading_settings.get_trading_settings(), snapshot)
+            self.assertIs(await trading_settings.get_trading_settings_async(), snapshot)
+            self.assertEqual(trading_settings.get_setting('max_active_offers'), 9)
+
+        sync_redis.assert_not_called()
+        async_redis.assert_not_awaited()
+
+    async def test_refresh_swaps_the_snapshot_and_signals_other_processes(self):
+        settings = trading_settings.TradingSettings(offer_max_quantity=91)
+        redis_client = AsyncMock()
+        trading_settings._snapshot_live = True
+
+        with patch('core.trading_settings.load_trading_settings_async', AsyncMock(return_value=settings)), patch(
+            'core.trading_settings._set_redis_cache', AsyncMock()
+        ), patch('core.redis.get_redis_client', return_value=redis_client):
+            await trading_settings.refresh_settings_cache_async()
+
+        self.assertIs(trading_settings.get_trading_settings(), settings)
+        redis_client.publish.assert_awaited_once_with(trading_settings.SETTINGS_CHANGED_CHANNEL, '1')
+
+    async def test_snapshot_task_reloads_on_change_signals_and_reports_age(self):
+        first = trading_settings.TradingSettings(max_active_offers=4)
+        changed = trading_settings.TradingSettings(max_active_offers=6)
+        delivered = asyncio.Event()
+
+        class FakePubSub:
+            def __init__(self):
+                self.messages = [
+                    {'type': 'message', 'channel': trading_settings.SETTINGS_CHANGED_CHANNEL, 'data': '1'}
+                ]
+
+            async def subscribe(self, *channels):
+                self.channel, = channels
+
+            async def get_message(self, ignore_subscribe_messages=True, timeout=1.0):
+                if self.messages:
+                    return self.messages.pop(0)
+                delivered.set()
+                await asyncio.sleep(timeout)
+                return None
+
+            async def unsubscribe(self, *channels):
+                return None
+
+            async def close(self):
+                return None
+
+        pubsub = FakePubSub()
+        redis_client = MagicMock(pubsub=MagicMock(return_value=pubsub), aclose=AsyncMock())
+        with patch('redis.asyncio.Redis', return_value=redis_client), patch(
+            'core.trading_settings._get_from_redis_cache', AsyncMock(side_effect=[first, changed])
+        ) as redis_cache, patch('core.metrics.set_trading_settings_snapshot_age') as age_metric:
+            task = asyncio.create_task(trading_settings.run_trading_settings_snapshot())
+            await asyncio.wait_for(delivered.wait(), timeout=1)
+            self.assertTrue(trading_settings._snapshot_live)
+            self.assertIs(trading_settings.get_trading_settings(), changed)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        self.assertEqual(pubsub.channel, trading_settings.SETTINGS_CHANGED_CHANNEL)
+        self.assertEqual(redis_cache.await_count, 2)
+        self.assertGreaterEqual(age_metric.call_args.args[0], 0)
+        self.assertFalse(trading_settings._snapshot_live)
+
     async def test_save_get_and_update_setting(self):
         existing = MagicMock()
         session = MagicMock()
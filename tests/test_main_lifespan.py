@@ -24,6 +24,10 @@ class _AsyncSessionContext:
         return False
 
 
+async def _listener_forever():
+    await asyncio.sleep(3600)
+
+
 class MainLifespanTests(unittest.IsolatedAsyncioTestCase):
     async def test_lifespan_validates_public_webapp_url_before_initializing_when_contract_v2_is_enabled(self):
         with patch.object(main.settings, "invitation_contract_v2_enabled", True), patch(
@@ -49,7 +53,9 @@ class MainLifespanTests(unittest.IsolatedAsyncioTestCase):
             "main.setup_event_listeners"
         ), patch("main.AsyncSessionLocal", return_value=_AsyncSessionContext(session)), patch(
             "main.ensure_mandatory_channel_rollout", new=AsyncMock()
-        ), patch("main._start_background_leader_task") as leader_mock:
+        ), patch("main._start_background_leader_task") as leader_mock, patch(
+            "main.listen_cache_invalidations", new=_listener_forever
+        ):
             async with main.lifespan(main.app):
                 pass
 
@@ -69,7 +75,9 @@ class MainLifespanTests(unittest.IsolatedAsyncioTestCase):
             "main.setup_event_listeners"
         ) as setup_mock, patch("main.AsyncSessionLocal", return_value=_AsyncSessionContext(session)), patch(
             "main.ensure_mandatory_channel_rollout", new=AsyncMock()
-        ) as rollout_mock, patch("main._start_background_leader_task", side_effect=start_leader) as leader_mock:
+        ) as rollout_mock, patch("main._start_background_leader_task", side_effect=start_leader) as leader_mock, patch(
+            "main.listen_cache_invalidations", new=_listener_forever
+        ):
             async with main.lifespan(main.app):
                 pass
 
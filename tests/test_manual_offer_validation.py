@@ -419,29 +419,38 @@ class ManualOfferParserTests(unittest.IsolatedAsyncioTestCase):
         cached_items = [
             {"id": 1, "name": "امام", "aliases": ["ام", {"alias": "امامی"}]},
         ]
-        with patch("bot.utils.redis_helpers.get_cached_commodities", AsyncMock(return_value=cached_items)), patch(
-            "bot.utils.redis_helpers.set_cached_commodities", AsyncMock()
-        ) as set_cached:
+        with patch("core.cache.get_or_load_commodities", AsyncMock(return_value=cached_items)) as get_or_load:
             self.assertEqual(await self.original_find_commodity("امامی 30تا 75800"), (1, "امام"))
             self.assertEqual(await self.original_find_commodity("30تا 75800"), (None, None))
             self.assertEqual(await self.original_find_commodity("ربغ 30تا 75800"), (None, None))
-        set_cached.assert_not_awaited()
+        self.assertEqual(get_or_load.await_count, 3)
 
         commodities = [SimpleNamespace(id=1, name="امام"), SimpleNamespace(id=2, name="بهار")]
         aliases = [SimpleNamespace(id=7, alias="امامی", commodity_id=1)]
         session = SimpleNamespace(execute=AsyncMock(side_effect=[all_result(commodities), all_result(aliases)]))
-        with patch("bot.utils.redis_helpers.get_cached_commodities", AsyncMock(return_value=None)), patch(
-            "bot.utils.redis_helpers.set_cached_commodities", AsyncMock()
-        ) as set_cached, patch("bot.utils.offer_parser.AsyncSessionLocal", return_value=_AsyncSessionContext(session)):
+        loaded = []
+
+        async def load_on_miss(loader):
+            loaded.append(await loader())
+            return loaded[-1]
+
+        with patch("core.cache.get_or_load_commodities", load_on_miss), patch(
+            "bot.utils.offer_parser.AsyncSessionLocal", return_value=_AsyncSessionContext(session)
+        ):
             self.assertEqual(await self.original_find_commodity("امامی 30تا 75800"), (1, "امام"))
 
-        set_cached.assert_awaited_once()
-        self.assertEqual(set_cached.await_args.kwargs["ttl"], 300)
+        self.assertEqual(
+            loaded,
+            [[
+                {"id": 1, "name": "امام", "aliases": [{"id": 7, "alias": "امامی", "commodity_id": 1}]},
+                {"id": 2, "name": "بهار", "aliases": []},
+            ]],
+        )
 
         with patch(
-            "bot.utils.redis_helpers.get_cached_commodities",
+            "core.cache.get_or_load_commodities",
             AsyncMock(return_value=[{"id": 1, "name": "امام", "aliases": []}]),
-        ), patch("bot.utils.redis_helpers.set_cached_commodities", AsyncMock()):
+        ):
             self.assertEqual(await self.original_find_commodity("ناشناس 30تا 75800"), (None, None))
 
     async def test_parser_can_distinguish_explicit_commodity_from_omitted_name(self):
@@ -449,7 +458,7 @@ class ManualOfferParserTests(unittest.IsolatedAsyncioTestCase):
             {"id": 1, "name": "امام", "aliases": ["امامی"]},
         ]
         with patch(
-            "bot.utils.redis_helpers.get_cached_commodities",
+            "core.cache.get_or_load_commodities",
             AsyncMock(return_value=cached_items),
         ):
             explicit = await self.original_find_commodity(
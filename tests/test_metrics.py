@@ -1,4 +1,5 @@
 import os
+import sqlite3
 import tempfile
 import unittest
 from unittest.mock import patch
@@ -118,6 +119,7 @@ class MetricsTests(unittest.TestCase):
                 first = MetricsRegistry()
                 second = MetricsRegistry()
                 first.counter("trading_bot_shared_total", "Shared counter.", service_part="one")
+                first.flush()
                 body = second.render_prometheus()
 
             self.assertTrue(os.path.exists(db_path))
@@ -126,6 +128,91 @@ class MetricsTests(unittest.TestCase):
             self.assertIn("trading_bot_shared_total", body)
             self.assertIn('service_part="one"', body)
 
+    def _shared_registry(self, db_path, **env):
+        environ = {
+            "TRADING_BOT_METRICS_BACKEND": "shared_sqlite",
+            "TRADING_BOT_METRICS_DB": db_path,
+            "TRADING_BOT_METRICS_FLUSH_SECONDS": "3600",
+            **env,
+        }
+        with patch.dict(os.environ, environ, clear=False):
+            metrics_registry = MetricsRegistry()
+        self.addCleanup(metrics_registry._flusher_stop.set)
+        return metrics_registry
+
+    def test_shared_sqlite_hot_path_only_buffers_in_memory(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            metrics_registry = self._shared_registry(os.path.join(tmpdir, "metrics.sqlite3"))
+
+            with patch("core.metrics.sqlite3.connect") as connect:
+                metrics_registry.counter("trading_bot_shared_total", "Shared counter.", route="/a")
+                metrics_registry.gauge("trading_bot_shared_gauge", "Shared gauge.", 3)
+                metrics_registry.observe("trading_bot_shared_ms", "Shared histogram.", 12.5)
+
+            connect.assert_not_called()
+            self.assertEqual(len(metrics_registry._dirty), 3)
+
+    def test_shared_sqlite_flushes_deltas_that_aggregate_across_processes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "metrics.sqlite3")
+            first = self._shared_registry(db_path)
+            second = self._shared_registry(db_path)
+
+            for _ in range(3):
+                first.counter("trading_bot_shared_total", "Shared counter.", route="/a")
+            first.observe("trading_bot_shared_ms", "Shared histogram.", 12.5)
+            first.flush()
+            first.counter("trading_bot_shared_total", "Shared counter.", route="/a")
+            first.flush()
+            first.flush()
+            second.counter("trading_bot_shared_total", "Shared counter.", route="/a", amount=2)
+            second.observe("trading_bot_shared_ms", "Shared histogram.", 700)
+            second.gauge("trading_bot_shared_gauge", "Shared gauge.", 7)
+
+            body = second.render_prometheus()
+
+        self.assertIn('trading_bot_shared_total{route="/a"} 6', body)
+        self.assertIn("trading_bot_shared_ms_count 2", body)
+        self.assertIn('trading_bot_shared_ms_bucket{le="25"} 1', body)
+        self.assertIn('trading_bot_shared_ms_bucket{le="1000"} 2', body)
+        self.assertIn("trading_bot_shared_ms_sum 712.5", body)
+        self.assertIn("trading_bot_shared_gauge 7", body)
+
+    def test_shared_sqlite_failed_flush_keeps_deltas_buffered(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "metrics.sqlite3")
+            metrics_registry = self._shared_registry(db_path)
+            metrics_registry.counter("trading_bot_shared_total", "Shared counter.")
+
+            with patch.object(MetricsRegistry, "_connect", side_effect=sqlite3.OperationalError("locked")):
+                metrics_registry.flush()
+            self.assertEqual(len(metrics_registry._dirty), 1)
+
+            body = metrics_registry.render_prometheus()
+
+        self.assertIn("trading_bot_shared_total 1", body)
+
+    def test_forked_child_does_not_reflush_inherited_totals(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            metrics_registry = self._shared_registry(os.path.join(tmpdir, "metrics.sqlite3"))
+            metrics_registry.counter("trading_bot_shared_total", "Shared counter.", amount=5)
+
+            metrics_registry._after_fork_in_child()
+            metrics_registry.counter("trading_bot_shared_total", "Shared counter.")
+            body = metrics_registry.render_prometheus()
+
+        self.assertIn("trading_bot_shared_total 1", body)
+
+    def test_zero_flush_interval_writes_through(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "metrics.sqlite3")
+            metrics_registry = self._shared_registry(db_path, TRADING_BOT_METRICS_FLUSH_SECONDS="0")
+            metrics_registry.counter("trading_bot_shared_total", "Shared counter.")
+
+            self.assertFalse(metrics_registry._dirty)
+            self.assertIsNone(metrics_registry._flusher)
+            self.assertIn("trading_bot_shared_total 1", self._shared_registry(db_path).render_prometheus())
+
     def test_metrics_output_remains_secret_free(self):
         record_http_request(
             method="GET",
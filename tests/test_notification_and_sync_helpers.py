@@ -1,3 +1,4 @@
+import asyncio
 import hashlib
 import hmac
 import json
@@ -263,5 +264,200 @@ class SyncPushHelperTests(unittest.TestCase):
         self.assertEqual(client.init_kwargs["verify"], "/etc/ssl/internal-ca.pem")
 
 
+
+class RecordingAsyncClient:
+    is_closed = False
+
+    def __init__(self, response=None, *, gate=None):
+        self.posts = []
+        self.response = response or SimpleNamespace(
+            status_code=200,
+            json=lambda: {"status": "success", "errors": 0},
+        )
+        self.gate = gate
+        self.closed = False
+
+    async def post(self, url, content, headers):
+        self.posts.append((url, json.loads(content), headers))
+        if self.gate is not None:
+            await self.gate.wait()
+        return self.response
+
+    async def aclose(self):
+        self.closed = True
+
+
+class DirectPushPipelineTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.original_pipeline = sync_push._pipeline
+        self.original_cooldowns = dict(sync_push._target_cooldowns)
+        sync_push._pipeline = None
+        sync_push._target_cooldowns.clear()
+
+    async def asyncTearDown(self):
+        await sync_push.shutdown_direct_push_pipeline()
+        sync_push._pipeline = self.original_pipeline
+        sync_push._target_cooldowns.clear()
+        sync_push._target_cooldowns.update(self.original_cooldowns)
+
+    def _pipeline(self, client, **overrides):
+        values = {
+            "sync_direct_push_queue_size": 10,
+            "sync_direct_push_batch_size": 50,
+            "sync_direct_push_batch_window_ms": 5.0,
+            "sync_direct_push_max_in_flight": 2,
+            **overrides,
+        }
+        with patch.multiple("core.config.settings", **values):
+            pipeline = sync_push._loop_pipeline()
+        pipeline._client = client
+        pipeline._client_verify_setting = sync_push.runtime_sync_tls_verify_setting()
+        return pipeline
+
+    async def _drain(self, pipeline):
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if pipeline._queue.empty() and not pipeline._sends:
+                return
+
+    async def test_loop_payloads_are_batched_into_one_signed_request(self):
+        client = RecordingAsyncClient()
+        pipeline = self._pipeline(client)
+
+        with patch("core.server_routing.default_peer_server_url", return_value="https://peer.example/"), \
+             patch("core.config.settings.sync_api_key", "secret"), \
+             patch.object(sync_push, "_executor") as executor, \
+             patch.object(sync_push, "record_sync_direct_push") as record:
+            for index in range(3):
+                sync_push.push_sync_direct({"type": "notification", "id": index})
+            await self._drain(pipeline)
+
+        executor.submit.assert_not_called()
+        self.assertEqual(len(client.posts), 1)
+        url, items, headers = client.posts[0]
+        self.assertEqual(url, "https://peer.example/api/sync/receive")
+        self.assertEqual([item["id"] for item in items], [0, 1, 2])
+        body = json.dumps(items, sort_keys=True, default=str)
+        self.assertEqual(
+            headers["X-Signature"],
+            hmac.new(
+                b"secret",
+                f"{headers['X-Timestamp']}:{body}".encode(),
+                hashlib.sha256,
+            ).hexdigest(),
+        )
+        record.assert_called_once_with("sent", 3)
+
+    async def test_full_queue_drops_with_backpressure_metric(self):
+        gate = asyncio.Event()
+        client = RecordingAsyncClient(gate=gate)
+        pipeline = self._pipeline(
+            client,
+            sync_direct_push_queue_size=2,
+            sync_direct_push_batch_size=1,
+            sync_direct_push_max_in_flight=1,
+        )
+
+        with patch.object(sync_push, "record_sync_direct_push") as record:
+            # One batch in flight, one waiting for the in-flight slot, then
+            # the bounded queue holds two more.
+            accepted = []
+            for index in range(5):
+                accepted.append(pipeline.submit({"id": index}, "https://peer.example", "secret"))
+                await asyncio.sleep(0.01)
+            gate.set()
+            await self._drain(pipeline)
+
+        self.assertEqual(accepted, [True, True, True, True, False])
+        record.assert_any_call("dropped_queue_full")
+        self.assertEqual(len(client.posts), 4)
+
+    async def test_failed_batch_enters_cooldown_and_later_batches_are_dropped(self):
+        client = RecordingAsyncClient(
+            SimpleNamespace(status_code=503, json=lambda: {"status": "error"})
+        )
+        pipeline = self._pipeline(client)
+
+        with patch("core.config.settings.sync_direct_push_cooldown_seconds", 60.0), \
+             patch.object(sync_push, "record_sync_direct_push") as record:
+            pipeline.submit({"id": 1}, "https://peer.example", "secret")
+            await self._drain(pipeline)
+            pipeline.submit({"id": 2}, "https://peer.example", "secret")
+            await self._drain(pipeline)
+
+        self.assertEqual(len(client.posts), 1)
+        self.assertTrue(sync_push._target_is_in_cooldown("https://peer.example"))
+        self.assertEqual(
+            [call.args for call in record.call_args_list],
+            [("failed", 1), ("dropped_cooldown", 1)],
+        )
+
+    async def test_shutdown_waits_for_in_flight_batch_and_closes_client(self):
+        gate = asyncio.Event()
+        client = RecordingAsyncClient(gate=gate)
+        pipeline = self._pipeline(client)
+        pipeline.submit({"id": 1}, "https://peer.example", "secret")
+        await asyncio.sleep(0.02)
+
+        shutdown = asyncio.create_task(sync_push.shutdown_direct_push_pipeline())
+        await asyncio.sleep(0.01)
+        self.assertFalse(shutdown.done())
+        gate.set()
+        await shutdown
+
+        self.assertEqual(len(client.posts), 1)
+        self.assertTrue(client.closed)
+        self.assertIsNone(sync_push._pipeline)
+
+    async def test_shutdown_counts_a_dequeued_batch_that_was_never_sent(self):
+        gate = asyncio.Event()
+        client = RecordingAsyncClient(gate=gate)
+        pipeline = self._pipeline(
+            client,
+            sync_direct_push_batch_size=1,
+            sync_direct_push_max_in_flight=1,
+        )
+
+        with patch.object(sync_push, "record_sync_direct_push") as record:
+            # One batch in flight, one dequeued and waiting for the in-flight
+            # slot, and one still queued.
+            for index in range(3):
+                pipeline.submit({"id": index}, "https://peer.example", "secret")
+                await asyncio.sleep(0.02)
+            shutdown = asyncio.create_task(sync_push.shutdown_direct_push_pipeline())
+            await asyncio.sleep(0.01)
+            gate.set()
+            await shutdown
+
+        self.assertEqual(len(client.posts), 1)
+        self.assertEqual(
+            sorted(call.args for call in record.call_args_list),
+            [("dropped_shutdown", 1), ("dropped_shutdown", 1), ("sent", 1)],
+        )
+
+    async def test_replaced_client_closes_only_after_its_in_flight_sends(self):
+        gate = asyncio.Event()
+        old_client = RecordingAsyncClient(gate=gate)
+        new_client = RecordingAsyncClient()
+        pipeline = self._pipeline(old_client, sync_direct_push_batch_size=1)
+
+        with patch.object(sync_push, "record_sync_direct_push"):
+            pipeline.submit({"id": 1}, "https://peer.example", "secret")
+            await asyncio.sleep(0.02)
+            with patch.object(sync_push, "runtime_sync_tls_verify_setting", return_value="/etc/ca.pem"), \
+                 patch.object(sync_push.httpx, "AsyncClient", return_value=new_client):
+                pipeline.submit({"id": 2}, "https://peer.example", "secret")
+                await asyncio.sleep(0.02)
+            self.assertEqual(len(new_client.posts), 1)
+            self.assertFalse(old_client.closed)
+            gate.set()
+            await self._drain(pipeline)
+
+        self.assertTrue(old_client.closed)
+        self.assertFalse(new_client.closed)
+        self.assertIs(pipeline._client, new_client)
+        self.assertEqual(pipeline._client_sends, {})
+
+
 if __name__ == "__main__":
     unittest.main()
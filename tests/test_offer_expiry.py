@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock, patch
 
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm.exc import StaleDataError
 
 from core import offer_expiry
@@ -164,6 +165,62 @@ class OfferExpiryTests(unittest.IsolatedAsyncioTestCase):
         self.assertGreaterEqual(delay, offer_expiry.MIN_DEADLINE_SLEEP_SECONDS)
         self.assertLess(delay, offer_expiry.CHECK_INTERVAL)
 
+    async def _next_delay_for_rows(self, rows, *, expiry_minutes=2):
+        settings_obj = SimpleNamespace(offer_expiry_minutes=expiry_minutes)
+        session = SimpleNamespace(execute=AsyncMock(return_value=rows_result(rows)))
+
+        class SessionManager:
+            async def __aenter__(self):
+                return session
+
+            async def __aexit__(self, exc_type, exc, tb):
+                return False
+
+        with patch("core.trading_settings.get_trading_settings_async", AsyncMock(return_value=settings_obj)), \
+             patch("core.offer_expiry.AsyncSessionLocal", return_value=SessionManager()), \
+             patch("core.offer_expiry.current_server", return_value="foreign"):
+            delay = await offer_expiry.get_next_expiry_delay_seconds()
+        return delay, session.execute.await_args.args[0]
+
+    async def test_next_expiry_delay_reads_only_the_oldest_active_offers(self):
+        now = offer_expiry.utc_now_naive()
+        # The older offer is in a long overtime window; the newer one ends first.
+        rows = [
+            (now - timedelta(minutes=2, seconds=-1), 10),
+            (now - timedelta(minutes=2, seconds=-1.5), 0),
+            (now + timedelta(minutes=30), 0),
+        ]
+
+        delay, stmt = await self._next_delay_for_rows(rows)
+
+        self.assertLess(delay, 1.6)
+        compiled = str(stmt.compile(dialect=postgresql.dialect()))
+        self.assertIn("ORDER BY offers.created_at ASC", compiled)
+        self.assertIn("LIMIT", compiled)
+
+    async def test_next_expiry_delay_wakes_at_lower_bound_when_scan_is_truncated(self):
+        now = offer_expiry.utc_now_naive()
+        rows = [(now - timedelta(minutes=2, seconds=-1), 10)] * 2
+
+        with patch.object(offer_expiry, "NEXT_DEADLINE_SCAN_LIMIT", 2):
+            delay, _stmt = await self._next_delay_for_rows(rows)
+
+        self.assertLess(delay, 1.1)
+
+    async def test_stale_offer_scan_filters_final_deadline_in_sql(self):
+        session = SimpleNamespace(execute=AsyncMock(return_value=scalars_result([])))
+
+        with patch("core.offer_expiry.current_server", return_value="iran"):
+            ready = await offer_expiry._load_local_stale_active_offers(
+                session,
+                now=offer_expiry.utc_now_naive(),
+                normal_lifetime_minutes=15,
+            )
+
+        self.assertEqual(ready, [])
+        compiled = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        self.assertIn("offers.created_at + offers.overtime_minutes_snapshot *", compiled)
+
     async def test_expire_stale_offers_expires_offers_and_runs_side_effects(self):
         settings_obj = SimpleNamespace(offer_expiry_minutes=15)
         expired_offers = [
@@ -192,8 +249,8 @@ class OfferExpiryTests(unittest.IsolatedAsyncioTestCase):
              patch("core.services.offer_expiry_service._invalidate_overtime_after_offer_expiry", AsyncMock()), \
              patch("core.offer_expiry.apply_remote_stale_channel_state", AsyncMock(return_value=0)), \
              patch("core.offer_expiry.apply_offer_channel_state", AsyncMock()) as apply_offer_channel_state, \
-             patch("core.events.publish_event_sync") as publish_event_sync, \
-             patch("core.cache.decr_active_offer_count", AsyncMock()) as decr_active_offer_count:
+             patch("core.events.publish_events_sync") as publish_events_sync, \
+             patch("core.cache.decr_active_offer_counts", AsyncMock()) as decr_active_offer_counts:
             count = await offer_expiry.expire_stale_offers()
 
         self.assertEqual(count, 3)
@@ -209,13 +266,8 @@ class OfferExpiryTests(unittest.IsolatedAsyncioTestCase):
         applied_offer_ids = [call.args[0].id for call in apply_offer_channel_state.await_args_list]
         self.assertEqual(applied_offer_ids, [1, 2, 3])
         self.assertTrue(all(call.kwargs["reason"] == "auto_expire_time_limit" for call in apply_offer_channel_state.await_args_list))
-        self.assertEqual(publish_event_sync.call_count, 3)
-        publish_event_sync.assert_any_call("offer:expired", {"id": 1})
-        publish_event_sync.assert_any_call("offer:expired", {"id": 2})
-        publish_event_sync.assert_any_call("offer:expired", {"id": 3})
-        self.assertEqual(decr_active_offer_count.await_count, 3)
-        decr_active_offer_count.assert_any_await(11)
-        decr_active_offer_count.assert_any_await(22)
+        publish_events_sync.assert_called_once_with("offer:expired", [{"id": 1}, {"id": 2}, {"id": 3}])
+        decr_active_offer_counts.assert_awaited_once_with({11: 2, 22: 1})
 
     async def test_expire_stale_offers_retries_after_concurrent_expiry_stale_row_conflict(self):
         settings_obj = SimpleNamespace(offer_expiry_minutes=15)
@@ -249,8 +301,8 @@ class OfferExpiryTests(unittest.IsolatedAsyncioTestCase):
              patch("core.offer_expiry._sweep_overdue_overtime_decisions", AsyncMock()), \
              patch("core.offer_expiry.apply_remote_stale_channel_state", AsyncMock(return_value=0)), \
              patch("core.offer_expiry.apply_offer_channel_state", AsyncMock()) as apply_offer_channel_state, \
-             patch("core.events.publish_event_sync"), \
-             patch("core.cache.decr_active_offer_count", AsyncMock()):
+             patch("core.events.publish_events_sync"), \
+             patch("core.cache.decr_active_offer_counts", AsyncMock()):
             count = await offer_expiry.expire_stale_offers()
 
         self.assertEqual(count, 1)
@@ -286,8 +338,8 @@ class OfferExpiryTests(unittest.IsolatedAsyncioTestCase):
              patch("core.services.offer_expiry_service._invalidate_overtime_after_offer_expiry", AsyncMock()), \
              patch("core.offer_expiry.apply_remote_stale_channel_state", AsyncMock(return_value=0)), \
              patch("core.offer_expiry.apply_offer_channel_state", AsyncMock()) as apply_offer_channel_state, \
-             patch("core.events.publish_event_sync", side_effect=RuntimeError("pubsub down")), \
-             patch("core.cache.decr_active_offer_count", AsyncMock(side_effect=RuntimeError("redis down"))):
+             patch("core.events.publish_events_sync", side_effect=RuntimeError("pubsub down")), \
+             patch("core.cache.decr_active_offer_counts", AsyncMock(side_effect=RuntimeError("redis down"))):
             count = await offer_expiry.expire_stale_offers()
 
         self.assertEqual(count, 1)
@@ -461,6 +461,64 @@ class OfferPublicationWorkerTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(sum(report.applied for report in reports), 1)
         self.assertEqual(sum(report.skipped_locked for report in reports), 1)
 
+    def test_plan_spends_budget_on_terminal_then_quantity_changes_per_channel(self):
+        plain = candidate(make_offer(id=91, offer_public_id="ofr_91", status=OfferStatus.ACTIVE, remaining_quantity=50))
+        partial = candidate(make_offer(id=92, offer_public_id="ofr_92", status=OfferStatus.ACTIVE, remaining_quantity=25))
+        expired = candidate(make_offer(id=93, offer_public_id="ofr_93", status=OfferStatus.EXPIRED))
+        other_offer = make_offer(id=94, offer_public_id="ofr_94", status=OfferStatus.ACTIVE, remaining_quantity=50)
+        other_channel = candidate(other_offer, make_state(other_offer, telegram_chat_id=-100999))
+        already_expired_offer = make_offer(id=95, offer_public_id="ofr_95", status=OfferStatus.EXPIRED, version_id=9)
+        already_expired = candidate(
+            already_expired_offer,
+            make_state(
+                already_expired_offer,
+                status=OfferPublicationStatus.DISABLED,
+                last_known_offer_status=OfferStatus.EXPIRED.value,
+            ),
+        )
+
+        plan = worker.plan_channel_state_edits(
+            [plain, partial, expired, other_channel, already_expired, candidate(expired.offer)],
+            edit_budget=2,
+            spacing_seconds=0.5,
+            interval_seconds=1.0,
+        )
+
+        self.assertEqual(plan.edits, (expired, other_channel, partial))
+        self.assertEqual(plan.collapsed, (already_expired,))
+        self.assertEqual(plan.duplicates, 1)
+        self.assertEqual(plan.deferred, 1)
+        self.assertEqual(plan.depth, 6)
+        self.assertEqual(plan.channels, 2)
+        # Three edits on the busy channel: one spacing now, one interval, then the last edit.
+        self.assertEqual(plan.estimated_drain_seconds, 1.5)
+
+    async def test_redundant_terminal_transition_is_recorded_without_channel_edit(self):
+        offer = make_offer(id=96, offer_public_id="ofr_96", status=OfferStatus.CANCELLED, version_id=14)
+        item = candidate(
+            offer,
+            make_state(
+                offer,
+                status=OfferPublicationStatus.DISABLED,
+                last_known_offer_status=OfferStatus.CANCELLED.value,
+            ),
+        )
+
+        with patch.object(worker, "record_offer_channel_state_plan") as record_plan:
+            report, fake_db, apply_state = await self._run_channel_cycle(
+                [item],
+                OfferChannelStateApplyResult(ok=True, response_class="2xx", reason="ok"),
+            )
+
+        apply_state.assert_not_awaited()
+        fake_db.commit.assert_awaited_once()
+        self.assertEqual(report.collapsed, 1)
+        self.assertEqual(report.edits_saved, 1)
+        self.assertEqual(report.processed, 0)
+        self.assertEqual(item.state.offer_version_id, offer.version_id)
+        self.assertEqual(item.state.status, OfferPublicationStatus.DISABLED)
+        record_plan.assert_called_once_with(backlog_depth=1, estimated_drain_seconds=0.0, edits_saved=1)
+
     def test_retry_delay_is_exponential_and_bounded(self):
         with patch.object(worker.settings, "offer_publication_worker_retry_base_seconds", 5), patch.object(
             worker.settings, "offer_publication_worker_retry_max_seconds", 60
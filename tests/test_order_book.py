@@ -0,0 +1,226 @@
+import random
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from core import order_book as order_book_module
+from core.enums import SettlementType
+from core.order_book import OrderBookEntry, OrderBookIndex, OrderBookService, check_order_book_parity
+from core.services import trade_service
+from core import web_push
+from models.offer import OfferStatus, OfferType
+
+BASE_TIME = datetime(2026, 10, 17, 8, 0, tzinfo=timezone.utc)
+
+
+def offer_row(offer_id, *, commodity_id=1, offer_type="sell", settlement_type="cash", quantity=10, price=100,
+              user_id=None, excluded=False, minutes_ago=0, overtime=0):
+    return SimpleNamespace(
+        id=offer_id,
+        user_id=user_id if user_id is not None else offer_id,
+        commodity_id=commodity_id,
+        offer_type=OfferType(offer_type),
+        settlement_type=SettlementType(settlement_type),
+        quantity=quantity,
+        price=price,
+        exclude_from_competitive_price=excluded,
+        created_at=BASE_TIME - timedelta(minutes=minutes_ago),
+        overtime_minutes_snapshot=overtime,
+    )
+
+
+def entry(offer_id, **kwargs):
+    return OrderBookEntry.from_row(offer_row(offer_id, **kwargs))
+
+
+class FakeRowsDB:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        return SimpleNamespace(all=lambda: list(self.rows))
+
+
+class OrderBookIndexTests(unittest.TestCase):
+    def test_comparable_prices_match_a_brute_force_scan(self):
+        rng = random.Random(23)
+        index = OrderBookIndex()
+        entries = {}
+        for offer_id in range(1, 400):
+            item = entry(
+                offer_id,
+                commodity_id=rng.randint(1, 3),
+                offer_type=rng.choice(["buy", "sell"]),
+                settlement_type=rng.choice(["cash", "tomorrow"]),
+                quantity=rng.randint(1, 60),
+                price=rng.randint(90, 110) * 1000,
+                user_id=rng.randint(1, 20),
+                excluded=rng.random() < 0.1,
+            )
+            index.upsert(item)
+            entries[offer_id] = item
+        for offer_id in rng.sample(sorted(entries), 120):
+            index.discard(offer_id)
+            entries.pop(offer_id)
+        for offer_id in rng.sample(sorted(entries), 60):
+            moved = entry(offer_id, commodity_id=2, quantity=rng.randint(5, 50), price=rng.randint(90, 110) * 1000)
+            index.upsert(moved)
+            entries[offer_id] = moved
+
+        for commodity_id in (1, 2, 3):
+            for offer_type in ("buy", "sell"):
+                for settlement_type in ("cash", "tomorrow"):
+                    for min_qty, max_qty in ((5, 20), (21, 40), (41, 50)):
+                        for exclude_user_id in (None, 7):
+                            expected = sorted(
+                                item.price
+                                for item in entries.values()
+                                if item.key == (commodity_id, offer_type, settlement_type)
+                                and min_qty <= item.quantity <= max_qty
+                                and not item.exclude_from_competitive_price
+                                and (exclude_user_id is None or item.user_id != exclude_user_id)
+                            )
+                            actual = index.comparable_prices(
+                                commodity_id=commodity_id,
+                                offer_type=OfferType(offer_type),
+                                settlement_type=SettlementType(settlement_type),
+                                min_quantity=min_qty,
+                                max_quantity=max_qty,
+                                exclude_user_id=exclude_user_id,
+                            )
+                            self.assertEqual(sorted(actual), expected)
+        self.assertEqual(len(index), len(entries))
+
+    def test_best_price_quantiles_and_empty_books_are_dropped(self):
+        index = OrderBookIndex()
+        for offer_id, price in enumerate((300, 100, 200, 400), start=1):
+            index.upsert(entry(offer_id, price=price))
+            index.upsert(entry(10 + offer_id, offer_type="buy", price=price))
+
+        sell_book = index.book(1, "sell", "cash")
+        buy_book = index.book(1, OfferType.BUY, SettlementType.CASH)
+        self.assertEqual(sell_book.best_price(), 100)
+        self.assertEqual(buy_book.best_price(), 400)
+        self.assertEqual(sell_book.price_quantile(0.5), 200)
+        self.assertEqual(sell_book.price_quantile(1.0), 400)
+        self.assertEqual([item.offer_id for item in sell_book.quantity_range(10, 10)], [2, 3, 1, 4])
+
+        for offer_id in range(11, 15):
+            index.discard(offer_id)
+        self.assertIsNone(index.book(1, "buy", "cash"))
+        self.assertEqual(index.book_count, 1)
+
+    def test_live_offer_check_follows_lifetime_and_overtime(self):
+        index = OrderBookIndex()
+        index.upsert(entry(1, minutes_ago=3))
+        index.upsert(entry(2, minutes_ago=3, overtime=2))
+        now_epoch = BASE_TIME.timestamp()
+
+        self.assertTrue(index.has_other_live_offer(1, normal_lifetime_minutes=2, now_epoch=now_epoch))
+        self.assertFalse(index.has_other_live_offer(2, normal_lifetime_minutes=2, now_epoch=now_epoch))
+        self.assertFalse(index.has_other_live_offer(9, normal_lifetime_minutes=2, now_epoch=now_epoch + 180))
+        self.assertTrue(index.has_other_live_offer(1, normal_lifetime_minutes=0, now_epoch=now_epoch + 10_000))
+
+    def test_newest_offer_ids_apply_listing_filters_and_cursor(self):
+        index = OrderBookIndex()
+        index.upsert(entry(1, minutes_ago=5))
+        index.upsert(entry(2, minutes_ago=4, offer_type="buy"))
+        index.upsert(entry(3, minutes_ago=3, settlement_type="tomorrow"))
+        index.upsert(entry(4, minutes_ago=3, user_id=50))
+        index.upsert(entry(5, minutes_ago=1, commodity_id=2))
+
+        self.assertEqual(index.newest_offer_ids(limit=10), [5, 4, 3, 2, 1])
+        self.assertEqual(index.newest_offer_ids(offer_type="sell", settlement_type="cash", limit=10), [5, 4, 1])
+        self.assertEqual(index.newest_offer_ids(commodity_id=1, skip=1, limit=2), [3, 2])
+        self.assertEqual(index.newest_offer_ids(user_id=50, limit=10), [4])
+        self.assertEqual(
+            index.newest_offer_ids(before=(BASE_TIME - timedelta(minutes=3), 4), limit=10),
+            [3, 2, 1],
+        )
+
+
+class OrderBookServiceTests(unittest.IsolatedAsyncioTestCase):
+    async def test_parity_check_reports_and_repairs_drift(self):
+        index = OrderBookIndex()
+        index.upsert(entry(1, price=100))
+        index.upsert(entry(2, price=999))
+        index.upsert(entry(3))
+        db = FakeRowsDB([offer_row(1, price=100), offer_row(2, price=200), offer_row(4)])
+
+        with patch.object(order_book_module, "record_order_book_parity") as record:
+            report = await check_order_book_parity(db, index, repair=True)
+
+        self.assertEqual((report.missing, report.unexpected, report.mismatched), ((4,), (3,), (2,)))
+        self.assertFalse(report.ok)
+        record.assert_called_once_with(missing=1, unexpected=1, mismatched=1)
+        self.assertEqual(sorted(index.entries()), [1, 2, 4])
+        self.assertEqual(index.get(2).price, 200)
+        self.assertIn("offers.status", str(db.statements[0]))
+
+    async def test_dirty_offers_are_read_twice_and_refreshed_from_one_query(self):
+        service = OrderBookService()
+        service.index.upsert(entry(1))
+        service.index.upsert(entry(2))
+        with patch.object(order_book_module.settings, "order_book_refresh_debounce_ms", 50, create=True), patch.object(
+            order_book_module.settings, "order_book_refresh_settle_seconds", 1.0, create=True
+        ):
+            service.mark_dirty(1, now=10.0)
+            service.mark_dirty(3, now=10.0)
+
+        self.assertAlmostEqual(service.seconds_until_due(now=10.0), 0.05)
+        self.assertEqual(service.pop_due(now=10.05), {1, 3})
+        self.assertEqual(service.pop_due(now=10.5), set())
+        db = FakeRowsDB([offer_row(3, price=150)])
+        due = service.pop_due(now=11.0)
+        service.apply_refresh(due, await order_book_module.load_order_book_entries_by_id(db, due))
+
+        self.assertEqual(due, {1, 3})
+        self.assertEqual(sorted(service.index.entries()), [2, 3])
+        self.assertEqual(len(db.statements), 1)
+        compiled = str(db.statements[0].compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("offers.id IN (1, 3)", compiled)
+
+
+class OrderBookConsumerTests(unittest.IsolatedAsyncioTestCase):
+    def ready_service(self, *entries):
+        service = OrderBookService()
+        for item in entries:
+            service.index.upsert(item)
+        service.ready = True
+        return service
+
+    async def test_comparable_prices_come_from_the_ready_index_without_sql(self):
+        service = self.ready_service(
+            entry(1, quantity=10, price=100, user_id=5),
+            entry(2, quantity=15, price=110, user_id=6),
+            entry(3, quantity=30, price=120, user_id=6),
+        )
+        db = SimpleNamespace(execute=AsyncMock())
+
+        with patch.object(order_book_module, "order_book", service):
+            prices = await trade_service._get_comparable_active_prices(
+                db, "sell", SettlementType.CASH, commodity_id=1, quantity=12, user_id=5
+            )
+
+        self.assertEqual(prices, [110])
+        db.execute.assert_not_awaited()
+
+    async def test_first_live_offer_check_uses_the_ready_index(self):
+        service = self.ready_service(entry(1, minutes_ago=1), entry(2, minutes_ago=10))
+        db = SimpleNamespace(scalar=AsyncMock())
+
+        with patch.object(order_book_module, "order_book", service), patch(
+            "core.trading_settings.get_trading_settings_async",
+            new=AsyncMock(return_value=SimpleNamespace(offer_expiry_minutes=2)),
+        ), patch("core.utils.utc_now_naive", return_value=BASE_TIME.replace(tzinfo=None)):
+            self.assertFalse(await web_push.is_first_active_market_offer(db, 2))
+            self.assertTrue(await web_push.is_first_active_market_offer(db, 1))
+
+        db.scalar.assert_not_awaited()
+
+
+if __name__ == "__main__":
+    unittest.main()
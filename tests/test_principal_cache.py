@@ -0,0 +1,256 @@
+import json
+import uuid
+import unittest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy.orm.exc import StaleDataError
+
+from api import deps
+from core import events, last_seen, principal_cache as principal_cache_module
+from core.last_seen import LastSeenBuffer
+from core.principal_cache import PrincipalCache, apply_principal_invalidation
+from models.user import UserRole
+
+NOW = datetime(2026, 10, 17, 8, 0)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_user(**overrides):
+    values = {
+        "id": 7,
+        "telegram_id": None,
+        "sync_version": 3,
+        "is_deleted": False,
+        "account_status": "active",
+        "must_change_password": False,
+        "role": UserRole.STANDARD,
+        "last_seen_at": NOW,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def active_cache(**kwargs):
+    cache = PrincipalCache(ttl_seconds=kwargs.pop("ttl_seconds", 30), **kwargs)
+    cache.active = True
+    return cache
+
+
+class _ResultStub:
+    def __init__(self, value):
+        self._value = value
+
+    def scalar_one_or_none(self):
+        return self._value
+
+
+class PrincipalCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.cache = active_cache(max_entries=2, clock=self.clock)
+        patcher = patch.object(principal_cache_module, "record_api_principal_cache")
+        self.record = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def results(self):
+        return [call.args[0] for call in self.record.call_args_list]
+
+    def test_hit_requires_same_user_token_and_fresh_entry(self):
+        self.assertIsNone(self.cache.get("s1"))
+        self.cache.put("s1", make_user())
+
+        self.assertTrue(self.cache.vouches_for("s1", self.cache.get("s1"), make_user()))
+        self.assertFalse(self.cache.vouches_for("s1", self.cache.get("s1"), make_user(role=UserRole.SUPER_ADMIN)))
+        self.assertIsNone(self.cache.get("s1"))
+
+        self.cache.put("s1", make_user())
+        self.assertFalse(self.cache.vouches_for("s1", self.cache.get("s1"), make_user(id=8)))
+
+        # A presence-only write bumps sync_version but must not cost the hit.
+        self.cache.put("s1", make_user())
+        self.assertTrue(self.cache.vouches_for("s1", self.cache.get("s1"), make_user(sync_version=4)))
+
+        self.cache.put("s1", make_user())
+        self.clock.now += 30
+        self.assertIsNone(self.cache.get("s1"))
+        self.assertEqual(self.results(), ["miss", "hit", "stale", "miss", "stale", "hit", "stale"])
+
+    def test_invalidation_by_session_or_user_and_across_a_verification(self):
+        self.cache.put("s1", make_user())
+        self.cache.put("s2", make_user(id=8))
+
+        self.assertEqual(apply_principal_invalidation(self.cache, json.dumps({"user_ids": [8]})), 1)
+        self.assertEqual(apply_principal_invalidation(self.cache, b'{"session_ids": ["s1"]}'), 1)
+        self.assertEqual(apply_principal_invalidation(self.cache, "not json"), 0)
+        self.assertEqual(len(self.cache), 0)
+
+        generation = self.cache.generation
+        self.cache.invalidate(session_ids=["s3"])
+        self.cache.put("s3", make_user(), generation=generation)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_cache_is_off_until_the_listener_is_subscribed(self):
+        cache = PrincipalCache(ttl_seconds=30)
+        cache.put("s1", make_user())
+        self.assertEqual(len(cache), 0)
+
+        cache.active = True
+        cache.put("s1", make_user())
+        cache.active = False
+        self.assertIsNone(cache.get("s1"))
+        self.assertFalse(PrincipalCache(ttl_seconds=0).enabled)
+
+
+class GetCurrentUserPrincipalCacheTests(unittest.IsolatedAsyncioTestCase):
+    async def test_repeated_requests_skip_blacklist_and_session_lookups(self):
+        session_id = str(uuid.uuid4())
+        user = make_user()
+        db = AsyncMock()
+        db.execute = AsyncMock(return_value=_ResultStub(user))
+        db.get = AsyncMock(return_value=SimpleNamespace(is_active=True, user_id=7))
+        cache = active_cache()
+        blacklisted = AsyncMock(return_value=False)
+
+        with patch.object(deps, "principal_cache", cache), patch.object(
+            deps, "last_seen_buffer", LastSeenBuffer()
+        ), patch("api.deps.jwt.decode", return_value={"sub": "7", "sid": session_id}), patch(
+            "core.services.session_service.is_session_blacklisted", blacklisted
+        ), patch.object(principal_cache_module, "record_api_principal_cache"):
+            for _ in range(3):
+                self.assertIs(await deps.get_current_user(db=db, token="token"), user)
+            user.role = UserRole.MIDDLE_MANAGER
+            await deps.get_current_user(db=db, token="token")
+            cache.invalidate(session_ids=[session_id])
+            db.get = AsyncMock(return_value=SimpleNamespace(is_active=False, user_id=7))
+            with self.assertRaises(deps.HTTPException) as ctx:
+                await deps.get_current_user(db=db, token="token")
+
+        self.assertEqual(ctx.exception.status_code, 401)
+        self.assertEqual(blacklisted.await_count, 3)
+        self.assertEqual(db.execute.await_count, 5)
+
+    async def test_stale_presence_is_buffered_instead_of_committed(self):
+        user = make_user(last_seen_at=datetime.utcnow() - timedelta(minutes=5))
+        db = AsyncMock()
+        db.execute = AsyncMock(return_value=_ResultStub(user))
+        buffer = LastSeenBuffer()
+
+        with patch.object(deps, "last_seen_buffer", buffer), patch(
+            "api.deps.jwt.decode", return_value={"sub": "7"}
+        ):
+            await deps.get_current_user(db=db, token="token")
+            await deps.get_current_user(db=db, token="token")
+
+        db.commit.assert_not_awaited()
+        self.assertEqual(list(buffer.drain()), [7])
+
+
+class FakeFlushSession:
+    def __init__(self, rows, commit_errors=()):
+        self.rows = rows
+        self.committed = [row.last_seen_at for row in rows]
+        self.commit_errors = list(commit_errors)
+        self.statements = []
+        self.commit = AsyncMock(side_effect=self._commit)
+        self.rollback = AsyncMock(side_effect=self._rollback)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    async def _commit(self):
+        if self.commit_errors:
+            raise self.commit_errors.pop(0)
+
+    async def _rollback(self):
+        for row, value in zip(self.rows, self.committed):
+            row.last_seen_at = value
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        return MagicMock(scalars=MagicMock(return_value=MagicMock(all=MagicMock(return_value=self.rows))))
+
+
+class LastSeenBufferTests(unittest.IsolatedAsyncioTestCase):
+    def test_note_keeps_the_latest_touch_and_skips_recent_presence(self):
+        buffer = LastSeenBuffer()
+        self.assertFalse(buffer.note(make_user(last_seen_at=NOW), now=NOW + timedelta(seconds=60)))
+        self.assertTrue(buffer.note(make_user(last_seen_at=None), now=NOW + timedelta(seconds=2)))
+        self.assertTrue(buffer.note(make_user(last_seen_at=None), now=NOW + timedelta(seconds=1)))
+
+        self.assertEqual(buffer.drain(), {7: NOW + timedelta(seconds=2)})
+
+    async def test_flush_writes_all_users_in_one_transaction_and_never_moves_backwards(self):
+        buffer = LastSeenBuffer()
+        rows = [make_user(id=1, last_seen_at=None), make_user(id=2, last_seen_at=NOW + timedelta(hours=1))]
+        session = FakeFlushSession(rows, commit_errors=[StaleDataError("concurrent user update")])
+        buffer.requeue({1: NOW, 2: NOW})
+
+        with patch.object(last_seen, "record_last_seen_flush") as record:
+            self.assertEqual(await buffer.flush(lambda: session), 1)
+
+        self.assertEqual(rows[0].last_seen_at, NOW)
+        self.assertEqual(rows[1].last_seen_at, NOW + timedelta(hours=1))
+        self.assertEqual(len(session.statements), 2)
+        session.rollback.assert_awaited_once()
+        self.assertEqual(session.commit.await_count, 2)
+        self.assertEqual(record.call_args.kwargs["result"], "ok")
+        self.assertEqual(len(buffer), 0)
+
+    async def test_failed_flush_requeues_the_touches(self):
+        buffer = LastSeenBuffer()
+        buffer.requeue({1: NOW})
+
+        def broken_session():
+            raise ConnectionError("database unavailable")
+
+        with patch.object(last_seen, "record_last_seen_flush") as record:
+            self.assertEqual(await buffer.flush(broken_session), 0)
+
+        self.assertEqual(buffer.drain(), {1: NOW})
+        self.assertEqual(record.call_args.kwargs["result"], "error")
+
+
+class PrincipalInvalidationEventTests(unittest.TestCase):
+    def test_committed_session_and_role_changes_publish_affected_principals(self):
+        from models.session import UserSession
+        from models.user import User
+
+        session_uuid = uuid.uuid4()
+        presence_only = User(id=9, last_seen_at=NOW)
+        session = SimpleNamespace(
+            info={},
+            dirty=[UserSession(id=session_uuid, is_active=False), User(id=5, role=UserRole.MIDDLE_MANAGER), presence_only],
+            deleted=[],
+            in_nested_transaction=lambda: False,
+        )
+        events.collect_principal_invalidations(session, None)
+        cache = active_cache()
+        cache.put(str(session_uuid), make_user(id=5))
+
+        with patch.object(events, "publish_event_sync") as publish, patch(
+            "core.principal_cache.principal_cache", cache
+        ):
+            events.publish_principal_invalidations_after_commit(session)
+            events.publish_principal_invalidations_after_commit(session)
+
+        publish.assert_called_once_with(
+            events.PRINCIPAL_INVALIDATED_EVENT,
+            {"session_ids": [str(session_uuid)], "user_ids": [5]},
+        )
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import patch
+
+from api.routers import realtime
+from api.routers.realtime import build_realtime_frame, listen_batched_realtime_events
+from core.realtime_batching import REALTIME_BATCH_PROTOCOL, RealtimeBatchEncoder
+from core.realtime_fanout import RealtimeFanoutHub
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+        self.close_calls = []
+
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+
+    async def close(self, code, reason):
+        self.close_calls.append((code, reason))
+
+
+def frame(event_type, event_id, **data):
+    return build_realtime_frame(f"events:{event_type}", json.dumps({**data, "_realtime_event_id": event_id}))
+
+
+class IdleRedisClient:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    def pubsub(self):
+        return self
+
+    async def subscribe(self, *channels):
+        return None
+
+    async def psubscribe(self, *patterns):
+        return None
+
+    async def get_message(self, ignore_subscribe_messages=True, timeout=1.0):
+        await asyncio.sleep(3600)
+
+    async def aclose(self):
+        return None
+
+
+def make_hub(history_size=4):
+    return RealtimeFanoutHub(
+        redis_factory=IdleRedisClient,
+        public_event_types=realtime.WEBSOCKET_PUBLIC_EVENT_TYPES,
+        frame_builder=build_realtime_frame,
+        history_size=history_size,
+    )
+
+
+class RealtimeBatchEncoderTests(unittest.TestCase):
+    def test_known_offer_updates_carry_only_changed_fields(self):
+        encoder = RealtimeBatchEncoder()
+        encoder.add(frame("offer:created", "e1", id=7, status="active", remaining_quantity=10, price=100))
+        self.assertEqual(
+            json.loads(encoder.drain())["events"],
+            [
+                {
+                    "type": "offer:created",
+                    "event_id": "e1",
+                    "data": {"id": 7, "status": "active", "remaining_quantity": 10, "price": 100},
+                }
+            ],
+        )
+
+        encoder.add(frame("offer:updated", "e2", id=7, status="active", remaining_quantity=6))
+        encoder.add(frame("offer:updated", "e3", id=7, status="active", remaining_quantity=4))
+        batch = json.loads(encoder.drain())
+
+        self.assertEqual(
+            batch,
+            {
+                "type": "batch",
+                "events": [{"type": "offer:updated", "event_id": "e3", "delta": {"remaining_quantity": 4, "id": 7}}],
+                "last_event_id": "e3",
+            },
+        )
+        self.assertIsNone(encoder.drain())
+
+    def test_window_merges_per_offer_and_keeps_other_events_in_order(self):
+        encoder = RealtimeBatchEncoder()
+        encoder.add(frame("offer:created", "e1", id=7, status="active", remaining_quantity=10))
+        encoder.add(frame("market:closed", "e2", is_open=False))
+        encoder.add(frame("offer:updated", "e3", id=7, remaining_quantity=5))
+        encoder.add(frame("offer:updated", "e3", id=7, remaining_quantity=1))
+        encoder.add(frame("offer:expired", "e4", id=8, status="expired"))
+
+        events = json.loads(encoder.drain())["events"]
+
+        self.assertEqual(
+            events,
+            [
+                {"type": "offer:created", "event_id": "e3", "data": {"id": 7, "status": "active", "remaining_quantity": 5}},
+                {"type": "market:closed", "event_id": "e2", "data": {"is_open": False}},
+                {"type": "offer:expired", "event_id": "e4", "data": {"id": 8, "status": "expired"}},
+            ],
+        )
+
+    def test_terminal_event_forgets_the_offer(self):
+        encoder = RealtimeBatchEncoder()
+        encoder.add(frame("offer:created", "e1", id=7, status="active"))
+        encoder.drain()
+        encoder.add(frame("offer:cancelled", "e2", id=7, status="cancelled"))
+        encoder.drain()
+        encoder.add(frame("offer:updated", "e3", id=7, status="active"))
+
+        (event,) = json.loads(encoder.drain())["events"]
+
+        self.assertEqual(event["data"], {"id": 7, "status": "active"})
+
+
+class RealtimeResumeHistoryTests(unittest.IsolatedAsyncioTestCase):
+    async def test_frames_since_returns_later_frames_or_none_once_forgotten(self):
+        hub = make_hub(history_size=3)
+        for index in range(1, 5):
+            hub.dispatch("events:offer:updated", json.dumps({"id": index, "_realtime_event_id": f"e{index}"}))
+
+        self.assertEqual([item.event_id for item in hub.frames_since("e2")], ["e3", "e4"])
+        self.assertEqual(hub.frames_since("e4"), [])
+        self.assertIsNone(hub.frames_since("e1"))
+
+
+class BatchedWebSocketListenerTests(unittest.IsolatedAsyncioTestCase):
+    async def test_resumed_connection_receives_ack_then_one_coalesced_batch(self):
+        hub = make_hub()
+        hub.dispatch("events:offer:created", json.dumps({"id": 7, "remaining_quantity": 9, "_realtime_event_id": "e1"}))
+        hub.dispatch("events:offer:updated", json.dumps({"id": 7, "remaining_quantity": 8, "_realtime_event_id": "e2"}))
+        websocket = FakeWebSocket()
+
+        with patch.object(realtime, "realtime_fanout_hub", hub), patch.object(
+            realtime, "realtime_batch_interval_seconds", return_value=0.05
+        ):
+            task = asyncio.create_task(listen_batched_realtime_events(websocket, user_id=5, since="e1"))
+            await asyncio.sleep(0)
+            hub.dispatch("events:offer:updated", json.dumps({"id": 7, "remaining_quantity": 3, "_realtime_event_id": "e3"}))
+            await asyncio.sleep(0.2)
+            (subscription,) = hub._subscribers
+            hub._evict(subscription)
+            await asyncio.wait_for(task, timeout=1)
+
+        self.assertEqual(
+            websocket.sent,
+            [
+                {"type": "protocol", "protocol": REALTIME_BATCH_PROTOCOL, "interval_ms": 50, "resumed": True},
+                {
+                    "type": "batch",
+                    "events": [{"type": "offer:updated", "event_id": "e3", "data": {"id": 7, "remaining_quantity": 3}}],
+                    "last_event_id": "e3",
+                },
+            ],
+        )
+        self.assertEqual(websocket.close_calls, [(1013, "Realtime consumer too slow")])
+        self.assertEqual(hub.subscriber_count, 0)
+        await hub.stop()
+
+    async def test_unknown_resume_point_is_reported_and_batch_protocol_needs_shared_hub(self):
+        hub = make_hub()
+        websocket = FakeWebSocket()
+
+        with patch.object(realtime, "realtime_fanout_hub", hub):
+            task = asyncio.create_task(listen_batched_realtime_events(websocket, user_id=5, since="gone"))
+            await asyncio.sleep(0)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        await hub.stop()
+
+        self.assertFalse(websocket.sent[0]["resumed"])
+        with patch.object(realtime.settings, "realtime_shared_subscriber_enabled", False):
+            self.assertIsNone(realtime.negotiate_realtime_protocol(REALTIME_BATCH_PROTOCOL))
+        with patch.object(realtime.settings, "realtime_shared_subscriber_enabled", True):
+            self.assertEqual(realtime.negotiate_realtime_protocol(REALTIME_BATCH_PROTOCOL), REALTIME_BATCH_PROTOCOL)
+            self.assertIsNone(realtime.negotiate_realtime_protocol("v2"))
+
+
+if __name__ == "__main__":
+    unittest.main()
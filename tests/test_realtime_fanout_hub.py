@@ -0,0 +1,244 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import patch
+
+from api.routers import realtime
+from api.routers.realtime import (
+    build_realtime_frame,
+    listen_shared_realtime_events,
+    shared_event_generator,
+)
+from core.realtime_fanout import RealtimeFanoutHub
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+        self.close_calls = []
+
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+
+    async def close(self, code, reason):
+        self.close_calls.append((code, reason))
+
+
+class FakePubSub:
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.subscribed = None
+        self.patterns = None
+        self.closed = False
+
+    async def subscribe(self, *channels):
+        self.subscribed = channels
+
+    async def psubscribe(self, *patterns):
+        self.patterns = patterns
+
+    async def get_message(self, ignore_subscribe_messages=True, timeout=1.0):
+        if self.messages:
+            return self.messages.pop(0)
+        await asyncio.sleep(3600)
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeRedisClient:
+    def __init__(self, pubsub):
+        self._pubsub = pubsub
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    def pubsub(self):
+        return self._pubsub
+
+
+def make_hub(pubsub=None, *, queue_size=8, frame_builder=build_realtime_frame):
+    return RealtimeFanoutHub(
+        redis_factory=lambda: FakeRedisClient(pubsub or FakePubSub([])),
+        public_event_types=realtime.WEBSOCKET_PUBLIC_EVENT_TYPES,
+        frame_builder=frame_builder,
+        queue_size=queue_size,
+    )
+
+
+def offer_event(offer_id, event_id):
+    return json.dumps(
+        {"id": offer_id, "status": "active", "mobile_number": "0935", "_realtime_event_id": event_id}
+    )
+
+
+class RealtimeFanoutHubTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncTearDown(self):
+        await realtime.realtime_fanout_hub.stop()
+
+    async def test_public_event_is_projected_once_for_every_subscriber(self):
+        calls = []
+
+        def counting_builder(channel, raw_data):
+            calls.append(channel)
+            return build_realtime_frame(channel, raw_data)
+
+        hub = make_hub(frame_builder=counting_builder)
+        subscriptions = [
+            hub.subscribe(user_id=user_id, event_types=realtime.WEBSOCKET_PUBLIC_EVENT_TYPES, transport="websocket")
+            for user_id in (1, 2, 3)
+        ]
+
+        delivered = hub.dispatch("events:offer:created", offer_event(7, "event-7"))
+
+        self.assertEqual(delivered, 3)
+        self.assertEqual(calls, ["events:offer:created"])
+        frames = [subscription.queue.get_nowait() for subscription in subscriptions]
+        self.assertTrue(all(frame is frames[0] for frame in frames))
+        self.assertEqual(
+            json.loads(frames[0].websocket_text),
+            {"type": "offer:created", "data": {"id": 7, "status": "active"}, "event_id": "event-7"},
+        )
+        self.assertEqual(
+            frames[0].sse_text,
+            'id: event-7\nevent: offer:created\ndata: {"id": 7, "status": "active"}\n\n',
+        )
+        await hub.stop()
+
+    async def test_event_types_filter_each_subscription(self):
+        hub = make_hub()
+        websocket = hub.subscribe(user_id=1, event_types=realtime.WEBSOCKET_PUBLIC_EVENT_TYPES, transport="websocket")
+        sse = hub.subscribe(user_id=2, event_types=realtime.SSE_PUBLIC_EVENT_TYPES, transport="sse")
+
+        hub.dispatch("events:offer:cancelled", offer_event(7, "event-7"))
+
+        self.assertEqual(websocket.queue.qsize(), 1)
+        self.assertEqual(sse.queue.qsize(), 0)
+        await hub.stop()
+
+    async def test_notifications_route_only_to_the_owning_user(self):
+        calls = []
+
+        def counting_builder(channel, raw_data):
+            calls.append(channel)
+            return build_realtime_frame(channel, raw_data)
+
+        hub = make_hub(frame_builder=counting_builder)
+        owner = hub.subscribe(user_id=5, event_types=(), transport="websocket")
+        other = hub.subscribe(user_id=6, event_types=(), transport="websocket")
+
+        self.assertEqual(hub.dispatch("notifications:99", "not-json"), 0)
+        self.assertEqual(calls, [])
+
+        hub.dispatch("notifications:5", json.dumps({"event": "message", "data": {"safe": 1, "mobile_number": "0912"}}))
+
+        frame = owner.queue.get_nowait()
+        self.assertTrue(frame.private)
+        self.assertEqual(json.loads(frame.websocket_text), {"type": "message", "data": {"safe": 1}})
+        self.assertTrue(other.queue.empty())
+        await hub.stop()
+
+    async def test_slow_consumer_is_evicted_without_blocking_others(self):
+        hub = make_hub(queue_size=2)
+        slow = hub.subscribe(user_id=1, event_types=realtime.WEBSOCKET_PUBLIC_EVENT_TYPES, transport="websocket")
+        fast = hub.subscribe(user_id=2, event_types=realtime.WEBSOCKET_PUBLIC_EVENT_TYPES, transport="websocket")
+
+        with patch("core.realtime_fanout.record_realtime_fanout_eviction") as record_eviction:
+            for index in range(3):
+                hub.dispatch("events:offer:created", offer_event(index, f"event-{index}"))
+                if not fast.queue.empty():
+                    fast.queue.get_nowait()
+
+        record_eviction.assert_called_once_with("websocket")
+        self.assertTrue(slow.evicted)
+        self.assertIsNone(await slow.next_frame())
+        self.assertEqual(hub.subscriber_count, 1)
+        self.assertFalse(fast.evicted)
+        await hub.stop()
+
+    async def test_listener_uses_one_subscription_for_public_and_notification_channels(self):
+        pubsub = FakePubSub([
+            {"type": "message", "channel": b"events:offer:created", "data": offer_event(7, "event-7").encode()},
+            {
+                "type": "pmessage",
+                "pattern": b"notifications:*",
+                "channel": b"notifications:5",
+                "data": b'{"event":"message","data":{"safe":1}}',
+            },
+        ])
+        hub = make_hub(pubsub)
+        subscription = hub.subscribe(user_id=5, event_types=realtime.WEBSOCKET_PUBLIC_EVENT_TYPES, transport="websocket")
+
+        first = await asyncio.wait_for(subscription.next_frame(), timeout=1)
+        second = await asyncio.wait_for(subscription.next_frame(), timeout=1)
+        await hub.stop()
+
+        self.assertEqual((first.event_type, second.event_type), ("offer:created", "message"))
+        self.assertIn("events:offer:created", pubsub.subscribed)
+        self.assertEqual(pubsub.patterns, ("notifications:*",))
+        self.assertTrue(pubsub.closed)
+
+    async def test_shared_websocket_consumer_dedups_and_closes_on_eviction(self):
+        hub = make_hub(queue_size=4)
+        websocket = FakeWebSocket()
+
+        with patch.object(realtime, "realtime_fanout_hub", hub), patch(
+            "api.routers.realtime._websocket_access_denial", return_value=None
+        ):
+            task = asyncio.create_task(listen_shared_realtime_events(websocket, user_id=5))
+            await asyncio.sleep(0)
+            hub.dispatch("events:offer:created", offer_event(7, "event-7"))
+            hub.dispatch("events:offer:created", offer_event(7, "event-7"))
+            await asyncio.sleep(0)
+            (subscription,) = hub._subscribers
+            hub._evict(subscription)
+            await asyncio.wait_for(task, timeout=1)
+
+        self.assertEqual(
+            websocket.sent,
+            [{"type": "offer:created", "data": {"id": 7, "status": "active"}, "event_id": "event-7"}],
+        )
+        self.assertEqual(websocket.close_calls, [(1013, "Realtime consumer too slow")])
+        self.assertEqual(hub.subscriber_count, 0)
+        await hub.stop()
+
+    async def test_shared_websocket_consumer_closes_on_private_access_denial(self):
+        hub = make_hub()
+        websocket = FakeWebSocket()
+
+        with patch.object(realtime, "realtime_fanout_hub", hub), patch(
+            "api.routers.realtime._websocket_access_denial", return_value=(4003, "Session has been revoked")
+        ):
+            task = asyncio.create_task(listen_shared_realtime_events(websocket, user_id=5, session_id="s1"))
+            await asyncio.sleep(0)
+            hub.dispatch("notifications:5", '{"event":"message","data":{"safe":1}}')
+            await asyncio.wait_for(task, timeout=1)
+
+        self.assertEqual(websocket.sent, [])
+        self.assertEqual(websocket.close_calls, [(4003, "Session has been revoked")])
+        self.assertEqual(hub.subscriber_count, 0)
+        await hub.stop()
+
+    async def test_shared_sse_generator_yields_prerendered_frames(self):
+        hub = make_hub()
+
+        with patch.object(realtime, "realtime_fanout_hub", hub), patch(
+            "api.routers.realtime._websocket_access_denial", return_value=None
+        ):
+            generator = shared_event_generator(5)
+            pending = asyncio.ensure_future(generator.__anext__())
+            await asyncio.sleep(0)
+            hub.dispatch("events:offer:updated", offer_event(7, "event-7"))
+            chunk = await asyncio.wait_for(pending, timeout=1)
+            await generator.aclose()
+
+        self.assertEqual(chunk, 'id: event-7\nevent: offer:updated\ndata: {"id": 7, "status": "active"}\n\n')
+        self.assertEqual(hub.subscriber_count, 0)
+        await hub.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -14,6 +14,10 @@ async def _worker_forever():
     await asyncio.sleep(3600)
 
 
+async def _bot_child_forever(*_args, **_kwargs):
+    await asyncio.sleep(3600)
+
+
 class RunBotRuntimeTests(unittest.IsolatedAsyncioTestCase):
     async def test_main_fails_closed_without_bot_token(self):
         with patch.object(run_bot.settings, 'server_mode', 'foreign'), patch.object(
@@ -61,6 +65,8 @@ class RunBotRuntimeTests(unittest.IsolatedAsyncioTestCase):
         storage = MagicMock()
         event_isolation = object()
         storage.create_isolation.return_value = event_isolation
+        init_redis = AsyncMock()
+        close_redis = AsyncMock()
 
         with patch.object(run_bot.settings, 'server_mode', 'foreign'), patch.object(
             run_bot.settings, 'trading_bot_service', 'bot'
@@ -78,7 +84,15 @@ class RunBotRuntimeTests(unittest.IsolatedAsyncioTestCase):
             'run_bot.TradeContentionGateMiddleware', return_value=trade_gate_middleware
         ) as gate_ctor, patch(
             'run_bot.StaleNavigationHandoffMiddleware', return_value=navigation_middleware
-        ) as navigation_ctor, patch('run_bot.listen_trade_suggestion_events', _listener_forever), patch(
+        ) as navigation_ctor, patch('run_bot.listen_trade_suggestion_events', _listener_forever), patch.multiple(
+            'run_bot',
+            init_redis=init_redis,
+            close_redis=close_redis,
+            listen_bot_access_invalidations=_bot_child_forever,
+            listen_cache_invalidations=_bot_child_forever,
+            run_trading_settings_snapshot=_bot_child_forever,
+            run_message_delete_scheduler=_bot_child_forever,
+        ), patch(
             'run_bot.offer_telegram_publication_loop', _worker_forever
         ), patch(
             'run_bot.telegram_trade_delivery_loop', _worker_forever
@@ -90,6 +104,8 @@ class RunBotRuntimeTests(unittest.IsolatedAsyncioTestCase):
             await run_bot.main()
 
         init_db.assert_awaited_once()
+        init_redis.assert_awaited_once()
+        close_redis.assert_awaited_once()
         setup_event_listeners.assert_called_once_with()
         storage_from_url.assert_called_once_with('redis://localhost:6379/0')
         storage.create_isolation.assert_called_once_with(lock_kwargs={"timeout": 120})
@@ -99,7 +115,7 @@ class RunBotRuntimeTests(unittest.IsolatedAsyncioTestCase):
         )
         callback_receipt_ctor.assert_called_once_with()
         gate_ctor.assert_called_once_with()
-        auth_ctor.assert_called_once_with(run_bot.AsyncSessionLocal)
+        auth_ctor.assert_called_once_with(run_bot.AsyncSessionLocal, access_cache=run_bot.bot_access_cache)
         navigation_ctor.assert_called_once_with()
         self.assertEqual(fake_dp.update.outer_middleware.call_count, 5)
         self.assertIs(
@@ -137,7 +153,14 @@ class RunBotRuntimeTests(unittest.IsolatedAsyncioTestCase):
             'run_bot.Dispatcher', return_value=fake_dp
         ), patch('run_bot.AuthMiddleware', return_value=object()), patch(
             'run_bot.listen_trade_suggestion_events', _listener_forever
-        ), patch('run_bot.offer_telegram_publication_loop', _worker_forever), patch(
+        ), patch('run_bot.listen_bot_access_invalidations', _bot_child_forever), patch.multiple(
+            'run_bot',
+            init_redis=AsyncMock(),
+            close_redis=AsyncMock(),
+            listen_cache_invalidations=_bot_child_forever,
+            run_trading_settings_snapshot=_bot_child_forever,
+        ), patch('run_bot.run_message_delete_scheduler', _bot_child_forever), patch(
+            'run_bot.offer_telegram_publication_loop', _worker_forever), patch(
             'run_bot.telegram_trade_delivery_loop', _worker_forever
         ), patch('run_bot.telegram_admin_broadcast_delivery_loop', _worker_forever), patch(
             'run_bot.telegram_notification_outbox_delivery_loop', _worker_forever
@@ -0,0 +1,180 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import ANY, AsyncMock, patch
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.dml import Insert
+
+from api.routers.sync import _resolve_offer_id_by_public_id, receive_sync_data
+from core.sync_reference_cache import (
+    SyncReferenceCache,
+    bind_sync_reference_cache,
+    reset_sync_reference_cache,
+)
+from models.offer import Offer
+
+
+class RowsResult:
+    def __init__(self, rows=()):
+        self._rows = list(rows)
+
+    def all(self):
+        return list(self._rows)
+
+    def scalars(self):
+        return SimpleNamespace(first=lambda: None)
+
+
+class FakeDB:
+    def __init__(self, *, fail_inserts=0, rows=()):
+        self.execute_calls = []
+        self.fail_inserts = fail_inserts
+        self.rows = list(rows)
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def execute(self, stmt, *args, **kwargs):
+        self.execute_calls.append(stmt)
+        if isinstance(stmt, Insert) and self.fail_inserts:
+            self.fail_inserts -= 1
+            raise RuntimeError("duplicate key value violates unique constraint")
+        return RowsResult(self.rows)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+    def begin_nested(self):
+        class _Ctx:
+            async def __aenter__(self_inner):
+                return None
+
+            async def __aexit__(self_inner, exc_type, exc, tb):
+                return False
+
+        return _Ctx()
+
+    def inserts(self, table):
+        return [
+            stmt
+            for stmt in self.execute_calls
+            if isinstance(stmt, Insert) and stmt.table.name == table
+        ]
+
+
+def notification_items(count, *, dedupe=lambda index: f"notice:{index}"):
+    return [
+        {
+            "type": "db_change",
+            "table": "notifications",
+            "operation": "INSERT",
+            "id": 100 + index,
+            "data": {
+                "id": 100 + index,
+                "user_id": 7,
+                "message": f"notice {index}",
+                "is_read": False,
+                "dedupe_key": dedupe(index),
+            },
+        }
+        for index in range(count)
+    ]
+
+
+class SyncRouterReceiveBulkTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        for target, value in (
+            ("sync_receive_bulk_apply_enabled", True),
+            ("sync_receive_bulk_min_items", 50),
+            ("sync_receive_bulk_batch_size", 500),
+        ):
+            patcher = patch(f"api.routers.sync.settings.{target}", value, create=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        for target in ("_refresh_notification_unread_counts", "_apply_item"):
+            patcher = patch(f"api.routers.sync.{target}", new=AsyncMock(return_value="ok"))
+            setattr(self, target.strip("_"), patcher.start())
+            self.addCleanup(patcher.stop)
+
+    async def test_catch_up_batch_writes_guard_free_rows_with_one_upsert(self):
+        db = FakeDB()
+
+        with patch("api.routers.sync.record_sync_bulk_apply") as metric:
+            response = await receive_sync_data(notification_items(60), SimpleNamespace(), db=db)
+
+        self.assertEqual(response, {"status": "success", "processed": 60})
+        self.apply_item.assert_not_awaited()
+        (stmt,) = db.inserts("notifications")
+        self.assertEqual(len(stmt._multi_values[0]), 60)
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        self.assertIn("ON CONFLICT (dedupe_key) WHERE dedupe_key IS NOT NULL DO UPDATE", sql)
+        self.assertNotIn("id", stmt._multi_values[0][0])
+        metric.assert_called_once_with(server_mode=ANY, table="notifications", result="applied", count=60)
+
+    async def test_failed_upsert_falls_back_to_per_item_apply(self):
+        db = FakeDB(fail_inserts=1)
+
+        with patch("api.routers.sync.record_sync_bulk_apply") as metric:
+            response = await receive_sync_data(notification_items(60), SimpleNamespace(), db=db)
+
+        self.assertEqual(response, {"status": "success", "processed": 60})
+        self.assertEqual(self.apply_item.await_count, 60)
+        metric.assert_called_once_with(server_mode=ANY, table="notifications", result="fallback", count=60)
+
+    async def test_repeated_conflict_key_starts_a_new_upsert(self):
+        db = FakeDB()
+        items = notification_items(60, dedupe=lambda index: f"notice:{index % 40}")
+
+        response = await receive_sync_data(items, SimpleNamespace(), db=db)
+
+        self.assertEqual(response["processed"], 60)
+        self.assertEqual([len(stmt._multi_values[0]) for stmt in db.inserts("notifications")], [40, 20])
+
+    async def test_live_batches_keep_the_per_item_path(self):
+        db = FakeDB()
+
+        response = await receive_sync_data(notification_items(3), SimpleNamespace(), db=db)
+
+        self.assertEqual(response, {"status": "success", "processed": 3})
+        self.assertEqual(self.apply_item.await_count, 3)
+        self.assertEqual(db.inserts("notifications"), [])
+
+
+class SyncReferenceCacheTests(unittest.IsolatedAsyncioTestCase):
+    async def test_wanted_keys_resolve_in_one_query_and_refresh_after_writes(self):
+        db = FakeDB(rows=[("ofr_1", 11), ("ofr_2", 12)])
+        cache = SyncReferenceCache()
+        for public_id in ("ofr_1", "ofr_2", "ofr_3"):
+            cache.want(Offer, "offer_public_id", public_id)
+        token = bind_sync_reference_cache(cache)
+        self.addCleanup(reset_sync_reference_cache, token)
+
+        self.assertEqual(await _resolve_offer_id_by_public_id(db, "ofr_1"), 11)
+        self.assertEqual(await _resolve_offer_id_by_public_id(db, "ofr_2"), 12)
+        self.assertEqual(cache.queries, 1)
+        self.assertEqual(len(db.execute_calls), 1)
+
+        # Misses and unknown keys fall back to the per-item SELECT.
+        self.assertIsNone(await _resolve_offer_id_by_public_id(db, "ofr_3"))
+        self.assertIsNone(await _resolve_offer_id_by_public_id(db, "ofr_9"))
+        self.assertEqual(len(db.execute_calls), 3)
+
+        cache.begin_write("offers")
+        self.assertIsNone(await cache.lookup(db, Offer, "offer_public_id", "ofr_1"))
+        cache.begin_write("trades")
+        self.assertEqual(await cache.lookup(db, Offer, "offer_public_id", "ofr_1"), 11)
+        self.assertEqual(cache.queries, 2)
+
+    async def test_values_of_the_wrong_type_are_not_prefetched(self):
+        cache = SyncReferenceCache()
+        cache.want(Offer, "offer_public_id", 42)
+        cache.want(Offer, "id", True)
+
+        self.assertIsNone(await cache.lookup(FakeDB(), Offer, "offer_public_id", 42))
+        self.assertEqual(cache.queries, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -80,6 +80,9 @@ class FakeScalarResult:
     def first(self):
         return self.value
 
+    def all(self):
+        return list(self.value)
+
 
 class FakeExecuteResult:
     def __init__(self, value):
@@ -163,6 +166,288 @@ class SendSyncItemTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(kwargs["timeout"], 2.0)
 
 
+class SendSyncBatchTests(unittest.IsolatedAsyncioTestCase):
+    async def test_send_sync_batch_signs_all_items_as_one_body(self):
+        client = AsyncMock()
+        client.post.return_value = object()
+        items = [{"hash": "a", "table": "offers"}, {"hash": "b", "table": "trades"}]
+        timestamp = 1700000000
+
+        with patch("core.sync_worker.time.time", return_value=timestamp):
+            await sync_worker.send_sync_batch(client, items, "https://peer.example", "secret-key")
+
+        client.post.assert_awaited_once()
+        args, kwargs = client.post.await_args
+        expected_body = json.dumps(items, sort_keys=True)
+        self.assertEqual(args[0], "https://peer.example/api/sync/receive")
+        self.assertEqual(kwargs["content"], expected_body)
+        self.assertEqual(
+            kwargs["headers"]["X-Signature"],
+            hmac.new(
+                b"secret-key",
+                f"{timestamp}:{expected_body}".encode(),
+                hashlib.sha256,
+            ).hexdigest(),
+        )
+
+    def test_configured_batch_size_defaults_to_single_row_and_is_bounded(self):
+        with patch("core.sync_worker.settings", SimpleNamespace()):
+            self.assertEqual(sync_worker.configured_sync_worker_batch_size(), 1)
+        with patch("core.sync_worker.settings", SimpleNamespace(sync_worker_batch_size=0)):
+            self.assertEqual(sync_worker.configured_sync_worker_batch_size(), 1)
+        with patch("core.sync_worker.settings", SimpleNamespace(sync_worker_batch_size=10_000)):
+            self.assertEqual(
+                sync_worker.configured_sync_worker_batch_size(),
+                sync_worker.SYNC_WORKER_MAX_BATCH_SIZE,
+            )
+
+
+def make_batch_item(table, record_id, change_log_id):
+    return {
+        "type": "db_change",
+        "operation": "UPDATE",
+        "table": table,
+        "id": record_id,
+        "data": {"id": record_id},
+        "hash": f"hash-{change_log_id}",
+        "change_log_id": change_log_id,
+    }
+
+
+class BatchDeliveryOutcomeTests(unittest.TestCase):
+    def setUp(self):
+        self.items = [
+            make_batch_item("offers", 5, 101),
+            make_batch_item("customer_relations", 6, 102),
+            make_batch_item("market_runtime_state", 1, 103),
+        ]
+
+    def test_success_response_delivers_every_item(self):
+        response = FakeResponse(
+            200,
+            '{"status":"success","processed":3}',
+            {"status": "success", "processed": 3},
+        )
+
+        outcomes = sync_worker.batch_delivery_outcomes(response, self.items)
+
+        self.assertEqual([outcome.delivered for outcome in outcomes], [True, True, True])
+
+    def test_partial_response_is_attributed_per_item(self):
+        response = FakeResponse(
+            200,
+            "{}",
+            {
+                "status": "partial",
+                "processed": 1,
+                "errors": 2,
+                "error_items": [
+                    {
+                        "table": "customer_relations",
+                        "record_id": 6,
+                        "reason": "deferred_foreign_key_dependency_missing",
+                    },
+                    {
+                        "table": "market_runtime_state",
+                        "record_id": "1",
+                        "reason": "source_authority_forbidden:foreign",
+                    },
+                ],
+            },
+        )
+
+        offer, relation, runtime_state = sync_worker.batch_delivery_outcomes(response, self.items)
+
+        self.assertTrue(offer.delivered)
+        self.assertIsNone(offer.peer_rejection_reason)
+        self.assertFalse(relation.delivered)
+        self.assertEqual(relation.peer_rejection_reason, "deferred_foreign_key_dependency_missing")
+        self.assertTrue(runtime_state.delivered)
+        self.assertEqual(runtime_state.terminal_rejection_reason, "source_authority_forbidden:foreign")
+
+    def test_unattributable_responses_return_none(self):
+        unmatched = FakeResponse(
+            200,
+            "{}",
+            {
+                "status": "partial",
+                "processed": 2,
+                "errors": 1,
+                "error_items": [{"table": "offers", "record_id": 99, "reason": "apply_failed"}],
+            },
+        )
+        missing_details = FakeResponse(
+            200,
+            "{}",
+            {"status": "partial", "processed": 2, "errors": 1},
+        )
+        server_error = FakeResponse(500, "boom", {"status": "error"})
+        invalid_json = FakeResponse(200, "not-json")
+
+        for response in (unmatched, missing_details, server_error, invalid_json):
+            with self.subTest(status=response.status_code, body=response.text):
+                self.assertIsNone(sync_worker.batch_delivery_outcomes(response, self.items))
+
+    def test_single_item_batch_keeps_legacy_classification(self):
+        response = FakeResponse(
+            200,
+            "{}",
+            {
+                "status": "partial",
+                "processed": 0,
+                "errors": 1,
+                "error_items": [{"table": "mystery", "record_id": 8, "reason": "unregistered_table"}],
+            },
+        )
+
+        (outcome,) = sync_worker.batch_delivery_outcomes(response, self.items[:1])
+
+        self.assertFalse(outcome.delivered)
+        self.assertEqual(outcome.peer_rejection_reason, "peer_partial_rejection")
+
+    def test_short_or_rejected_batch_stops_backlog_drain(self):
+        full = sync_worker.SyncBatchDeliveryResult(claimed=50, delivered=50)
+        short = sync_worker.SyncBatchDeliveryResult(claimed=10, delivered=10)
+        rejected = sync_worker.SyncBatchDeliveryResult(claimed=50, delivered=49, rejected=1)
+
+        self.assertEqual(
+            sync_worker.next_batch_poll_drain_remaining(full, remaining=100, batch_size=50),
+            50,
+        )
+        self.assertEqual(
+            sync_worker.next_batch_poll_drain_remaining(short, remaining=100, batch_size=50),
+            0,
+        )
+        self.assertEqual(
+            sync_worker.next_batch_poll_drain_remaining(rejected, remaining=100, batch_size=50),
+            0,
+        )
+
+
+class DeliverChangeLogBatchTests(unittest.IsolatedAsyncioTestCase):
+    async def test_fetch_batch_reads_aggregate_heads_with_one_query(self):
+        entries = [
+            SimpleNamespace(
+                id=200 + index,
+                operation="UPDATE",
+                table_name="trades",
+                record_id=index,
+                data={"id": index},
+                hash=f"hash-{index}",
+                timestamp=datetime(2026, 1, 2, 3, 4, 5),
+            )
+            for index in range(1, 4)
+        ]
+        fake_session = FakeDBSession([entries])
+
+        with patch("core.db.AsyncSessionLocal", return_value=fake_session):
+            items = await sync_worker.fetch_unsynced_change_log_batch(25)
+
+        self.assertEqual([item["change_log_id"] for item in items], [201, 202, 203])
+        self.assertEqual(len(fake_session.statements), 1)
+        compiled_query = str(fake_session.statements[0])
+        self.assertIn("EXISTS", compiled_query)
+        self.assertIn("change_log.quarantined_at IS NULL", compiled_query)
+        self.assertIn("LIMIT", compiled_query)
+
+    async def test_batch_marks_accepted_rows_and_backs_off_rejected_rows(self):
+        items = [
+            make_batch_item("offers", 5, 101),
+            make_batch_item("customer_relations", 6, 102),
+            make_batch_item("trades", 7, 103),
+        ]
+        response = FakeResponse(
+            200,
+            "{}",
+            {
+                "status": "partial",
+                "processed": 2,
+                "errors": 1,
+                "error_items": [
+                    {
+                        "table": "customer_relations",
+                        "record_id": 6,
+                        "reason": "deferred_foreign_key_dependency_missing",
+                    }
+                ],
+            },
+        )
+        send_mock = AsyncMock(return_value=response)
+        marker_mock = AsyncMock(return_value=2)
+        failure_mock = AsyncMock(return_value=None)
+
+        with patch(
+            "core.sync_worker.fetch_unsynced_change_log_batch",
+            AsyncMock(return_value=items),
+        ) as fetch_mock, patch("core.sync_worker.send_sync_batch", send_mock), patch(
+            "core.sync_worker.mark_change_log_batch_delivered", marker_mock
+        ), patch(
+            "core.sync_worker.record_change_log_delivery_failure", failure_mock
+        ):
+            result = await sync_worker.deliver_change_log_batch(
+                object(),
+                "https://peer.example",
+                "sync-key",
+                batch_size=50,
+            )
+
+        fetch_mock.assert_awaited_once_with(50)
+        send_mock.assert_awaited_once()
+        self.assertEqual(send_mock.await_args.args[1], items)
+        marker_mock.assert_awaited_once_with([items[0], items[2]])
+        failure_mock.assert_awaited_once_with(
+            items[1],
+            reason="deferred_foreign_key_dependency_missing",
+        )
+        self.assertEqual(result.claimed, 3)
+        self.assertEqual(result.delivered, 2)
+        self.assertEqual(result.rejected, 1)
+        self.assertFalse(result.clean)
+
+    async def test_unattributed_batch_leaves_rows_pending(self):
+        items = [make_batch_item("offers", 5, 101), make_batch_item("trades", 7, 103)]
+        marker_mock = AsyncMock()
+        failure_mock = AsyncMock()
+
+        with patch(
+            "core.sync_worker.fetch_unsynced_change_log_batch",
+            AsyncMock(return_value=items),
+        ), patch(
+            "core.sync_worker.send_sync_batch",
+            AsyncMock(return_value=FakeResponse(500, "boom", {"status": "error"})),
+        ), patch(
+            "core.sync_worker.mark_change_log_batch_delivered", marker_mock
+        ), patch(
+            "core.sync_worker.record_change_log_delivery_failure", failure_mock
+        ):
+            result = await sync_worker.deliver_change_log_batch(
+                object(),
+                "https://peer.example",
+                "sync-key",
+                batch_size=50,
+            )
+
+        self.assertEqual(result.claimed, 2)
+        self.assertFalse(result.attributed)
+        marker_mock.assert_not_awaited()
+        failure_mock.assert_not_awaited()
+
+    async def test_mark_batch_delivered_updates_all_ids_in_one_statement(self):
+        fake_session = FakeDBSession(None)
+        fake_session.execute = AsyncMock(return_value=SimpleNamespace(rowcount=2))
+
+        with patch("core.db.AsyncSessionLocal", return_value=fake_session):
+            marked = await sync_worker.mark_change_log_batch_delivered(
+                [{"change_log_id": 12}, {"change_log_id": 11}, {"change_log_id": "bad"}]
+            )
+
+        self.assertEqual(marked, 2)
+        fake_session.execute.assert_awaited_once()
+        statement = fake_session.execute.await_args.args[0]
+        self.assertEqual(sorted(statement.compile().params["id_1"]), [11, 12])
+        self.assertEqual(fake_session.commit_count, 1)
+
+
 class PeerResponsePolicyTests(unittest.TestCase):
     def test_terminal_source_authority_tables_share_receiver_authority_set(self):
         from api.routers.sync import IRAN_AUTHORITATIVE_SYNC_TABLES as receiver_authority_tables
@@ -653,6 +938,8 @@ class SyncWorkerMainTests(unittest.IsolatedAsyncioTestCase):
         failure_state_return_value=None,
         sync_verify_tls=True,
         sync_ca_bundle=None,
+        sync_worker_batch_size=None,
+        batch_side_effect=None,
     ):
         fake_redis = FakeRedis(blpop_results)
         fake_settings = SimpleNamespace(
@@ -663,12 +950,15 @@ class SyncWorkerMainTests(unittest.IsolatedAsyncioTestCase):
             sync_ca_bundle=sync_ca_bundle,
             environment="production",
         )
+        if sync_worker_batch_size is not None:
+            fake_settings.sync_worker_batch_size = sync_worker_batch_size
         fake_client = FakeAsyncClient()
         client_ctor = Mock(return_value=fake_client)
         send_mock = AsyncMock(side_effect=send_side_effect, return_value=send_return_value)
         marker_mock = AsyncMock(side_effect=marker_side_effect, return_value=marker_return_value)
         fetch_mock = AsyncMock(side_effect=fetch_side_effect, return_value=fetch_return_value)
         failure_state_mock = AsyncMock(return_value=failure_state_return_value)
+        batch_mock = AsyncMock(side_effect=batch_side_effect)
         sleep_mock = AsyncMock()
 
         with patch("core.sync_worker.redis.Redis", return_value=fake_redis), patch(
@@ -681,6 +971,8 @@ class SyncWorkerMainTests(unittest.IsolatedAsyncioTestCase):
             "core.sync_worker.fetch_next_unsynced_change_log_item", fetch_mock
         ), patch(
             "core.sync_worker.record_change_log_delivery_failure", failure_state_mock
+        ), patch(
+            "core.sync_worker.deliver_change_log_batch", batch_mock
         ), patch(
             "core.sync_worker.asyncio.sleep", sleep_mock
         ):
@@ -688,6 +980,7 @@ class SyncWorkerMainTests(unittest.IsolatedAsyncioTestCase):
                 await sync_worker.main()
 
         self.fetch_mock = fetch_mock
+        self.batch_mock = batch_mock
         self.failure_state_mock = failure_state_mock
         self.client_ctor = client_ctor
         return fake_redis, send_mock, sleep_mock, marker_mock
@@ -1282,6 +1575,50 @@ class SyncWorkerMainTests(unittest.IsolatedAsyncioTestCase):
         )
         sleep_mock.assert_awaited_once_with(1)
 
+    async def test_main_batch_mode_drains_backlog_in_batches(self):
+        fake_redis, send_mock, sleep_mock, marker_mock = await self._run_main_once(
+            blpop_results=[None, asyncio.CancelledError()],
+            sync_worker_batch_size=40,
+            batch_side_effect=[
+                sync_worker.SyncBatchDeliveryResult(claimed=40, delivered=40),
+                sync_worker.SyncBatchDeliveryResult(claimed=40, delivered=40),
+                sync_worker.SyncBatchDeliveryResult(claimed=7, delivered=7),
+            ],
+        )
+
+        self.assertEqual(self.batch_mock.await_count, 3)
+        self.assertEqual(
+            [call.kwargs["batch_size"] for call in self.batch_mock.await_args_list],
+            [40, 40, 40],
+        )
+        self.assertEqual(self.batch_mock.await_args_list[0].args[1], "https://peer.example")
+        send_mock.assert_not_awaited()
+        self.fetch_mock.assert_not_awaited()
+        self.assertEqual(len(fake_redis.blpop_calls), 2)
+        sleep_mock.assert_not_awaited()
+
+    async def test_main_batch_mode_replays_unattributed_rows_one_by_one(self):
+        item = make_batch_item("offers", 5, 101)
+        response = FakeResponse(
+            200,
+            '{"status":"success","processed":1,"errors":0}',
+            {"status": "success", "processed": 1, "errors": 0},
+        )
+
+        fake_redis, send_mock, sleep_mock, marker_mock = await self._run_main_once(
+            blpop_results=[None, None, asyncio.CancelledError()],
+            sync_worker_batch_size=40,
+            batch_side_effect=[sync_worker.SyncBatchDeliveryResult(claimed=2, attributed=False)],
+            fetch_side_effect=[item, None],
+            send_return_value=response,
+        )
+
+        self.batch_mock.assert_awaited_once()
+        sleep_mock.assert_awaited_once_with(1)
+        send_mock.assert_awaited_once()
+        marker_mock.assert_awaited_once_with(item)
+        self.assertEqual(self.fetch_mock.await_count, 2)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -50,6 +50,7 @@ from core.telegram_delivery_market_freshness import (
     validate_market_telegram_delivery_freshness,
 )
 from core.telegram_delivery_offer_freshness import (
+    build_authoritative_offer_delivery_payload,
     telegram_channel_destination_key,
     validate_offer_telegram_delivery_freshness,
 )
@@ -68,6 +69,7 @@ from core.services.telegram_delivery_queue_service import (
     TelegramDeliveryQueueSurfaceError,
     apply_telegram_delivery_freshness_result as _apply_telegram_delivery_freshness_result,
     claim_next_telegram_delivery_job,
+    claim_telegram_delivery_jobs,
     defer_unstarted_telegram_delivery_lease,
     enqueue_telegram_delivery_job,
     mark_telegram_delivery_dispatch_started as _mark_telegram_delivery_dispatch_started,
@@ -75,6 +77,7 @@ from core.services.telegram_delivery_queue_service import (
     record_telegram_delivery_provider_outcome,
     record_telegram_provider_outcome_apply_failure,
     recover_expired_telegram_delivery_leases,
+    renew_unstarted_telegram_delivery_leases,
     resolve_telegram_delivery_result as _resolve_telegram_delivery_result,
 )
 from core.services.telegram_delivery_reconciliation_service import (
@@ -307,7 +310,7 @@ def _run_alembic(sync_url: str, *args: str) -> None:
     env["DATABASE_URL"] = sync_url
     env["TRADING_BOT_MIGRATION_MODE"] = "scratch"
     env["TRADING_BOT_EXPECTED_CHECKOUT"] = os.getcwd()
-    env["TRADING_BOT_EXPECTED_ALEMBIC_HEAD"] = "ff5a6b7c8d9e"
+    env["TRADING_BOT_EXPECTED_ALEMBIC_HEAD"] = "1b2c3d4e5f6a"
     result = subprocess.run(
         [sys.executable, "scripts/run_guarded_scratch_alembic.py", *args],
         capture_output=True,
@@ -2198,6 +2201,116 @@ class TelegramDeliveryQueuePostgresTests(unittest.IsolatedAsyncioTestCase):
             await first.commit()
             await second.commit()
 
+    async def test_batch_claim_leases_one_job_per_destination_in_fairness_order(self):
+        now = utc_now()
+        await self._enqueue("batch-general-a1", destination="private:batch-a")
+        await self._enqueue("batch-general-a2", destination="private:batch-a")
+        await self._enqueue(
+            "batch-callback-b",
+            action=TelegramDeliveryAction.CALLBACK_DEADLINE,
+            method="answerCallbackQuery",
+            payload={"callback_query_id": "batch-callback"},
+            destination="private:batch-b",
+            deadline=now + timedelta(seconds=2),
+        )
+        await self._enqueue("batch-general-c", destination="private:batch-c")
+
+        async with self.Session() as first, self.Session() as second:
+            batch = await claim_telegram_delivery_jobs(
+                first,
+                current_server="foreign",
+                bot_identity="primary",
+                worker_id="batch-worker",
+                request_timeout_seconds=10,
+                lease_seconds=30,
+                max_jobs=10,
+                now=now,
+            )
+            concurrent = await claim_telegram_delivery_jobs(
+                second,
+                current_server="foreign",
+                bot_identity="primary",
+                worker_id="batch-worker-concurrent",
+                request_timeout_seconds=10,
+                lease_seconds=30,
+                max_jobs=10,
+                now=now,
+            )
+            await first.commit()
+            await second.commit()
+
+        self.assertEqual(
+            [job.source_natural_id for job in batch],
+            ["batch-callback-b", "batch-general-a1", "batch-general-c"],
+        )
+        self.assertTrue(all(job.state == TelegramDeliveryState.LEASED for job in batch))
+        self.assertEqual({job.lease_until for job in batch}, {batch[0].lease_until})
+        self.assertNotIn(
+            "batch-general-a2", [job.source_natural_id for job in concurrent]
+        )
+        follow_up = await self._claim("batch-follow-up", now=now)
+        self.assertEqual(follow_up.source_natural_id, "batch-general-a2")
+
+        async with self.Session() as db:
+            with self.assertRaisesRegex(
+                TelegramDeliveryQueueValidationError, "claim_batch_size_invalid"
+            ):
+                await claim_telegram_delivery_jobs(
+                    db,
+                    current_server="foreign",
+                    bot_identity="primary",
+                    worker_id="batch-worker",
+                    request_timeout_seconds=10,
+                    lease_seconds=30,
+                    max_jobs=0,
+                )
+
+    async def test_renewal_extends_only_live_unstarted_leases_of_the_same_worker(self):
+        now = utc_now()
+        await self._enqueue("renew-a", destination="private:renew-a")
+        await self._enqueue("renew-b", destination="private:renew-b")
+        async with self.Session() as db:
+            batch = await claim_telegram_delivery_jobs(
+                db,
+                current_server="foreign",
+                bot_identity="primary",
+                worker_id="renew-worker",
+                request_timeout_seconds=10,
+                lease_seconds=30,
+                max_jobs=2,
+                now=now,
+            )
+            await db.commit()
+        first, second = batch
+
+        later = now + timedelta(seconds=20)
+        async with self.Session() as db:
+            renewed = await renew_unstarted_telegram_delivery_leases(
+                db,
+                current_server="foreign",
+                leases=[(first.id, first.lease_token), (second.id, second.lease_token + 1)],
+                worker_id="renew-worker",
+                request_timeout_seconds=10,
+                lease_seconds=30,
+                now=later,
+            )
+            await db.commit()
+        self.assertEqual(renewed, {first.id})
+
+        async with self.Session() as db:
+            refreshed = {
+                record.id: record.lease_until
+                for record in (
+                    await db.execute(
+                        select(TelegramDeliveryJobRecord).where(
+                            TelegramDeliveryJobRecord.id.in_([first.id, second.id])
+                        )
+                    )
+                ).scalars()
+            }
+        self.assertEqual(refreshed[first.id], later + timedelta(seconds=30))
+        self.assertEqual(refreshed[second.id], now + timedelta(seconds=30))
+
     async def test_fencing_rejects_old_worker_result_after_lease_recovery(self):
         await self._enqueue("fencing")
         started = utc_now()
@@ -4119,6 +4232,99 @@ class TelegramDeliveryQueuePostgresTests(unittest.IsolatedAsyncioTestCase):
             TelegramDeliveryAction.PARTIAL_OFFER_EDIT,
         )
 
+    async def test_rapid_offer_edits_coalesce_to_the_final_render(self):
+        public_id = "ofr_stage3_coalesce_pg"
+        commodity_name = "stage3-coalesce-commodity"
+        channel_id = -100123456702
+        await self._reset_authoritative_fixture(
+            (
+                "DELETE FROM offer_publication_states WHERE offer_public_id = :public_id",
+                {"public_id": public_id},
+            ),
+            (
+                "DELETE FROM offers WHERE offer_public_id = :public_id",
+                {"public_id": public_id},
+            ),
+            ("DELETE FROM commodities WHERE name = :name", {"name": commodity_name}),
+        )
+        async with self.Session() as db:
+            commodity = Commodity(name=commodity_name)
+            db.add(commodity)
+            await db.flush()
+            offer = Offer(
+                offer_public_id=public_id,
+                home_server="foreign",
+                offer_type=OfferType.SELL,
+                settlement_type=SettlementType.CASH,
+                commodity_id=commodity.id,
+                commodity=commodity,
+                quantity=10,
+                remaining_quantity=10,
+                price=72_500_000,
+                is_wholesale=True,
+                status=OfferStatus.ACTIVE,
+            )
+            db.add(offer)
+            await db.flush()
+            state = build_offer_publication_state(
+                offer,
+                OfferPublicationSurface.TELEGRAM_CHANNEL,
+                status=OfferPublicationStatus.SENT,
+            )
+            state.surface_resource_id = "901"
+            state.telegram_chat_id = channel_id
+            state.telegram_message_id = 901
+            state.offer_version_id = offer.version_id
+            db.add(state)
+            await db.flush()
+
+            results = []
+            for remaining in (8, 5, 3):
+                offer.remaining_quantity = remaining
+                await db.flush()
+                results.append(
+                    await enqueue_current_offer_delivery(
+                        db,
+                        current_server="foreign",
+                        offer=offer,
+                        state=state,
+                        expected_channel_id=channel_id,
+                        offer_expiry_minutes=2,
+                    )
+                )
+            final_version = offer.version_id
+            final_payload = build_authoritative_offer_delivery_payload(
+                offer,
+                action=TelegramDeliveryAction.PARTIAL_OFFER_EDIT,
+                expected_channel_id=channel_id,
+                message_id=901,
+            )
+            await db.commit()
+
+        self.assertEqual([result.coalesced_edits for result in results], [0, 1, 1])
+        async with self.Session() as db:
+            jobs = list(
+                (
+                    await db.execute(
+                        select(TelegramDeliveryJobRecord)
+                        .where(TelegramDeliveryJobRecord.source_natural_id == public_id)
+                        .order_by(TelegramDeliveryJobRecord.source_version)
+                    )
+                ).scalars()
+            )
+        self.assertEqual(
+            [job.state for job in jobs],
+            [
+                TelegramDeliveryState.SUPERSEDED,
+                TelegramDeliveryState.SUPERSEDED,
+                TelegramDeliveryState.PENDING,
+            ],
+        )
+        claimed = await self._claim("coalesced-edit-worker")
+        self.assertEqual(claimed.source_version, final_version)
+        self.assertEqual(claimed.payload["text"], final_payload["text"])
+        self.assertIsNone(await self._claim("coalesced-edit-worker-2"))
+
     async def test_dispatch_marker_refuses_iran_surface(self):
         await self._enqueue("foreign-only-marker")
         job = await self._claim("worker-foreign", now=utc_now())
@@ -1,4 +1,5 @@
 import asyncio
+from collections import deque
 from types import SimpleNamespace
 import unittest
 from unittest.mock import ANY, AsyncMock, MagicMock, call, patch
@@ -280,8 +281,8 @@ class TelegramDeliveryQueueWorkerSafetyTests(unittest.IsolatedAsyncioTestCase):
             "core.telegram_delivery_queue_worker.AsyncSessionLocal",
             return_value=session_context,
         ), patch(
-            "core.telegram_delivery_queue_worker.claim_next_telegram_delivery_job",
-            new=AsyncMock(return_value=job),
+            "core.telegram_delivery_queue_worker.claim_telegram_delivery_jobs",
+            new=AsyncMock(return_value=[job]),
         ), patch(
             "core.telegram_delivery_queue_worker.apply_telegram_delivery_freshness_result",
             new=AsyncMock(return_value=True),
@@ -651,7 +652,7 @@ class TelegramDeliveryQueueWorkerSafetyTests(unittest.IsolatedAsyncioTestCase):
             ), patch(
                 "core.telegram_delivery_queue_worker.assert_background_job_authority"
             ), patch(
-                "core.telegram_delivery_queue_worker.claim_next_telegram_delivery_job",
+                "core.telegram_delivery_queue_worker.claim_telegram_delivery_jobs",
                 new=AsyncMock(),
             ) as claim, patch(
                 "core.telegram_delivery_queue_worker.recover_expired_telegram_delivery_leases",
@@ -714,8 +715,8 @@ class TelegramDeliveryQueueWorkerSafetyTests(unittest.IsolatedAsyncioTestCase):
             "core.telegram_delivery_queue_worker.AsyncSessionLocal",
             return_value=context,
         ), patch(
-            "core.telegram_delivery_queue_worker.claim_next_telegram_delivery_job",
-            new=AsyncMock(return_value=job),
+            "core.telegram_delivery_queue_worker.claim_telegram_delivery_jobs",
+            new=AsyncMock(return_value=[job]),
         ), patch(
             "core.telegram_delivery_queue_worker.apply_telegram_delivery_freshness_result",
             side_effect=apply_freshness,
@@ -753,6 +754,67 @@ class TelegramDeliveryQueueWorkerSafetyTests(unittest.IsolatedAsyncioTestCase):
         gateway.assert_not_awaited()
         self.assertFalse(worker._provider_dispatch_entries)
 
+    async def test_claim_batch_renews_waiting_leases_and_drops_lost_ones(self):
+        jobs = [
+            SimpleNamespace(id=996 + offset, lease_token=3, destination_key=f"chat:{offset}")
+            for offset in range(3)
+        ]
+        context = MagicMock()
+        context.__aenter__ = AsyncMock(return_value=AsyncMock())
+        context.__aexit__ = AsyncMock(return_value=False)
+        claim = AsyncMock(side_effect=[jobs, []])
+        # Job 997's lease lapsed while 996 was being sent.
+        renew = AsyncMock(return_value={998})
+        leased = deque()
+        claim_kwargs = {
+            "lane_identity": "primary",
+            "worker_id": "slot-1",
+            "max_jobs": 3,
+            "allowed_destination_classes": None,
+            "maximum_effective_priority": None,
+        }
+
+        with patch(
+            "core.telegram_delivery_queue_worker.AsyncSessionLocal",
+            return_value=context,
+        ), patch(
+            "core.telegram_delivery_queue_worker.claim_telegram_delivery_jobs",
+            new=claim,
+        ), patch(
+            "core.telegram_delivery_queue_worker.renew_unstarted_telegram_delivery_leases",
+            new=renew,
+        ):
+            first = await worker._next_leased_job(leased, **claim_kwargs)
+            renew.assert_not_awaited()
+            second = await worker._next_leased_job(leased, **claim_kwargs)
+            third = await worker._next_leased_job(leased, **claim_kwargs)
+
+        self.assertEqual((first.id, second.id, third), (996, 998, None))
+        self.assertEqual(claim.await_count, 2)
+        self.assertEqual(claim.await_args_list[0].kwargs["max_jobs"], 3)
+        renew.assert_awaited_once()
+        self.assertEqual(renew.await_args.kwargs["leases"], [(997, 3), (998, 3)])
+        self.assertEqual(renew.await_args.kwargs["worker_id"], "slot-1")
+
+    async def test_unreached_claims_are_handed_back_without_an_error(self):
+        leased = deque([SimpleNamespace(id=999, lease_token=4)])
+        defer = AsyncMock(return_value=True)
+
+        with patch(
+            "core.telegram_delivery_queue_worker._defer_for_dispatch_limit",
+            new=defer,
+        ):
+            await worker._return_unreached_claims(leased, worker_id="slot-1")
+
+        self.assertFalse(leased)
+        defer.assert_awaited_once_with(
+            job_id=999,
+            worker_id="slot-1",
+            lease_token=4,
+            retry_seconds=0.001,
+            reason="claim_batch_unreached",
+        )
+
     async def test_dispatch_freshness_change_is_deferred_without_provider_error(self):
         job = SimpleNamespace(
             id=994,
@@ -783,8 +845,8 @@ class TelegramDeliveryQueueWorkerSafetyTests(unittest.IsolatedAsyncioTestCase):
             "core.telegram_delivery_queue_worker.AsyncSessionLocal",
             return_value=context,
         ), patch(
-            "core.telegram_delivery_queue_worker.claim_next_telegram_delivery_job",
-            new=AsyncMock(return_value=job),
+            "core.telegram_delivery_queue_worker.claim_telegram_delivery_jobs",
+            new=AsyncMock(return_value=[job]),
         ), patch(
             "core.telegram_delivery_queue_worker.apply_telegram_delivery_freshness_result",
             new=AsyncMock(return_value=True),
@@ -861,8 +923,8 @@ class TelegramDeliveryQueueWorkerSafetyTests(unittest.IsolatedAsyncioTestCase):
             "core.telegram_delivery_queue_worker.AsyncSessionLocal",
             return_value=context,
         ), patch(
-            "core.telegram_delivery_queue_worker.claim_next_telegram_delivery_job",
-            new=AsyncMock(return_value=job),
+            "core.telegram_delivery_queue_worker.claim_telegram_delivery_jobs",
+            new=AsyncMock(return_value=[job]),
         ), patch(
             "core.telegram_delivery_queue_worker.apply_telegram_delivery_freshness_result",
             new=AsyncMock(return_value=True),
@@ -1040,8 +1102,8 @@ class TelegramDeliveryQueueWorkerSafetyTests(unittest.IsolatedAsyncioTestCase):
             "core.telegram_delivery_queue_worker.AsyncSessionLocal",
             return_value=session_context,
         ), patch(
-            "core.telegram_delivery_queue_worker.claim_next_telegram_delivery_job",
-            new=AsyncMock(return_value=job),
+            "core.telegram_delivery_queue_worker.claim_telegram_delivery_jobs",
+            new=AsyncMock(return_value=[job]),
         ), patch(
             "core.telegram_delivery_queue_worker.apply_telegram_delivery_freshness_result",
             new=AsyncMock(return_value=True),
@@ -3,7 +3,7 @@ import base64
 import hashlib
 from pathlib import Path
 from types import SimpleNamespace
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import httpx
 
@@ -176,26 +176,71 @@ class TelegramGatewayPolicyTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(result.transport_phase, "pre_write")
         client_ctor.assert_not_called()
 
-    async def test_response_survives_client_close_error_after_provider_reply(self):
-        client = FakeAsyncClientContext(
-            response=FakeResponse(),
-            exit_error=RuntimeError("synthetic close failure"),
-        )
-        with patch("core.telegram_gateway.current_server", return_value="foreign"), patch(
-            "core.telegram_gateway.httpx.AsyncClient",
-            return_value=client,
-        ):
-            result = await telegram_gateway.send_message(
-                9,
-                "hello",
+    async def test_async_gateway_reuses_one_pooled_client_per_identity_and_token(self):
+        client = FakeAsyncClientContext(response=FakeResponse())
+        registry = telegram_gateway.TelegramHttpClientRegistry()
+        registry.configure_identity("publisher_1", max_connections=5)
+        with patch("core.telegram_gateway.current_server", return_value="foreign"), patch.object(
+            telegram_gateway, "telegram_http_clients", registry
+        ), patch("core.telegram_gateway.httpx.AsyncClient", return_value=client) as client_ctor:
+            for _ in range(3):
+                result = await telegram_gateway.post_telegram_method(
+                    "sendMessage",
+                    {"chat_id": 9, "text": "hello"},
+                    bot_token="token",
+                    bot_identity="publisher_1",
+                )
+                self.assertTrue(result.ok)
+            await telegram_gateway.post_telegram_method(
+                "sendMessage",
+                {"chat_id": 9, "text": "hello"},
                 bot_token="token",
             )
 
-        self.assertTrue(result.ok)
-        self.assertEqual(result.message_id, 42)
-        self.assertEqual(result.status_code, 200)
-        self.assertEqual(result.error, "RuntimeError")
-        self.assertEqual(result.transport_phase, "response_received")
+        self.assertEqual(client.post.await_count, 4)
+        self.assertEqual(client_ctor.call_count, 2)
+        transport = client_ctor.call_args_list[0].kwargs["transport"]
+        self.assertIsInstance(transport, telegram_gateway._TracingAsyncTransport)
+        self.assertEqual(transport.bot_identity, "publisher_1")
+        self.assertEqual(client_ctor.call_args_list[1].kwargs["transport"].bot_identity, "default")
+        self.assertEqual(registry.connection_limit("publisher_1"), 5)
+
+    async def test_request_trace_records_connect_tls_and_server_phases(self):
+        trace = telegram_gateway._TelegramRequestTrace("primary")
+        with patch("core.telegram_gateway.time.perf_counter", side_effect=[1.0, 1.01, 1.01, 1.03, 1.03, 1.2]), patch(
+            "core.telegram_gateway.observe_telegram_http_phase"
+        ) as observe:
+            for event_name in (
+                "connection.connect_tcp.started",
+                "connection.connect_tcp.complete",
+                "connection.start_tls.started",
+                "connection.start_tls.complete",
+                "http11.send_request_headers.started",
+                "http11.receive_response_headers.complete",
+            ):
+                await trace.async_callback(event_name, {})
+
+        phases = {call.kwargs["phase"]: round(call.kwargs["duration_ms"]) for call in observe.call_args_list}
+        self.assertEqual(phases, {"connect": 10, "tls": 20, "server": 170})
+        self.assertEqual({call.kwargs["bot_identity"] for call in observe.call_args_list}, {"primary"})
+
+    async def test_close_hook_closes_pooled_clients_and_tolerates_close_errors(self):
+        client = FakeAsyncClientContext(response=FakeResponse())
+        client.aclose = AsyncMock(side_effect=RuntimeError("synthetic close failure"))
+        sync_client = SimpleNamespace(post=Mock(return_value=FakeResponse()), close=Mock())
+        registry = telegram_gateway.TelegramHttpClientRegistry()
+        with patch("core.telegram_gateway.current_server", return_value="foreign"), patch.object(
+            telegram_gateway, "telegram_http_clients", registry
+        ), patch("core.telegram_gateway.httpx.AsyncClient", return_value=client), patch(
+            "core.telegram_gateway.httpx.Client", return_value=sync_client
+        ):
+            await telegram_gateway.send_message(9, "hello", bot_token="token")
+            telegram_gateway.send_message_sync(9, "hello", bot_token="token")
+            await telegram_gateway.close_telegram_http_clients()
+
+        client.aclose.assert_awaited_once()
+        sync_client.close.assert_called_once()
+        self.assertEqual(registry._sync_clients, {})
 
     async def test_transport_failures_record_prewrite_vs_unknown_write(self):
         for error, expected in (
@@ -253,10 +298,11 @@ class TelegramGatewayPolicyTests(unittest.IsolatedAsyncioTestCase):
     def test_sync_gateway_delegates_to_telegram_http_client(self):
         response = SimpleNamespace(status_code=200, text="", json=lambda: {"ok": True})
 
+        http_post = Mock(return_value=response)
         with patch("core.telegram_gateway.current_server", return_value="foreign"), patch(
-            "core.telegram_gateway.httpx.post",
-            return_value=response,
-        ) as http_post:
+            "core.telegram_gateway.httpx.Client",
+            return_value=SimpleNamespace(post=http_post),
+        ):
             result = telegram_gateway.send_message_sync(
                 9,
                 "hello",
@@ -276,10 +322,11 @@ class TelegramGatewayPolicyTests(unittest.IsolatedAsyncioTestCase):
     def test_sync_gateway_omits_none_optional_fields_only_at_http_boundary(self):
         response = SimpleNamespace(status_code=200, text="", json=lambda: {"ok": True})
 
+        http_post = Mock(return_value=response)
         with patch("core.telegram_gateway.current_server", return_value="foreign"), patch(
-            "core.telegram_gateway.httpx.post",
-            return_value=response,
-        ) as http_post:
+            "core.telegram_gateway.httpx.Client",
+            return_value=SimpleNamespace(post=http_post),
+        ):
             result = telegram_gateway.post_telegram_method_sync(
                 "sendMessage",
                 {
@@ -305,10 +352,11 @@ class TelegramGatewayPolicyTests(unittest.IsolatedAsyncioTestCase):
     def test_sync_document_gateway_uses_verified_multipart(self):
         document = b"sync-report"
         response = SimpleNamespace(status_code=200, text="", json=lambda: {"ok": True})
+        http_post = Mock(return_value=response)
         with patch("core.telegram_gateway.current_server", return_value="foreign"), patch(
-            "core.telegram_gateway.httpx.post",
-            return_value=response,
-        ) as http_post:
+            "core.telegram_gateway.httpx.Client",
+            return_value=SimpleNamespace(post=http_post),
+        ):
             result = telegram_gateway.post_telegram_method_sync(
                 "sendDocument",
                 {
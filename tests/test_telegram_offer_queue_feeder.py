@@ -69,10 +69,12 @@ class TelegramOfferQueueFeederTests(unittest.IsolatedAsyncioTestCase):
             SimpleNamespace(
                 queue_result=SimpleNamespace(created=True),
                 skipped_reason=None,
+                coalesced_edits=0,
             ),
             SimpleNamespace(
                 queue_result=SimpleNamespace(created=False),
                 skipped_reason=None,
+                coalesced_edits=2,
             ),
         ]
         with patch.object(
@@ -118,13 +120,18 @@ class TelegramOfferQueueFeederTests(unittest.IsolatedAsyncioTestCase):
             feeder,
             "enqueue_offer_lifecycle_channel_handoffs",
             new=AsyncMock(return_value=[]),
-        ) as lifecycle_enqueue:
+        ) as lifecycle_enqueue, patch.object(
+            feeder,
+            "record_telegram_offer_edits_coalesced",
+        ) as record_coalesced:
             report = await feeder.run_telegram_offer_queue_handoff_cycle()
 
         self.assertEqual(report.publication_handoffs, 1)
         self.assertEqual(report.edit_handoffs, 0)
         self.assertEqual(report.lifecycle_handoffs, 0)
         self.assertEqual(report.deduplicated, 1)
+        self.assertEqual(report.coalesced_edits, 2)
+        record_coalesced.assert_called_once_with(2)
         self.assertFalse(report.publication_gated)
         self.assertEqual(enqueue.await_count, 2)
         lifecycle_enqueue.assert_awaited_once()
@@ -195,6 +202,7 @@ class TelegramOfferQueueFeederTests(unittest.IsolatedAsyncioTestCase):
                 return_value=SimpleNamespace(
                     queue_result=SimpleNamespace(created=True),
                     skipped_reason=None,
+                    coalesced_edits=0,
                 )
             ),
         ), patch.object(
@@ -225,6 +233,7 @@ class TelegramOfferQueueFeederTests(unittest.IsolatedAsyncioTestCase):
                 SimpleNamespace(
                     queue_result=SimpleNamespace(created=True),
                     skipped_reason=None,
+                    coalesced_edits=0,
                 ),
             ]
         )
@@ -242,11 +251,41 @@ class TelegramOfferQueueFeederTests(unittest.IsolatedAsyncioTestCase):
                 now=self.database_now,
             )
 
-        self.assertEqual(counts, (1, 0, 0, 1))
+        self.assertEqual(counts, (1, 0, 0, 1, 0))
         session.commit.assert_awaited_once()
         session.rollback.assert_not_awaited()
         self.assertEqual(session.savepoint_entries, 2)
 
+    async def test_lifecycle_handoffs_report_coalesced_edits(self):
+        session = FakeSession()
+        results = [
+            SimpleNamespace(
+                queue_result=SimpleNamespace(created=True),
+                skipped_reason=None,
+                coalesced_edits=1,
+            ),
+            SimpleNamespace(
+                queue_result=None,
+                skipped_reason="offer_not_publishable_and_never_published",
+                coalesced_edits=2,
+            ),
+        ]
+
+        with patch.object(
+            feeder,
+            "enqueue_offer_lifecycle_channel_handoffs",
+            new=AsyncMock(return_value=results),
+        ):
+            counts = await feeder._handoff_lifecycle_candidates(
+                session,
+                expected_channel_id=-100,
+                offer_expiry_minutes=2,
+                now=self.database_now,
+            )
+
+        self.assertEqual(counts, (1, 0, 1, 0, 3))
+        session.commit.assert_awaited_once()
+
     def test_runtime_owner_guard_rejects_legacy(self):
         runtime = SimpleNamespace(
             mode=TelegramDeliveryRuntimeMode.LEGACY,
@@ -307,6 +307,104 @@ class TelegramOfferQueueServiceTests(unittest.IsolatedAsyncioTestCase):
         self.assertIn("telegram_delivery_jobs.action_kind IN ('offer_publish')", sql)
         self.assertIn("telegram_delivery_jobs.state NOT IN", sql)
 
+    async def test_superseded_edits_are_counted_and_lifecycle_rerender_coalesces(self):
+        now = utc_now()
+        rows = [
+            SimpleNamespace(
+                source_version=2,
+                action_kind=TelegramDeliveryAction.OFFER_PUBLISH,
+                state="pending",
+            ),
+            SimpleNamespace(
+                source_version=2,
+                action_kind=TelegramDeliveryAction.PARTIAL_OFFER_EDIT,
+                state="pending_retry",
+            ),
+            SimpleNamespace(
+                source_version=3,
+                action_kind=TelegramDeliveryAction.OTHER_ACTIVE_OFFER_EDIT,
+                state="pending",
+            ),
+        ]
+        db = SimpleNamespace(
+            execute=AsyncMock(return_value=SimpleNamespace(scalars=lambda: rows)),
+        )
+
+        saved = await service._supersede_obsolete_offer_jobs(
+            db,
+            offer_public_id="ofr_queue_10",
+            source_version=3,
+            now=now,
+            rerender_action=TelegramDeliveryAction.OVERTIME_CHANNEL_EDIT,
+        )
+
+        self.assertEqual(saved, 2)
+        self.assertEqual(
+            [row.outcome_reason for row in rows],
+            [
+                "offer_queue_newer_source_version",
+                "offer_queue_newer_source_version",
+                "offer_queue_newer_render",
+            ],
+        )
+        self.assertTrue(all(row.terminal_at == now for row in rows))
+        sql = str(
+            db.execute.await_args.args[0].compile(
+                dialect=postgresql.dialect(),
+                compile_kwargs={"literal_binds": True},
+            )
+        )
+        self.assertIn("telegram_delivery_jobs.dispatch_started_at IS NULL", sql)
+        same_version = sql.split("source_version = 3 AND", 1)[1].split(")", 1)[0]
+        self.assertIn("'other_active_offer_edit'", same_version)
+        self.assertNotIn("'overtime_channel_edit'", same_version)
+        self.assertNotIn("'invalid_action_button_edit'", same_version)
+        self.assertNotIn("'offer_publish'", same_version)
+        self.assertNotIn("'expired_offer_edit'", same_version)
+
+    async def test_only_lifecycle_edits_rerender_the_same_source_version(self):
+        supersede = AsyncMock(return_value=4)
+        enqueue = AsyncMock(
+            return_value=SimpleNamespace(created=True, job=SimpleNamespace(id=5))
+        )
+        with patch.object(
+            service,
+            "enqueue_telegram_delivery_job",
+            new=enqueue,
+        ), patch.object(
+            service,
+            "_supersede_obsolete_offer_jobs",
+            new=supersede,
+        ), patch.object(
+            service,
+            "_offer_edit_first_enqueued_at",
+            new=AsyncMock(return_value=utc_now()),
+        ):
+            lifecycle = await service.enqueue_current_offer_delivery(
+                object(),
+                current_server="foreign",
+                offer=make_offer(remaining_quantity=10),
+                state=make_state(),
+                expected_channel_id=-1001234567890,
+                offer_expiry_minutes=2,
+                action=TelegramDeliveryAction.FINAL_TAIL_CHANNEL_EDIT,
+            )
+            plain = await service.enqueue_current_offer_delivery(
+                object(),
+                current_server="foreign",
+                offer=make_offer(remaining_quantity=10),
+                state=make_state(),
+                expected_channel_id=-1001234567890,
+                offer_expiry_minutes=2,
+            )
+
+        self.assertEqual(
+            [call.kwargs["rerender_action"] for call in supersede.await_args_list],
+            [TelegramDeliveryAction.FINAL_TAIL_CHANNEL_EDIT, None],
+        )
+        self.assertEqual(lifecycle.coalesced_edits, 4)
+        self.assertEqual(plain.coalesced_edits, 4)
+
     async def test_edit_success_counter_is_capped_and_stale_success_resets_rank(self):
         now = utc_now()
         feeder_state = SimpleNamespace(
@@ -744,14 +744,14 @@ class TradesRouterHelperTests(unittest.IsolatedAsyncioTestCase):
             self.assertFalse(trades.send_telegram_message_sync(1, "hello"))
 
         with patch("api.routers.trades.os.getenv", return_value="token"), patch(
-            "core.telegram_gateway.httpx.post",
-            return_value=SimpleNamespace(status_code=200),
+            "core.telegram_gateway.httpx.Client",
+            return_value=SimpleNamespace(post=Mock(return_value=SimpleNamespace(status_code=200))),
         ):
             self.assertTrue(trades.send_telegram_message_sync(1, "hello"))
 
         with patch("api.routers.trades.os.getenv", return_value="token"), patch(
-            "core.telegram_gateway.httpx.post",
-            side_effect=RuntimeError("telegram down"),
+            "core.telegram_gateway.httpx.Client",
+            return_value=SimpleNamespace(post=Mock(side_effect=RuntimeError("telegram down"))),
         ), patch.object(trades, "logger") as logger:
             self.assertFalse(trades.send_telegram_message_sync(1, "hello"))
         logger.error.assert_called_once()
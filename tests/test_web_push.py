@@ -1,5 +1,7 @@
 import unittest
 import asyncio
+import threading
+import time
 from datetime import datetime
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock, patch
@@ -20,6 +22,21 @@ class FakeAsyncSessionContext:
         return False
 
 
+class FakeVapidSigner:
+    def headers_for(self, endpoint):
+        return {"Authorization": f"vapid t={endpoint.split('/')[2]}"}
+
+
+def push_target(subscription_id, user_id=None, host="push.example.test"):
+    return web_push.WebPushTarget(
+        subscription_id=subscription_id,
+        user_id=user_id or subscription_id,
+        endpoint=f"https://{host}/subscription/{subscription_id}",
+        p256dh="p256dh",
+        auth="auth",
+    )
+
+
 class WebPushHelpersTests(unittest.IsolatedAsyncioTestCase):
     def test_endpoint_hash_is_stable_and_non_plaintext(self):
         endpoint = "https://push.example.test/subscription/abc"
@@ -94,11 +111,17 @@ class WebPushHelpersTests(unittest.IsolatedAsyncioTestCase):
             web_push.settings, "web_push_ttl_seconds", 60
         ), patch.object(web_push.settings, "web_push_timeout_seconds", 3.0), patch.object(
             web_push, "webpush", Mock()
-        ), patch.object(web_push.asyncio, "to_thread", new=AsyncMock()) as to_thread_mock:
+        ), patch.object(
+            web_push, "get_web_push_vapid_signer", return_value=FakeVapidSigner()
+        ), patch.object(web_push, "_post_web_push") as post_mock:
             result = await web_push.send_web_push_to_user(db, 7, {"title": "x"})
 
         self.assertEqual(result, {"total": 1, "sent": 1, "failed": 0, "disabled": 0})
-        to_thread_mock.assert_awaited_once()
+        post_mock.assert_called_once()
+        _session, subscription_info, _data, headers, ttl, timeout = post_mock.call_args.args
+        self.assertEqual(subscription_info["endpoint"], subscription.endpoint)
+        self.assertEqual(headers, {"Authorization": "vapid t=push.example.test"})
+        self.assertEqual((ttl, timeout), (60, 3.0))
         db.commit.assert_awaited_once()
         self.assertEqual(subscription.failure_count, 0)
         self.assertIsNone(subscription.last_error)
@@ -284,7 +307,7 @@ class WebPushHelpersTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(info_mock.call_args.kwargs["extra"]["reason"], "not_first_live_offer")
         self.assertEqual(info_mock.call_args.kwargs["extra"]["offer_id"], 42)
 
-    async def test_market_offer_push_logs_delivery_summary(self):
+    async def test_market_offer_push_fans_out_once_and_logs_delivery_summary(self):
         offer = SimpleNamespace(
             id=42,
             user_id=1,
@@ -305,25 +328,39 @@ class WebPushHelpersTests(unittest.IsolatedAsyncioTestCase):
             async def execute(self, _stmt):
                 return FakeExecuteResult()
 
+        targets = [push_target(1, user_id=2), push_target(2, user_id=3), push_target(3, user_id=3)]
+        report = web_push.WebPushFanoutReport(
+            outcomes=(
+                web_push.WebPushOutcome(subscription_id=1, user_id=2, latency_ms=10.0),
+                web_push.WebPushOutcome(subscription_id=2, user_id=3, latency_ms=30.0),
+                web_push.WebPushOutcome(subscription_id=3, user_id=3, latency_ms=20.0, status_code=410, error="gone"),
+            ),
+            duration_seconds=0.5,
+        )
         with patch.object(web_push, "is_web_push_configured", return_value=True), patch(
             "core.db.AsyncSessionLocal",
-            return_value=FakeAsyncSessionContext(FakeDB()),
-        ), patch.object(
+            side_effect=lambda: FakeAsyncSessionContext(FakeDB()),
+        ) as session_factory, patch.object(
             web_push, "is_first_active_market_offer", new=AsyncMock(return_value=True)
         ), patch.object(
             web_push, "load_market_offer_push_target_user_ids", new=AsyncMock(return_value=[2, 3])
         ), patch.object(
-            web_push,
-            "send_web_push_to_user",
-            new=AsyncMock(
-                side_effect=[
-                    {"total": 1, "sent": 1, "failed": 0, "disabled": 0},
-                    {"total": 2, "sent": 1, "failed": 1, "disabled": 1},
-                ]
-            ),
-        ), patch.object(web_push.logger, "info") as info_mock:
+            web_push, "load_web_push_fanout_targets", new=AsyncMock(return_value=targets)
+        ) as load_targets, patch.object(
+            web_push, "deliver_web_push", new=AsyncMock(return_value=report)
+        ) as deliver, patch.object(
+            web_push, "apply_web_push_outcomes", new=AsyncMock()
+        ) as apply_outcomes, patch.object(
+            web_push, "record_web_push_fanout"
+        ) as record_fanout, patch.object(web_push.logger, "info") as info_mock:
             await web_push.send_market_offer_web_push(42)
 
+        self.assertEqual(load_targets.await_args.args[1], [2, 3])
+        deliver.assert_awaited_once()
+        self.assertEqual(deliver.await_args.args[0], targets)
+        self.assertEqual(apply_outcomes.await_args.args[1], report.outcomes)
+        self.assertEqual(session_factory.call_count, 2)
+        self.assertEqual(record_fanout.call_args.kwargs["p95_latency_ms"], 30.0)
         info_mock.assert_called_once()
         extra = info_mock.call_args.kwargs["extra"]
         self.assertEqual(extra["event"], "web_push.market_offer.completed")
@@ -333,6 +370,112 @@ class WebPushHelpersTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(extra["sent"], 2)
         self.assertEqual(extra["failed"], 1)
         self.assertEqual(extra["disabled"], 1)
+        self.assertEqual(extra["throughput_per_second"], 6.0)
+
+    async def test_fanout_targets_load_in_one_query_and_drop_isolated_users(self):
+        rows = [
+            SimpleNamespace(id=5, user_id=2, endpoint="https://a.test/5", p256dh="k", auth="a", account_name="qa_1", mobile_number=None),
+            SimpleNamespace(id=6, user_id=3, endpoint="https://a.test/6", p256dh="k", auth="a", account_name="real", mobile_number=None),
+        ]
+
+        class FakeDB:
+            def __init__(self):
+                self.statements = []
+
+            async def execute(self, stmt):
+                self.statements.append(stmt)
+                return SimpleNamespace(all=lambda: rows)
+
+        db = FakeDB()
+        isolation = SimpleNamespace(
+            enabled=True,
+            allow_user_ids=frozenset(),
+            allow_account_prefixes=("qa_",),
+            allow_mobile_prefixes=(),
+        )
+        with patch("core.production_test_isolation.get_isolation_config", new=AsyncMock(return_value=isolation)):
+            targets = await web_push.load_web_push_fanout_targets(db, [3, 2, 2])
+
+        self.assertEqual(len(db.statements), 1)
+        compiled = str(db.statements[0].compile(compile_kwargs={"literal_binds": True}))
+        self.assertIn("push_subscriptions.user_id IN (2, 3)", compiled)
+        self.assertEqual([target.subscription_id for target in targets], [5])
+
+    async def test_deliver_web_push_bounds_concurrency_and_reports_latency(self):
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def fake_post(_session, subscription_info, *_args):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+            if subscription_info["endpoint"].endswith("/3"):
+                raise RuntimeError("push service down")
+
+        web_push.close_web_push_pool()
+        with patch.object(web_push.settings, "web_push_fanout_concurrency", 2), patch.object(
+            web_push, "get_web_push_vapid_signer", return_value=FakeVapidSigner()
+        ), patch.object(web_push, "_post_web_push", side_effect=fake_post):
+            report = await web_push.deliver_web_push([push_target(index) for index in range(1, 7)], {"title": "x"})
+        web_push.close_web_push_pool()
+
+        self.assertEqual(peak, 2)
+        self.assertEqual(report.summary(), {"total": 6, "sent": 5, "failed": 1, "disabled": 0})
+        self.assertGreater(report.p95_latency_ms, 0)
+        self.assertGreater(report.throughput_per_second, 0)
+        (failure,) = [outcome for outcome in report.outcomes if not outcome.sent]
+        self.assertEqual((failure.subscription_id, failure.error), (3, "push service down"))
+
+    def test_vapid_signer_signs_once_per_origin_until_near_expiry(self):
+        vapid = Mock()
+        vapid.sign.side_effect = lambda claims: {"Authorization": f"vapid {claims['aud']} {claims['exp']}"}
+        signer = web_push.WebPushVapidSigner("private", "mailto:ops@example.test")
+
+        with patch.object(web_push, "Vapid") as vapid_cls, patch.object(web_push.time, "time", return_value=1000.0):
+            vapid_cls.from_string.return_value = vapid
+            first = signer.headers_for("https://fcm.googleapis.com/fcm/send/a")
+            again = signer.headers_for("https://fcm.googleapis.com/fcm/send/b")
+            other = signer.headers_for("https://updates.push.services.mozilla.com/wpush/v2/c")
+        with patch.object(web_push, "Vapid", vapid_cls), patch.object(
+            web_push.time, "time", return_value=1000.0 + web_push.VAPID_TOKEN_LIFETIME_SECONDS
+        ):
+            renewed = signer.headers_for("https://fcm.googleapis.com/fcm/send/a")
+
+        self.assertEqual(first, again)
+        self.assertNotEqual(first, other)
+        self.assertNotEqual(first, renewed)
+        self.assertEqual(vapid.sign.call_count, 3)
+        vapid_cls.from_string.assert_called_once_with(private_key="private")
+
+    async def test_outcomes_are_written_back_with_one_update_per_group(self):
+        db = SimpleNamespace(execute=AsyncMock(), commit=AsyncMock())
+        outcomes = [
+            web_push.WebPushOutcome(subscription_id=1, user_id=1, latency_ms=1.0),
+            web_push.WebPushOutcome(subscription_id=2, user_id=2, latency_ms=1.0),
+            web_push.WebPushOutcome(subscription_id=3, user_id=3, latency_ms=1.0, status_code=410, error="gone: a"),
+            web_push.WebPushOutcome(subscription_id=4, user_id=4, latency_ms=1.0, status_code=410, error="gone: b"),
+            web_push.WebPushOutcome(subscription_id=5, user_id=5, latency_ms=1.0, status_code=500, error="boom"),
+        ]
+
+        await web_push.apply_web_push_outcomes(db, outcomes)
+
+        statements = [
+            str(call.args[0].compile(compile_kwargs={"literal_binds": True})) for call in db.execute.await_args_list
+        ]
+        self.assertEqual(len(statements), 3)
+        self.assertIn("failure_count=0", statements[0].replace(" ", ""))
+        self.assertIn("IN (1, 2)", statements[0])
+        self.assertIn("enabled=false", statements[1].replace(" ", "").lower())
+        self.assertIn("IN (3, 4)", statements[1])
+        self.assertIn("WHEN 3 THEN 'gone: a' WHEN 4 THEN 'gone: b'", statements[1])
+        self.assertNotIn("enabled", statements[2])
+        self.assertIn("failure_count + 1", statements[2])
+        db.commit.assert_awaited_once()
 
     async def test_send_returns_zero_summary_when_unconfigured(self):
         with patch.object(web_push, "is_web_push_configured", return_value=False):